@@ -11,12 +11,13 @@ Key Features:
 - Simulates trading execution to compute returns and cumulative performance
 - Logs all major steps using a provided logger
 - Saves backtest results to a CSV file for further analysis
+- Vectorized alert-condition backtests that score many rule sets in one pass
 """
 
 import pandas as pd
 import numpy as np
 import logging
-from typing import Any, Dict, Union, Optional, List
+from typing import Any, Callable, Dict, Union, Optional, List
 import datetime
 from pathlib import Path
 
@@ -31,6 +32,177 @@ except ImportError:
     from strategy import Strategy
 
 
+# --- vectorized alert conditions ---------------------------------------------
+# Whole-series equivalents of the TBOW alert CONDITION_HANDLERS. Each takes the
+# shared indicator arrays and returns a boolean array with one entry per bar.
+def _prev(values: np.ndarray) -> np.ndarray:
+    """Previous-bar values, NaN on the first bar."""
+    out = np.empty_like(values)
+    out[:1] = np.nan
+    out[1:] = values[:-1]
+    return out
+
+def _macd_curl_down(ind):  return (_prev(ind["macd_hist"]) > 0) & (ind["macd_hist"] < 0)
+def _macd_curl_up(ind):    return (_prev(ind["macd_hist"]) < 0) & (ind["macd_hist"] > 0)
+def _rsi_below(thresh):    return lambda ind: ind["rsi"] < thresh
+def _rsi_above(thresh):    return lambda ind: ind["rsi"] > thresh
+def _price_below(level):   return lambda ind: ind["price"] < level
+def _price_above(level):   return lambda ind: ind["price"] > level
+def _vwap_above(ind):      return ind["price"] > ind["vwap"]
+def _vwap_below(ind):      return ind["price"] < ind["vwap"]
+
+VECTOR_CONDITIONS: Dict[str, Callable[[Dict[str, np.ndarray]], np.ndarray]] = {
+    "MACD_curl_down": _macd_curl_down,
+    "MACD_curl_up":   _macd_curl_up,
+    "RSI_below_40":   _rsi_below(40),
+    "RSI_above_60":   _rsi_above(60),
+    "Price_below_500":_price_below(500),
+    "VWAP_above":     _vwap_above,
+    "VWAP_below":     _vwap_below,
+}
+
+# Indicator array name -> candidate DataFrame columns
+_INDICATOR_COLUMNS = {
+    "macd_hist": ("MACD_hist", "macd_hist"),
+    "rsi": ("RSI", "rsi"),
+    "vwap": ("vwap", "VWAP"),
+}
+
+
+def extract_indicator_arrays(df: pd.DataFrame) -> Dict[str, np.ndarray]:
+    """
+    Pull the indicator columns used by alert conditions into float arrays.
+
+    VWAP is derived from close and volume when the frame has no VWAP column.
+    """
+    close = df["close"].to_numpy(dtype=float)
+    arrays = {"price": close}
+    for name, columns in _INDICATOR_COLUMNS.items():
+        column = next((c for c in columns if c in df.columns), None)
+        if column is not None:
+            arrays[name] = df[column].to_numpy(dtype=float)
+
+    if "vwap" not in arrays and "volume" in df.columns:
+        volume = df["volume"].to_numpy(dtype=float)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            arrays["vwap"] = np.cumsum(close * volume) / np.cumsum(volume)
+
+    return arrays
+
+
+def evaluate_rule_sets(
+    arrays: Dict[str, np.ndarray], rule_sets: List[List[str]]
+) -> np.ndarray:
+    """
+    Evaluate many alert rule sets over the whole series.
+
+    Every distinct condition is computed once and shared between rule sets.
+    Returns a boolean array of shape (len(rule_sets), n_bars) that is True
+    where all of a rule set's conditions hold.
+    """
+    unique = sorted({condition for rule_set in rule_sets for condition in rule_set})
+    unknown = [c for c in unique if c not in VECTOR_CONDITIONS]
+    if unknown:
+        raise ValueError(f"Unknown condition(s): {', '.join(unknown)}")
+    if any(not rule_set for rule_set in rule_sets):
+        raise ValueError("Rule sets must contain at least one condition")
+
+    n_bars = len(arrays["price"])
+    try:
+        matrix = np.vstack([
+            np.asarray(VECTOR_CONDITIONS[c](arrays), dtype=bool).reshape(n_bars)
+            for c in unique
+        ]) if unique else np.zeros((0, n_bars), dtype=bool)
+    except KeyError as e:
+        raise ValueError(f"Data is missing indicator required by alert conditions: {e}")
+
+    row = {condition: i for i, condition in enumerate(unique)}
+    return np.vstack([
+        matrix[[row[c] for c in rule_set]].all(axis=0) for rule_set in rule_sets
+    ]) if rule_sets else np.zeros((0, n_bars), dtype=bool)
+
+
+def vectorized_alert_backtest(
+    df: pd.DataFrame,
+    rule_sets: List[List[str]],
+    hold_bars: int = 6,
+    transaction_cost: float = 0.001,
+    initial_cash: float = 10000,
+) -> List[Dict[str, Any]]:
+    """
+    Backtest alert rule sets with array operations instead of a row loop.
+
+    An alert enters a long position at the close of the bar where all of its
+    conditions hold. The position is held for ``hold_bars`` bars after the most
+    recent alert (6 x 5Min = the 30 minute window used by the alert digest).
+
+    Returns one result dict per rule set, in input order, with summary metrics
+    and the per-bar ``entries``, ``position``, ``strategy_returns`` and
+    ``equity`` arrays.
+    """
+    if hold_bars < 1:
+        raise ValueError("hold_bars must be at least 1")
+
+    arrays = extract_indicator_arrays(df)
+    entries = evaluate_rule_sets(arrays, rule_sets)
+    n_rules, n_bars = entries.shape
+    if n_rules == 0 or n_bars == 0:
+        return []
+
+    close = arrays["price"]
+    bar = np.arange(n_bars)
+
+    # Bar index of the most recent alert, forward-filled along each row
+    last_entry = np.maximum.accumulate(np.where(entries, bar, -1), axis=1)
+    position = ((last_entry >= 0) & (bar - last_entry < hold_bars)).astype(float)
+
+    returns = np.zeros(n_bars)
+    returns[1:] = close[1:] / close[:-1] - 1
+    held = np.zeros_like(position)
+    held[:, 1:] = position[:, :-1]
+    turnover = np.abs(np.diff(position, axis=1, prepend=0.0))
+
+    strategy_returns = held * returns - turnover * transaction_cost
+    equity = initial_cash * np.cumprod(1 + strategy_returns, axis=1)
+    drawdown = equity / np.maximum.accumulate(equity, axis=1) - 1
+    starts = np.diff(position, axis=1, prepend=0.0) > 0
+
+    results = []
+    for r, rule_set in enumerate(rule_sets):
+        # Label each held bar with its trade number and sum log returns per trade
+        trade_id = (np.cumsum(starts[r]) * position[r]).astype(int)
+        held_id = np.zeros(n_bars, dtype=int)
+        held_id[1:] = trade_id[:-1]
+        n_trades = int(starts[r].sum())
+        trade_log = np.bincount(
+            held_id, weights=np.log1p(returns) * (held_id > 0), minlength=n_trades + 1
+        )[1:]
+        trade_returns = np.expm1(trade_log) - 2 * transaction_cost
+
+        period_returns = strategy_returns[r]
+        volatility = period_returns.std() * np.sqrt(252)
+        total_return = equity[r, -1] / initial_cash - 1
+        annual_return = total_return / (n_bars / 252)
+
+        results.append({
+            "conditions": list(rule_set),
+            "alerts": int(entries[r].sum()),
+            "trade_count": n_trades,
+            "win_rate": float((trade_returns > 0).mean()) if n_trades else 0,
+            "avg_trade_return": float(trade_returns.mean()) if n_trades else 0,
+            "total_return": float(total_return),
+            "max_drawdown": float(drawdown[r].min()),
+            "sharpe_ratio": float(annual_return / volatility) if volatility else float("nan"),
+            "final_balance": float(equity[r, -1]),
+            "entries": entries[r],
+            "position": position[r],
+            "strategy_returns": period_returns,
+            "equity": equity[r],
+        })
+
+    return results
+
+
 class Backtester:
     """
     Implements a backtesting engine for evaluating trading strategies.
@@ -48,6 +220,8 @@ class Backtester:
         log_callback: Any = None,
         initial_cash: float = 10000,
         log_file: str = "backtest_results.csv",
+        alert_conditions: Optional[List[str]] = None,
+        alert_hold_bars: int = 6,
     ):
         """
         Initializes the Backtester with flexible parameters.
@@ -67,6 +241,9 @@ class Backtester:
         - log_callback (optional): External logging callback.
         - initial_cash: Initial account balance.
         - log_file: Filename to save the backtest results.
+        - alert_conditions (optional): Alert condition names (e.g. "MACD_curl_up").
+          When given, signals come from the conditions via the vectorized path.
+        - alert_hold_bars: Bars to hold after an alert fires.
         """
         self.strategy = strategy
         self.logger = logger
@@ -78,6 +255,8 @@ class Backtester:
         self.log_callback = log_callback
         self.initial_cash = initial_cash
         self.log_file = log_file
+        self.alert_conditions = alert_conditions
+        self.alert_hold_bars = alert_hold_bars
 
         # Performance metrics
         self.metrics = {}
@@ -122,17 +301,23 @@ class Backtester:
         # Calculate indicators using the strategy.
         df = self._calculate_indicators(df)
 
-        # Generate trading signals.
-        df = self._generate_signals(df)
+        if self.alert_conditions:
+            # Signals, positions and returns all come from the alert conditions.
+            df = self._simulate_alert_trading(df)
+        else:
+            # Generate trading signals.
+            df = self._generate_signals(df)
 
-        # Simulate trading execution.
-        df = self._simulate_trading(df)
+            # Simulate trading execution.
+            df = self._simulate_trading(df)
 
-        # Calculate returns and cumulative performance.
-        df = self._calculate_returns(df)
+            # Calculate returns and cumulative performance.
+            df = self._calculate_returns(df)
         
         # Calculate performance metrics
         self._calculate_performance_metrics(df)
+        if self.alert_conditions:
+            self.metrics["alert_metrics"] = self._calculate_alert_metrics(df)
 
         # Save results to CSV.
         self._save_results(df)
@@ -316,6 +501,126 @@ class Backtester:
         
         return df
 
+    def run_alert_backtests(
+        self, data: pd.DataFrame, rule_sets: List[List[str]]
+    ) -> pd.DataFrame:
+        """
+        Score many alert rule sets in one pass over shared indicator arrays.
+
+        Returns a summary DataFrame with one row per rule set, indexed by the
+        rule set joined with " && ".
+        """
+        df = self._calculate_indicators(data.copy())
+        results = vectorized_alert_backtest(
+            df,
+            rule_sets,
+            hold_bars=self.alert_hold_bars,
+            transaction_cost=self.portfolio.get("transaction_cost", 0.001),
+            initial_cash=self.initial_cash,
+        )
+        summary = pd.DataFrame([
+            {k: v for k, v in result.items() if not isinstance(v, np.ndarray)}
+            for result in results
+        ])
+        if not summary.empty:
+            summary.index = [" && ".join(r["conditions"]) for r in results]
+        self.logger.info(f"Scored {len(results)} alert rule sets over {len(df)} bars")
+        return summary
+
+    def _simulate_alert_trading(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Vectorized simulation for ``alert_conditions``.
+
+        Fills the same columns as the signal-driven path so metrics, saving
+        and plotting work unchanged.
+        """
+        self.logger.info(f"Simulating alert conditions: {' && '.join(self.alert_conditions)}")
+        result = vectorized_alert_backtest(
+            df,
+            [self.alert_conditions],
+            hold_bars=self.alert_hold_bars,
+            transaction_cost=self.portfolio.get("transaction_cost", 0.001),
+            initial_cash=self.initial_cash,
+        )[0]
+
+        position = result["position"]
+        change = np.diff(position, prepend=0.0)
+        df["signal"] = np.where(change > 0, "BUY", np.where(change < 0, "SELL", "HOLD"))
+        df["position"] = position
+        df["returns"] = df["close"].pct_change()
+        df["strategy_returns"] = result["strategy_returns"]
+        df["portfolio_value"] = result["equity"]
+        df["cumulative_returns"] = result["equity"] / self.initial_cash
+        df["cumulative_max"] = df["cumulative_returns"].cummax()
+        df["drawdown"] = (df["cumulative_returns"] / df["cumulative_max"]) - 1
+
+        # Trade records for the shared metrics, one per entry/exit pair
+        close = df["close"].to_numpy(dtype=float)
+        entry_idx = np.flatnonzero(change > 0)
+        exit_idx = np.flatnonzero(change < 0)
+        exit_idx = np.append(exit_idx, len(df) - 1)[:len(entry_idx)]
+        self.trades = [
+            {
+                "entry_date": df.index[i],
+                "entry_price": close[i],
+                "exit_date": df.index[j],
+                "exit_price": close[j],
+                "direction": "LONG",
+                "profit_loss": (close[j] / close[i] - 1) * self.initial_cash,
+                "profit_loss_pct": (close[j] / close[i] - 1) * 100,
+            }
+            for i, j in zip(entry_idx, exit_idx)
+        ]
+        self.logger.info(
+            f"Alert simulation completed: {result['alerts']} alerts, {len(self.trades)} trades"
+        )
+        return df
+
+    def _calculate_alert_metrics(self, df: pd.DataFrame) -> Dict[str, Any]:
+        """
+        Per-condition trigger statistics over the ``alert_hold_bars`` window.
+        """
+        arrays = extract_indicator_arrays(df)
+        close = arrays["price"]
+        h = self.alert_hold_bars
+        forward_move = np.full(len(close), np.nan)
+        if len(close) > h:
+            forward_move[:-h] = (close[h:] / close[:-h] - 1) * 100
+
+        conditions = list(dict.fromkeys(self.alert_conditions))
+        triggers = evaluate_rule_sets(arrays, [[c] for c in conditions])
+        combined = triggers.all(axis=0)
+
+        condition_stats = {}
+        for condition, fired in zip(conditions, triggers):
+            moves = forward_move[fired & ~np.isnan(forward_move)]
+            condition_stats[condition] = {
+                "triggers": int(fired.sum()),
+                "win_rate": float((moves > 0).mean()) if moves.size else 0,
+                "avg_move": float(moves.mean()) if moves.size else 0,
+                "max_move": float(moves.max()) if moves.size else 0,
+                "min_move": float(moves.min()) if moves.size else 0,
+            }
+
+        correlations = {}
+        for i, cond1 in enumerate(conditions):
+            for j in range(i + 1, len(conditions)):
+                a, b = triggers[i], triggers[j]
+                if a.std() == 0 or b.std() == 0:
+                    correlation = 0.0
+                else:
+                    correlation = float(np.corrcoef(a, b)[0, 1])
+                correlations[(cond1, conditions[j])] = {
+                    "correlation": correlation,
+                    "count": int((a & b).sum()),
+                }
+
+        return {
+            "total_alerts": int(combined.sum()),
+            "condition_stats": condition_stats,
+            "correlations": correlations,
+        }
+
     def _calculate_returns(self, df: pd.DataFrame) -> pd.DataFrame:
         """
         Calculate returns and performance metrics.
@@ -10,16 +10,19 @@ used in the BasicBot trading system, including:
 
 Usage:
     python model_trainer.py --model regime --symbols SPY --start 2018-01-01 --end 2023-01-01
+    python model_trainer.py --model regime --symbols SPY QQQ --walk-forward --folds 4 --workers 4
 """
 
 import os
 import sys
+import time
 import argparse
 import logging
+from concurrent.futures import ProcessPoolExecutor, as_completed
 import pandas as pd
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 
 # Ensure parent directory is in path for imports
 script_dir = Path(__file__).resolve().parent
@@ -34,6 +37,12 @@ from basicbot.logger import setup_logging
 # Configure logging
 logger = setup_logging("model_trainer")
 
+# Bump when extract_features() or label_regimes() change so cached
+# feature matrices are rebuilt instead of reused.
+FEATURE_VERSION = "1"
+
+DEFAULT_CACHE_DIR = script_dir / "cache" / "features"
+
 
 def download_data(
     symbols: List[str],
@@ -187,15 +196,276 @@ def train_regime_model(
     return results
 
 
+def feature_cache_path(
+    cache_dir: Path,
+    symbol: str,
+    start_date: str,
+    end_date: str,
+    timeframe: str = "1d"
+) -> Path:
+    """Cache file for a symbol's engineered features over a date range."""
+    return Path(cache_dir) / f"{symbol}_{timeframe}_{start_date}_{end_date}_v{FEATURE_VERSION}.pkl"
+
+
+def load_or_build_features(
+    symbol: str,
+    df: pd.DataFrame,
+    start_date: str,
+    end_date: str,
+    timeframe: str = "1d",
+    cache_dir: Optional[Path] = None
+) -> Tuple[pd.DataFrame, Dict[str, float]]:
+    """
+    Return labeled regime features for a symbol, using the on-disk cache.
+    
+    Features are cached by (symbol, timeframe, date range, FEATURE_VERSION).
+    
+    Returns:
+        Tuple of (labeled feature DataFrame, stage timings in seconds)
+    """
+    cache_path = feature_cache_path(cache_dir or DEFAULT_CACHE_DIR, symbol, start_date, end_date, timeframe)
+    timings = {}
+    
+    if cache_path.exists():
+        start = time.perf_counter()
+        try:
+            labeled = pd.read_pickle(cache_path)
+            timings["features_cached"] = time.perf_counter() - start
+            logger.info(f"Loaded cached features for {symbol} from {cache_path}")
+            return labeled, timings
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable feature cache {cache_path}: {e}")
+    
+    detector = RegimeDetector(model_dir=str(script_dir / "models"), logger=logger)
+    
+    start = time.perf_counter()
+    features = detector.extract_features(df)
+    timings["features"] = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    labeled = detector.label_regimes(features)
+    timings["labels"] = time.perf_counter() - start
+    
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    labeled.to_pickle(cache_path)
+    return labeled, timings
+
+
+def walk_forward_windows(
+    n_rows: int,
+    folds: int,
+    test_fraction: float = 0.2
+) -> List[Tuple[slice, slice]]:
+    """
+    Anchored walk-forward windows over ``n_rows`` labeled rows.
+    
+    The last ``test_fraction`` of the data is split into ``folds`` consecutive
+    test windows; each fold trains on everything before its test window.
+    """
+    test_rows = int(n_rows * test_fraction)
+    fold_size = test_rows // folds if folds else 0
+    if fold_size == 0:
+        raise ValueError(f"Not enough rows ({n_rows}) for {folds} walk-forward folds")
+    
+    first_test = n_rows - fold_size * folds
+    return [
+        (slice(0, first_test + i * fold_size), slice(first_test + i * fold_size, first_test + (i + 1) * fold_size))
+        for i in range(folds)
+    ]
+
+
+def _train_fold(
+    symbol: str,
+    fold: int,
+    train_df: pd.DataFrame,
+    test_df: pd.DataFrame,
+    optimize: bool,
+    model_dir: str
+) -> Dict[str, Any]:
+    """Fit and score one walk-forward fold (runs in a worker process)."""
+    detector = RegimeDetector(model_dir=model_dir, logger=setup_logging("model_trainer"))
+    
+    start = time.perf_counter()
+    metrics = detector.fit_labeled(train_df, optimize=optimize, eval_df=test_df, save=False)
+    train_time = time.perf_counter() - start
+    
+    return {
+        "symbol": symbol,
+        "fold": fold,
+        "train_rows": len(train_df),
+        "test_rows": len(test_df),
+        "metrics": metrics,
+        "model": detector.model,
+        "scaler": detector.scaler,
+        "feature_names": detector.feature_names,
+        "train_time": train_time
+    }
+
+
+def run_training_pipeline(
+    data_dict: Dict[str, pd.DataFrame],
+    start_date: str,
+    end_date: str,
+    timeframe: str = "1d",
+    folds: int = 4,
+    optimize: bool = True,
+    workers: Optional[int] = None,
+    model_dir: str = None,
+    cache_dir: Optional[Path] = None,
+    register: bool = True,
+    download_time: float = 0.0
+) -> Dict[str, Any]:
+    """
+    Walk-forward regime training with cached features and a process pool.
+    
+    Every (symbol, fold) pair is trained in its own worker. The model from
+    each symbol's final fold is saved to ``model_dir`` and, when ``register``
+    is set, to the ModelManager registry with per-stage timings.
+    
+    Returns:
+        Dictionary of per-symbol results with fold metrics and timings
+    """
+    model_path = Path(model_dir) if model_dir else (script_dir / "models")
+    results = {}
+    timings = {}
+    jobs = []
+    
+    for symbol, df in data_dict.items():
+        try:
+            labeled, timings[symbol] = load_or_build_features(
+                symbol, df, start_date, end_date, timeframe, cache_dir
+            )
+            timings[symbol]["download"] = download_time
+            for fold, (train_idx, test_idx) in enumerate(walk_forward_windows(len(labeled), folds)):
+                jobs.append((symbol, fold, labeled.iloc[train_idx], labeled.iloc[test_idx]))
+        except Exception as e:
+            logger.error(f"Error preparing features for {symbol}: {e}")
+            results[symbol] = {"error": str(e)}
+    
+    fold_results: Dict[str, List[Dict[str, Any]]] = {}
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(_train_fold, symbol, fold, train_df, test_df, optimize, str(model_path)): (symbol, fold)
+            for symbol, fold, train_df, test_df in jobs
+        }
+        for future in as_completed(futures):
+            symbol, fold = futures[future]
+            try:
+                fold_results.setdefault(symbol, []).append(future.result())
+                logger.info(f"Finished walk-forward fold {fold} for {symbol}")
+            except Exception as e:
+                logger.error(f"Error training fold {fold} for {symbol}: {e}")
+                results[symbol] = {"error": str(e)}
+    wall_time = time.perf_counter() - start
+    
+    for symbol, folds_done in fold_results.items():
+        if symbol in results:
+            continue
+        folds_done.sort(key=lambda r: r["fold"])
+        final = folds_done[-1]
+        
+        stage_timings = dict(timings[symbol])
+        stage_timings["train"] = sum(r["train_time"] for r in folds_done)
+        stage_timings["train_wall"] = wall_time
+        
+        # Save the most recent fold as the live model
+        start = time.perf_counter()
+        detector = RegimeDetector(model_dir=str(model_path), logger=logger)
+        detector.model = final["model"]
+        detector.scaler = final["scaler"]
+        detector.feature_names = final["feature_names"]
+        detector._save_model()
+        # Timed before registering so the registry metadata includes the save stage
+        stage_timings["save"] = time.perf_counter() - start
+        if register:
+            _register_model(symbol, final, stage_timings)
+        
+        accuracies = [r["metrics"]["accuracy"] for r in folds_done]
+        results[symbol] = {
+            "folds": [
+                {k: r[k] for k in ("fold", "train_rows", "test_rows", "metrics")}
+                for r in folds_done
+            ],
+            "metrics": {"accuracy": sum(accuracies) / len(accuracies)},
+            "timings": stage_timings
+        }
+        logger.info(
+            f"{symbol}: walk-forward accuracy {results[symbol]['metrics']['accuracy']:.4f} "
+            f"over {len(folds_done)} folds"
+        )
+    
+    return results
+
+
+def _register_model(symbol: str, fold_result: Dict[str, Any], timings: Dict[str, float]):
+    """Record the final fold's model and stage timings with ModelManager."""
+    try:
+        from basicbot.model_training_utils import ModelManager
+    except ImportError as e:
+        logger.warning(f"ModelManager unavailable, skipping registry save: {e}")
+        return
+    
+    metrics = fold_result["metrics"]
+    ModelManager(logger).save_model(
+        model=fold_result["model"],
+        symbol=symbol,
+        model_type="random_forest",
+        hyperparameters=fold_result["model"].get_params(),
+        metrics={
+            "accuracy": metrics["accuracy"],
+            "confusion_matrix": metrics["confusion_matrix"],
+            "fold": fold_result["fold"],
+            "train_rows": fold_result["train_rows"],
+            "test_rows": fold_result["test_rows"]
+        },
+        scaler=fold_result["scaler"],
+        timings=timings
+    )
+
+
 def train_models(args):
     """Train models based on command line arguments."""
     # Download data
+    start = time.perf_counter()
     data_dict = download_data(args.symbols, args.start, args.end, args.timeframe)
+    download_time = time.perf_counter() - start
     
     if not data_dict:
         logger.error("No data available for training. Exiting.")
         return
     
+    if args.walk_forward:
+        if args.model.lower() != "regime":
+            logger.error(f"Walk-forward training is not available for model type: {args.model}")
+            return
+        
+        results = run_training_pipeline(
+            data_dict,
+            args.start,
+            args.end,
+            timeframe=args.timeframe,
+            folds=args.folds,
+            optimize=not args.no_optimize,
+            workers=args.workers,
+            model_dir=args.model_dir,
+            cache_dir=Path(args.cache_dir) if args.cache_dir else None,
+            download_time=download_time
+        )
+        
+        print("\n===== Walk-Forward Regime Training Summary =====")
+        for symbol, res in results.items():
+            if "error" in res:
+                print(f"\n{symbol}: ERROR - {res['error']}")
+                continue
+            
+            print(f"\n{symbol}:")
+            print(f"  Mean Accuracy: {res['metrics']['accuracy']:.4f}")
+            for fold in res["folds"]:
+                print(f"  Fold {fold['fold']}: {fold['metrics']['accuracy']:.4f} ({fold['train_rows']} train / {fold['test_rows']} test)")
+            print("  Timings: " + ", ".join(f"{k}={v:.2f}s" for k, v in res["timings"].items()))
+        return
+    
     # Prepare data
     prepared_data = prepare_data(data_dict, args.window)
     
@@ -280,6 +550,26 @@ def main():
         help="Skip hyperparameter optimization"
     )
     
+    parser.add_argument(
+        "--walk-forward", action="store_true",
+        help="Use the cached, parallel walk-forward training pipeline"
+    )
+    
+    parser.add_argument(
+        "--folds", type=int, default=4,
+        help="Number of walk-forward folds"
+    )
+    
+    parser.add_argument(
+        "--workers", type=int, default=None,
+        help="Worker processes for walk-forward training (default: CPU count)"
+    )
+    
+    parser.add_argument(
+        "--cache-dir", type=str, default=None,
+        help="Directory for cached feature matrices"
+    )
+    
     args = parser.parse_args()
     
     # Run training
@@ -14,10 +14,17 @@ Usage:
     detector = RegimeDetector()
     detector.train(historical_data)
     regime = detector.predict(current_data)
+    regimes = detector.predict_batch({"SPY": spy_data, "QQQ": qqq_data})
+
+    # Streaming: feed one bar at a time, features use a bounded tail window
+    detector.update_bar("SPY", bar)
+    regime = detector.predict_latest("SPY")
 """
 
 import os
 import logging
+import threading
+from collections import deque
 import numpy as np
 import pandas as pd
 from pathlib import Path
@@ -55,6 +62,30 @@ except ImportError:
             return logger
 
 
+REGIME_NAMES = {
+    0: "mean_reverting",
+    1: "trending_up",
+    2: "trending_down",
+    3: "high_volatility"
+}
+
+# Per-process cache of loaded artifacts, keyed by model directory.
+# Entries are reused until the model or scaler file's mtime changes.
+_ARTIFACT_CACHE: Dict[str, Dict[str, Any]] = {}
+_ARTIFACT_LOCK = threading.Lock()
+
+
+def _artifact_mtimes(model_dir: Path) -> Optional[Tuple[float, float]]:
+    """Return (model mtime, scaler mtime), or None if either file is missing."""
+    try:
+        return (
+            (model_dir / "regime_model.joblib").stat().st_mtime,
+            (model_dir / "regime_scaler.joblib").stat().st_mtime,
+        )
+    except FileNotFoundError:
+        return None
+
+
 class RegimeDetector:
     """
     Market regime detection model that classifies market conditions.
@@ -83,6 +114,12 @@ class RegimeDetector:
         self.model = None
         self.scaler = None
         self.feature_names = []
+        self._loaded_mtimes = None
+        
+        # Incremental mode: trailing raw bars per symbol and their latest features
+        self.state_window = 250
+        self._bar_state: Dict[str, deque] = {}
+        self._latest_features: Dict[str, np.ndarray] = {}
         
         # Ensure model directory exists
         os.makedirs(self.model_dir, exist_ok=True)
@@ -96,24 +133,41 @@ class RegimeDetector:
         """
         Load pre-trained model from disk.
         
+        Artifacts are shared through a per-process cache and only
+        deserialized again when the files on disk change.
+        
         Returns:
             True if model loaded successfully, False otherwise
         """
         model_path = self.model_dir / "regime_model.joblib"
         scaler_path = self.model_dir / "regime_scaler.joblib"
+        mtimes = _artifact_mtimes(self.model_dir)
         
-        if model_path.exists() and scaler_path.exists():
+        if mtimes is not None:
+            key = str(self.model_dir.resolve())
             try:
-                self.model = joblib.load(model_path)
-                self.scaler = joblib.load(scaler_path)
+                with _ARTIFACT_LOCK:
+                    cached = _ARTIFACT_CACHE.get(key)
+                    if cached is None or cached["mtimes"] != mtimes:
+                        feature_names = []
+                        feature_path = self.model_dir / "regime_features.txt"
+                        if feature_path.exists():
+                            with open(feature_path, 'r') as f:
+                                feature_names = [line.strip() for line in f.readlines()]
+                        cached = {
+                            "mtimes": mtimes,
+                            "model": joblib.load(model_path),
+                            "scaler": joblib.load(scaler_path),
+                            "feature_names": feature_names,
+                        }
+                        _ARTIFACT_CACHE[key] = cached
+                        self.logger.info(f"Loaded pre-trained regime model from {model_path}")
                 
-                # Load feature names if available
-                feature_path = self.model_dir / "regime_features.txt"
-                if feature_path.exists():
-                    with open(feature_path, 'r') as f:
-                        self.feature_names = [line.strip() for line in f.readlines()]
-                
-                self.logger.info(f"Loaded pre-trained regime model from {model_path}")
+                self.model = cached["model"]
+                self.scaler = cached["scaler"]
+                if cached["feature_names"]:
+                    self.feature_names = list(cached["feature_names"])
+                self._loaded_mtimes = mtimes
                 return True
             except Exception as e:
                 self.logger.error(f"Error loading model: {e}")
@@ -121,6 +175,12 @@ class RegimeDetector:
         self.logger.info("No pre-trained regime model found, will need training")
         return False
     
+    def _refresh_model(self):
+        """Reload the model if its files changed since they were loaded."""
+        mtimes = _artifact_mtimes(self.model_dir)
+        if mtimes is not None and mtimes != self._loaded_mtimes:
+            self._load_model()
+    
     def _save_model(self):
         """Save the trained model to disk."""
         if self.model is None or self.scaler is None:
@@ -141,6 +201,17 @@ class RegimeDetector:
                     for feature in self.feature_names:
                         f.write(f"{feature}\n")
             
+            # Publish the fresh artifacts to the process cache
+            mtimes = _artifact_mtimes(self.model_dir)
+            with _ARTIFACT_LOCK:
+                _ARTIFACT_CACHE[str(self.model_dir.resolve())] = {
+                    "mtimes": mtimes,
+                    "model": self.model,
+                    "scaler": self.scaler,
+                    "feature_names": list(self.feature_names),
+                }
+            self._loaded_mtimes = mtimes
+            
             self.logger.info(f"Saved regime model to {model_path}")
         except Exception as e:
             self.logger.error(f"Error saving model: {e}")
@@ -324,13 +395,47 @@ class RegimeDetector:
         self.logger.info("Labeling market regimes")
         labeled_df = self.label_regimes(features_df)
         
+        return self.fit_labeled(labeled_df, optimize=optimize, test_size=test_size)
+    
+    def fit_labeled(
+        self,
+        labeled_df: pd.DataFrame,
+        optimize: bool = True,
+        test_size: float = 0.2,
+        eval_df: Optional[pd.DataFrame] = None,
+        save: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Fit the model on already-engineered, labeled features.
+        
+        Args:
+            labeled_df: Output of extract_features() + label_regimes()
+            optimize: Whether to perform hyperparameter optimization
+            test_size: Proportion held out when eval_df is not given
+            eval_df: Optional labeled out-of-sample window (walk-forward)
+            save: Whether to save the fitted model to model_dir
+            
+        Returns:
+            Dictionary with training metrics
+        """
+        self.feature_names = [
+            col for col in labeled_df.columns
+            if col not in ['open', 'high', 'low', 'close', 'volume', 'date', 'timestamp', 'regime']
+        ]
+        
         # Prepare training data
         X, y, feature_names = self.prepare_training_data(labeled_df)
         
-        # Split into training and testing sets
-        X_train, X_test, y_train, y_test = train_test_split(
-            X, y, test_size=test_size, random_state=42, stratify=y
-        )
+        if eval_df is not None:
+            # Out-of-sample window scored with the scaler fitted on training data
+            X_train, y_train = X, y
+            X_test = self.scaler.transform(eval_df[self.feature_names].values)
+            y_test = eval_df['regime'].values
+        else:
+            # Split into training and testing sets
+            X_train, X_test, y_train, y_test = train_test_split(
+                X, y, test_size=test_size, random_state=42, stratify=y
+            )
         
         if optimize:
             # Hyperparameter optimization
@@ -379,7 +484,8 @@ class RegimeDetector:
         self.logger.info(f"Top 5 important features: {feature_importance['feature'].head(5).tolist()}")
         
         # Save the model
-        self._save_model()
+        if save:
+            self._save_model()
         
         # Return metrics
         metrics = {
@@ -391,56 +497,127 @@ class RegimeDetector:
         
         return metrics
     
+    def _latest_feature_row(self, data: pd.DataFrame) -> np.ndarray:
+        """Feature vector for the newest bar in ``data``."""
+        features_df = self.extract_features(data)
+        if features_df.empty:
+            raise ValueError("Not enough data to compute regime features")
+        return features_df[self.feature_names].values[-1]
+    
+    def _score(self, X: np.ndarray) -> List[Dict[str, Any]]:
+        """Scale feature rows and score them with one model call."""
+        X_scaled = self.scaler.transform(X)
+        regime_proba = self.model.predict_proba(X_scaled)
+        classes = [int(c) for c in self.model.classes_]
+        timestamp = datetime.now().isoformat()
+        
+        predictions = []
+        for proba in regime_proba:
+            best = int(np.argmax(proba))
+            regime_id = classes[best]
+            predictions.append({
+                "regime_id": regime_id,
+                "regime": REGIME_NAMES.get(regime_id, "unknown"),
+                "confidence": float(proba[best]),
+                "probabilities": {
+                    REGIME_NAMES.get(c, "unknown"): float(p)
+                    for c, p in zip(classes, proba)
+                },
+                "timestamp": timestamp
+            })
+        return predictions
+    
+    def _check_ready(self):
+        self._refresh_model()
+        if self.model is None or self.scaler is None:
+            raise ValueError("Model not trained. Call train() first.")
+    
     def predict(self, data: pd.DataFrame) -> Dict[str, Any]:
         """
         Predict market regime from price data.
         
+        Only the newest bar is scored.
+        
         Args:
             data: DataFrame with OHLCV data
             
         Returns:
             Dictionary with regime prediction and confidence
         """
-        if self.model is None or self.scaler is None:
-            raise ValueError("Model not trained. Call train() first.")
+        self._check_ready()
+        return self._score(self._latest_feature_row(data)[np.newaxis, :])[0]
+    
+    def predict_batch(self, data_by_symbol: Dict[str, pd.DataFrame]) -> Dict[str, Dict[str, Any]]:
+        """
+        Predict the current regime for many symbols with one model call.
         
-        # Extract features
-        features_df = self.extract_features(data)
+        Args:
+            data_by_symbol: Mapping of symbol to OHLCV DataFrame
+            
+        Returns:
+            Mapping of symbol to prediction. Symbols whose features cannot be
+            computed map to an "unknown" regime with an "error" entry.
+        """
+        self._check_ready()
         
-        # Get feature values
-        X = features_df[self.feature_names].values
+        rows, symbols, results = [], [], {}
+        for symbol, data in data_by_symbol.items():
+            try:
+                rows.append(self._latest_feature_row(data))
+                symbols.append(symbol)
+            except Exception as e:
+                self.logger.warning(f"Skipping regime features for {symbol}: {e}")
+                results[symbol] = {"regime": "unknown", "confidence": 0.0, "error": str(e)}
         
-        # Scale features
-        X_scaled = self.scaler.transform(X)
+        if rows:
+            for symbol, prediction in zip(symbols, self._score(np.vstack(rows))):
+                results[symbol] = prediction
         
-        # Make prediction
-        regime_proba = self.model.predict_proba(X_scaled)
-        regime_id = self.model.predict(X_scaled)[0]
-        
-        # Map regime ID to name
-        regime_names = {
-            0: "mean_reverting",
-            1: "trending_up",
-            2: "trending_down",
-            3: "high_volatility"
-        }
+        return {symbol: results[symbol] for symbol in data_by_symbol}
+    
+    def update_bar(self, symbol: str, bar: Union[Dict[str, float], pd.Series]) -> Optional[np.ndarray]:
+        """
+        Incremental mode: append one OHLCV bar and refresh that symbol's features.
         
-        regime_name = regime_names.get(regime_id, "unknown")
-        confidence = regime_proba[0][regime_id]
+        Features are recomputed over the trailing ``state_window`` bars only,
+        so the cost per bar does not grow with history. Moving averages and
+        rolling statistics match the full-history values; EMA-based features
+        (RSI, ATR, MACD) converge to them once the window is warmed up.
         
-        # Get all probabilities as dict
-        probabilities = {
-            regime_names[i]: prob 
-            for i, prob in enumerate(regime_proba[0])
-        }
+        Returns:
+            The newest feature vector, or None while the window is warming up.
+        """
+        state = self._bar_state.get(symbol)
+        if state is None:
+            state = self._bar_state[symbol] = deque(maxlen=self.state_window)
+        state.append({col: float(bar[col]) for col in ['open', 'high', 'low', 'close', 'volume']})
         
-        return {
-            "regime_id": int(regime_id),
-            "regime": regime_name,
-            "confidence": float(confidence),
-            "probabilities": probabilities,
-            "timestamp": datetime.now().isoformat()
-        }
+        try:
+            row = self._latest_feature_row(pd.DataFrame(list(state)))
+        except ValueError:
+            return None
+        self._latest_features[symbol] = row
+        return row
+    
+    def predict_latest(self, symbols: Optional[List[str]] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Score the cached newest feature rows from update_bar() in one call.
+        
+        Args:
+            symbols: Symbols to score (default: all warmed-up symbols)
+            
+        Returns:
+            Mapping of symbol to prediction
+        """
+        self._check_ready()
+        if isinstance(symbols, str):
+            symbols = [symbols]
+        symbols = [s for s in (symbols or list(self._latest_features)) if s in self._latest_features]
+        if not symbols:
+            return {}
+        
+        X = np.vstack([self._latest_features[s] for s in symbols])
+        return dict(zip(symbols, self._score(X)))
     
     def get_regime_strategy(self, regime_prediction: Dict[str, Any]) -> Dict[str, Any]:
         """
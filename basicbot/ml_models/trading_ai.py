@@ -162,6 +162,47 @@ class TradingAI:
                 "error": str(e)
             }
     
+    def detect_market_regimes(
+        self,
+        data_by_symbol: Dict[str, pd.DataFrame]
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Detect current market regimes for many symbols with one model call.
+        
+        Args:
+            data_by_symbol: Mapping of symbol to OHLCV DataFrame
+            
+        Returns:
+            Mapping of symbol to regime detection results
+        """
+        unavailable = {"regime": "unknown", "confidence": 0.0, "available": False}
+        if self.regime_detector is None:
+            self.logger.warning("Regime detector not available")
+            return {symbol: dict(unavailable) for symbol in data_by_symbol}
+        
+        results = {}
+        eligible = {}
+        for symbol, data in data_by_symbol.items():
+            if len(data) < 50:
+                self.logger.warning(f"Insufficient data for regime detection on {symbol}: {len(data)} rows")
+                results[symbol] = dict(unavailable)
+            else:
+                eligible[symbol] = data
+        
+        try:
+            predictions = self.regime_detector.predict_batch(eligible) if eligible else {}
+        except Exception as e:
+            self.logger.error(f"Error detecting market regimes: {e}")
+            predictions = {symbol: dict(unavailable, error=str(e)) for symbol in eligible}
+        
+        for symbol, prediction in predictions.items():
+            prediction["available"] = "error" not in prediction
+            if prediction["available"]:
+                self.current_regime[symbol] = prediction
+            results[symbol] = prediction
+        
+        return results
+    
     def adapt_strategy(
         self,
         symbol: str,
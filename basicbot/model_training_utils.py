@@ -7,14 +7,18 @@ Description:
     Supports different model frameworks (e.g., Keras, scikit-learn) and ensures
     proper storage of models, scalers, and metadata.
     Utilizes a factory-style ModelManager to route to the appropriate specialized manager.
+    Loaded models and resolved "latest" versions are cached per process and
+    reused until the files on disk change; joblib models can be memory-mapped
+    so worker processes share one read-only copy through the OS page cache.
 """
 
 import datetime
 import json
 import logging
+import threading
 from abc import ABC, abstractmethod
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterable, Optional, Tuple
 
 import joblib
 
@@ -26,6 +30,25 @@ from logger import setup_logging
 from tensorflow.keras.models import Sequential, load_model, save_model
 
 
+# -----------------------------------------------------------------------------
+# Process-wide Registry Cache
+# -----------------------------------------------------------------------------
+# model_dir -> (model_dir mtime, latest version dir)
+_VERSION_CACHE: Dict[Path, Tuple[float, Optional[Path]]] = {}
+# (model file, mmap_mode) -> (model file mtime, loaded model)
+_MODEL_CACHE: Dict[Tuple[Path, Optional[str]], Tuple[float, Any]] = {}
+_CACHE_LOCK = threading.Lock()
+
+
+def clear_model_cache() -> None:
+    """
+    Drop every cached model and version lookup in this process.
+    """
+    with _CACHE_LOCK:
+        _VERSION_CACHE.clear()
+        _MODEL_CACHE.clear()
+
+
 # -----------------------------------------------------------------------------
 # Base I/O Class
 # -----------------------------------------------------------------------------
@@ -56,6 +79,7 @@ class BaseModelIO(ABC):
         hyperparameters: Dict[str, Any],
         metrics: Dict[str, Any],
         scaler: Optional[Any] = None,
+        timings: Optional[Dict[str, float]] = None,
     ) -> Dict[str, Path]:
         raise NotImplementedError("Subclasses must implement 'save_model'")
 
@@ -87,13 +111,42 @@ class BaseModelIO(ABC):
     def _get_latest_version_dir(self, model_dir: Path) -> Optional[Path]:
         """
         Return the most recently modified version directory within model_dir.
+        The result is cached until model_dir's own mtime changes, which happens
+        whenever a version directory is added or removed.
         """
+        dir_mtime = model_dir.stat().st_mtime
+        with _CACHE_LOCK:
+            cached = _VERSION_CACHE.get(model_dir)
+        if cached and cached[0] == dir_mtime:
+            return cached[1]
+
         versions = sorted(
             [d for d in model_dir.iterdir() if d.is_dir()],
             key=lambda x: x.stat().st_mtime,
             reverse=True,
         )
-        return versions[0] if versions else None
+        latest = versions[0] if versions else None
+        with _CACHE_LOCK:
+            _VERSION_CACHE[model_dir] = (dir_mtime, latest)
+        return latest
+
+    def _load_cached(self, model_path: Path, loader, mmap_mode: Optional[str] = None) -> Any:
+        """
+        Return the model at model_path, deserializing it only if it is not
+        already cached or the file has changed since it was cached.
+        """
+        key = (model_path.resolve(), mmap_mode)
+        file_mtime = model_path.stat().st_mtime
+        with _CACHE_LOCK:
+            cached = _MODEL_CACHE.get(key)
+        if cached and cached[0] == file_mtime:
+            self.logger.debug(f"Model cache hit for {model_path}")
+            return cached[1]
+
+        model = loader(model_path)
+        with _CACHE_LOCK:
+            _MODEL_CACHE[key] = (file_mtime, model)
+        return model
 
     def _save_metadata(
         self,
@@ -104,9 +157,12 @@ class BaseModelIO(ABC):
         hyperparameters: Dict[str, Any],
         metrics: Dict[str, Any],
         timestamp: str,
+        timings: Optional[Dict[str, float]] = None,
     ) -> Path:
         """
         Save metadata to a JSON file in the version directory.
+        Optional per-stage timings (seconds) from the training pipeline are
+        recorded alongside the metrics.
         """
         version = version_dir.name
         metadata_file = version_dir / "metadata.json"
@@ -119,6 +175,8 @@ class BaseModelIO(ABC):
             "hyperparameters": hyperparameters,
             "metrics": metrics,
         }
+        if timings:
+            metadata_content["timings"] = timings
         try:
             with open(metadata_file, "w") as f:
                 json.dump(metadata_content, f, indent=4)
@@ -169,6 +227,7 @@ class KerasModelIO(BaseModelIO):
         hyperparameters: Dict[str, Any],
         metrics: Dict[str, Any],
         scaler: Optional[Any] = None,
+        timings: Optional[Dict[str, float]] = None,
     ) -> Dict[str, Path]:
         self.logger.info(f"Saving Keras model: Symbol={symbol}, Type={model_type}")
         version_dir = self._create_version_directory(symbol, model_type)
@@ -203,6 +262,7 @@ class KerasModelIO(BaseModelIO):
             hyperparameters=hyperparameters,
             metrics=metrics,
             timestamp=timestamp,
+            timings=timings,
         )
         self.logger.info(
             f"Saved Keras model for {symbol} at version directory: {version_dir}"
@@ -224,7 +284,7 @@ class KerasModelIO(BaseModelIO):
             )
             return None
         try:
-            model = load_model(model_path)
+            model = self._load_cached(model_path, load_model)
             self.logger.debug(f"Keras model loaded from {model_path}")
             return model
         except Exception as e:
@@ -251,6 +311,7 @@ class JoblibModelIO(BaseModelIO):
         hyperparameters: Dict[str, Any],
         metrics: Dict[str, Any],
         scaler: Optional[Any] = None,
+        timings: Optional[Dict[str, float]] = None,
     ) -> Dict[str, Path]:
         self.logger.info(f"Saving Joblib model: Symbol={symbol}, Type={model_type}")
         version_dir = self._create_version_directory(symbol, model_type)
@@ -285,6 +346,7 @@ class JoblibModelIO(BaseModelIO):
             hyperparameters=hyperparameters,
             metrics=metrics,
             timestamp=timestamp,
+            timings=timings,
         )
         self.logger.info(
             f"Saved Joblib model for {symbol} at version directory: {version_dir}"
@@ -292,8 +354,17 @@ class JoblibModelIO(BaseModelIO):
         return {"model": model_file, "scaler": scaler_file, "metadata": metadata_file}
 
     def load_model(
-        self, symbol: str, model_type: str, version: Optional[str] = None
+        self,
+        symbol: str,
+        model_type: str,
+        version: Optional[str] = None,
+        mmap_mode: Optional[str] = None,
     ) -> Optional[Any]:
+        """
+        Load a joblib model. With mmap_mode="r", large numpy arrays inside the
+        model are memory-mapped read-only instead of copied into the process,
+        so worker processes loading the same version share their pages.
+        """
         self.logger.info(
             f"Loading Joblib model: Symbol={symbol}, Type={model_type}, Version={version or 'latest'}"
         )
@@ -306,7 +377,11 @@ class JoblibModelIO(BaseModelIO):
             )
             return None
         try:
-            model = joblib.load(model_path)
+            model = self._load_cached(
+                model_path,
+                lambda path: joblib.load(path, mmap_mode=mmap_mode),
+                mmap_mode=mmap_mode,
+            )
             self.logger.debug(f"Joblib model loaded from {model_path}")
             return model
         except Exception as e:
@@ -350,38 +425,69 @@ class ModelManager:
         hyperparameters: Dict[str, Any],
         metrics: Dict[str, Any],
         scaler: Optional[Any] = None,
+        timings: Optional[Dict[str, float]] = None,
     ) -> Dict[str, Path]:
         """
         Save the model using the appropriate I/O manager based on model_type.
+        `timings` holds optional per-stage durations in seconds for the metadata.
         """
         model_type_lower = model_type.lower()
         if model_type_lower in self.KERAS_TYPES:
             return self.keras_io.save_model(
-                model, symbol, model_type, hyperparameters, metrics, scaler
+                model, symbol, model_type, hyperparameters, metrics, scaler, timings
             )
         elif model_type_lower in self.JOBLIB_TYPES:
             return self.joblib_io.save_model(
-                model, symbol, model_type, hyperparameters, metrics, scaler
+                model, symbol, model_type, hyperparameters, metrics, scaler, timings
             )
         else:
             self.logger.error(f"Model type '{model_type}' is not supported.")
             raise ValueError(f"Model type '{model_type}' is not supported.")
 
     def load_model(
-        self, symbol: str, model_type: str, version: Optional[str] = None
+        self,
+        symbol: str,
+        model_type: str,
+        version: Optional[str] = None,
+        mmap_mode: Optional[str] = None,
     ) -> Optional[Any]:
         """
         Load the model by delegating to the appropriate manager.
+        `mmap_mode` applies to joblib models only and is ignored for Keras.
         """
         model_type_lower = model_type.lower()
         if model_type_lower in self.KERAS_TYPES:
             return self.keras_io.load_model(symbol, model_type, version)
         elif model_type_lower in self.JOBLIB_TYPES:
-            return self.joblib_io.load_model(symbol, model_type, version)
+            return self.joblib_io.load_model(symbol, model_type, version, mmap_mode)
         else:
             self.logger.error(f"Model type '{model_type}' is not supported.")
             raise ValueError(f"Model type '{model_type}' is not supported.")
 
+    def warm_up(
+        self,
+        models: Iterable[Tuple[str, str]],
+        mmap_mode: Optional[str] = None,
+    ) -> Dict[Tuple[str, str], bool]:
+        """
+        Preload the latest version of each (symbol, model_type) pair into the
+        process cache, e.g. before market open, so the first prediction of the
+        session does not pay the deserialization cost.
+        Cache entries are keyed by mmap_mode, so pass the same mmap_mode the
+        later load_model() calls use (both default to None).
+        Returns a mapping of each pair to whether it loaded successfully.
+        """
+        results = {}
+        for symbol, model_type in models:
+            try:
+                model = self.load_model(symbol, model_type, mmap_mode=mmap_mode)
+            except ValueError:
+                model = None
+            results[(symbol, model_type)] = model is not None
+        loaded = sum(results.values())
+        self.logger.info(f"Warm-up loaded {loaded}/{len(results)} models.")
+        return results
+
     def validate_model(
         self, symbol: str, model_type: str, version: Optional[str] = None
     ) -> bool:
@@ -17,8 +17,12 @@ import asyncio
 import uuid
 import time
 import csv
-from collections import deque
-from typing import Dict, Any, Optional, List, Callable
+import sqlite3
+from bisect import bisect_left, bisect_right
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Dict, Any, Optional, List, Callable, Tuple
 from dataclasses import dataclass, asdict
 from datetime import datetime, timedelta
 import discord
@@ -26,6 +30,12 @@ from discord.ext import commands
 import os
 import pytz
 
+# Handle both package and standalone imports
+try:
+    from basicbot.backtester import Backtester
+except ImportError:
+    from backtester import Backtester
+
 # --- signal handlers ---------------------------------------------------------
 def macd_curl_down(data):    return data.macd_hist[-2] > 0 and data.macd_hist[-1] < 0
 def macd_curl_up(data):      return data.macd_hist[-2] < 0 and data.macd_hist[-1] > 0
@@ -46,6 +56,44 @@ CONDITION_HANDLERS = {
     "VWAP_below":     vwap_below,
 }
 
+@lru_cache(maxsize=None)
+def _condition_bit(condition: str) -> int:
+    """Assign each known condition a stable bit position."""
+    if condition not in CONDITION_HANDLERS:
+        raise KeyError(condition)
+    return 1 << list(CONDITION_HANDLERS).index(condition)
+
+@lru_cache(maxsize=1024)
+def compile_conditions(conditions: Tuple[str, ...]) -> int:
+    """Compile a rule's condition list into a bitmask predicate.
+
+    A rule is met on a tick when ``mask & met == mask``, where ``met`` is the
+    bitmask of conditions that evaluated true for the symbol on that tick.
+    """
+    mask = 0
+    for condition in conditions:
+        mask |= _condition_bit(condition)
+    return mask
+
+def evaluate_conditions(mask: int, data: Any, logger: Optional[logging.Logger] = None) -> int:
+    """Evaluate every condition referenced by ``mask`` once against ``data``.
+
+    Returns the bitmask of conditions that are currently true. Conditions that
+    raise are treated as not met.
+    """
+    met = 0
+    for condition, handler in CONDITION_HANDLERS.items():
+        bit = _condition_bit(condition)
+        if not mask & bit:
+            continue
+        try:
+            if handler(data):
+                met |= bit
+        except Exception as e:
+            if logger:
+                logger.error(f"Error evaluating condition {condition}: {e}")
+    return met
+
 @dataclass
 class AlertRule:
     """Alert rule configuration."""
@@ -92,45 +140,118 @@ class AlertRule:
         elapsed = (datetime.now() - self.last_triggered).total_seconds()
         return elapsed >= self.cooldown_seconds
 
+class PriceSeries:
+    """Bounded, time-ordered price buffer for one symbol.
+    
+    Timestamps and prices are kept in parallel lists so lookups can bisect on
+    time. The oldest points are dropped in bulk once the buffer holds twice
+    ``max_points``, which keeps appends amortized O(1).
+    """
+    
+    def __init__(self, max_points: int):
+        """Initialize an empty series."""
+        self.max_points = max_points
+        self.timestamps: List[datetime] = []
+        self.prices: List[float] = []
+        self._start = 0  # first live index; older entries await compaction
+    
+    def __len__(self) -> int:
+        return len(self.timestamps) - self._start
+    
+    def __iter__(self):
+        return zip(self.timestamps[self._start:], self.prices[self._start:])
+    
+    def append(self, timestamp: datetime, price: float):
+        """Add a point, keeping timestamps sorted."""
+        if not self.timestamps or timestamp >= self.timestamps[-1]:
+            self.timestamps.append(timestamp)
+            self.prices.append(price)
+        else:
+            idx = bisect_right(self.timestamps, timestamp, lo=self._start)
+            self.timestamps.insert(idx, timestamp)
+            self.prices.insert(idx, price)
+        
+        overflow = len(self) - self.max_points
+        if overflow > 0:
+            self._start += overflow
+            if self._start >= self.max_points:
+                del self.timestamps[:self._start]
+                del self.prices[:self._start]
+                self._start = 0
+    
+    def index_at_or_after(self, timestamp: datetime) -> int:
+        """Index of the first point at or after ``timestamp``."""
+        return bisect_left(self.timestamps, timestamp, lo=self._start)
+    
+    def price_at_or_after(self, timestamp: datetime) -> Optional[float]:
+        """First price at or after ``timestamp``."""
+        idx = self.index_at_or_after(timestamp)
+        return self.prices[idx] if idx < len(self.timestamps) else None
+    
+    def prices_between(self, start_time: datetime, end_time: datetime) -> List[float]:
+        """Prices with ``start_time <= ts <= end_time``."""
+        lo = self.index_at_or_after(start_time)
+        hi = bisect_right(self.timestamps, end_time, lo=lo)
+        return self.prices[lo:hi]
+    
+    def prices_from(self, timestamp: datetime, count: int) -> List[float]:
+        """Up to ``count`` prices starting at the first point at or after ``timestamp``."""
+        lo = self.index_at_or_after(timestamp)
+        return self.prices[lo:lo + count]
+
 class PriceCache:
     """In-memory price cache for post-alert analysis."""
     
     def __init__(self, max_points: int = 120):
         """Initialize price cache."""
-        self.cache: Dict[str, deque] = {}
+        self.cache: Dict[str, PriceSeries] = {}
         self.max_points = max_points
     
     def update(self, symbol: str, price: float, timestamp: datetime):
         """Update price cache for a symbol."""
         if symbol not in self.cache:
-            self.cache[symbol] = deque(maxlen=self.max_points)
-        self.cache[symbol].append((timestamp, price))
+            self.cache[symbol] = PriceSeries(self.max_points)
+        self.cache[symbol].append(timestamp, price)
     
     def get_price_after(self, symbol: str, timestamp: datetime, minutes: int = 30) -> Optional[float]:
         """Get price after specified minutes from timestamp."""
         if symbol not in self.cache:
             return None
         
-        target_time = timestamp + timedelta(minutes=minutes)
-        for ts, price in self.cache[symbol]:
-            if ts >= target_time:
-                return price
-        return None
+        return self.cache[symbol].price_at_or_after(timestamp + timedelta(minutes=minutes))
     
     def get_price_range(self, symbol: str, start_time: datetime, end_time: datetime) -> List[float]:
         """Get all prices in a time range."""
         if symbol not in self.cache:
             return []
         
-        return [price for ts, price in self.cache[symbol] if start_time <= ts <= end_time]
+        return self.cache[symbol].prices_between(start_time, end_time)
+    
+    def get_prices_from(self, symbol: str, timestamp: datetime, count: int) -> List[float]:
+        """Get up to ``count`` prices starting at ``timestamp``."""
+        if symbol not in self.cache:
+            return []
+        
+        return self.cache[symbol].prices_from(timestamp, count)
 
 class AlertLogger:
-    """Logs alert triggers for daily digest."""
+    """Logs alert triggers for daily digest.
+    
+    Alerts are appended to ``log_file`` (CSV) and indexed in a SQLite
+    database alongside it, so daily queries touch only that day's rows.
+    """
+    
+    FIELDS = [
+        "alert_id", "symbol", "conditions", "fired_ts",
+        "price_at_fire", "price_after_30m"
+    ]
     
-    def __init__(self, log_file: str = "runtime/alert_log.csv"):
+    def __init__(self, log_file: str = "runtime/alert_log.csv", db_file: Optional[str] = None):
         """Initialize alert logger."""
         self.log_file = log_file
+        self.db_file = db_file or os.path.splitext(log_file)[0] + ".db"
         self._ensure_log_file()
+        self._ensure_db()
     
     def _ensure_log_file(self):
         """Ensure log file exists with headers."""
@@ -138,44 +259,114 @@ class AlertLogger:
         if not os.path.exists(self.log_file):
             with open(self.log_file, "w", newline="") as f:
                 writer = csv.writer(f)
-                writer.writerow([
-                    "alert_id", "symbol", "conditions", "fired_ts",
-                    "price_at_fire", "price_after_30m"
-                ])
+                writer.writerow(self.FIELDS)
+    
+    @contextmanager
+    def _connect(self):
+        """Open the index database; commits on success and always closes."""
+        conn = sqlite3.connect(self.db_file)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+    
+    def _ensure_db(self):
+        """Create the alert index and backfill it from an existing CSV log."""
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS alerts (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    alert_id TEXT,
+                    symbol TEXT,
+                    conditions TEXT,
+                    fired_ts TEXT,
+                    price_at_fire REAL,
+                    price_after_30m REAL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_alerts_fired_ts ON alerts (fired_ts)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_alerts_alert_id ON alerts (alert_id, fired_ts)")
+            
+            if conn.execute("SELECT 1 FROM alerts LIMIT 1").fetchone() is None:
+                with open(self.log_file, "r", newline="") as f:
+                    rows = [
+                        (
+                            row["alert_id"],
+                            row["symbol"],
+                            row["conditions"],
+                            row["fired_ts"],
+                            float(row["price_at_fire"]),
+                            float(row["price_after_30m"]) if row["price_after_30m"] else None
+                        )
+                        for row in csv.DictReader(f)
+                    ]
+                conn.executemany(
+                    "INSERT INTO alerts (alert_id, symbol, conditions, fired_ts, price_at_fire, price_after_30m) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    rows
+                )
     
     def log_alert(self, alert: AlertRule, price: float, price_after: Optional[float] = None):
         """Log an alert trigger."""
+        row = (
+            alert.alert_id,
+            alert.symbol,
+            " && ".join(alert.conditions),
+            datetime.now().isoformat(),
+            price,
+            price_after
+        )
         with open(self.log_file, "a", newline="") as f:
             writer = csv.writer(f)
-            writer.writerow([
-                alert.alert_id,
-                alert.symbol,
-                " && ".join(alert.conditions),
-                datetime.now().isoformat(),
-                price,
-                price_after
-            ])
+            writer.writerow(row)
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO alerts (alert_id, symbol, conditions, fired_ts, price_at_fire, price_after_30m) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                row
+            )
+    
+    @staticmethod
+    def _row_to_alert(row: tuple) -> Dict[str, Any]:
+        alert_id, symbol, conditions, fired_ts, price_at_fire, price_after_30m = row
+        return {
+            "alert_id": alert_id,
+            "symbol": symbol,
+            "conditions": conditions,
+            "fired_ts": datetime.fromisoformat(fired_ts),
+            "price_at_fire": float(price_at_fire),
+            "price_after_30m": float(price_after_30m) if price_after_30m is not None else None
+        }
+    
+    def get_alerts_for_date(self, day) -> List[Dict[str, Any]]:
+        """Get all alerts triggered on ``day``."""
+        start = datetime.combine(day, datetime.min.time())
+        end = start + timedelta(days=1)
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT alert_id, symbol, conditions, fired_ts, price_at_fire, price_after_30m "
+                "FROM alerts WHERE fired_ts >= ? AND fired_ts < ? ORDER BY fired_ts, id",
+                (start.isoformat(), end.isoformat())
+            ).fetchall()
+        return [self._row_to_alert(row) for row in rows]
     
     def get_todays_alerts(self) -> List[Dict[str, Any]]:
         """Get all alerts triggered today."""
-        today = datetime.now().date()
-        alerts = []
-        
-        with open(self.log_file, "r", newline="") as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                fired_ts = datetime.fromisoformat(row["fired_ts"])
-                if fired_ts.date() == today:
-                    alerts.append({
-                        "alert_id": row["alert_id"],
-                        "symbol": row["symbol"],
-                        "conditions": row["conditions"],
-                        "fired_ts": fired_ts,
-                        "price_at_fire": float(row["price_at_fire"]),
-                        "price_after_30m": float(row["price_after_30m"]) if row["price_after_30m"] else None
-                    })
-        
-        return alerts
+        return self.get_alerts_for_date(datetime.now().date())
+    
+    def get_alert(self, alert_id: str, day=None) -> Optional[Dict[str, Any]]:
+        """Get the first trigger of ``alert_id`` on ``day`` (default: today)."""
+        start = datetime.combine(day or datetime.now().date(), datetime.min.time())
+        end = start + timedelta(days=1)
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT alert_id, symbol, conditions, fired_ts, price_at_fire, price_after_30m "
+                "FROM alerts WHERE alert_id = ? AND fired_ts >= ? AND fired_ts < ? "
+                "ORDER BY fired_ts, id LIMIT 1",
+                (alert_id, start.isoformat(), end.isoformat())
+            ).fetchone()
+        return self._row_to_alert(row) if row else None
 
 class DigestManager:
     """Manages daily digest generation and scheduling."""
@@ -505,14 +696,12 @@ class DigestManager:
                     stats["avg_move"] = (stats["avg_move"] * (stats["total_moves"] - 1) + move) / stats["total_moves"]
                     
                     # Calculate max drawdown
-                    prices = self.price_cache.cache.get(symbol, [])
+                    prices = self.price_cache.get_prices_from(symbol, alert["fired_ts"], 36)  # 30 min = 36 5s intervals
                     if prices:
-                        trigger_idx = next((i for i, (ts, _) in enumerate(prices) if ts >= alert["fired_ts"]), None)
-                        if trigger_idx is not None:
-                            trigger_price = prices[trigger_idx][1]
-                            min_price = min(p[1] for p in prices[trigger_idx:trigger_idx + 36])  # 30 min = 36 5s intervals
-                            max_drawdown = (min_price - trigger_price) / trigger_price * 100
-                            stats["max_drawdown"] = min(stats["max_drawdown"], max_drawdown)
+                        trigger_price = prices[0]
+                        min_price = min(prices)
+                        max_drawdown = (min_price - trigger_price) / trigger_price * 100
+                        stats["max_drawdown"] = min(stats["max_drawdown"], max_drawdown)
             
             # Create embed
             embed = discord.Embed(
@@ -672,7 +861,7 @@ class DigestManager:
         """Replay a specific alert with detailed analysis."""
         try:
             # Get alert details
-            alert = next((a for a in self.alert_logger.get_todays_alerts() if a["alert_id"] == alert_id), None)
+            alert = self.alert_logger.get_alert(alert_id)
             if not alert:
                 return None
             
@@ -763,12 +952,22 @@ class DigestManager:
 class AlertManager:
     """Manages alert rules and triggers."""
     
-    def __init__(self, bot: "TBOWDiscord", logger: Optional[logging.Logger] = None):
+    def __init__(
+        self,
+        bot: "TBOWDiscord",
+        logger: Optional[logging.Logger] = None,
+        max_workers: int = 4
+    ):
         """Initialize alert manager."""
         self.bot = bot
         self.logger = logger or logging.getLogger(__name__)
         self.rules: List[AlertRule] = []
         self.alerts_file = "runtime/alerts.json"
+        # Blocking data fetch and pandas analysis run here, off the event loop
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="tbow-alerts"
+        )
         self._load_rules()
     
     def _load_rules(self):
@@ -834,10 +1033,72 @@ class AlertManager:
     def _all_conditions_met(self, rule: AlertRule, data: Any) -> bool:
         """Check if all conditions in a rule are met."""
         try:
-            return all(CONDITION_HANDLERS[condition](data) for condition in rule.conditions)
+            mask = compile_conditions(tuple(rule.conditions))
         except Exception as e:
             self.logger.error(f"Error checking conditions for rule {rule.alert_id}: {e}")
             return False
+        return evaluate_conditions(mask, data, self.logger) == mask
+    
+    def _fetch_and_analyze(self, symbol: str) -> Optional[Tuple[Any, Dict[str, Any], Dict[str, Any]]]:
+        """Fetch market data and run analysis for a symbol (runs in executor)."""
+        data = self.bot.tbow.strategy.fetch_historical_data(symbol=symbol)
+        if data is None or data.empty:
+            return None
+        
+        context = self.bot.tbow.scan_market_context(data)
+        indicators = self.bot.tbow.analyze_indicators(data)
+        return data, context, indicators
+    
+    def _evaluate_symbol(self, rules: List[AlertRule], data: Any) -> List[AlertRule]:
+        """Return the rules met on this tick, evaluating each condition once."""
+        masks = {}
+        for rule in rules:
+            try:
+                masks[rule.alert_id] = compile_conditions(tuple(rule.conditions))
+            except Exception as e:
+                self.logger.error(f"Error checking conditions for rule {rule.alert_id}: {e}")
+        
+        # Union of all sub-conditions referenced on this symbol
+        needed = 0
+        for mask in masks.values():
+            needed |= mask
+        met = evaluate_conditions(needed, data, self.logger)
+        
+        return [
+            rule for rule in rules
+            if rule.alert_id in masks and masks[rule.alert_id] & met == masks[rule.alert_id]
+        ]
+    
+    async def _check_symbol(self, symbol: str, rules: List[AlertRule]):
+        """Check all rules for one symbol."""
+        try:
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(self._executor, self._fetch_and_analyze, symbol)
+            if result is None:
+                return
+            data, context, indicators = result
+            
+            # Update price cache
+            latest = data.iloc[-1]
+            self.bot.digest_manager.price_cache.update(
+                symbol,
+                latest["close"],
+                datetime.now()
+            )
+            
+            # Only rules off cooldown need evaluating
+            candidates = [rule for rule in rules if rule.can_trigger()]
+            if not candidates:
+                return
+            
+            triggered = await loop.run_in_executor(
+                self._executor, self._evaluate_symbol, candidates, data
+            )
+            for rule in triggered:
+                await self._trigger_alert(rule, data, context, indicators)
+        
+        except Exception as e:
+            self.logger.error(f"Error checking alerts for {symbol}: {e}")
     
     async def check_alerts(self):
         """Check for alert triggers."""
@@ -853,33 +1114,19 @@ class AlertManager:
                     symbol_rules[rule.symbol] = []
                 symbol_rules[rule.symbol].append(rule)
             
-            # Check each symbol
-            for symbol, rules in symbol_rules.items():
-                # Get market data
-                data = self.bot.tbow.strategy.fetch_historical_data(symbol=symbol)
-                if data is None or data.empty:
-                    continue
-                
-                # Get analysis
-                context = self.bot.tbow.scan_market_context(data)
-                indicators = self.bot.tbow.analyze_indicators(data)
-                
-                # Update price cache
-                latest = data.iloc[-1]
-                self.bot.digest_manager.price_cache.update(
-                    symbol,
-                    latest["close"],
-                    datetime.now()
-                )
-                
-                # Check each rule
-                for rule in rules:
-                    if rule.can_trigger() and self._all_conditions_met(rule, data):
-                        await self._trigger_alert(rule, data, context, indicators)
+            # Check each symbol concurrently
+            await asyncio.gather(*(
+                self._check_symbol(symbol, rules)
+                for symbol, rules in symbol_rules.items()
+            ))
         
         except Exception as e:
             self.logger.error(f"Error checking alerts: {e}")
     
+    def shutdown(self):
+        """Release the analysis executor."""
+        self._executor.shutdown(wait=False)
+    
     async def _trigger_alert(
         self,
         rule: AlertRule,
@@ -1005,8 +1252,18 @@ class TBOWDiscord(commands.Bot):
         """Handle bot ready event."""
         self.logger.info(f"TBOW Discord bot logged in as {self.user}")
         
-        # Start alert checker
-        self.alert_checker = asyncio.create_task(self._run_alert_checker())
+        # Start alert checker (on_ready fires again after every reconnect)
+        checker = getattr(self, "alert_checker", None)
+        if checker is None or checker.done():
+            self.alert_checker = asyncio.create_task(self._run_alert_checker())
+    
+    async def close(self):
+        """Stop the alert checker and release the alert executor, then close the bot."""
+        checker = getattr(self, "alert_checker", None)
+        if checker is not None:
+            checker.cancel()
+        self.alert_manager.shutdown()
+        await super().close()
     
     async def _run_alert_checker(self):
         """Run alert checker loop."""
@@ -1520,10 +1777,10 @@ class TBOWDiscord(commands.Bot):
             embed.add_field(
                 name="Strategy Performance",
                 value=(
-                    f"Total Trades: {metrics.get('total_trades', 0)}\n"
-                    f"Win Rate: {metrics.get('win_rate', 0):.1f}%\n"
+                    f"Total Trades: {metrics.get('trade_count', 0)}\n"
+                    f"Win Rate: {metrics.get('win_rate', 0):.1%}\n"
                     f"Profit Factor: {metrics.get('profit_factor', 0):.2f}\n"
-                    f"Max Drawdown: {metrics.get('max_drawdown', 0):.1f}%\n"
+                    f"Max Drawdown: {metrics.get('max_drawdown', 0):.1%}\n"
                     f"Sharpe Ratio: {metrics.get('sharpe_ratio', 0):.2f}\n"
                     f"Sortino Ratio: {metrics.get('sortino_ratio', 0):.2f}"
                 ),
@@ -1546,7 +1803,7 @@ class TBOWDiscord(commands.Bot):
                         name=condition,
                         value=(
                             f"Triggers: {stats['triggers']}\n"
-                            f"Win Rate: {stats['win_rate']:.1f}%\n"
+                            f"Win Rate: {stats['win_rate']:.1%}\n"
                             f"Avg Move: {stats['avg_move']:.1f}%\n"
                             f"Max Move: {stats['max_move']:.1f}%\n"
                             f"Min Move: {stats['min_move']:.1f}%"
@@ -0,0 +1,61 @@
+"""
+talib_stub.py - Stand-in for TA-Lib in tests
+
+Pandas implementations of the TA-Lib functions used by
+RegimeDetector.extract_features, registered only when TA-Lib is missing.
+"""
+
+import sys
+import types
+
+import numpy as np
+import pandas as pd
+
+
+def _talib_stub():
+    """Minimal pandas implementations of the TA-Lib functions used by extract_features."""
+    talib = types.ModuleType("talib")
+
+    def SMA(values, timeperiod=30):
+        return pd.Series(values).rolling(timeperiod).mean().values
+
+    def ATR(high, low, close, timeperiod=14):
+        prev_close = pd.Series(close).shift(1)
+        true_range = pd.concat([
+            pd.Series(high) - pd.Series(low),
+            (pd.Series(high) - prev_close).abs(),
+            (pd.Series(low) - prev_close).abs(),
+        ], axis=1).max(axis=1, skipna=False)
+        return true_range.rolling(timeperiod).mean().values
+
+    def RSI(close, timeperiod=14):
+        delta = pd.Series(close).diff()
+        gain = delta.clip(lower=0).rolling(timeperiod).mean()
+        loss = (-delta.clip(upper=0)).rolling(timeperiod).mean()
+        return (100 - 100 / (1 + gain / loss.replace(0, np.nan))).fillna(100).where(gain.notna()).values
+
+    def MACD(close, fastperiod=12, slowperiod=26, signalperiod=9):
+        series = pd.Series(close)
+        macd = series.ewm(span=fastperiod).mean() - series.ewm(span=slowperiod).mean()
+        macd[:slowperiod - 1] = np.nan
+        signal = macd.ewm(span=signalperiod).mean()
+        signal[:slowperiod + signalperiod - 2] = np.nan
+        return macd.values, signal.values, (macd - signal).values
+
+    def BBANDS(close, timeperiod=5, nbdevup=2, nbdevdn=2):
+        series = pd.Series(close)
+        middle = series.rolling(timeperiod).mean()
+        std = series.rolling(timeperiod).std(ddof=0)
+        return (middle + nbdevup * std).values, middle.values, (middle - nbdevdn * std).values
+
+    for function in (SMA, ATR, RSI, MACD, BBANDS):
+        setattr(talib, function.__name__, function)
+    return talib
+
+
+def install_talib_stub():
+    """Register the stub as ``talib`` unless TA-Lib is installed."""
+    try:
+        import talib  # noqa: F401
+    except ImportError:
+        sys.modules["talib"] = _talib_stub()
@@ -0,0 +1,92 @@
+"""
+test_backtester.py - Tests for the vectorized alert-condition backtester
+
+This module checks the vectorized alert path against hand-computed values:
+- Shared condition evaluation across rule sets
+- Hold-window positions and trade counting
+- Backtester integration with alert_conditions
+"""
+
+import unittest
+import logging
+import os
+import shutil
+import tempfile
+import pandas as pd
+import numpy as np
+
+from basicbot.backtester import (
+    Backtester,
+    evaluate_rule_sets,
+    extract_indicator_arrays,
+    vectorized_alert_backtest,
+)
+
+
+class _IdentityStrategy:
+    """Strategy stub whose data already carries indicators."""
+
+    symbol = "TEST"
+    timeframe = "5Min"
+
+    def calculate_indicators(self, df):
+        return df
+
+
+class TestVectorizedAlertBacktest(unittest.TestCase):
+    """Test cases for the vectorized alert backtest."""
+
+    def setUp(self):
+        self.df = pd.DataFrame({
+            "close":     [100.0, 101.0, 102.0, 100.0, 103.0, 104.0, 103.0, 105.0],
+            "MACD_hist": [-0.5, 0.2, 0.3, -0.1, 0.4, 0.2, -0.3, 0.1],
+            "RSI":       [35.0, 38.0, 45.0, 39.0, 42.0, 55.0, 37.0, 30.0],
+            "volume":    [1000] * 8,
+        }, index=pd.date_range("2024-01-02 09:30", periods=8, freq="5min"))
+
+    def test_rule_sets_match_scalar_conditions(self):
+        arrays = extract_indicator_arrays(self.df)
+        entries = evaluate_rule_sets(arrays, [["MACD_curl_up"], ["MACD_curl_up", "RSI_below_40"]])
+        self.assertEqual(entries.shape, (2, 8))
+        np.testing.assert_array_equal(np.flatnonzero(entries[0]), [1, 4, 7])
+        np.testing.assert_array_equal(np.flatnonzero(entries[1]), [1, 7])
+
+    def test_unknown_condition(self):
+        with self.assertRaises(ValueError):
+            vectorized_alert_backtest(self.df, [["NOT_A_CONDITION"]])
+
+    def test_hold_window_and_returns(self):
+        result = vectorized_alert_backtest(
+            self.df, [["MACD_curl_up", "RSI_below_40"]], hold_bars=2, transaction_cost=0
+        )[0]
+        np.testing.assert_array_equal(result["position"], [0, 1, 1, 0, 0, 0, 0, 1])
+        self.assertEqual(result["trade_count"], 2)
+        # Held from close of bar 1 to close of bar 3: 101 -> 100
+        self.assertAlmostEqual(result["total_return"], 100.0 / 101.0 - 1)
+        self.assertAlmostEqual(result["win_rate"], 0.0)
+
+    def test_backtester_alert_conditions(self):
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir)
+        backtester = Backtester(
+            strategy=_IdentityStrategy(),
+            logger=logging.getLogger("test_backtester"),
+            alert_conditions=["MACD_curl_up", "RSI_below_40"],
+            alert_hold_bars=2,
+            log_file=os.path.join(temp_dir, "backtest_results.csv"),
+        )
+        df = backtester.run_backtest(self.df)
+        self.assertEqual(list(df["signal"].iloc[:4]), ["HOLD", "BUY", "HOLD", "SELL"])
+        self.assertEqual(backtester.metrics["trade_count"], 2)
+        alert_metrics = backtester.metrics["alert_metrics"]
+        self.assertEqual(alert_metrics["total_alerts"], 2)
+        self.assertEqual(alert_metrics["condition_stats"]["MACD_curl_up"]["triggers"], 3)
+        for stats in alert_metrics["condition_stats"].values():
+            self.assertTrue(0.0 <= stats["win_rate"] <= 1.0)
+
+        summary = backtester.run_alert_backtests(self.df, [["MACD_curl_up"], ["RSI_below_40"]])
+        self.assertEqual(list(summary.index), ["MACD_curl_up", "RSI_below_40"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,147 @@
+"""
+test_model_trainer.py - Tests for the walk-forward regime training pipeline
+
+This module checks the pieces the walk-forward pipeline relies on:
+- Walk-forward folds are consecutive, disjoint and never train on the future
+- The feature cache is reused and rebuilt when FEATURE_VERSION changes
+- Registered models carry the timings of every stage, including the save
+"""
+
+import unittest
+import os
+import shutil
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from talib_stub import install_talib_stub
+
+install_talib_stub()
+
+from basicbot.ml_models import model_trainer
+from basicbot.ml_models.regime_detector import RegimeDetector
+
+
+def _prices(n_rows=400):
+    rng = np.random.default_rng(3)
+    closes = 100 * np.cumprod(1 + rng.normal(0, 0.01, n_rows))
+    return pd.DataFrame({
+        "open": closes,
+        "high": closes * 1.01,
+        "low": closes * 0.99,
+        "close": closes,
+        "volume": np.full(len(closes), 1000.0),
+    })
+
+
+def _label(detector, features):
+    # label_regimes needs a year of history; the tests only care about the frame
+    return features.assign(regime=(features["returns"] > 0).astype(int))
+
+
+class TestWalkForwardWindows(unittest.TestCase):
+    """Test cases for walk_forward_windows."""
+
+    def test_folds_are_disjoint_and_train_on_the_past(self):
+        for n_rows, folds in [(1000, 4), (503, 3), (100, 1), (57, 5)]:
+            windows = model_trainer.walk_forward_windows(n_rows, folds)
+            self.assertEqual(len(windows), folds)
+
+            previous_test_end = None
+            for train, test in windows:
+                # Anchored at the start, training stops where the test window begins
+                self.assertEqual(train.start, 0)
+                self.assertEqual(train.stop, test.start)
+                self.assertGreater(test.stop, test.start)
+                if previous_test_end is not None:
+                    self.assertEqual(test.start, previous_test_end)
+                previous_test_end = test.stop
+            self.assertEqual(previous_test_end, n_rows)
+
+            tested = [i for _, test in windows for i in range(n_rows)[test]]
+            self.assertEqual(len(tested), len(set(tested)))
+
+    def test_folds_slice_labeled_rows_without_leakage(self):
+        labeled = pd.DataFrame({"row": np.arange(200)})
+        for train, test in model_trainer.walk_forward_windows(len(labeled), 4):
+            self.assertLess(labeled.iloc[train]["row"].max(), labeled.iloc[test]["row"].min())
+
+    def test_too_few_rows_raise(self):
+        with self.assertRaises(ValueError):
+            model_trainer.walk_forward_windows(10, 4)
+
+
+class TestFeatureCache(unittest.TestCase):
+    """Test cases for load_or_build_features."""
+
+    def setUp(self):
+        self.cache_dir = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.cache_dir)
+        self.df = _prices()
+
+    def _load(self):
+        with mock.patch.object(RegimeDetector, "label_regimes", autospec=True, side_effect=_label):
+            return model_trainer.load_or_build_features(
+                "SPY", self.df, "2020-01-01", "2021-01-01", cache_dir=self.cache_dir
+            )
+
+    def test_cache_reused_and_invalidated_by_feature_version(self):
+        with mock.patch.object(RegimeDetector, "extract_features",
+                               autospec=True, side_effect=RegimeDetector.extract_features) as extract:
+            built, timings = self._load()
+            self.assertIn("features", timings)
+            self.assertEqual(extract.call_count, 1)
+
+            cached, timings = self._load()
+            self.assertIn("features_cached", timings)
+            self.assertEqual(extract.call_count, 1)
+            pd.testing.assert_frame_equal(cached, built)
+
+            with mock.patch.object(model_trainer, "FEATURE_VERSION", "test-bump"):
+                _, timings = self._load()
+                self.assertIn("features", timings)
+                self.assertEqual(extract.call_count, 2)
+                self.assertTrue(model_trainer.feature_cache_path(
+                    self.cache_dir, "SPY", "2020-01-01", "2021-01-01"
+                ).name.endswith("_vtest-bump.pkl"))
+
+    def test_unreadable_cache_is_rebuilt(self):
+        path = model_trainer.feature_cache_path(self.cache_dir, "SPY", "2020-01-01", "2021-01-01")
+        path.write_bytes(b"not a pickle")
+        labeled, timings = self._load()
+        self.assertIn("features", timings)
+        self.assertIn("regime", labeled.columns)
+        pd.testing.assert_frame_equal(pd.read_pickle(path), labeled)
+
+
+class TestTrainingPipeline(unittest.TestCase):
+    """Test cases for run_training_pipeline."""
+
+    def test_registered_timings_include_save(self):
+        tmp_dir = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, tmp_dir)
+        registered = {}
+
+        def register(symbol, fold_result, timings):
+            registered[symbol] = dict(timings)
+
+        with mock.patch.object(RegimeDetector, "label_regimes", autospec=True, side_effect=_label), \
+                mock.patch.object(model_trainer, "ProcessPoolExecutor", ThreadPoolExecutor), \
+                mock.patch.object(model_trainer, "_register_model", side_effect=register):
+            results = model_trainer.run_training_pipeline(
+                {"SPY": _prices()}, "2020-01-01", "2021-01-01", folds=2, optimize=False,
+                workers=2, model_dir=str(tmp_dir / "models"), cache_dir=tmp_dir
+            )
+
+        self.assertIn("save", registered["SPY"])
+        self.assertEqual(registered["SPY"], results["SPY"]["timings"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+"""
+test_model_training_utils.py - Tests for the ModelManager registry caches
+
+This module checks the process-wide caches of model_training_utils:
+- Latest-version lookups reused until the model directory changes
+- Loaded models reused until the model file changes
+- warm_up() filling the same cache entries load_model() reads
+"""
+
+import unittest
+import logging
+import os
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+import joblib
+import numpy as np
+from sklearn.linear_model import LinearRegression
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+try:
+    import model_training_utils
+    from model_training_utils import ModelManager, clear_model_cache
+except ImportError as e:  # TensorFlow is required by the module
+    model_training_utils = None
+    IMPORT_ERROR = str(e)
+else:
+    IMPORT_ERROR = ""
+
+
+def _model(slope):
+    return LinearRegression().fit(np.arange(10).reshape(-1, 1), slope * np.arange(10))
+
+
+def _bump_mtime(path, seconds=10):
+    stat = os.stat(path)
+    os.utime(path, (stat.st_atime, stat.st_mtime + seconds))
+
+
+@unittest.skipIf(model_training_utils is None, f"model_training_utils unavailable: {IMPORT_ERROR}")
+class TestModelManagerCaches(unittest.TestCase):
+    """Test cases for the version and model caches."""
+
+    def setUp(self):
+        self.save_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.save_dir)
+        patcher = mock.patch.dict(os.environ, {"MODEL_SAVE_PATH": self.save_dir})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        clear_model_cache()
+        self.addCleanup(clear_model_cache)
+
+        self.manager = ModelManager(logging.getLogger("test_model_training_utils"))
+        self.model_dir = self.manager.joblib_io.get_model_directory("SPY", "random_forest")
+
+    def _write_version(self, name, model):
+        version_dir = self.model_dir / name
+        version_dir.mkdir()
+        joblib.dump(model, version_dir / "SPY_random_forest_model.pkl")
+        return version_dir
+
+    def _count_loads(self):
+        return mock.patch.object(model_training_utils.joblib, "load", wraps=joblib.load)
+
+    def test_warm_up_fills_the_entries_load_model_uses(self):
+        self._write_version("v_1", _model(2.0))
+        results = self.manager.warm_up([("SPY", "random_forest"), ("SPY", "unknown_type")])
+        self.assertEqual(results, {("SPY", "random_forest"): True, ("SPY", "unknown_type"): False})
+
+        with self._count_loads() as load:
+            first = self.manager.load_model("SPY", "random_forest")
+            second = self.manager.load_model("SPY", "random_forest")
+        self.assertEqual(load.call_count, 0)
+        self.assertIs(first, second)
+        self.assertAlmostEqual(first.coef_[0], 2.0)
+
+    def test_model_cache_reloads_when_the_file_changes(self):
+        version_dir = self._write_version("v_1", _model(2.0))
+        first = self.manager.load_model("SPY", "random_forest")
+
+        model_file = version_dir / "SPY_random_forest_model.pkl"
+        joblib.dump(_model(3.0), model_file)
+        _bump_mtime(model_file)
+        with self._count_loads() as load:
+            reloaded = self.manager.load_model("SPY", "random_forest")
+        self.assertEqual(load.call_count, 1)
+        self.assertIsNot(reloaded, first)
+        self.assertAlmostEqual(reloaded.coef_[0], 3.0)
+
+    def test_mmap_mode_is_cached_separately(self):
+        self._write_version("v_1", _model(2.0))
+        plain = self.manager.load_model("SPY", "random_forest")
+        mapped = self.manager.load_model("SPY", "random_forest", mmap_mode="r")
+        self.assertIsNot(plain, mapped)
+        self.assertIs(self.manager.load_model("SPY", "random_forest", mmap_mode="r"), mapped)
+
+    def test_latest_version_cached_until_the_directory_changes(self):
+        self._write_version("v_1", _model(1.0))
+        _bump_mtime(self.model_dir)
+        self.assertAlmostEqual(self.manager.load_model("SPY", "random_forest").coef_[0], 1.0)
+
+        with mock.patch.object(Path, "iterdir", autospec=True, side_effect=Path.iterdir) as iterdir:
+            self.manager.load_model("SPY", "random_forest")
+            self.assertEqual(iterdir.call_count, 0)
+
+            newer = self._write_version("v_2", _model(4.0))
+            _bump_mtime(newer, 20)
+            _bump_mtime(self.model_dir, 20)
+            self.assertAlmostEqual(self.manager.load_model("SPY", "random_forest").coef_[0], 4.0)
+            self.assertEqual(iterdir.call_count, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,146 @@
+"""
+test_regime_detector.py - Tests for cached, batched regime inference
+
+This module checks the RegimeDetector inference paths:
+- Process-wide artifact cache and its invalidation on mtime change
+- predict_batch / detect_market_regimes agreeing with single predictions
+- predict() scoring the newest bar rather than the oldest
+"""
+
+import unittest
+import logging
+import os
+import shutil
+import sys
+import tempfile
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from talib_stub import install_talib_stub
+
+install_talib_stub()
+
+import joblib
+from sklearn.preprocessing import StandardScaler
+
+from basicbot.ml_models import regime_detector
+from basicbot.ml_models.regime_detector import RegimeDetector
+from basicbot.ml_models.trading_ai import TradingAI
+
+
+class _ReturnSignModel:
+    """Model stub: trending_up when the bar's return is positive, else trending_down."""
+
+    classes_ = np.array([1, 2])
+
+    def __init__(self, column):
+        self.column = column
+
+    def predict_proba(self, X):
+        up = np.where(X[:, self.column] > 0, 0.9, 0.2)
+        return np.column_stack([up, 1 - up])
+
+
+def _ohlcv(closes):
+    closes = np.asarray(closes, dtype=float)
+    return pd.DataFrame({
+        "open": closes,
+        "high": closes * 1.01,
+        "low": closes * 0.99,
+        "close": closes,
+        "volume": np.full(len(closes), 1000.0),
+    })
+
+
+def _trend_then_reversal(n, daily, last):
+    """Steady trend of ``daily`` per bar whose newest bar moves by ``last``."""
+    closes = 100 * np.cumprod(np.full(n, 1 + daily))
+    closes[-1] = closes[-2] * (1 + last)
+    return _ohlcv(closes)
+
+
+class TestRegimeDetectorInference(unittest.TestCase):
+    """Test cases for RegimeDetector inference."""
+
+    def setUp(self):
+        self.model_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.model_dir)
+        self.addCleanup(regime_detector._ARTIFACT_CACHE.clear)
+        self.logger = logging.getLogger("test_regime_detector")
+
+        # Falling prices whose newest bar jumps up, and the reverse
+        self.falling = _trend_then_reversal(120, -0.004, 0.03)
+        self.rising = _trend_then_reversal(120, 0.004, -0.03)
+
+        self.detector = RegimeDetector(model_dir=self.model_dir, logger=self.logger)
+        features = self.detector.extract_features(self.falling)
+        # Identity scaling keeps the sign of the returns feature
+        self.detector.scaler = StandardScaler(with_mean=False, with_std=False).fit(
+            features[self.detector.feature_names].values
+        )
+        self.detector.model = _ReturnSignModel(self.detector.feature_names.index("returns"))
+        self.detector._save_model()
+
+    def test_predict_scores_newest_bar(self):
+        self.assertEqual(self.detector.predict(self.falling)["regime"], "trending_up")
+        self.assertEqual(self.detector.predict(self.rising)["regime"], "trending_down")
+        # Without the reversal bar the newest bar follows the trend
+        self.assertEqual(self.detector.predict(self.falling.iloc[:-1])["regime"], "trending_down")
+
+    def test_batch_matches_single_predictions(self):
+        short = self.falling.iloc[:20]
+        data = {"FALL": self.falling, "RISE": self.rising, "SHORT": short}
+        batch = self.detector.predict_batch(data)
+
+        self.assertEqual(list(batch), ["FALL", "RISE", "SHORT"])
+        for symbol in ("FALL", "RISE"):
+            single = self.detector.predict(data[symbol])
+            for key in ("regime_id", "regime", "confidence", "probabilities"):
+                self.assertEqual(batch[symbol][key], single[key])
+        self.assertEqual(batch["SHORT"]["regime"], "unknown")
+        self.assertIn("error", batch["SHORT"])
+
+        ai = TradingAI(model_dir=self.model_dir, logger=self.logger)
+        regimes = ai.detect_market_regimes(data)
+        self.assertEqual(regimes["FALL"]["regime"], batch["FALL"]["regime"])
+        self.assertEqual(regimes["RISE"]["regime"], batch["RISE"]["regime"])
+        self.assertFalse(regimes["SHORT"]["available"])
+        self.assertTrue(regimes["FALL"]["available"])
+        self.assertEqual(set(ai.current_regime), {"FALL", "RISE"})
+
+    def test_predict_latest_matches_predict_on_window(self):
+        for _, bar in self.falling.iterrows():
+            self.detector.update_bar("FALL", bar)
+        latest = self.detector.predict_latest("FALL")["FALL"]
+        self.assertEqual(latest["regime"], self.detector.predict(self.falling)["regime"])
+        self.assertEqual(self.detector.predict_latest("UNSEEN"), {})
+
+    def test_artifact_cache_reused_until_mtime_changes(self):
+        with mock.patch.object(regime_detector.joblib, "load", wraps=joblib.load) as load:
+            other = RegimeDetector(model_dir=self.model_dir, logger=self.logger)
+            self.assertEqual(load.call_count, 0)
+            self.assertIs(other.model, self.detector.model)
+
+            # Replace the model on disk with one that reads the opposite sign
+            flipped = _ReturnSignModel(self.detector.model.column)
+            flipped.classes_ = np.array([2, 1])
+            model_path = os.path.join(self.model_dir, "regime_model.joblib")
+            joblib.dump(flipped, model_path)
+            stat = os.stat(model_path)
+            os.utime(model_path, (stat.st_atime, stat.st_mtime + 10))
+
+            self.assertEqual(other.predict(self.falling)["regime"], "trending_down")
+            self.assertEqual(load.call_count, 2)
+            self.assertIsNot(other.model, self.detector.model)
+
+            # The refreshed entry is shared by the next instance
+            third = RegimeDetector(model_dir=self.model_dir, logger=self.logger)
+            self.assertEqual(load.call_count, 2)
+            self.assertIs(third.model, other.model)
+
+
+if __name__ == "__main__":
+    unittest.main()
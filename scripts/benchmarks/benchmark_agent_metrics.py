@@ -0,0 +1,103 @@
+"""
+Benchmark AgentMetrics recording and MetricsCollector aggregate queries.
+
+Compares the append-only time series with the previous layout, which rewrote the
+whole <agent>_metrics.json per sample and made the collector load every agent file
+(here: a p99 over all raw response times). Legacy recording is timed on
+--legacy-samples samples per agent; the legacy query runs over the same history
+as the rollup query.
+
+Usage:
+    python scripts/benchmarks/benchmark_agent_metrics.py --agents 50 --samples 2000
+"""
+
+import argparse
+import json
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "src"))
+
+from dreamos.metrics.agent_metrics import AgentMetrics, MetricsCollector
+
+
+def legacy_record(path: Path, metrics: dict, action: str, duration_ms: float) -> None:
+    metrics["response_times"].append({
+        "timestamp": datetime.now().isoformat(), "action": action, "duration_ms": duration_ms
+    })
+    with open(path, "w") as f:
+        json.dump(metrics, f, indent=2)
+
+
+def legacy_p99(directory: Path) -> float:
+    durations = []
+    for metrics_file in directory.glob("*_metrics.json"):
+        with open(metrics_file) as f:
+            durations.extend(rt["duration_ms"] for rt in json.load(f)["response_times"])
+    return statistics.quantiles(durations, n=100)[98]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark agent metrics storage")
+    parser.add_argument("--agents", type=int, default=50, help="Number of agents")
+    parser.add_argument("--samples", type=int, default=2000, help="Response times per agent")
+    parser.add_argument("--legacy-samples", type=int, default=300, help="Samples per agent timed for the legacy layout")
+    args = parser.parse_args()
+
+    rng = random.Random(5)
+    durations = [rng.lognormvariate(4, 0.8) for _ in range(args.samples)]
+
+    with tempfile.TemporaryDirectory() as legacy_dir, tempfile.TemporaryDirectory() as series_dir:
+        legacy_dir = Path(legacy_dir)
+        start = time.perf_counter()
+        for agent in range(args.agents):
+            path = legacy_dir / f"Agent-{agent}_metrics.json"
+            metrics = {"response_times": [], "success_rates": [], "resource_utilization": []}
+            for duration in durations[:args.legacy_samples]:
+                legacy_record(path, metrics, "run", duration)
+        legacy_rate = args.agents * args.legacy_samples / (time.perf_counter() - start)
+
+        record_time = 0.0
+        for agent in range(args.agents):
+            agent_metrics = AgentMetrics(f"Agent-{agent}", series_dir)
+            start = time.perf_counter()
+            for duration in durations:
+                agent_metrics.record_response_time("run", duration)
+            agent_metrics.flush()
+            record_time += time.perf_counter() - start
+        rate = args.agents * args.samples / record_time
+
+        # Same full history for both queries
+        for agent in range(args.agents):
+            with open(legacy_dir / f"Agent-{agent}_metrics.json", "w") as f:
+                json.dump({"response_times": [
+                    {"timestamp": datetime.now().isoformat(), "action": "run", "duration_ms": d}
+                    for d in durations
+                ]}, f, indent=2)
+        start = time.perf_counter()
+        exact = legacy_p99(legacy_dir)
+        legacy_query = (time.perf_counter() - start) * 1000
+
+        collector = MetricsCollector(series_dir)
+        start = time.perf_counter()
+        cold = collector.get_response_time_percentiles((99,), window=timedelta(hours=1))
+        cold_query = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        collector.get_response_time_percentiles((99,), window=timedelta(hours=1))
+        warm_query = (time.perf_counter() - start) * 1000
+
+    total = args.agents * args.samples
+    print(f"agents: {args.agents}, samples per agent: {args.samples} ({total:,} total)")
+    print(f"record        legacy rewrite {legacy_rate:>10,.0f} samples/s   append {rate:>10,.0f} samples/s")
+    print(f"p99 query     legacy load {legacy_query:9.2f} ms   rollups cold {cold_query:8.2f} ms   "
+          f"warm {warm_query:8.2f} ms")
+    print(f"p99 value     exact {exact:.3f}   rollup {cold['p99']:.3f}")
+
+
+if __name__ == "__main__":
+    main()
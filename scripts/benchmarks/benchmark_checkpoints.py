@@ -0,0 +1,101 @@
+"""
+Benchmark full vs. delta agent checkpoints.
+
+Simulates a long-running agent whose memory grows by a few entries between
+routine checkpoints and reports bytes written and latency per checkpoint for
+the legacy full-snapshot format and the content-addressed delta format.
+
+Usage:
+    python scripts/benchmarks/benchmark_checkpoints.py --memory-entries 5000 --checkpoints 50
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "src"))
+
+from dreamos.core.checkpoint_manager import CheckpointManager
+
+
+def _dir_size(path: str) -> int:
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            total += os.path.getsize(os.path.join(root, name))
+    return total
+
+
+def run(delta: bool, memory_entries: int, checkpoints: int, growth: int) -> dict:
+    """Create `checkpoints` checkpoints in a scratch runtime directory and measure them."""
+    agent_id = "bench-agent"
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        try:
+            agent_data_dir = f"runtime/agent_data/{agent_id}"
+            os.makedirs(agent_data_dir, exist_ok=True)
+            memory = {
+                "short_term": [f"observation {i}: " + "x" * 64 for i in range(memory_entries)],
+                "session": []
+            }
+            with open(f"{agent_data_dir}/context.json", 'w') as f:
+                json.dump({"goals": ["benchmark"], "constraints": [], "decisions": []}, f)
+
+            manager = CheckpointManager(agent_id, delta=delta)
+            # Keep every checkpoint so bytes written are not hidden by retention
+            manager._apply_retention_policy = lambda checkpoint_type: None
+
+            latencies = []
+            bytes_written = 0
+            for i in range(checkpoints):
+                memory["session"].extend(f"step {i}.{j}" for j in range(growth))
+                with open(f"{agent_data_dir}/memory.json", 'w') as f:
+                    json.dump(memory, f)
+
+                before = _dir_size(manager.checkpoint_dir)
+                start = time.perf_counter()
+                # Distinct types keep filenames unique within the same second
+                manager.create_checkpoint(f"bench{i}")
+                latencies.append(time.perf_counter() - start)
+                bytes_written += _dir_size(manager.checkpoint_dir) - before
+
+            start = time.perf_counter()
+            manager.restore_checkpoint(manager.get_latest_checkpoint(f"bench{checkpoints - 1}"))
+            restore_latency = time.perf_counter() - start
+        finally:
+            os.chdir(cwd)
+
+    latencies.sort()
+    return {
+        "format": "delta" if delta else "full",
+        "bytes_per_checkpoint": bytes_written / checkpoints,
+        "p50_ms": latencies[len(latencies) // 2] * 1000,
+        "max_ms": latencies[-1] * 1000,
+        "restore_ms": restore_latency * 1000
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark full vs. delta checkpoints")
+    parser.add_argument("--memory-entries", type=int, default=5000,
+                        help="Short-term memory entries in the agent state")
+    parser.add_argument("--checkpoints", type=int, default=50,
+                        help="Number of checkpoints to create")
+    parser.add_argument("--growth", type=int, default=5,
+                        help="Session entries appended between checkpoints")
+    args = parser.parse_args()
+
+    print(f"{'format':<8}{'bytes/ckpt':>14}{'p50 ms':>10}{'max ms':>10}{'restore ms':>12}")
+    for delta in (False, True):
+        result = run(delta, args.memory_entries, args.checkpoints, args.growth)
+        print(f"{result['format']:<8}{result['bytes_per_checkpoint']:>14.0f}"
+              f"{result['p50_ms']:>10.2f}{result['max_ms']:>10.2f}{result['restore_ms']:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""
+Benchmark DriftDetector ingestion and summaries across many agent/metric series.
+
+Feeds points round-robin over --agents x --metrics series (with injected spikes)
+into the streaming DriftDetector and compares with the previous algorithm (slice
+the window, then statistics.mean/stdev over it per point; scan and sort the whole
+drift history per summary). Both first get one full window per series (untimed),
+then the streaming detector is timed on --points points and the legacy one on
+--legacy-points points. The same --points points are also fed through one
+add_metric_points_batch call.
+
+Usage:
+    python scripts/benchmarks/benchmark_drift_detector.py --points 2000000 --agents 2000
+"""
+
+import argparse
+import itertools
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "src"))
+
+from dreamos.core.drift_detector import DriftDetector, DriftPoint
+
+METRICS = ("response_time", "accuracy", "helpfulness", "safety")
+
+
+class LegacyDetector:
+    """The per-point recomputation DriftDetector used before (z-score only)."""
+
+    def __init__(self, window_size: int, threshold: float = 2.0):
+        self.window_size = window_size
+        self.threshold = threshold
+        self.series = {}
+        self.drift_history = []
+
+    def add_metric_point(self, agent_id, metric_name, value, timestamp):
+        values = self.series.setdefault((agent_id, metric_name), [])
+        values.append(value)
+        if len(values) > self.window_size:
+            values = self.series[(agent_id, metric_name)] = values[-self.window_size:]
+        if len(values) >= self.window_size:
+            baseline = values[:-1]
+            mean = statistics.mean(baseline)
+            std = statistics.stdev(baseline)
+            if std and abs(value - mean) / std >= self.threshold:
+                magnitude = abs(value - mean) / std
+                self.drift_history.append(DriftPoint(timestamp, agent_id, metric_name, mean, value,
+                                                     magnitude, 0.99, "high"))
+
+    def system_summary(self, cutoff):
+        recent = [d for d in self.drift_history if d.timestamp >= cutoff]
+        affected = len(set(d.agent_id for d in recent))
+        severity = {}
+        for d in recent:
+            severity[d.severity] = severity.get(d.severity, 0) + 1
+        confidence = statistics.mean([d.confidence for d in recent])
+        ordered = sorted(recent, key=lambda d: d.timestamp)
+        half = len(ordered) // 2
+        first = statistics.mean([d.drift_magnitude for d in ordered[:half]])
+        second = statistics.mean([d.drift_magnitude for d in ordered[half:]])
+        return affected, severity, confidence, first, second
+
+
+def points(count: int, agents: int, metrics: int, seed: int = 7):
+    rng = random.Random(seed)
+    start = datetime.utcnow() - timedelta(days=30)
+    step = timedelta(days=30) / count
+    for i in range(count):
+        series = i % (agents * metrics)
+        value = rng.gauss(10.0, 1.0)
+        if rng.random() < 0.005:
+            value += rng.choice((-6.0, 6.0))
+        yield f"Agent-{series // metrics}", METRICS[series % metrics], value, start + step * i
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark DriftDetector")
+    parser.add_argument("--points", type=int, default=2000000, help="Points for the streaming detector")
+    parser.add_argument("--legacy-points", type=int, default=200000, help="Points for the legacy detector")
+    parser.add_argument("--agents", type=int, default=2000, help="Distinct agents")
+    parser.add_argument("--metrics", type=int, default=4, choices=range(1, 5), help="Metrics per agent")
+    parser.add_argument("--window", type=int, default=100, help="Window size")
+    parser.add_argument("--detectors", default="zscore", help="Comma separated detectors")
+    args = parser.parse_args()
+
+    warmup = args.agents * args.metrics * args.window
+    total = warmup + max(args.points, args.legacy_points)
+
+    def feed(target, count):
+        stream = points(total, args.agents, args.metrics)
+        for agent_id, metric, value, ts in itertools.islice(stream, warmup):
+            target.add_metric_point(agent_id, metric, value, ts)
+        start = time.perf_counter()
+        for agent_id, metric, value, ts in itertools.islice(stream, count):
+            target.add_metric_point(agent_id, metric, value, ts)
+        return count / (time.perf_counter() - start)
+
+    legacy = LegacyDetector(args.window)
+    legacy_rate = feed(legacy, args.legacy_points)
+    config = {"window_size": args.window, "detectors": args.detectors.split(",")}
+    detector = DriftDetector(config)
+    rate = feed(detector, args.points)
+
+    batch_detector = DriftDetector(config)
+    stream = points(total, args.agents, args.metrics)
+    for agent_id, metric, value, ts in itertools.islice(stream, warmup):
+        batch_detector.add_metric_point(agent_id, metric, value, ts)
+    agent_ids, metrics, values, timestamps = zip(*itertools.islice(stream, args.points))
+    agent_ids, metrics = np.array(agent_ids, dtype=object), np.array(metrics, dtype=object)
+    values, timestamps = np.array(values), np.array(timestamps, dtype="datetime64[us]")
+    start = time.perf_counter()
+    batch_result = batch_detector.add_metric_points_batch(agent_ids, metrics, values, timestamps)
+    batch_rate = args.points / (time.perf_counter() - start)
+
+    # Summaries over the same history
+    legacy.drift_history = list(detector.drift_history)
+    cutoff = datetime.utcnow() - timedelta(days=7)
+    start = time.perf_counter()
+    legacy.system_summary(cutoff)
+    legacy_summary = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    summary = detector.get_system_drift_summary(timedelta(days=7))
+    stream_summary = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    detector.get_agent_drift_summary("Agent-1", timedelta(days=7))
+    agent_summary = (time.perf_counter() - start) * 1000
+
+    print(f"series: {args.agents * args.metrics}, window {args.window}, detectors {args.detectors}, "
+          f"timed after {warmup:,} warm-up points")
+    print(f"ingest   legacy {legacy_rate:>12,.0f} points/s   streaming {rate:>12,.0f} points/s   "
+          f"batch {batch_rate:>12,.0f} points/s")
+    print(f"batch drift points: {len(batch_result):,}")
+    print(f"drifts recorded: {len(detector.drift_history):,} ({summary['total_drifts']:,} in last 7 days)")
+    print(f"7-day system summary   legacy scan {legacy_summary:8.2f} ms   bucketed {stream_summary:8.2f} ms")
+    print(f"7-day agent summary    bucketed {agent_summary:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Benchmark FeedbackEngineV2 ingestion, synchronous vs. through the FeedbackPipeline.
+
+Analysis is simulated as I/O bound (e.g. a call to a classification service) by
+sleeping --analysis-ms in the sentiment analyzer. Reports the time callers spend in
+ingest_feedback, total throughput and the pipeline's per-stage metrics.
+
+Usage:
+    python scripts/benchmarks/benchmark_feedback_pipeline.py --items 2000 --analysis-ms 2
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "src"))
+
+from dreamos.feedback import FeedbackEngineV2
+
+
+def make_engine_class(analysis_seconds: float):
+    class BenchEngine(FeedbackEngineV2):
+        def _analyze_sentiment(self, text):
+            time.sleep(analysis_seconds)
+            return "neutral"
+
+    return BenchEngine
+
+
+def feedback_items(count: int):
+    for i in range(count):
+        yield {"type": "user_feedback", "task_id": f"T-{i % 200}",
+               "feedback": {"satisfaction": i % 5, "comments": "looks good"}}
+
+
+def run(engine_class, directory: str, items: int, pipeline_options=None):
+    config = {"feedback_dir": directory}
+    if pipeline_options is not None:
+        config.update(async_ingest=True, pipeline=pipeline_options)
+    engine = engine_class(config)
+    caller = 0.0
+    start = time.perf_counter()
+    for feedback in feedback_items(items):
+        t = time.perf_counter()
+        engine.ingest_feedback(feedback)
+        caller += time.perf_counter() - t
+    pipeline = engine.pipeline
+    engine.close()
+    total = time.perf_counter() - start
+    return caller / items * 1000, items / total, pipeline.get_metrics() if pipeline else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark feedback ingestion")
+    parser.add_argument("--items", type=int, default=2000, help="Feedback items to ingest")
+    parser.add_argument("--analysis-ms", type=float, default=2.0, help="Simulated analysis time")
+    parser.add_argument("--workers", type=int, default=8, help="Pipeline analysis workers")
+    parser.add_argument("--batch-size", type=int, default=64, help="Pipeline micro-batch size")
+    args = parser.parse_args()
+
+    engine_class = make_engine_class(args.analysis_ms / 1000)
+    with tempfile.TemporaryDirectory() as sync_dir, tempfile.TemporaryDirectory() as async_dir:
+        sync_caller, sync_rate, _ = run(engine_class, sync_dir, args.items)
+        async_caller, async_rate, metrics = run(
+            engine_class, async_dir, args.items,
+            {"workers": args.workers, "batch_size": args.batch_size, "block_timeout": None},
+        )
+
+    print(f"{'mode':<10}{'caller ms/item':>16}{'items/s':>12}")
+    print(f"{'sync':<10}{sync_caller:>16.4f}{sync_rate:>12.0f}")
+    print(f"{'pipeline':<10}{async_caller:>16.4f}{async_rate:>12.0f}")
+    print("pipeline metrics:")
+    print(json.dumps(metrics, indent=2))
+
+
+if __name__ == "__main__":
+    main()
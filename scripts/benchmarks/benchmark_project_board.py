@@ -0,0 +1,139 @@
+"""
+Benchmark ProjectBoardManager lookups on a large task board.
+
+Builds a board of --tasks tasks and compares the previous access pattern
+(parse the whole task_board.json on every call, then scan) with the indexed
+TaskBoardStore for point lookups, filtered listings, full-text search and claims.
+
+Usage:
+    python scripts/benchmarks/benchmark_project_board.py --tasks 100000 --agents 50
+"""
+
+import argparse
+import json
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "src"))
+
+from dreamos.coordination.project_board_manager import ProjectBoardManager
+
+STATUSES = ("PENDING", "WORKING", "COMPLETED", "BLOCKED")
+PRIORITIES = ("LOW", "MEDIUM", "HIGH", "CRITICAL")
+
+
+def make_tasks(count: int, agents: int, seed: int = 11) -> list:
+    rng = random.Random(seed)
+    tasks = []
+    for i in range(count):
+        task = {
+            "task_id": f"TASK-{i:06d}",
+            "name": f"Task {i}",
+            "description": f"Benchmark task number {i}",
+            "status": rng.choice(STATUSES),
+            "priority": rng.choice(PRIORITIES),
+            "history": [{"action": "CREATED", "agent": "SYSTEM"}],
+        }
+        if task["status"] != "PENDING":
+            task["assigned_agent"] = f"Agent-{rng.randrange(agents)}"
+        tasks.append(task)
+    return tasks
+
+
+def legacy_get(path: Path, task_id: str):
+    with open(path, "r", encoding="utf-8") as f:
+        tasks = json.load(f)
+    return next(t for t in tasks if t.get("task_id") == task_id)
+
+
+def legacy_list(path: Path, status: str, agent_id: str):
+    with open(path, "r", encoding="utf-8") as f:
+        tasks = json.load(f)
+    return [t for t in tasks
+            if t.get("status", "").upper() == status and t.get("assigned_agent") == agent_id]
+
+
+def legacy_search(path: Path, query: str):
+    with open(path, "r", encoding="utf-8") as f:
+        tasks = json.load(f)
+    query = query.lower()
+    return [t for t in tasks
+            if any(query in str(t.get(field, "")).lower()
+                   for field in ("name", "description", "notes", "result_summary"))]
+
+
+def measure(fn, iterations: int) -> float:
+    """Median milliseconds per call."""
+    samples = []
+    for i in range(iterations):
+        start = time.perf_counter()
+        fn(i)
+        samples.append(time.perf_counter() - start)
+    samples.sort()
+    return samples[len(samples) // 2] * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark ProjectBoardManager storage")
+    parser.add_argument("--tasks", type=int, default=100000, help="Tasks on the board")
+    parser.add_argument("--agents", type=int, default=50, help="Distinct assigned agents")
+    parser.add_argument("--iterations", type=int, default=2000,
+                        help="Calls per indexed measurement")
+    parser.add_argument("--legacy-iterations", type=int, default=5,
+                        help="Calls per legacy measurement (each parses the whole board)")
+    args = parser.parse_args()
+
+    tasks = make_tasks(args.tasks, args.agents)
+    ids = [t["task_id"] for t in tasks]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        board_path = Path(tmp) / "task_board.json"
+        pbm = ProjectBoardManager(board_path)
+        pbm._save_tasks(tasks)
+        # Legacy layout: the same board written the way _save_tasks used to
+        legacy_path = Path(tmp) / "legacy_board.json"
+        with open(legacy_path, "w", encoding="utf-8") as f:
+            json.dump(tasks, f, indent=2)
+
+        start = time.perf_counter()
+        pbm = ProjectBoardManager(board_path)
+        pbm.list_tasks(limit=1)
+        cold_load = (time.perf_counter() - start) * 1000
+
+        rows = [
+            ("get_task",
+             measure(lambda i: legacy_get(legacy_path, ids[i * 7919 % len(ids)]), args.legacy_iterations),
+             measure(lambda i: pbm.get_task(ids[i * 7919 % len(ids)]), args.iterations)),
+            ("list status+agent",
+             measure(lambda i: legacy_list(legacy_path, "WORKING", f"Agent-{i % args.agents}"),
+                     args.legacy_iterations),
+             measure(lambda i: pbm.list_tasks("WORKING", f"Agent-{i % args.agents}"), args.iterations)),
+            ("list status+agent l=50",
+             float("nan"),
+             measure(lambda i: pbm.list_tasks("WORKING", f"Agent-{i % args.agents}", limit=50),
+                     args.iterations)),
+            ("list status limit=50",
+             float("nan"),
+             measure(lambda i: pbm.list_tasks(STATUSES[i % 4], limit=50), args.iterations)),
+            ("search word",
+             measure(lambda i: legacy_search(legacy_path, f"{i * 7919 % len(ids)}"), args.legacy_iterations),
+             measure(lambda i: pbm.search_tasks(f"{i * 7919 % len(ids)}"), args.iterations)),
+            ("search prefix limit=20",
+             float("nan"),
+             measure(lambda i: pbm.search_tasks(f"bench task {i % 10}", limit=20), args.iterations)),
+            ("claim_task",
+             float("nan"),
+             measure(lambda i: pbm.claim_task(ids[i * 104729 % len(ids)], "Agent-X"), args.iterations)),
+        ]
+
+    print(f"board: {args.tasks} tasks, cold load {cold_load:.0f} ms")
+    print(f"{'operation':<24}{'legacy ms':>12}{'indexed ms':>12}")
+    for name, legacy, indexed in rows:
+        print(f"{name:<24}{legacy:>12.3f}{indexed:>12.4f}")
+
+
+if __name__ == "__main__":
+    main()
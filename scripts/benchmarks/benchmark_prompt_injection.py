@@ -0,0 +1,81 @@
+"""
+Benchmark prompt injection latency headlessly.
+
+Replays the previous CursorOrchestrator sequence (type every character, fixed
+sleeps, 0.5s after re-activating the window) and the InjectionStrategy
+sequence (paste long prompts, poll for focus) against the RecordingBackend,
+whose virtual clock charges a simulated cost per UI operation.
+
+Usage:
+    python scripts/benchmarks/benchmark_prompt_injection.py --sizes 100 1000 8000 --char-latency 0.01
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "src"))
+
+from dreamos.automation.injection_strategy import InjectionStrategy, RecordingBackend
+
+WINDOW_TITLE = "Cursor - Agent 1"
+
+
+def legacy_inject(backend: RecordingBackend, text: str) -> float:
+    """The sequence CursorOrchestrator used before the strategy layer."""
+    start = backend.clock()
+    if not backend.is_window_active(WINDOW_TITLE):
+        backend.activate_window(WINDOW_TITLE)
+        backend.sleep(0.5)
+    backend.click(10, 20)
+    backend.sleep(0.1)
+    backend.hotkey("ctrl", "a")
+    backend.sleep(0.1)
+    backend.press("delete")
+    backend.sleep(0.1)
+    backend.write(text)
+    backend.sleep(0.1)
+    backend.press("enter")
+    return backend.clock() - start
+
+
+def make_backend(args, window_active: bool) -> RecordingBackend:
+    return RecordingBackend(
+        action_latency=args.action_latency,
+        char_latency=args.char_latency,
+        activation_delay=args.activation_delay,
+        window_active=window_active,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark prompt injection latency")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 4000, 8000],
+                        help="Prompt sizes in characters")
+    parser.add_argument("--char-latency", type=float, default=0.01,
+                        help="Simulated seconds per typed character")
+    parser.add_argument("--action-latency", type=float, default=0.008,
+                        help="Simulated seconds per click, key press or clipboard call")
+    parser.add_argument("--activation-delay", type=float, default=0.15,
+                        help="Simulated seconds for a window to take focus")
+    parser.add_argument("--paste-threshold", type=int, default=200,
+                        help="Prompt length from which the strategy pastes")
+    args = parser.parse_args()
+
+    print(f"{'chars':>7}{'focused':>9}{'legacy s':>11}{'strategy s':>12}{'mode':>7}{'speedup':>9}")
+    for size in args.sizes:
+        text = "p" * size
+        for window_active in (True, False):
+            legacy = legacy_inject(make_backend(args, window_active), text)
+
+            backend = make_backend(args, window_active)
+            strategy = InjectionStrategy(backend, paste_threshold=args.paste_threshold)
+            result = strategy.inject(10, 20, text, WINDOW_TITLE)
+            assert backend.submitted == [text]
+
+            print(f"{size:>7}{str(window_active):>9}{legacy:>11.3f}{result.elapsed:>12.3f}"
+                  f"{result.mode:>7}{legacy / result.elapsed:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Benchmark bridge command validation.
+
+Compares calling jsonschema.validate() per command (which checks the schema and
+builds a new validator every time) with the validators the BridgeInjector
+compiles once at startup, in both "best" and "first" error modes.
+
+Usage:
+    python scripts/benchmarks/benchmark_schema_validation.py --commands 20000 --invalid-ratio 0.2
+"""
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "src"))
+
+import jsonschema
+
+from bridge.injector import BridgeInjector
+
+
+def make_commands(count: int, invalid_ratio: float, seed: int = 7) -> list:
+    """Build a mix of valid and invalid EXECUTE_TASK / GET_STATUS commands."""
+    rng = random.Random(seed)
+    commands = []
+    for i in range(count):
+        if i % 2:
+            command = {
+                "command_type": "EXECUTE_TASK",
+                "source": "benchmark",
+                "command_id": f"cmd-{i}",
+                "payload": {"task_id": f"task-{i}", "parameters": {"priority": i % 5}},
+                "metadata": {"attempt": 1}
+            }
+        else:
+            command = {"command_type": "GET_STATUS", "source": "benchmark", "command_id": f"cmd-{i}"}
+
+        if rng.random() < invalid_ratio:
+            # Several violations so "best" mode has more than one error to rank
+            command["source"] = 42
+            command["command_id"] = None
+            if command["command_type"] == "EXECUTE_TASK":
+                command["payload"].pop("task_id")
+        commands.append(command)
+    return commands
+
+
+def time_validate(commands: list, validate) -> float:
+    """Return commands validated per second."""
+    start = time.perf_counter()
+    for command in commands:
+        validate(command)
+    return len(commands) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark bridge command validation")
+    parser.add_argument("--commands", type=int, default=20000,
+                        help="Number of commands to validate")
+    parser.add_argument("--invalid-ratio", type=float, default=0.2,
+                        help="Fraction of commands that fail validation")
+    args = parser.parse_args()
+
+    commands = make_commands(args.commands, args.invalid_ratio)
+
+    with tempfile.TemporaryDirectory() as log_dir:
+        logger_config = {"log_path": str(Path(log_dir) / "bridge.jsonl"), "enable_console": False}
+        injectors = {
+            mode: BridgeInjector({"logger_config": logger_config, "validation_mode": mode})
+            for mode in ("best", "first")
+        }
+        schemas = injectors["best"].schemas
+
+        def uncached(command):
+            try:
+                jsonschema.validate(instance=command, schema=schemas[command["command_type"]])
+            except jsonschema.exceptions.ValidationError:
+                pass
+
+        results = [("jsonschema.validate", time_validate(commands, uncached))]
+        for mode, injector in injectors.items():
+            validators = injector.validators
+            results.append((f"compiled ({mode})",
+                            time_validate(commands, lambda cmd: validators[cmd["command_type"]](cmd))))
+
+    baseline = results[0][1]
+    print(f"{'validator':<22}{'commands/s':>14}{'speedup':>10}")
+    for name, rate in results:
+        print(f"{name:<22}{rate:>14.0f}{rate / baseline:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Benchmark heartbeat and devlog writes: SQLite status store vs. the old JSON files.
+
+The legacy writer loads heartbeat.json / devlog.json and rewrites them on every
+call, as StatusMonitor did before. Each mode runs once with a single writer and
+once with --threads writers, each sending --writes heartbeats and devlog entries.
+Reported are writes per second and how many heartbeats/devlog entries survived:
+the legacy files lose concurrent read-modify-write updates, and writes that hit a
+torn file are dropped (which also makes their concurrent rate look better).
+
+Usage:
+    python scripts/benchmarks/benchmark_status_store.py --agents 200 --threads 8 --writes 200
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "src"))
+
+from dreamos.feedback.status_monitor import StatusMonitor
+
+
+class LegacyStatusMonitor:
+    """Read-modify-write of whole JSON files, as StatusMonitor did before."""
+
+    def __init__(self, status_dir: str):
+        self.heartbeat_file = os.path.join(status_dir, "heartbeat.json")
+        self.devlog_file = os.path.join(status_dir, "devlog.json")
+
+    def _update(self, path, default, change):
+        try:
+            if os.path.exists(path):
+                with open(path, "r") as f:
+                    data = json.load(f)
+            else:
+                data = default
+            change(data)
+            with open(path, "w") as f:
+                json.dump(data, f, indent=2)
+        except Exception:
+            pass  # the old monitor logged and dropped the write
+
+    def update_heartbeat(self, agent_id, status):
+        entry = {"timestamp": datetime.now().isoformat(), "status": status}
+        self._update(self.heartbeat_file, {}, lambda data: data.__setitem__(agent_id, entry))
+
+    def add_devlog_entry(self, agent_id, entry):
+        entry["timestamp"] = datetime.now().isoformat()
+        self._update(self.devlog_file, {}, lambda data: data.setdefault(agent_id, []).append(entry))
+
+    def counts(self):
+        def load(path):
+            try:
+                with open(path) as f:
+                    return json.load(f)
+            except (OSError, ValueError):
+                return {}
+        return len(load(self.heartbeat_file)), sum(len(v) for v in load(self.devlog_file).values())
+
+
+def run(monitor, agents: int, threads: int, writes: int) -> float:
+    def worker(n):
+        for i in range(writes):
+            agent_id = f"Agent-{(n + i * threads) % agents}"
+            monitor.update_heartbeat(agent_id, {"status": "ACTIVE", "cycle": i})
+            monitor.add_devlog_entry(agent_id, {"event": "cycle", "cycle": i})
+
+    workers = [threading.Thread(target=worker, args=(n,)) for n in range(threads)]
+    start = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    return 2 * threads * writes / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the feedback status store")
+    parser.add_argument("--agents", type=int, default=200, help="Distinct agents")
+    parser.add_argument("--threads", type=int, default=8, help="Concurrent writers")
+    parser.add_argument("--writes", type=int, default=200, help="Heartbeats (and devlog entries) per writer")
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    print(f"{args.writes} heartbeat+devlog writes per writer over {args.agents} agents")
+    print(f"{'writers':<9}{'mode':<8}{'writes/s':>12}{'heartbeats':>14}{'devlog entries':>18}")
+    for threads in (1, args.threads):
+        expected_agents = min(args.agents, threads * args.writes)
+        expected_entries = threads * args.writes
+        with tempfile.TemporaryDirectory() as legacy_dir, tempfile.TemporaryDirectory() as store_dir:
+            legacy = LegacyStatusMonitor(legacy_dir)
+            legacy_rate = run(legacy, args.agents, threads, args.writes)
+            legacy_agents, legacy_entries = legacy.counts()
+
+            monitor = StatusMonitor(store_dir)
+            rate = run(monitor, args.agents, threads, args.writes)
+            store_agents = len(monitor.get_heartbeat())
+            store_entries = sum(len(v) for v in monitor.get_devlog().values())
+            monitor.store.close()
+
+        for mode, mode_rate, agents, entries in (("json", legacy_rate, legacy_agents, legacy_entries),
+                                                 ("sqlite", rate, store_agents, store_entries)):
+            print(f"{threads:<9}{mode:<8}{mode_rate:>12,.0f}{agents:>9}/{expected_agents:<4}"
+                  f"{entries:>12}/{expected_entries:<5}")
+
+
+if __name__ == "__main__":
+    main()
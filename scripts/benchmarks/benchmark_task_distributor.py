@@ -0,0 +1,174 @@
+"""
+Simulate task distribution strategies and benchmark episode loading.
+
+Agents have hidden speeds (cost units per second) and capability sets. Tasks with
+log-normal costs arrive in --waves waves, --interval simulated seconds apart; a
+share of them needs one capability. Each wave is distributed by:
+
+- even: the previous TaskDistributor behaviour (sort by priority, split evenly by
+  count, ignoring load, speed and capabilities),
+- least_loaded / min_cost: TaskDistributionEngine, which learns each agent's speed
+  from the completions reported before every wave.
+
+Agents run their queues in order. Reported per strategy: makespan (when the last
+task finishes), imbalance (max / mean of the agents' busy time), mean task latency
+(arrival to finish), capability violations and planning time.
+
+Finally the time to collect tasks from --episodes episode files is compared
+between parsing every file on each run and the mtime cache.
+
+Usage:
+    python scripts/benchmarks/benchmark_task_distributor.py --agents 8 --waves 10 --tasks 200
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import yaml
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "src"))
+
+from dreamos.tools.task_distribution_engine import (
+    EpisodeCache,
+    TaskDistributionEngine,
+    required_capabilities,
+    task_cost,
+    task_priority,
+)
+
+CAPABILITIES = ("code", "docs", "infra")
+
+
+def make_agents(count: int, rng: random.Random):
+    agents = {}
+    for i in range(count):
+        capabilities = [c for c in CAPABILITIES if rng.random() < 0.5] or [rng.choice(CAPABILITIES)]
+        agents[f"Agent-{i + 1}"] = {"speed": rng.uniform(0.5, 3.0), "capabilities": capabilities}
+    return agents
+
+
+def make_waves(waves: int, tasks: int, rng: random.Random):
+    result = []
+    for wave in range(waves):
+        result.append([{
+            "id": f"W{wave}-T{i}",
+            "priority": rng.choice(("high", "medium", "low")),
+            "estimated_cost": round(rng.lognormvariate(1.2, 0.8), 2),
+            **({"required_capabilities": [rng.choice(CAPABILITIES)]} if rng.random() < 0.3 else {}),
+        } for i in range(tasks)])
+    return result
+
+
+def even_split(agent_ids, tasks):
+    """The previous distribution: priority sort, then equal counts per agent."""
+    ordered = sorted(tasks, key=lambda t: task_priority(t), reverse=True)
+    per_agent, extra = divmod(len(ordered), len(agent_ids))
+    assignments, index = {}, 0
+    for n, agent_id in enumerate(agent_ids):
+        count = per_agent + (1 if n < extra else 0)
+        assignments[agent_id] = ordered[index:index + count]
+        index += count
+    return assignments
+
+
+def simulate(strategy: str, agents, waves, interval: float):
+    engine = None if strategy == "even" else TaskDistributionEngine(strategy)
+    if engine:
+        engine.set_agents({a: {"capabilities": info["capabilities"]} for a, info in agents.items()})
+    free_at = {agent_id: 0.0 for agent_id in agents}
+    busy = {agent_id: 0.0 for agent_id in agents}
+    running = []  # (finish time, agent, task id, duration)
+    latencies, violations, planning = [], 0, 0.0
+
+    for wave, tasks in enumerate(waves):
+        now = wave * interval
+        if engine:
+            # Report completions observed so far
+            done = [r for r in running if r[0] <= now]
+            running = [r for r in running if r[0] > now]
+            for _, agent_id, task, duration in done:
+                engine.record_completion(agent_id, task, duration)
+        start = time.perf_counter()
+        if engine:
+            assignments = engine.plan(tasks).assignments
+        else:
+            assignments = even_split(list(agents), tasks)
+        planning += time.perf_counter() - start
+
+        for agent_id, agent_tasks in assignments.items():
+            speed = agents[agent_id]["speed"]
+            for task in agent_tasks:
+                if not required_capabilities(task) <= set(agents[agent_id]["capabilities"]):
+                    violations += 1
+                duration = task_cost(task) / speed
+                begin = max(free_at[agent_id], now)
+                free_at[agent_id] = begin + duration
+                busy[agent_id] += duration
+                latencies.append(free_at[agent_id] - now)
+                running.append((free_at[agent_id], agent_id, task["id"], duration))
+
+    return {
+        "makespan": max(free_at.values()),
+        "imbalance": max(busy.values()) / statistics.mean(busy.values()),
+        "latency": statistics.mean(latencies),
+        "violations": violations,
+        "planning_ms": planning * 1000,
+    }
+
+
+def episode_loading(episodes: int, tasks_per_episode: int, runs: int):
+    with tempfile.TemporaryDirectory() as directory:
+        directory = Path(directory)
+        for n in range(episodes):
+            with open(directory / f"episode-{n:03d}.yaml", "w") as f:
+                yaml.safe_dump({"tasks": [{"id": f"E{n}-{i}", "description": "x" * 200, "priority": 1}
+                                          for i in range(tasks_per_episode)]}, f)
+
+        start = time.perf_counter()
+        for _ in range(runs):
+            for path in directory.glob("episode-*.yaml"):
+                with open(path) as f:
+                    yaml.safe_load(f)
+        legacy = (time.perf_counter() - start) / runs * 1000
+
+        cache = EpisodeCache(directory)
+        cache.load_tasks()
+        start = time.perf_counter()
+        for _ in range(runs):
+            cache.load_tasks()
+        cached = (time.perf_counter() - start) / runs * 1000
+    return legacy, cached
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate task distribution strategies")
+    parser.add_argument("--agents", type=int, default=8, help="Number of agents")
+    parser.add_argument("--waves", type=int, default=10, help="Number of task waves")
+    parser.add_argument("--tasks", type=int, default=200, help="Tasks per wave")
+    parser.add_argument("--interval", type=float, default=60.0, help="Simulated seconds between waves")
+    parser.add_argument("--episodes", type=int, default=50, help="Episode files for the loading benchmark")
+    parser.add_argument("--seed", type=int, default=11, help="Random seed")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    agents = make_agents(args.agents, rng)
+    waves = make_waves(args.waves, args.tasks, rng)
+
+    print(f"{args.agents} agents, {args.waves} waves x {args.tasks} tasks every {args.interval:g}s")
+    print(f"{'strategy':<14}{'makespan s':>12}{'imbalance':>11}{'latency s':>11}{'violations':>12}{'plan ms':>10}")
+    for strategy in ("even", "least_loaded", "min_cost"):
+        r = simulate(strategy, agents, waves, args.interval)
+        print(f"{strategy:<14}{r['makespan']:>12.1f}{r['imbalance']:>11.2f}{r['latency']:>11.1f}"
+              f"{r['violations']:>12}{r['planning_ms']:>10.1f}")
+
+    legacy, cached = episode_loading(args.episodes, 40, runs=5)
+    print(f"episode loading ({args.episodes} files): parse all {legacy:.1f} ms   mtime cache {cached:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -10,7 +10,9 @@ import uuid
 import json
 import datetime
 import jsonschema
-from typing import Dict, Any, Callable, Optional
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Callable, List, Optional
 
 # Import logging components
 from bridge.logging import BridgeLogger, ErrorHandler
@@ -152,6 +154,14 @@ class BridgeInjector:
         Returns:
             Dictionary of validator functions by command type
         """
+        # Compile each schema once; jsonschema.validate() would re-check the schema
+        # and build a fresh validator on every call
+        self.compiled_validators = {}
+        for cmd_type, schema in self.schemas.items():
+            compiled = self._compile_schema(cmd_type, schema)
+            if compiled is not None:
+                self.compiled_validators[cmd_type] = compiled
+        
         validators = {
             "default": lambda cmd: self._validate_command(cmd, "default")
         }
@@ -163,10 +173,50 @@ class BridgeInjector:
         
         return validators
     
+    def _compile_schema(self, cmd_type: str, schema: Dict[str, Any]) -> Optional[Any]:
+        """
+        Check a command schema and build a reusable validator for it.
+        
+        Args:
+            cmd_type: The command type the schema belongs to
+            schema: The JSON schema
+            
+        Returns:
+            Validator instance, or None if the schema is invalid
+            
+        Raises:
+            ValueError: If the default schema, which every other type falls back to, is invalid
+        """
+        try:
+            validator_cls = jsonschema.validators.validator_for(schema)
+            validator_cls.check_schema(schema)
+            return validator_cls(schema)
+        except jsonschema.exceptions.SchemaError as e:
+            is_default = cmd_type == "default"
+            self.logger.log({
+                "source": "Bridge_Injector",
+                "status": "ERROR",
+                "message": (
+                    "Invalid default command schema" if is_default
+                    else f"Invalid schema for command type {cmd_type}, using default schema"
+                ),
+                "errorDetails": {
+                    "errorCode": "SCHEMA_COMPILE_FAILURE",
+                    "errorMessage": e.message
+                }
+            }, log_level="ERROR")
+            if is_default:
+                raise ValueError(f"Invalid default command schema: {e.message}") from e
+            return None
+    
     def _validate_command(self, command_data: Dict[str, Any], schema_key: str) -> Dict[str, Any]:
         """
         Validate a command against its schema.
         
+        With validation_mode "best" (the default) every error is collected and the
+        most relevant one is reported, as jsonschema.validate() does. With
+        validation_mode "first" validation stops at the first error found.
+        
         Args:
             command_data: The command data to validate
             schema_key: The schema key to validate against
@@ -174,25 +224,28 @@ class BridgeInjector:
         Returns:
             Validation result dictionary with is_valid, error_message, and errors
         """
-        schema = self.schemas.get(schema_key, self.schemas["default"])
+        validator = self.compiled_validators.get(schema_key, self.compiled_validators["default"])
         
-        try:
-            jsonschema.validate(instance=command_data, schema=schema)
+        if self.config.get('validation_mode', 'best') == 'first':
+            error = next(validator.iter_errors(command_data), None)
+        else:
+            error = jsonschema.exceptions.best_match(validator.iter_errors(command_data))
+        
+        if error is None:
             return {
                 "is_valid": True,
                 "error_message": None,
                 "errors": None
             }
-        except jsonschema.exceptions.ValidationError as e:
-            return {
-                "is_valid": False,
-                "error_message": str(e),
-                "errors": {
-                    "path": list(e.path),
-                    "message": e.message,
-                    "schema_path": list(e.schema_path)
-                }
+        return {
+            "is_valid": False,
+            "error_message": str(error),
+            "errors": {
+                "path": list(error.path),
+                "message": error.message,
+                "schema_path": list(error.schema_path)
             }
+        }
     
     def _initialize_routers(self) -> Dict[str, Callable]:
         """
@@ -298,6 +351,41 @@ class BridgeInjector:
             
             return None
     
+    def _check_command(self, command_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Validate a command and check it for infinite loops.
+        
+        Args:
+            command_data: The command to check
+            
+        Returns:
+            Error response if the command must not be routed, None otherwise
+        """
+        command_type = command_data.get("command_type")
+        if not command_type:
+            return self.error_handler.create_error_response(
+                "MISSING_COMMAND_TYPE",
+                "Command type not specified"
+            )
+            
+        validator = self.validators.get(command_type, self.validators.get("default"))
+        validation_result = validator(command_data)
+        
+        if not validation_result["is_valid"]:
+            return self.error_handler.create_error_response(
+                "INVALID_COMMAND",
+                validation_result["error_message"],
+                {"validation_errors": validation_result["errors"]}
+            )
+            
+        if self.logger.detect_infinite_loop(command_data):
+            return self.error_handler.create_error_response(
+                "LOOP_DETECTED",
+                "Command appears to be in an infinite loop"
+            )
+        
+        return None
+    
     def process_command(self, command_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Process an incoming command by validating, normalizing, and routing to the appropriate handler.
@@ -336,30 +424,11 @@ class BridgeInjector:
                     }
                 })
             
-            # Validate command
+            # Validate command and check for infinite loops before proceeding
             command_type = command_data.get("command_type")
-            if not command_type:
-                return self.error_handler.create_error_response(
-                    "MISSING_COMMAND_TYPE",
-                    "Command type not specified"
-                )
-                
-            validator = self.validators.get(command_type, self.validators.get("default"))
-            validation_result = validator(command_data)
-            
-            if not validation_result["is_valid"]:
-                return self.error_handler.create_error_response(
-                    "INVALID_COMMAND",
-                    validation_result["error_message"],
-                    {"validation_errors": validation_result["errors"]}
-                )
-                
-            # Check for infinite loops before proceeding
-            if self.logger.detect_infinite_loop(command_data):
-                return self.error_handler.create_error_response(
-                    "LOOP_DETECTED",
-                    "Command appears to be in an infinite loop"
-                )
+            error_response = self._check_command(command_data)
+            if error_response is not None:
+                return error_response
                 
             # Track recursion for nested calls
             if not self.logger.track_recursion(increment=True):
@@ -445,6 +514,167 @@ class BridgeInjector:
             
             return error_response
             
+    def process_commands(self, batch: List[Dict[str, Any]], concurrent: bool = False) -> List[Dict[str, Any]]:
+        """
+        Process a batch of commands.
+        
+        Receipt and completion are logged and recorded in telemetry once for the whole
+        batch. Every command is validated and checked for loops, then the valid ones are
+        routed grouped by command type. With concurrent=True the commands are routed on a
+        thread pool (batch_max_workers in the config), so routers must be thread-safe and
+        the commands in the batch must not depend on each other.
+        
+        Args:
+            batch: List of command dictionaries
+            concurrent: Route the commands of the batch in parallel
+            
+        Returns:
+            List of command responses, in the same order as the batch
+        """
+        start_time = time.time()
+        batch_id = str(uuid.uuid4())
+        responses: List[Optional[Dict[str, Any]]] = [None] * len(batch)
+        
+        type_counts = Counter(
+            str(cmd.get("command_type", "UNKNOWN")) if isinstance(cmd, dict) else "INVALID"
+            for cmd in batch
+        )
+        self.logger.log({
+            "source": "Bridge_Injector",
+            "status": "INFO",
+            "message": f"Received batch of {len(batch)} commands",
+            "payload": {"batch_id": batch_id, "command_types": dict(type_counts)}
+        })
+        
+        if self.telemetry:
+            self.telemetry.record_event({
+                "event_type": "COMMAND_BATCH_RECEIVED",
+                "source": "bridge_injector",
+                "data": {
+                    "batch_id": batch_id,
+                    "batch_size": len(batch),
+                    "command_types": dict(type_counts)
+                }
+            })
+        
+        # Validate everything first, then group what can be routed by command type
+        groups: Dict[str, List[int]] = defaultdict(list)
+        for index, command_data in enumerate(batch):
+            try:
+                if not isinstance(command_data, dict):
+                    error_response = self.error_handler.create_error_response(
+                        "INVALID_COMMAND",
+                        f"Command must be an object, not {type(command_data).__name__}"
+                    )
+                else:
+                    if "command_id" not in command_data:
+                        command_data["command_id"] = str(uuid.uuid4())
+                    error_response = self._check_command(command_data)
+            except Exception as e:
+                error_response = self.error_handler.handle_exception(e, context={"command_data": command_data})
+            if error_response is not None:
+                responses[index] = error_response
+            else:
+                groups[command_data["command_type"]].append(index)
+        
+        # The batch counts as one level of nesting, however many commands it holds
+        if groups and not self.logger.track_recursion(increment=True):
+            error_response = self.error_handler.create_error_response(
+                "STACK_EXHAUSTION",
+                "Maximum command processing depth reached"
+            )
+            for indexes in groups.values():
+                for index in indexes:
+                    responses[index] = dict(error_response)
+            groups = {}
+        
+        if groups:
+            try:
+                if concurrent:
+                    max_workers = self.config.get('batch_max_workers', 8)
+                    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                        futures = {}
+                        for command_type, indexes in groups.items():
+                            router = self.routers.get(command_type, self.routers.get("default"))
+                            for index in indexes:
+                                futures[index] = executor.submit(self._route_command, router, batch[index])
+                        for index, future in futures.items():
+                            responses[index] = future.result()
+                else:
+                    for command_type, indexes in groups.items():
+                        router = self.routers.get(command_type, self.routers.get("default"))
+                        for index in indexes:
+                            responses[index] = self._route_command(router, batch[index])
+            finally:
+                self.logger.track_recursion(increment=False)
+        
+        # Update statistics for the routed commands
+        for indexes in groups.values():
+            for index in indexes:
+                result = responses[index]
+                self.stats["commands_processed"] += 1
+                if result.get("status") == "success":
+                    self.stats["successful_commands"] += 1
+                else:
+                    self.stats["failed_commands"] += 1
+        status_counts = Counter(result.get("status") for result in responses)
+        
+        processing_time_ms = int((time.time() - start_time) * 1000)
+        
+        if self.telemetry:
+            self.telemetry.record_event({
+                "event_type": "COMMAND_BATCH_COMPLETED",
+                "source": "bridge_injector",
+                "data": {
+                    "batch_id": batch_id,
+                    "batch_size": len(batch),
+                    "status_counts": dict(status_counts),
+                    "processing_time_ms": processing_time_ms
+                }
+            })
+            self.telemetry.record_metric(
+                "command_batch_processing_time_ms",
+                processing_time_ms,
+                context={"batch_size": len(batch)}
+            )
+        
+        self.logger.log({
+            "source": "Bridge_Injector",
+            "status": "INFO",
+            "message": f"Batch processed: {len(batch)} commands",
+            "payload": {
+                "batch_id": batch_id,
+                "status_counts": dict(status_counts),
+                "processing_time_ms": processing_time_ms
+            }
+        })
+        
+        return responses
+    
+    def _route_command(self, router: Callable, command_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Route one command of a batch and attach its metadata.
+        
+        Args:
+            router: The router for the command type
+            command_data: The validated command
+            
+        Returns:
+            The router result, or an error response if the router raised
+        """
+        start_time = time.time()
+        try:
+            result = router(command_data)
+        except Exception as e:
+            result = self.error_handler.handle_exception(e, context={"command_data": command_data})
+        
+        result["metadata"] = {
+            "processing_time_ms": int((time.time() - start_time) * 1000),
+            "source_module": "injector",
+            "command_id": command_data["command_id"]
+        }
+        return result
+    
     def health_check(self) -> Dict[str, Any]:
         """
         Return health status of the Injector module.
@@ -500,6 +730,37 @@ def process_command(command_data: Dict[str, Any], config: Dict[str, Any] = None)
         
         return _default_injector.process_command(command_data)
 
+def process_commands(batch: List[Dict[str, Any]], config: Dict[str, Any] = None,
+                     concurrent: bool = False) -> List[Dict[str, Any]]:
+    """
+    Process a batch of commands using the Bridge Injector.
+    
+    Args:
+        batch: The commands to process
+        config: Optional configuration for the injector
+        concurrent: Route the commands of the batch in parallel
+        
+    Returns:
+        Command processing results, in the same order as the batch
+    """
+    global _default_injector
+    
+    if config is not None:
+        # Create a new injector with the provided config
+        injector = BridgeInjector(config)
+        return injector.process_commands(batch, concurrent=concurrent)
+    else:
+        # Use or create the default injector
+        if '_default_injector' not in globals():
+            _default_injector = BridgeInjector({
+                'logger_config': {
+                    'log_path': 'runtime/logs/bridge_injector.jsonl',
+                    'enable_console': True
+                }
+            })
+        
+        return _default_injector.process_commands(batch, concurrent=concurrent)
+
 def health_check(config: Dict[str, Any] = None) -> Dict[str, Any]:
     """
     Get health status of the Bridge Injector.
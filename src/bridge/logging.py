@@ -10,15 +10,76 @@ import os
 import time
 import uuid
 import json
+import queue
+import atexit
+import hashlib
 import datetime
+import threading
 import traceback
 import collections
 from typing import Dict, Any, Optional, List, Callable
 from collections import defaultdict
 
+# Payloads larger than this are replaced with a summary before writing
+MAX_PAYLOAD_BYTES = 1024 * 1024  # 1MB
+
+
+class LoopWindow:
+    """
+    Sliding window of recent payload digests with a digest -> count map,
+    so the number of recent repeats of a payload is known in O(1).
+    """
+    
+    __slots__ = ("size", "threshold", "digests", "counts")
+    
+    def __init__(self, size: int, threshold: int):
+        """
+        Args:
+            size: Number of recent payloads remembered
+            threshold: Repeats within the window that count as a loop
+        """
+        self.size = size
+        self.threshold = threshold
+        self.digests = collections.deque()
+        self.counts: Dict[str, int] = {}
+    
+    def observe(self, digest: str) -> int:
+        """
+        Record a digest and return how many times it was already in the window.
+        
+        Args:
+            digest: Payload digest
+            
+        Returns:
+            Occurrences of the digest before this one
+        """
+        occurrences = self.counts.get(digest, 0)
+        
+        if len(self.digests) >= self.size:
+            evicted = self.digests.popleft()
+            remaining = self.counts[evicted] - 1
+            if remaining:
+                self.counts[evicted] = remaining
+            else:
+                del self.counts[evicted]
+        
+        self.digests.append(digest)
+        self.counts[digest] = self.counts.get(digest, 0) + 1
+        return occurrences
+    
+    def __len__(self) -> int:
+        return len(self.digests)
+
+
 class BridgeLogger:
     """
     Core logging system with error tracking and reporting.
+    
+    With 'async_mode' enabled, log() only serializes the event and puts it on a
+    bounded in-memory queue. A writer thread drains the queue in batches into a
+    file handle it keeps open, and rotates by the byte count it has written.
+    Events that arrive while the queue is full are dropped and counted.
+    close() (also registered with atexit) flushes everything still queued.
     """
     
     def __init__(self, config: Dict[str, Any]):
@@ -34,8 +95,28 @@ class BridgeLogger:
         self.enable_console = config.get('enable_console', True)
         self.min_log_level = config.get('min_log_level', 'INFO')
         
-        # Initialize hash tracker for loop detection
-        self.recent_payloads = collections.deque(maxlen=100)
+        # Non-blocking writer settings
+        self.async_mode = config.get('async_mode', False)
+        self.queue_size = config.get('queue_size', 10000)
+        self.batch_size = config.get('batch_size', 256)
+        self.flush_interval = config.get('flush_interval', 0.5)
+        self.dropped_events = 0
+        self.written_events = 0
+        self.written_batches = 0
+        self._queue = None
+        self._writer = None
+        self._file = None
+        self._bytes_written = 0
+        self._closed = False
+        
+        # Initialize hash trackers for loop detection. 'loop_rules' maps a
+        # command_type to {"window": int, "threshold": int} overrides.
+        self.loop_window = config.get('loop_window', 100)
+        self.loop_threshold = config.get('loop_threshold', 5)
+        self.loop_rules = config.get('loop_rules', {})
+        self.loop_windows: Dict[Any, LoopWindow] = {}
+        # Digests of payloads without a command_type (kept for existing callers)
+        self.recent_payloads = self._get_loop_window(None).digests
         
         # Initialize recursion depth tracking
         self.current_recursion_depth = 0
@@ -49,6 +130,12 @@ class BridgeLogger:
         if log_dir and not os.path.exists(log_dir):
             os.makedirs(log_dir, exist_ok=True)
         
+        if self.async_mode:
+            self._queue = queue.Queue(maxsize=self.queue_size)
+            self._writer = threading.Thread(target=self._writer_loop, name="bridge-log-writer", daemon=True)
+            self._writer.start()
+            atexit.register(self.close)
+        
         # Log initialization
         self.log({
             "source": "Bridge_Logger",
@@ -92,31 +179,58 @@ class BridgeLogger:
             
         return event_data["eventId"]
     
+    def _serialize_event(self, event_data: Dict[str, Any]) -> str:
+        """
+        Serialize an event to a JSON line, truncating very large payloads.
+        
+        The event is serialized once; the payload is only measured separately
+        when the whole line is over the payload limit.
+        
+        Args:
+            event_data: The event data to serialize
+            
+        Returns:
+            JSON line including the trailing newline
+        """
+        line = json.dumps(event_data)
+        
+        # Truncate payload if very large to prevent log file bloat
+        if len(line) > MAX_PAYLOAD_BYTES and isinstance(event_data.get("payload"), dict):
+            payload_str = json.dumps(event_data["payload"])
+            if len(payload_str) > MAX_PAYLOAD_BYTES:
+                event_data["payload"] = {
+                    "truncated": True,
+                    "original_size": len(payload_str),
+                    "summary": str(event_data["payload"])[:1000] + "..."
+                }
+                line = json.dumps(event_data)
+        
+        return line + '\n'
+    
     def _write_log(self, event_data: Dict[str, Any]) -> None:
         """
-        Write event data to the log file.
+        Write event data to the log file, or queue it for the writer thread in async mode.
         
         Args:
             event_data: The event data to log
         """
         try:
+            line = self._serialize_event(event_data)
+            
+            if self.async_mode and not self._closed:
+                try:
+                    self._queue.put_nowait(line)
+                except queue.Full:
+                    self.dropped_events += 1
+                return
+            
             # Check if log rotation is needed
             if os.path.exists(self.log_path) and os.path.getsize(self.log_path) > self.max_log_size:
                 self._rotate_logs()
             
-            # Truncate payload if very large to prevent log file bloat
-            if "payload" in event_data and isinstance(event_data["payload"], dict):
-                payload_str = json.dumps(event_data["payload"])
-                if len(payload_str) > 1024 * 1024:  # 1MB
-                    event_data["payload"] = {
-                        "truncated": True,
-                        "original_size": len(payload_str),
-                        "summary": str(event_data["payload"])[:1000] + "..."
-                    }
-            
             # Write event to log file
             with open(self.log_path, 'a', encoding='utf-8') as f:
-                f.write(json.dumps(event_data) + '\n')
+                f.write(line)
                 
         except Exception as e:
             # Fall back to console if file logging fails
@@ -124,6 +238,114 @@ class BridgeLogger:
                 print(f"ERROR: Failed to write to log file: {str(e)}")
                 print(f"Log event: {json.dumps(event_data)}")
     
+    def _open_log_file(self) -> None:
+        """Open the log file for appending and start tracking its size."""
+        self._file = open(self.log_path, 'a', encoding='utf-8')
+        self._bytes_written = self._file.tell()
+    
+    def _write_batch(self, lines: List[str]) -> None:
+        """
+        Write a batch of serialized events with a single write call.
+        
+        Args:
+            lines: JSON lines to append
+        """
+        try:
+            if self._file is None:
+                self._open_log_file()
+            elif self._bytes_written > self.max_log_size:
+                self._file.close()
+                self._file = None
+                self._rotate_logs()
+                self._open_log_file()
+            
+            data = ''.join(lines)
+            self._file.write(data)
+            self._file.flush()
+            self._bytes_written += len(data.encode('utf-8'))
+            self.written_events += len(lines)
+            self.written_batches += 1
+        except Exception as e:
+            if self.enable_console:
+                print(f"ERROR: Failed to write {len(lines)} log events: {str(e)}")
+    
+    def _writer_loop(self) -> None:
+        """
+        Writer thread: block for the first event, then drain up to batch_size more.
+        A None item is the shutdown sentinel.
+        """
+        stop = False
+        while not stop:
+            try:
+                item = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                continue
+            
+            batch = []
+            while True:
+                if item is None:
+                    stop = True
+                else:
+                    batch.append(item)
+                if len(batch) >= self.batch_size:
+                    break
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            
+            if batch:
+                self._write_batch(batch)
+        
+        # Anything logged between the sentinel and shutdown
+        remaining = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not None:
+                remaining.append(item)
+        if remaining:
+            self._write_batch(remaining)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get writer statistics.
+        
+        Returns:
+            Dictionary with queue depth, written and dropped event counts
+        """
+        return {
+            "async_mode": self.async_mode,
+            "queued_events": self._queue.qsize() if self._queue else 0,
+            "written_events": self.written_events,
+            "written_batches": self.written_batches,
+            "dropped_events": self.dropped_events
+        }
+    
+    def close(self, timeout: Optional[float] = 5.0) -> None:
+        """
+        Flush queued events and stop the writer thread.
+        
+        Args:
+            timeout: Maximum seconds to wait for the writer to drain the queue
+        """
+        if not self.async_mode or self._closed:
+            return
+        self._closed = True
+        
+        # The sentinel must get through even if the queue is full
+        self._queue.put(None)
+        self._writer.join(timeout)
+        
+        if self._file is not None and not self._writer.is_alive():
+            self._file.close()
+            self._file = None
+        
+        if self.dropped_events and self.enable_console:
+            print(f"WARNING: Bridge logger dropped {self.dropped_events} events under load")
+    
     def _print_log(self, event_data: Dict[str, Any]) -> None:
         """
         Print event data to the console in a readable format.
@@ -160,7 +382,7 @@ class BridgeLogger:
         try:
             # Rotate existing log files
             for i in range(self.log_rotation_count - 1, 0, -1):
-                src = f"{self.log_path}.{i}" if i > 1 else self.log_path
+                src = f"{self.log_path}.{i}"
                 dst = f"{self.log_path}.{i + 1}"
                 
                 if os.path.exists(src):
@@ -237,22 +459,40 @@ class BridgeLogger:
     
     def _hash_payload(self, payload: Any) -> str:
         """
-        Create a hash of a payload for loop detection.
+        Create a stable 64-bit digest of a payload for loop detection.
+        
+        Unlike hash(), the digest is the same across processes and restarts.
         
         Args:
             payload: The payload to hash
             
         Returns:
-            String hash of the payload
+            Hex string of the 64-bit digest
         """
         try:
-            # Convert payload to string and create a simple hash
-            # In a real implementation, a more sophisticated hashing algorithm would be used
-            payload_str = json.dumps(payload, sort_keys=True)
-            return str(hash(payload_str))
+            payload_bytes = json.dumps(payload, sort_keys=True, separators=(',', ':')).encode('utf-8')
         except Exception:
             # Fall back to string representation if JSON conversion fails
-            return str(hash(str(payload)))
+            payload_bytes = str(payload).encode('utf-8', 'replace')
+        return hashlib.blake2b(payload_bytes, digest_size=8).hexdigest()
+    
+    def _get_loop_window(self, command_type: Any) -> LoopWindow:
+        """
+        Get the loop detection window for a command type, creating it on first use.
+        
+        Args:
+            command_type: Command type, or None for payloads without one
+            
+        Returns:
+            The LoopWindow for that command type
+        """
+        window = self.loop_windows.get(command_type)
+        if window is None:
+            rule = self.loop_rules.get(command_type, {})
+            window = LoopWindow(rule.get('window', self.loop_window),
+                                rule.get('threshold', self.loop_threshold))
+            self.loop_windows[command_type] = window
+        return window
     
     def detect_infinite_loop(self, payload: Any) -> bool:
         """
@@ -267,14 +507,15 @@ class BridgeLogger:
         # Create a hash of the payload to detect repetition
         payload_hash = self._hash_payload(payload)
         
-        # Count occurrences of this hash in recent payloads
-        occurrences = sum(1 for h in self.recent_payloads if h == payload_hash)
+        # Each command type has its own window and threshold
+        command_type = payload.get("command_type") if isinstance(payload, dict) else None
+        window = self._get_loop_window(command_type)
         
-        # Add current hash to recent payloads
-        self.recent_payloads.append(payload_hash)
+        # Count occurrences of this hash in recent payloads and record it
+        occurrences = window.observe(payload_hash)
         
-        # If we've seen this exact payload 5+ times recently, it's likely an infinite loop
-        if occurrences >= 5:
+        # If we've seen this exact payload threshold+ times recently, it's likely an infinite loop
+        if occurrences >= window.threshold:
             self.log({
                 "source": "Bridge_System",
                 "status": "ERROR",
@@ -282,7 +523,7 @@ class BridgeLogger:
                 "message": "Potential infinite loop detected based on payload hash repetition.",
                 "errorDetails": {
                     "errorCode": "LOOP_DETECTED",
-                    "errorMessage": f"Payload hash '{payload_hash[:6]}...' repeated {occurrences} times within {len(self.recent_payloads)} cycles."
+                    "errorMessage": f"Payload hash '{payload_hash[:6]}...' repeated {occurrences} times within {len(window)} cycles."
                 }
             }, log_level="ERROR")
             
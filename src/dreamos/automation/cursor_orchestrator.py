@@ -29,6 +29,13 @@ except ImportError as e:
 
 import tenacity
 
+from src.dreamos.automation.gui_arbiter import ActionPriority, GuiActionArbiter
+from src.dreamos.automation.injection_strategy import (
+    InjectionBackend,
+    InjectionError,
+    InjectionStrategy,
+    PyAutoGUIBackend,
+)
 from src.dreamos.core.config import AppConfig
 from src.dreamos.core.coordination.agent_bus import AgentBus, BaseEvent, EventType
 from src.dreamos.core.coordination.event_payloads import (
@@ -93,12 +100,14 @@ class CursorOrchestrator:
         self,
         config: AppConfig,
         agent_bus: Optional[AgentBus] = None,
+        backend: Optional[InjectionBackend] = None,
     ):
         """Initializes the CursorOrchestrator singleton instance.
 
         Args:
             config: The loaded AppConfig instance containing settings.
             agent_bus: Optional AgentBus instance. If None, gets the default singleton.
+            backend: Optional injection backend. If None, uses pyautogui/pyperclip.
 
         Raises:
             CursorOrchestratorError: If UI dependencies missing or no coords loaded.
@@ -110,7 +119,7 @@ class CursorOrchestrator:
             )
             raise ValueError("AppConfig instance is required for CursorOrchestrator.")
 
-        if not UI_AUTOMATION_AVAILABLE:
+        if backend is None and not UI_AUTOMATION_AVAILABLE:
             raise CursorOrchestratorError(
                 "Dependencies (pyautogui, pyperclip) not installed."
             )
@@ -137,6 +146,16 @@ class CursorOrchestrator:
         self.input_coordinates: Dict[str, Tuple[int, int]] = {}
         self.copy_coordinates: Dict[str, Tuple[int, int]] = {}
         self.agent_status: Dict[str, AgentStatus] = {}
+        self.injection_strategy = InjectionStrategy(
+            backend or PyAutoGUIBackend(),
+            paste_threshold=getattr(self.config, "paste_threshold_chars", 200),
+            ready_timeout=getattr(self.config, "ready_timeout_seconds", 2.0),
+            poll_interval=getattr(self.config, "ready_poll_interval_seconds", 0.01),
+        )
+        # Single owner of mouse and keyboard; every GUI sequence runs through it
+        self.gui_arbiter = GuiActionArbiter(
+            focus_window=self.injection_strategy.ensure_focus
+        )
         self._load_all_coordinates()
         self._initialize_agent_status()
         self._initialized = True
@@ -200,14 +219,16 @@ class CursorOrchestrator:
         prompt: str,
         timeout: Optional[float] = None,
         correlation_id: Optional[str] = None,
+        priority: ActionPriority = ActionPriority.NORMAL,
     ) -> bool:
         """Injects a prompt into the specified agent's Cursor window.
 
         Args:
             agent_id: The ID of the target agent.
             prompt: The text to inject.
-            timeout: Optional timeout in seconds.
+            timeout: Optional timeout in seconds, including time queued for the GUI.
             correlation_id: Optional correlation ID for tracking.
+            priority: Priority of the injection in the GUI action queue.
 
         Returns:
             bool: True if injection was successful.
@@ -232,13 +253,13 @@ class CursorOrchestrator:
             def injection_task():
                 self._perform_injection_sequence(x, y, prompt, agent_id, target_window_title)
 
+            action = self.gui_arbiter.run(
+                agent_id, target_window_title, injection_task, priority, deadline=timeout
+            )
             if timeout:
-                await asyncio.wait_for(
-                    asyncio.to_thread(injection_task),
-                    timeout=timeout,
-                )
+                await asyncio.wait_for(action, timeout=timeout)
             else:
-                await asyncio.to_thread(injection_task)
+                await action
 
             await self._set_agent_status(
                 agent_id,
@@ -292,28 +313,19 @@ class CursorOrchestrator:
     def _perform_injection_sequence(
         self, x: int, y: int, text: str, agent_id_for_log: str, target_window_title: str
     ):
-        """Performs the actual injection sequence."""
-        if not self._check_and_recover_focus(target_window_title, agent_id_for_log):
-            raise CursorOrchestratorError("Failed to recover window focus")
+        """Performs the actual injection sequence.
 
+        Long prompts are pasted and waits poll for window focus; see InjectionStrategy.
+        """
         try:
-            # Click the target location
-            pyautogui.click(x, y)
-            time.sleep(0.1)
-
-            # Clear existing text (Ctrl+A, Delete)
-            pyautogui.hotkey("ctrl", "a")
-            time.sleep(0.1)
-            pyautogui.press("delete")
-            time.sleep(0.1)
-
-            # Type the new text
-            pyautogui.write(text)
-            time.sleep(0.1)
-
-            # Press Enter to submit
-            pyautogui.press("enter")
+            result = self.injection_strategy.inject(x, y, text, target_window_title)
+            logger.debug(
+                f"Injected {result.chars} chars into {agent_id_for_log} by {result.mode} "
+                f"in {result.elapsed:.3f}s ({result.waited:.3f}s waiting)"
+            )
 
+        except InjectionError as e:
+            raise CursorOrchestratorError(str(e))
         except FailSafeException:
             raise CursorOrchestratorError("Fail-safe triggered during injection")
         except Exception as e:
@@ -324,13 +336,15 @@ class CursorOrchestrator:
         agent_id: str,
         timeout: Optional[float] = None,
         correlation_id: Optional[str] = None,
+        priority: ActionPriority = ActionPriority.NORMAL,
     ) -> Optional[str]:
         """Retrieves response from specified agent's Cursor window.
 
         Args:
             agent_id: The ID of the target agent.
-            timeout: Optional timeout in seconds.
+            timeout: Optional timeout in seconds, including time queued for the GUI.
             correlation_id: Optional correlation ID for tracking.
+            priority: Priority of the retrieval in the GUI action queue.
 
         Returns:
             Optional[str]: The retrieved response text, or None if failed.
@@ -355,13 +369,13 @@ class CursorOrchestrator:
             def copy_task():
                 return self._perform_copy_sequence(x, y, agent_id, target_window_title)
 
+            action = self.gui_arbiter.run(
+                agent_id, target_window_title, copy_task, priority, deadline=timeout
+            )
             if timeout:
-                response = await asyncio.wait_for(
-                    asyncio.to_thread(copy_task),
-                    timeout=timeout,
-                )
+                response = await asyncio.wait_for(action, timeout=timeout)
             else:
-                response = await asyncio.to_thread(copy_task)
+                response = await action
 
             if response:
                 await self._set_agent_status(
@@ -454,18 +468,24 @@ class CursorOrchestrator:
             x, y = self.input_coordinates[agent_id]
             target_window_title = f"Cursor - Agent {agent_id}"
 
-            if not self._check_and_recover_focus(target_window_title, agent_id):
-                return False
+            def health_check_task():
+                if not self._check_and_recover_focus(target_window_title, agent_id):
+                    return False
+                self._perform_health_check_click(x, y, agent_id)
+                return True
 
-            await asyncio.to_thread(
-                self._perform_health_check_click, x, y, agent_id
+            return await self.gui_arbiter.run(
+                agent_id, target_window_title, health_check_task, ActionPriority.LOW
             )
-            return True
 
         except Exception as e:
             logger.error(f"Health check failed for agent {agent_id}: {e}")
             return False
 
+    def get_gui_metrics(self) -> Dict:
+        """Returns GUI queue-wait and execution-time metrics per agent."""
+        return self.gui_arbiter.get_metrics()
+
     async def start_listening(self):
         """Starts listening for cursor action events."""
         logger.info("Starting CursorOrchestrator event listener...")
@@ -516,6 +536,9 @@ class CursorOrchestrator:
             # Unsubscribe from events
             self.agent_bus.unsubscribe(EventType.CURSOR_ACTION, self._handle_cursor_action_event)
             
+            # Cancel GUI actions that have not started
+            self.gui_arbiter.shutdown(wait=False)
+
             # Reset agent statuses
             async with self._lock:
                 for agent_id in self.agent_status:
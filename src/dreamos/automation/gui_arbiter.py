@@ -0,0 +1,297 @@
+"""
+GUI action arbiter.
+
+There is one mouse and one keyboard. Instead of every caller running its own GUI
+sequence on a thread and racing for focus, callers submit per-agent action scripts to
+the arbiter. A single worker thread owns the input devices and runs each script to
+completion before starting the next, so scripts never interleave.
+
+Scripts are ordered by priority, then by deadline, then by submission order. A script
+that cannot start before its deadline is failed instead of run late. When the next
+script targets the window that is already focused, the focus switch is skipped, and
+scripts of the same priority for the current window may run ahead of other windows
+(bounded by max_window_run) to avoid needless switching.
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import threading
+import time
+from concurrent.futures import Future
+from enum import IntEnum
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class ActionPriority(IntEnum):
+    """Priority of a GUI action script; lower values run first."""
+
+    HIGH = 0
+    NORMAL = 1
+    LOW = 2
+
+
+class GuiActionDeadlineExceeded(Exception):
+    """Raised when a queued GUI action could not start before its deadline."""
+    pass
+
+
+class _LatencyStats:
+    """Running count, mean and max of a latency in seconds."""
+
+    __slots__ = ("count", "total", "max")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else 0.0,
+            "max": self.max,
+        }
+
+
+class _GuiAction:
+    """A queued action script."""
+
+    __slots__ = ("agent_id", "window_title", "script", "priority", "deadline",
+                 "enqueued_at", "seq", "future", "taken")
+
+    def __init__(self, agent_id: str, window_title: str, script: Callable[[], Any],
+                 priority: int, deadline: Optional[float], enqueued_at: float, seq: int):
+        self.agent_id = agent_id
+        self.window_title = window_title
+        self.script = script
+        self.priority = priority
+        self.deadline = deadline
+        self.enqueued_at = enqueued_at
+        self.seq = seq
+        self.future: Future = Future()
+        self.taken = False
+
+    def sort_key(self):
+        return (self.priority, self.deadline if self.deadline is not None else float("inf"), self.seq)
+
+
+class GuiActionArbiter:
+    """
+    Serializes GUI action scripts onto a single worker thread.
+
+    Usage:
+        arbiter = GuiActionArbiter(focus_window=strategy.ensure_focus)
+        result = await arbiter.run("Agent-1", "Cursor - Agent Agent-1", script, deadline=5.0)
+        arbiter.shutdown()
+    """
+
+    def __init__(self,
+                 focus_window: Optional[Callable[[str], Any]] = None,
+                 max_window_run: int = 4,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize the arbiter and start its worker thread.
+
+        Args:
+            focus_window: Callable(window_title) that focuses a window; called before a
+                script whose window is not the one focused by the previous script
+            max_window_run: Maximum consecutive scripts for one window that may run ahead
+                of older scripts for other windows
+            clock: Monotonic clock used for deadlines and metrics
+        """
+        self.focus_window = focus_window
+        self.max_window_run = max_window_run
+        self.clock = clock
+
+        self._heap: List[tuple] = []
+        self._pending = 0
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._stopped = False
+
+        self._focused_window: Optional[str] = None
+        self._window_run = 0
+
+        self._wait_stats: Dict[str, _LatencyStats] = {}
+        self._exec_stats: Dict[str, _LatencyStats] = {}
+        self.stats = {"executed": 0, "failed": 0, "expired": 0, "cancelled": 0,
+                      "focus_switches": 0, "focus_skips": 0}
+
+        self._thread = threading.Thread(target=self._run, name="gui-arbiter", daemon=True)
+        self._thread.start()
+
+    def submit(self,
+               agent_id: str,
+               window_title: str,
+               script: Callable[[], Any],
+               priority: int = ActionPriority.NORMAL,
+               deadline: Optional[float] = None) -> Future:
+        """
+        Queue an action script.
+
+        Args:
+            agent_id: Agent the script acts for (used for metrics)
+            window_title: Title of the window the script operates on
+            script: Callable run on the worker thread; its return value resolves the future
+            priority: ActionPriority (lower runs first)
+            deadline: Seconds from now by which the script must start, or None
+
+        Returns:
+            Future resolving to the script's return value
+
+        Raises:
+            RuntimeError: If the arbiter has been shut down
+        """
+        now = self.clock()
+        with self._cond:
+            if self._stopped:
+                raise RuntimeError("GUI action arbiter is shut down")
+            action = _GuiAction(agent_id, window_title, script, int(priority),
+                                None if deadline is None else now + deadline, now, next(self._seq))
+            heapq.heappush(self._heap, (action.sort_key(), action))
+            self._pending += 1
+            self._cond.notify()
+            return action.future
+
+    async def run(self,
+                  agent_id: str,
+                  window_title: str,
+                  script: Callable[[], Any],
+                  priority: int = ActionPriority.NORMAL,
+                  deadline: Optional[float] = None) -> Any:
+        """Submit an action script and await its result. See submit()."""
+        return await asyncio.wrap_future(self.submit(agent_id, window_title, script, priority, deadline))
+
+    def pending_count(self) -> int:
+        """Return the number of queued scripts."""
+        with self._cond:
+            return self._pending
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Return queue-wait and execution-time metrics per agent.
+
+        Returns:
+            Dictionary with overall counters, the pending count and per-agent latency stats
+        """
+        with self._cond:
+            agents = {
+                agent_id: {
+                    "queue_wait": self._wait_stats[agent_id].snapshot(),
+                    "execution": self._exec_stats[agent_id].snapshot(),
+                }
+                for agent_id in self._wait_stats
+            }
+            return dict(self.stats, pending=self._pending, agents=agents)
+
+    def shutdown(self, wait: bool = True, timeout: Optional[float] = None) -> None:
+        """
+        Stop the worker. Scripts that have not started are cancelled.
+
+        Args:
+            wait: Wait for the running script to finish
+            timeout: Maximum seconds to wait
+        """
+        with self._cond:
+            self._stopped = True
+            for _, action in self._heap:
+                if not action.taken and action.future.cancel():
+                    self.stats["cancelled"] += 1
+            self._heap.clear()
+            self._pending = 0
+            self._cond.notify_all()
+        if wait:
+            self._thread.join(timeout)
+
+    def _select_next(self) -> Optional[_GuiAction]:
+        """Remove and return the next script to run. Called with the lock held."""
+        while self._heap and self._heap[0][1].taken:
+            heapq.heappop(self._heap)
+        if not self._heap:
+            return None
+
+        head = self._heap[0][1]
+        chosen = head
+        # Stay on the focused window if that does not jump a deadline or a higher priority
+        if (head.window_title != self._focused_window and head.deadline is None
+                and self._window_run < self.max_window_run):
+            for _, action in self._heap:
+                if (not action.taken and action.priority == head.priority
+                        and action.window_title == self._focused_window
+                        and (chosen is head or action.seq < chosen.seq)):
+                    chosen = action
+
+        if chosen is head:
+            heapq.heappop(self._heap)
+        chosen.taken = True
+        self._pending -= 1
+        return chosen
+
+    def _execute(self, action: _GuiAction) -> None:
+        """Run one script on the worker thread."""
+        if not action.future.set_running_or_notify_cancel():
+            self.stats["cancelled"] += 1
+            return
+
+        started = self.clock()
+        wait = started - action.enqueued_at
+        if action.deadline is not None and started > action.deadline:
+            self.stats["expired"] += 1
+            self._observe(action.agent_id, wait, None)
+            action.future.set_exception(GuiActionDeadlineExceeded(
+                f"GUI action for {action.agent_id} waited {wait:.3f}s, past its deadline"
+            ))
+            return
+
+        try:
+            if action.window_title == self._focused_window:
+                self.stats["focus_skips"] += 1
+                self._window_run += 1
+            else:
+                if self.focus_window is not None:
+                    self.focus_window(action.window_title)
+                self.stats["focus_switches"] += 1
+                self._focused_window = action.window_title
+                self._window_run = 1
+            result = action.script()
+        except Exception as e:
+            # Focus state is unknown after a failed script
+            self._focused_window = None
+            self.stats["failed"] += 1
+            self._observe(action.agent_id, wait, self.clock() - started)
+            logger.error(f"GUI action for {action.agent_id} failed: {e}")
+            action.future.set_exception(e)
+            return
+
+        self.stats["executed"] += 1
+        self._observe(action.agent_id, wait, self.clock() - started)
+        action.future.set_result(result)
+
+    def _observe(self, agent_id: str, wait: float, execution: Optional[float]) -> None:
+        with self._cond:
+            if agent_id not in self._wait_stats:
+                self._wait_stats[agent_id] = _LatencyStats()
+                self._exec_stats[agent_id] = _LatencyStats()
+            self._wait_stats[agent_id].observe(wait)
+            if execution is not None:
+                self._exec_stats[agent_id].observe(execution)
+
+    def _run(self) -> None:
+        """Worker thread main loop."""
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._pending or self._stopped)
+                if self._stopped:
+                    return
+                action = self._select_next()
+            if action is not None:
+                self._execute(action)
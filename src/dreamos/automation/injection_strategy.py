@@ -0,0 +1,358 @@
+"""
+Prompt injection strategies for Cursor windows.
+
+Separates *how* a prompt gets into a chat input from the UI library that does it:
+
+- InjectionBackend: the primitive UI operations (click, keys, clipboard, window focus,
+  clock). PyAutoGUIBackend drives the real desktop; RecordingBackend is a headless fake
+  with a virtual clock that records every action, for tests and latency benchmarks.
+- InjectionStrategy: the injection sequence. Long prompts are pasted from the clipboard
+  instead of typed character by character, and the sequence waits for the window to
+  report focus instead of sleeping for fixed intervals.
+"""
+
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class InjectionError(Exception):
+    """Raised when an injection sequence cannot be completed."""
+    pass
+
+
+class InjectionBackend:
+    """Primitive UI operations used by InjectionStrategy.
+
+    Subclasses implement the input and clipboard operations. Window focus is optional:
+    backends that cannot observe it return None from is_window_active().
+    """
+
+    def click(self, x: int, y: int) -> None:
+        raise NotImplementedError
+
+    def hotkey(self, *keys: str) -> None:
+        raise NotImplementedError
+
+    def press(self, key: str) -> None:
+        raise NotImplementedError
+
+    def write(self, text: str) -> None:
+        raise NotImplementedError
+
+    def get_clipboard(self) -> str:
+        raise NotImplementedError
+
+    def set_clipboard(self, text: str) -> None:
+        raise NotImplementedError
+
+    def is_window_active(self, title: str) -> Optional[bool]:
+        """Return whether the window is focused, or None if it cannot be determined."""
+        return None
+
+    def activate_window(self, title: str) -> bool:
+        """Bring the window to the front. Returns False if it does not exist."""
+        return True
+
+    def clock(self) -> float:
+        return time.monotonic()
+
+    def sleep(self, seconds: float) -> None:
+        time.sleep(seconds)
+
+
+class PyAutoGUIBackend(InjectionBackend):
+    """Desktop backend using pyautogui, pyperclip and (if installed) pygetwindow."""
+
+    def __init__(self):
+        import pyautogui
+        import pyperclip
+
+        try:
+            import pygetwindow
+        except ImportError:
+            pygetwindow = None
+
+        self._pyautogui = pyautogui
+        self._pyperclip = pyperclip
+        self._pygetwindow = pygetwindow
+
+    def click(self, x: int, y: int) -> None:
+        self._pyautogui.click(x, y)
+
+    def hotkey(self, *keys: str) -> None:
+        self._pyautogui.hotkey(*keys)
+
+    def press(self, key: str) -> None:
+        self._pyautogui.press(key)
+
+    def write(self, text: str) -> None:
+        self._pyautogui.write(text)
+
+    def get_clipboard(self) -> str:
+        return self._pyperclip.paste()
+
+    def set_clipboard(self, text: str) -> None:
+        self._pyperclip.copy(text)
+
+    def is_window_active(self, title: str) -> Optional[bool]:
+        if self._pygetwindow is None:
+            return None
+        windows = self._pygetwindow.getWindowsWithTitle(title)
+        if not windows:
+            return False
+        return bool(windows[0].isActive)
+
+    def activate_window(self, title: str) -> bool:
+        if self._pygetwindow is None:
+            return True
+        windows = self._pygetwindow.getWindowsWithTitle(title)
+        if not windows:
+            return False
+        windows[0].activate()
+        return True
+
+
+class RecordingBackend(InjectionBackend):
+    """Headless fake backend with a virtual clock.
+
+    Every operation is appended to `actions` as (virtual_time, name, args) and advances
+    the clock by a simulated cost, so injection latency can be measured without a display.
+    """
+
+    def __init__(
+        self,
+        action_latency: float = 0.008,
+        char_latency: float = 0.01,
+        activation_delay: float = 0.15,
+        window_active: bool = True,
+        focus_observable: bool = True,
+    ):
+        """Create a fake backend.
+
+        Args:
+            action_latency: Simulated seconds per click, key press or clipboard operation.
+            char_latency: Simulated seconds per typed character.
+            activation_delay: Seconds after activate_window() until the window reports focus.
+            window_active: Whether the window starts out focused.
+            focus_observable: If False, is_window_active() returns None like a backend
+                without window inspection.
+        """
+        self.action_latency = action_latency
+        self.char_latency = char_latency
+        self.activation_delay = activation_delay
+        self.focus_observable = focus_observable
+        self.now = 0.0
+        self.clipboard = ""
+        self.text = ""
+        self.submitted: List[str] = []
+        self.actions: List[Tuple[float, str, Tuple[Any, ...]]] = []
+        self._active_at: Optional[float] = 0.0 if window_active else None
+
+    def _record(self, name: str, *args: Any, cost: float = None) -> None:
+        self.actions.append((self.now, name, args))
+        self.now += self.action_latency if cost is None else cost
+
+    def click(self, x: int, y: int) -> None:
+        self._record("click", x, y)
+
+    def hotkey(self, *keys: str) -> None:
+        self._record("hotkey", *keys)
+        if keys == ("ctrl", "v"):
+            self.text += self.clipboard
+
+    def press(self, key: str) -> None:
+        self._record("press", key)
+        if key == "delete":
+            self.text = ""
+        elif key == "enter":
+            self.submitted.append(self.text)
+            self.text = ""
+
+    def write(self, text: str) -> None:
+        self._record("write", len(text), cost=len(text) * self.char_latency)
+        self.text += text
+
+    def get_clipboard(self) -> str:
+        self._record("get_clipboard")
+        return self.clipboard
+
+    def set_clipboard(self, text: str) -> None:
+        self._record("set_clipboard", len(text))
+        self.clipboard = text
+
+    def is_window_active(self, title: str) -> Optional[bool]:
+        if not self.focus_observable:
+            return None
+        return self._active_at is not None and self.now >= self._active_at
+
+    def activate_window(self, title: str) -> bool:
+        self._record("activate_window", title)
+        if self._active_at is None:
+            self._active_at = self.now + self.activation_delay
+        return True
+
+    def clock(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.actions.append((self.now, "sleep", (seconds,)))
+        self.now += seconds
+
+
+@dataclass
+class InjectionResult:
+    """Outcome of one injection."""
+
+    mode: str  # "paste" or "type"
+    chars: int
+    elapsed: float
+    waited: float = 0.0
+    steps: List[str] = field(default_factory=list)
+
+
+class InjectionStrategy:
+    """Injects prompts through an InjectionBackend.
+
+    Prompts of at least `paste_threshold` characters are pasted via the clipboard (the
+    previous clipboard content is restored afterwards); shorter prompts are typed.
+    Waits poll the backend's focus state with a growing interval and return as soon as
+    the window is ready. When the backend cannot observe focus, a short fixed settle
+    delay is used instead.
+    """
+
+    def __init__(
+        self,
+        backend: InjectionBackend,
+        paste_threshold: Optional[int] = 200,
+        ready_timeout: float = 2.0,
+        poll_interval: float = 0.01,
+        max_poll_interval: float = 0.1,
+        settle_delay: float = 0.05,
+        restore_clipboard: bool = True,
+    ):
+        """Create a strategy.
+
+        Args:
+            backend: The backend performing the UI operations.
+            paste_threshold: Minimum prompt length to paste instead of type; None never pastes.
+            ready_timeout: Maximum seconds to wait for the window to become ready.
+            poll_interval: First polling interval in seconds; doubled up to max_poll_interval.
+            max_poll_interval: Upper bound for the polling interval.
+            settle_delay: Fixed delay used when readiness cannot be observed, and after a paste.
+            restore_clipboard: Put the previous clipboard content back after pasting.
+        """
+        self.backend = backend
+        self.paste_threshold = paste_threshold
+        self.ready_timeout = ready_timeout
+        self.poll_interval = poll_interval
+        self.max_poll_interval = max_poll_interval
+        self.settle_delay = settle_delay
+        self.restore_clipboard = restore_clipboard
+        self._waited = 0.0
+
+    def _sleep(self, seconds: float) -> None:
+        self._waited += seconds
+        self.backend.sleep(seconds)
+
+    def wait_until(self, condition: Callable[[], Optional[bool]], timeout: Optional[float] = None) -> Optional[bool]:
+        """Poll a condition until it holds or the timeout expires.
+
+        Args:
+            condition: Callable returning True when ready, False when not, None if unknown.
+            timeout: Maximum seconds to wait; defaults to ready_timeout.
+
+        Returns:
+            True if the condition held, False on timeout, None if it cannot be observed
+            (after sleeping settle_delay).
+        """
+        timeout = self.ready_timeout if timeout is None else timeout
+        deadline = self.backend.clock() + timeout
+        interval = self.poll_interval
+        while True:
+            state = condition()
+            if state is None:
+                self._sleep(self.settle_delay)
+                return None
+            if state:
+                return True
+            remaining = deadline - self.backend.clock()
+            if remaining <= 0:
+                return False
+            self._sleep(min(interval, remaining))
+            interval = min(interval * 2, self.max_poll_interval)
+
+    def ensure_focus(self, window_title: str) -> None:
+        """Activate the window if needed and wait until it reports focus.
+
+        Raises:
+            InjectionError: If the window does not exist or never becomes active.
+        """
+        if self.backend.is_window_active(window_title) is False:
+            logger.info(f"Recovering focus for {window_title}")
+            if not self.backend.activate_window(window_title):
+                raise InjectionError(f"Window not found: {window_title}")
+            if self.wait_until(lambda: self.backend.is_window_active(window_title)) is False:
+                raise InjectionError(f"Window did not become active: {window_title}")
+
+    def inject(self, x: int, y: int, text: str, window_title: str, submit: bool = True) -> InjectionResult:
+        """Replace the content of the input at (x, y) with text and optionally submit it.
+
+        Args:
+            x: Input field x coordinate.
+            y: Input field y coordinate.
+            text: Prompt text.
+            window_title: Title of the target window.
+            submit: Press Enter after inserting the text.
+
+        Returns:
+            InjectionResult with the mode used and the elapsed time in backend seconds.
+        """
+        backend = self.backend
+        start = backend.clock()
+        mode = "paste" if self.paste_threshold is not None and len(text) >= self.paste_threshold else "type"
+        steps = []
+        self._waited = 0.0
+
+        self.ensure_focus(window_title)
+        steps.append("focus")
+
+        backend.click(x, y)
+        # Clicking can raise a different window; make sure keys go to the input
+        self.ensure_focus(window_title)
+        steps.append("click")
+
+        backend.hotkey("ctrl", "a")
+        backend.press("delete")
+        steps.append("clear")
+
+        if mode == "paste":
+            self._paste(text)
+        else:
+            backend.write(text)
+        steps.append(mode)
+
+        if submit:
+            backend.press("enter")
+            steps.append("submit")
+
+        elapsed = backend.clock() - start
+        return InjectionResult(mode=mode, chars=len(text), elapsed=elapsed,
+                               waited=self._waited, steps=steps)
+
+    def _paste(self, text: str) -> None:
+        """Paste text via the clipboard, restoring the previous content afterwards."""
+        backend = self.backend
+        previous = backend.get_clipboard() if self.restore_clipboard else None
+        backend.set_clipboard(text)
+        if self.wait_until(lambda: backend.get_clipboard() == text) is False:
+            raise InjectionError("Clipboard did not take the prompt text")
+        backend.hotkey("ctrl", "v")
+        # The target reads the clipboard asynchronously; let it finish before Enter
+        # or before the clipboard is restored
+        self._sleep(self.settle_delay)
+        if previous is not None:
+            backend.set_clipboard(previous)
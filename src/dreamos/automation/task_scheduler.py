@@ -2,11 +2,17 @@
 Task Scheduler module for managing and executing scheduled tasks.
 """
 
-from typing import Dict, Any, List, Optional, Callable, Union
+from typing import Dict, Any, List, Optional, Callable, Union, Tuple
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from enum import Enum
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 import asyncio
+import bisect
+import functools
+import heapq
+import itertools
 import logging
 import json
 import uuid
@@ -34,6 +40,14 @@ class TaskPriority(Enum):
     CRITICAL = 4
 
 
+class ExecutionBackend(Enum):
+    """Where a task's function runs."""
+    
+    INLINE = "inline"    # awaited (or called) on the scheduler's event loop
+    THREAD = "thread"    # thread pool; for blocking I/O
+    PROCESS = "process"  # process pool; for CPU-heavy work (function must be picklable)
+
+
 @dataclass
 class ScheduledTask:
     """Represents a scheduled task."""
@@ -57,13 +71,76 @@ class ScheduledTask:
     error: Optional[str] = None
     tags: List[str] = field(default_factory=list)
     metadata: Dict[str, Any] = field(default_factory=dict)
+    # None keeps the default: coroutines inline, plain functions in the thread pool
+    backend: Optional[ExecutionBackend] = None
+
+
+class LatencyHistogram:
+    """Fixed-bucket histogram of latencies in seconds (dispatch lag, queue wait, run time)."""
+    
+    # Upper bounds in seconds; the last bucket catches everything slower
+    BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+    
+    def __init__(self):
+        self.counts = [0] * (len(self.BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+    
+    def observe(self, seconds: float):
+        """Record one sample."""
+        seconds = max(seconds, 0.0)
+        self.counts[bisect.bisect_left(self.BUCKETS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """Return the histogram as a JSON-serializable dictionary."""
+        labels = [f"<={bound}s" for bound in self.BUCKETS] + [f">{self.BUCKETS[-1]}s"]
+        return {
+            "buckets": dict(zip(labels, self.counts)),
+            "count": self.count,
+            "mean": self.total / self.count if self.count else 0.0,
+            "max": self.max
+        }
+
+
+def _run_coroutine_function(function: Callable, parameters: Dict[str, Any]) -> Any:
+    """Run an async task function to completion in a worker thread or process."""
+    return asyncio.run(function(**parameters))
 
 
 class TaskExecutor:
     """Executes individual tasks with timeout and retry logic."""
     
-    def __init__(self):
+    def __init__(self, max_thread_workers: Optional[int] = None,
+                 max_process_workers: Optional[int] = None):
         self.logger = logging.getLogger("TaskExecutor")
+        self.max_thread_workers = max_thread_workers
+        self.max_process_workers = max_process_workers
+        self._thread_pool: Optional[ThreadPoolExecutor] = None
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+    
+    def _get_pool(self, backend: ExecutionBackend):
+        """Return the executor for a pooled backend, creating it on first use."""
+        if backend == ExecutionBackend.PROCESS:
+            if self._process_pool is None:
+                self._process_pool = ProcessPoolExecutor(max_workers=self.max_process_workers)
+            return self._process_pool
+        if self._thread_pool is None:
+            self._thread_pool = ThreadPoolExecutor(
+                max_workers=self.max_thread_workers, thread_name_prefix="scheduled-task"
+            )
+        return self._thread_pool
+    
+    def shutdown(self, wait: bool = False):
+        """Shut down the worker pools."""
+        for pool in (self._thread_pool, self._process_pool):
+            if pool is not None:
+                pool.shutdown(wait=wait)
+        self._thread_pool = None
+        self._process_pool = None
     
     async def execute_task(self, task: ScheduledTask) -> Dict[str, Any]:
         """Execute a task with timeout and error handling."""
@@ -122,17 +199,29 @@ class TaskExecutor:
             "run_count": task.run_count
         }
     
+    async def _run_function(self, task: ScheduledTask) -> Any:
+        """Run the task function on its execution backend."""
+        is_coroutine = asyncio.iscoroutinefunction(task.function)
+        backend = task.backend
+        if backend is None:
+            backend = ExecutionBackend.INLINE if is_coroutine else ExecutionBackend.THREAD
+        
+        if backend == ExecutionBackend.INLINE:
+            if is_coroutine:
+                return await task.function(**task.parameters)
+            return task.function(**task.parameters)
+        
+        if is_coroutine:
+            call = functools.partial(_run_coroutine_function, task.function, task.parameters)
+        else:
+            call = functools.partial(task.function, **task.parameters)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_pool(backend), call)
+    
     async def _execute_with_retry(self, task: ScheduledTask) -> Any:
         """Execute task with retry logic."""
         try:
-            if asyncio.iscoroutinefunction(task.function):
-                return await task.function(**task.parameters)
-            else:
-                # For synchronous functions, run in thread pool
-                loop = asyncio.get_event_loop()
-                return await loop.run_in_executor(
-                    None, task.function, **task.parameters
-                )
+            return await self._run_function(task)
         except Exception as e:
             task.retry_count += 1
             if task.retry_count >= task.max_retries:
@@ -145,16 +234,62 @@ class TaskExecutor:
 
 
 class TaskScheduler:
-    """Main task scheduler for managing and executing scheduled tasks."""
+    """
+    Main task scheduler for managing and executing scheduled tasks.
+    
+    Pending tasks are kept in a min-heap keyed by next run time. The run loop
+    sleeps until the earliest entry is due and is woken early when tasks are
+    added or resumed. Heap entries are invalidated lazily: an entry only counts
+    if its task is still pending and its time matches the task's next_run.
     
-    def __init__(self, max_concurrent_tasks: int = 10):
+    Each TaskPriority has its own concurrency lane on top of the global
+    max_concurrent_tasks limit. Lanes are drained highest priority first, and
+    critical_reserve of the global slots are kept for CRITICAL work, so a
+    CRITICAL task never waits behind lower-priority ones. Due tasks whose lane
+    (or the scheduler) is full wait in that lane's FIFO queue until a running
+    task finishes.
+    """
+    
+    def __init__(self, max_concurrent_tasks: int = 10,
+                 lane_limits: Optional[Dict[TaskPriority, int]] = None,
+                 max_thread_workers: Optional[int] = None,
+                 max_process_workers: Optional[int] = None,
+                 critical_reserve: int = 1):
+        """
+        Args:
+            max_concurrent_tasks: Limit on running tasks across all lanes
+            lane_limits: Per-priority lane limits (default: max_concurrent_tasks)
+            max_thread_workers: Size of the THREAD backend pool
+            max_process_workers: Size of the PROCESS backend pool
+            critical_reserve: Global slots only CRITICAL tasks may use; at least one
+                slot is always left to the other lanes
+        """
         self.tasks: Dict[str, ScheduledTask] = {}
-        self.executor = TaskExecutor()
+        self.executor = TaskExecutor(max_thread_workers, max_process_workers)
         self.max_concurrent_tasks = max_concurrent_tasks
+        self.critical_reserve = max(0, min(critical_reserve, max_concurrent_tasks - 1))
+        self.lane_limits = {
+            priority: (lane_limits or {}).get(priority, max_concurrent_tasks)
+            for priority in TaskPriority
+        }
+        self._lane_running = {priority: 0 for priority in TaskPriority}
+        self._lane_queues = {priority: deque() for priority in TaskPriority}
+        self.lane_metrics = {
+            priority: {"queue_wait": LatencyHistogram(), "run_time": LatencyHistogram()}
+            for priority in TaskPriority
+        }
         self.running_tasks: Dict[str, asyncio.Task] = {}
         self.logger = logging.getLogger("TaskScheduler")
         self.is_running = False
         
+        # (next_run, sequence, task_id); sequence keeps ordering stable for equal times
+        self._heap: List[Tuple[datetime, int, str]] = []
+        self._sequence = itertools.count()
+        self._cron_iters: Dict[str, croniter] = {}
+        self._wakeup: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.dispatch_lag = LatencyHistogram()
+        
         # Statistics
         self.stats = {
             "total_tasks": 0,
@@ -168,7 +303,8 @@ class TaskScheduler:
                  description: str = "", priority: TaskPriority = TaskPriority.NORMAL,
                  timeout: Optional[int] = None, max_retries: int = 3,
                  parameters: Optional[Dict[str, Any]] = None,
-                 tags: Optional[List[str]] = None) -> str:
+                 tags: Optional[List[str]] = None,
+                 backend: Optional[ExecutionBackend] = None) -> str:
         """Add a new scheduled task."""
         task_id = str(uuid.uuid4())
         
@@ -188,7 +324,8 @@ class TaskScheduler:
             timeout=timeout,
             max_retries=max_retries,
             parameters=parameters or {},
-            tags=tags or []
+            tags=tags or [],
+            backend=backend
         )
         
         # Calculate next run time
@@ -197,6 +334,7 @@ class TaskScheduler:
         self.tasks[task_id] = task
         self.stats["total_tasks"] += 1
         self.stats["pending_tasks"] += 1
+        self._schedule(task)
         
         self.logger.info(f"Added task {task_id}: {name} (next run: {task.next_run})")
         return task_id
@@ -220,6 +358,7 @@ class TaskScheduler:
             self.stats["pending_tasks"] -= 1
         
         del self.tasks[task_id]
+        self._cron_iters.pop(task_id, None)
         self.stats["total_tasks"] -= 1
         
         self.logger.info(f"Removed task {task_id}")
@@ -249,6 +388,7 @@ class TaskScheduler:
             task.status = TaskStatus.PENDING
             task.next_run = self._calculate_next_run(task)
             self.stats["pending_tasks"] += 1
+            self._schedule(task)
             self.logger.info(f"Resumed task {task_id}")
             return True
         
@@ -270,8 +410,16 @@ class TaskScheduler:
         """Get all tasks with a specific priority."""
         return [task for task in self.tasks.values() if task.priority == priority]
     
-    def _calculate_next_run(self, task: ScheduledTask) -> datetime:
-        """Calculate the next run time for a task."""
+    def _calculate_next_run(self, task: ScheduledTask, after_run: bool = False) -> datetime:
+        """
+        Calculate the next run time for a task.
+        
+        Args:
+            task: The task
+            after_run: True right after the task ran; only then is the cached cron
+                iterator advanced. Otherwise (add, resume) it is rebuilt from the
+                base time, so recomputing next_run never skips a run.
+        """
         if task.status == TaskStatus.PAUSED:
             return task.next_run or datetime.utcnow()
         
@@ -279,14 +427,61 @@ class TaskScheduler:
         base_time = task.last_run or datetime.utcnow()
         
         try:
+            cron = self._cron_iters.get(task.task_id) if after_run else None
+            if cron is not None and cron.get_current(datetime) < base_time:
+                # Advance the cached iterator past base_time, skipping missed runs
+                for _ in range(64):
+                    next_run = cron.get_next(datetime)
+                    if next_run > base_time:
+                        return next_run
+            
+            # Not advancing after a run, no usable iterator, or it fell too far behind
             cron = croniter(task.schedule, base_time)
+            self._cron_iters[task.task_id] = cron
             return cron.get_next(datetime)
         except Exception as e:
             self.logger.error(f"Error calculating next run for task {task.task_id}: {e}")
             return datetime.utcnow() + timedelta(hours=1)  # Default fallback
     
+    def _schedule(self, task: ScheduledTask):
+        """Push a pending task onto the heap and wake the run loop."""
+        if task.next_run is None:
+            return
+        heapq.heappush(self._heap, (task.next_run, next(self._sequence), task.task_id))
+        
+        # Drop stale entries once they dominate the heap
+        if len(self._heap) > 2 * len(self.tasks) + 64:
+            self._heap = [entry for entry in self._heap if self._is_live(entry)]
+            heapq.heapify(self._heap)
+        
+        self._wake()
+    
+    def _wake(self):
+        """Wake the run loop early (safe to call from other threads)."""
+        if self._wakeup is not None and self._loop is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+    
+    def _is_live(self, entry: Tuple[datetime, int, str]) -> bool:
+        """Return True if a heap entry still refers to a pending run of its task."""
+        when, _, task_id = entry
+        task = self.tasks.get(task_id)
+        return (task is not None and
+                task.status == TaskStatus.PENDING and
+                task.next_run == when and
+                task_id not in self.running_tasks)
+    
+    def _seconds_until_next(self) -> Optional[float]:
+        """Seconds until the earliest live heap entry, or None if nothing is scheduled."""
+        while self._heap and not self._is_live(self._heap[0]):
+            heapq.heappop(self._heap)
+        if not self._heap:
+            return None
+        return max((self._heap[0][0] - datetime.utcnow()).total_seconds(), 0.0)
+    
     async def _execute_task(self, task: ScheduledTask):
         """Execute a single task."""
+        lane = task.priority
+        started = time.monotonic()
         try:
             result = await self.executor.execute_task(task)
             
@@ -298,7 +493,7 @@ class TaskScheduler:
             
             # Calculate next run time
             if task.status == TaskStatus.COMPLETED:
-                task.next_run = self._calculate_next_run(task)
+                task.next_run = self._calculate_next_run(task, after_run=True)
                 task.status = TaskStatus.PENDING
                 self.stats["pending_tasks"] += 1
             
@@ -306,33 +501,52 @@ class TaskScheduler:
             self.logger.error(f"Unexpected error executing task {task.task_id}: {e}")
             self.stats["failed_tasks"] += 1
         finally:
+            self.lane_metrics[lane]["run_time"].observe(time.monotonic() - started)
+            self._lane_running[lane] -= 1
+            
             # Remove from running tasks
             if task.task_id in self.running_tasks:
                 del self.running_tasks[task.task_id]
                 self.stats["running_tasks"] -= 1
+            
+            # Requeue for the next run or a retry; a freed slot may also unblock due tasks
+            if task.task_id in self.tasks and task.status == TaskStatus.PENDING:
+                self._schedule(task)
+            else:
+                self._wake()
     
     async def _check_and_execute_tasks(self):
-        """Check for tasks that need to be executed."""
+        """Dispatch due tasks, highest priority first, within the global and lane limits."""
         current_time = datetime.utcnow()
-        tasks_to_run = []
-        
-        # Find tasks that should run now
-        for task in self.tasks.values():
-            if (task.status == TaskStatus.PENDING and 
-                task.next_run and 
-                task.next_run <= current_time):
-                tasks_to_run.append(task)
-        
-        # Sort by priority (highest first)
-        tasks_to_run.sort(key=lambda t: t.priority.value, reverse=True)
-        
-        # Execute tasks (respecting concurrency limit)
-        for task in tasks_to_run:
-            if len(self.running_tasks) >= self.max_concurrent_tasks:
-                break
-            
-            if task.task_id not in self.running_tasks:
+        
+        # Move due tasks off the heap into their priority lanes
+        while self._heap and self._heap[0][0] <= current_time:
+            entry = heapq.heappop(self._heap)
+            if self._is_live(entry):
+                self._lane_queues[self.tasks[entry[2]].priority].append(entry)
+        
+        # Drain lanes, highest priority first, while the scheduler has free slots
+        running = sum(self._lane_running.values())
+        for priority in sorted(TaskPriority, key=lambda p: p.value, reverse=True):
+            queue = self._lane_queues[priority]
+            limit = self.max_concurrent_tasks
+            if priority != TaskPriority.CRITICAL:
+                limit -= self.critical_reserve
+            while (queue and running < limit and
+                   self._lane_running[priority] < self.lane_limits[priority]):
+                entry = queue.popleft()
+                # Skip tasks removed, paused or rescheduled while queued
+                if not self._is_live(entry):
+                    continue
+                
+                task = self.tasks[entry[2]]
+                wait = (datetime.utcnow() - task.next_run).total_seconds()
+                self.dispatch_lag.observe(wait)
+                self.lane_metrics[priority]["queue_wait"].observe(wait)
+                
                 # Create async task for execution
+                self._lane_running[priority] += 1
+                running += 1
                 async_task = asyncio.create_task(self._execute_task(task))
                 self.running_tasks[task.task_id] = async_task
                 self.stats["running_tasks"] += 1
@@ -342,9 +556,12 @@ class TaskScheduler:
         """Main scheduler loop."""
         self.logger.info("Starting Task Scheduler")
         self.is_running = True
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
         
         while self.is_running:
             try:
+                self._wakeup.clear()
                 await self._check_and_execute_tasks()
                 
                 # Clean up completed async tasks
@@ -356,8 +573,13 @@ class TaskScheduler:
                 for task_id in completed_tasks:
                     del self.running_tasks[task_id]
                 
-                # Sleep before next check
-                await asyncio.sleep(1)
+                # Sleep until the next task is due, or until woken by add/resume/completion
+                # (lane-queued tasks are dispatched on the wakeup from a finishing task)
+                delay = self._seconds_until_next()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
                 
             except Exception as e:
                 self.logger.error(f"Error in scheduler loop: {e}")
@@ -367,12 +589,14 @@ class TaskScheduler:
         """Stop the scheduler."""
         self.logger.info("Stopping Task Scheduler")
         self.is_running = False
+        self._wake()
         
         # Cancel all running tasks
         for task_id, async_task in self.running_tasks.items():
             async_task.cancel()
         
         self.running_tasks.clear()
+        self.executor.shutdown(wait=False)
     
     def get_statistics(self) -> Dict[str, Any]:
         """Get scheduler statistics."""
@@ -388,16 +612,26 @@ class TaskScheduler:
                 for priority in TaskPriority
             },
             "running_tasks": list(self.running_tasks.keys()),
+            "dispatch_lag": self.dispatch_lag.snapshot(),
+            "lanes": {
+                priority.name: {
+                    "limit": self.lane_limits[priority],
+                    "running": self._lane_running[priority],
+                    "queued": len(self._lane_queues[priority]),
+                    "queue_wait": self.lane_metrics[priority]["queue_wait"].snapshot(),
+                    "run_time": self.lane_metrics[priority]["run_time"].snapshot()
+                }
+                for priority in TaskPriority
+            },
             "timestamp": datetime.utcnow().isoformat()
         }
     
     def get_upcoming_tasks(self, limit: int = 10) -> List[Dict[str, Any]]:
         """Get upcoming tasks sorted by next run time."""
-        pending_tasks = [task for task in self.tasks.values() 
-                        if task.status == TaskStatus.PENDING and task.next_run]
-        
-        # Sort by next run time
-        pending_tasks.sort(key=lambda t: t.next_run)
+        # Take the earliest live entries (lane-queued tasks are overdue) instead of sorting every task
+        candidates = itertools.chain(self._heap, *self._lane_queues.values())
+        entries = heapq.nsmallest(limit, (entry for entry in candidates if self._is_live(entry)))
+        pending_tasks = [self.tasks[task_id] for _, _, task_id in entries]
         
         # Return limited results
         return [
@@ -408,7 +642,7 @@ class TaskScheduler:
                 "priority": task.priority.value,
                 "tags": task.tags
             }
-            for task in pending_tasks[:limit]
+            for task in pending_tasks
         ]
     
     def export_tasks(self) -> Dict[str, Any]:
@@ -424,7 +658,8 @@ class TaskScheduler:
                     "max_retries": task.max_retries,
                     "parameters": task.parameters,
                     "tags": task.tags,
-                    "metadata": task.metadata
+                    "metadata": task.metadata,
+                    "backend": task.backend.value if task.backend else None
                 }
                 for task_id, task in self.tasks.items()
             },
@@ -456,7 +691,8 @@ class TaskScheduler:
                     timeout=task_data.get("timeout"),
                     max_retries=task_data.get("max_retries", 3),
                     parameters=task_data.get("parameters", {}),
-                    tags=task_data.get("tags", [])
+                    tags=task_data.get("tags", []),
+                    backend=ExecutionBackend(task_data["backend"]) if task_data.get("backend") else None
                 )
                 
                 imported_task_ids.append(new_task_id)
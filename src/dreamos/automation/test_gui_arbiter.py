@@ -0,0 +1,88 @@
+"""
+Test script for the GUI action arbiter.
+
+Tests ordering, deadlines, focus merging and metrics of GuiActionArbiter.
+"""
+
+import threading
+import time
+import unittest
+
+from dreamos.automation.gui_arbiter import (
+    ActionPriority,
+    GuiActionArbiter,
+    GuiActionDeadlineExceeded,
+)
+
+
+class TestGuiActionArbiter(unittest.TestCase):
+    """Test cases for GuiActionArbiter."""
+
+    def setUp(self):
+        """Set up an arbiter that records focus switches and script runs."""
+        self.focused = []
+        self.ran = []
+        self.arbiter = GuiActionArbiter(focus_window=self.focused.append)
+
+    def tearDown(self):
+        """Stop the worker thread."""
+        self.arbiter.shutdown()
+
+    def _block_worker(self):
+        """Occupy the worker until the returned event is set."""
+        release = threading.Event()
+        started = threading.Event()
+
+        def blocker():
+            started.set()
+            release.wait(5)
+
+        self.arbiter.submit("blocker", "Window-0", blocker)
+        started.wait(5)
+        return release
+
+    def _script(self, name):
+        def script():
+            self.ran.append(name)
+            return name
+        return script
+
+    def test_priority_and_window_merging(self):
+        """Higher priority runs first; same-window scripts run back to back."""
+        release = self._block_worker()
+        futures = [
+            self.arbiter.submit("Agent-1", "Window-1", self._script("a1"), ActionPriority.LOW),
+            self.arbiter.submit("Agent-2", "Window-2", self._script("b1")),
+            self.arbiter.submit("Agent-1", "Window-1", self._script("a2")),
+            self.arbiter.submit("Agent-2", "Window-2", self._script("b2")),
+            self.arbiter.submit("Agent-3", "Window-3", self._script("c1"), ActionPriority.HIGH),
+        ]
+        release.set()
+        for future in futures:
+            future.result(timeout=5)
+
+        self.assertEqual(self.ran, ["c1", "b1", "b2", "a2", "a1"])
+        self.assertEqual(self.focused, ["Window-0", "Window-3", "Window-2", "Window-1"])
+        self.assertEqual(self.arbiter.get_metrics()["focus_skips"], 2)
+
+    def test_deadline_and_metrics(self):
+        """A script that cannot start in time fails; metrics are kept per agent."""
+        release = self._block_worker()
+        late = self.arbiter.submit("Agent-1", "Window-1", self._script("late"), deadline=0.01)
+        ok = self.arbiter.submit("Agent-2", "Window-2", self._script("ok"), deadline=5.0)
+        time.sleep(0.05)
+        release.set()
+
+        with self.assertRaises(GuiActionDeadlineExceeded):
+            late.result(timeout=5)
+        self.assertEqual(ok.result(timeout=5), "ok")
+        self.assertEqual(self.ran, ["ok"])
+
+        metrics = self.arbiter.get_metrics()
+        self.assertEqual(metrics["expired"], 1)
+        self.assertGreaterEqual(metrics["agents"]["Agent-2"]["queue_wait"]["max"], 0.05)
+        self.assertEqual(metrics["agents"]["Agent-2"]["execution"]["count"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
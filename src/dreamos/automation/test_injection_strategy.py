@@ -0,0 +1,66 @@
+"""
+Test script for the prompt injection strategies.
+
+Runs the injection sequence against the headless RecordingBackend.
+"""
+
+import unittest
+
+from dreamos.automation.injection_strategy import (
+    InjectionError,
+    InjectionStrategy,
+    RecordingBackend,
+)
+
+
+class TestInjectionStrategy(unittest.TestCase):
+    """Test cases for InjectionStrategy."""
+
+    def test_long_prompt_is_pasted_and_clipboard_restored(self):
+        """Prompts over the threshold are pasted and the user's clipboard survives."""
+        backend = RecordingBackend()
+        backend.clipboard = "user data"
+        strategy = InjectionStrategy(backend, paste_threshold=100)
+        prompt = "x" * 5000
+
+        result = strategy.inject(10, 20, prompt, "Cursor - Agent 1")
+
+        self.assertEqual(result.mode, "paste")
+        self.assertEqual(backend.submitted, [prompt])
+        self.assertEqual(backend.clipboard, "user data")
+        self.assertNotIn("write", [name for _, name, _ in backend.actions])
+        self.assertLess(result.elapsed, 0.2)
+
+    def test_short_prompt_is_typed(self):
+        """Prompts under the threshold are typed."""
+        backend = RecordingBackend()
+        strategy = InjectionStrategy(backend, paste_threshold=100)
+
+        result = strategy.inject(10, 20, "hello", "Cursor - Agent 1")
+
+        self.assertEqual(result.mode, "type")
+        self.assertEqual(backend.submitted, ["hello"])
+        self.assertEqual(result.waited, 0.0)
+
+    def test_focus_wait_returns_when_window_is_ready(self):
+        """The focus wait ends shortly after activation instead of after a fixed delay."""
+        backend = RecordingBackend(activation_delay=0.15, window_active=False)
+        strategy = InjectionStrategy(backend, ready_timeout=2.0, max_poll_interval=0.02)
+
+        result = strategy.inject(10, 20, "hello", "Cursor - Agent 1")
+
+        self.assertGreaterEqual(result.waited, 0.15)
+        self.assertLess(result.waited, 0.2)
+
+    def test_focus_timeout_raises(self):
+        """A window that never becomes active fails the injection."""
+        backend = RecordingBackend(activation_delay=10.0, window_active=False)
+        strategy = InjectionStrategy(backend, ready_timeout=0.5)
+
+        with self.assertRaises(InjectionError):
+            strategy.inject(10, 20, "hello", "Cursor - Agent 1")
+        self.assertEqual(backend.submitted, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,218 @@
+"""
+Test script for the TaskScheduler.
+
+Tests next-run calculation, priority lanes and dispatch of TaskScheduler with
+a croniter stand-in whose schedule is a period in seconds.
+"""
+
+import asyncio
+import sys
+import types
+import unittest
+from datetime import datetime, timedelta
+from unittest import mock
+
+
+class _StubCroniter:
+    """croniter stand-in: the schedule is a period in seconds, runs fall on its multiples."""
+
+    EPOCH = datetime(2000, 1, 1)
+
+    def __init__(self, schedule, start_time=None):
+        self.period = timedelta(seconds=float(schedule))
+        start_time = start_time or datetime.utcnow()
+        self.current = self.EPOCH + self.period * ((start_time - self.EPOCH) // self.period)
+
+    def get_next(self, ret_type=None):
+        self.current += self.period
+        return self.current
+
+    def get_current(self, ret_type=None):
+        return self.current
+
+
+try:
+    import croniter  # noqa: F401
+except ImportError:
+    sys.modules["croniter"] = types.SimpleNamespace(croniter=_StubCroniter)
+
+from dreamos.automation import task_scheduler
+from dreamos.automation.task_scheduler import TaskPriority, TaskScheduler, TaskStatus
+
+HOUR = 3600
+
+
+async def _noop():
+    return None
+
+
+class _Gate:
+    """Async task function that blocks until released and counts its runs."""
+
+    def __init__(self):
+        self.release = asyncio.Event()
+        self.runs = 0
+
+        async def function():
+            self.runs += 1
+            await self.release.wait()
+
+        self.function = function
+
+
+class TestTaskScheduler(unittest.TestCase):
+    """Test cases for TaskScheduler."""
+
+    def setUp(self):
+        """Use the croniter stand-in and a fresh scheduler."""
+        patcher = mock.patch.object(task_scheduler, "croniter", _StubCroniter)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.scheduler = TaskScheduler()
+
+    def test_pause_resume_keeps_next_run(self):
+        """Test that pausing and resuming never skips a run."""
+        task_id = self.scheduler.add_task("hourly", _noop, str(HOUR))
+        task = self.scheduler.get_task(task_id)
+        first = task.next_run
+
+        for _ in range(3):
+            self.assertTrue(self.scheduler.pause_task(task_id))
+            self.assertTrue(self.scheduler.resume_task(task_id))
+            self.assertEqual(task.next_run, first)
+        self.assertEqual(self.scheduler.get_upcoming_tasks()[0]["next_run"], first.isoformat())
+
+    def test_next_run_after_run_advances_once(self):
+        """Test that a finished run moves to the following slot, skipping missed ones."""
+        task_id = self.scheduler.add_task("hourly", _noop, str(HOUR))
+        task = self.scheduler.get_task(task_id)
+        first = task.next_run
+
+        task.last_run = first + timedelta(seconds=1)
+        second = self.scheduler._calculate_next_run(task, after_run=True)
+        self.assertEqual(second, first + timedelta(seconds=HOUR))
+
+        # The run after that started three periods late
+        task.last_run = second + timedelta(seconds=3 * HOUR + 1)
+        self.assertEqual(self.scheduler._calculate_next_run(task, after_run=True),
+                         second + timedelta(seconds=4 * HOUR))
+
+        # Resuming afterwards recomputes from the last run without skipping
+        self.scheduler.pause_task(task_id)
+        self.scheduler.resume_task(task_id)
+        self.assertEqual(task.next_run, second + timedelta(seconds=4 * HOUR))
+        self.assertEqual(task.status, TaskStatus.PENDING)
+
+    def _add_due(self, scheduler, name, priority):
+        """Add an hourly task gated by its own _Gate and make it due now."""
+        gate = _Gate()
+        task_id = scheduler.add_task(name, gate.function, str(HOUR), priority=priority, max_retries=0)
+        task = scheduler.get_task(task_id)
+        task.next_run = datetime.utcnow() - timedelta(seconds=1)
+        scheduler._schedule(task)
+        return task_id, gate
+
+    @staticmethod
+    async def _finish(scheduler, *task_gates):
+        """Release the gates of running tasks and wait for those tasks to complete."""
+        running = [scheduler.running_tasks[task_id] for task_id, _ in task_gates]
+        for _, gate in task_gates:
+            gate.release.set()
+        await asyncio.gather(*running)
+
+    def test_lane_limit_queues_and_other_lanes_continue(self):
+        """Test that a full lane queues its tasks without blocking other lanes."""
+        async def scenario():
+            scheduler = TaskScheduler(max_concurrent_tasks=10, lane_limits={TaskPriority.LOW: 1})
+            low = [self._add_due(scheduler, f"low-{i}", TaskPriority.LOW) for i in range(3)]
+            high = self._add_due(scheduler, "high", TaskPriority.HIGH)
+
+            await scheduler._check_and_execute_tasks()
+            lanes = scheduler.get_statistics()["lanes"]
+            self.assertEqual((lanes["LOW"]["running"], lanes["LOW"]["queued"]), (1, 2))
+            self.assertEqual(lanes["HIGH"]["running"], 1)
+            self.assertEqual(set(scheduler.running_tasks), {low[0][0], high[0]})
+
+            # Each finished LOW task frees the lane for the next queued one, in FIFO order
+            for finished, queued in zip(low, low[1:]):
+                await self._finish(scheduler, finished)
+                await scheduler._check_and_execute_tasks()
+                self.assertEqual(set(scheduler.running_tasks), {queued[0], high[0]})
+
+            await self._finish(scheduler, low[-1], high)
+            self.assertEqual(scheduler.stats["completed_tasks"], 4)
+            self.assertEqual([gate.runs for _, gate in low + [high]], [1, 1, 1, 1])
+            self.assertEqual(scheduler.lane_metrics[TaskPriority.LOW]["queue_wait"].count, 3)
+            self.assertEqual(sum(scheduler._lane_running.values()), 0)
+
+        asyncio.run(scenario())
+
+    def test_max_concurrent_tasks_limits_all_lanes(self):
+        """Test that max_concurrent_tasks caps running tasks across lanes, highest priority first."""
+        async def scenario():
+            # One of the three slots is reserved for CRITICAL tasks
+            scheduler = TaskScheduler(max_concurrent_tasks=3)
+            high = [self._add_due(scheduler, f"high-{i}", TaskPriority.HIGH) for i in range(3)]
+            critical = self._add_due(scheduler, "critical", TaskPriority.CRITICAL)
+
+            await scheduler._check_and_execute_tasks()
+            self.assertEqual(set(scheduler.running_tasks), {critical[0], high[0][0]})
+            self.assertEqual(scheduler.get_statistics()["lanes"]["HIGH"]["queued"], 2)
+
+            await self._finish(scheduler, critical, high[0])
+            await scheduler._check_and_execute_tasks()
+            self.assertEqual(set(scheduler.running_tasks), {high[1][0], high[2][0]})
+            await self._finish(scheduler, high[1], high[2])
+
+        asyncio.run(scenario())
+
+    def test_critical_starts_when_low_saturates_scheduler(self):
+        """Test that LOW tasks cannot take the slots reserved for CRITICAL ones."""
+        async def scenario():
+            scheduler = TaskScheduler(max_concurrent_tasks=4)
+            low = [self._add_due(scheduler, f"low-{i}", TaskPriority.LOW) for i in range(6)]
+            await scheduler._check_and_execute_tasks()
+            self.assertEqual(set(scheduler.running_tasks), {task_id for task_id, _ in low[:3]})
+            self.assertEqual(scheduler.get_statistics()["lanes"]["LOW"]["queued"], 3)
+
+            critical = self._add_due(scheduler, "critical", TaskPriority.CRITICAL)
+            await scheduler._check_and_execute_tasks()
+            self.assertIn(critical[0], scheduler.running_tasks)
+            self.assertEqual(len(scheduler.running_tasks), 4)
+
+            await self._finish(scheduler, critical, *low[:3])
+            await scheduler._check_and_execute_tasks()
+            await self._finish(scheduler, *low[3:])
+            self.assertEqual([gate.runs for _, gate in low], [1] * 6)
+
+        asyncio.run(scenario())
+
+    def test_duplicate_heap_entries_dispatch_once(self):
+        """Test that a run pushed onto the heap several times is dispatched once."""
+        async def scenario():
+            scheduler = TaskScheduler(lane_limits={TaskPriority.NORMAL: 1})
+            task_id, gate = self._add_due(scheduler, "normal", TaskPriority.NORMAL)
+            task = scheduler.get_task(task_id)
+            scheduler._schedule(task)
+            scheduler._schedule(task)
+
+            await scheduler._check_and_execute_tasks()
+            await asyncio.sleep(0)
+            await scheduler._check_and_execute_tasks()
+            await asyncio.sleep(0)
+            self.assertEqual(gate.runs, 1)
+            self.assertEqual(scheduler._lane_running[TaskPriority.NORMAL], 1)
+
+            # The queued duplicates are stale once the run finished and was rescheduled
+            await self._finish(scheduler, (task_id, gate))
+            self.assertEqual(task.status, TaskStatus.PENDING)
+            self.assertGreater(task.next_run, datetime.utcnow())
+            await scheduler._check_and_execute_tasks()
+            self.assertEqual(gate.runs, 1)
+            self.assertEqual(scheduler.running_tasks, {})
+            self.assertEqual(scheduler.stats["pending_tasks"], 1)
+
+        asyncio.run(scenario())
+
+if __name__ == "__main__":
+    unittest.main()
@@ -9,9 +9,13 @@ import datetime
 import json
 import logging
 import sys
+from contextlib import contextmanager
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
+from .task_board_store import DEFAULT_COMPACT_THRESHOLD, TaskBoardStore
+from .task_search_index import TaskSearchIndex
+
 # --- Configuration ---
 CENTRAL_TASK_DIR = "runtime/central_tasks"
 CENTRAL_TASK_FILE = "task_board.json"
@@ -54,15 +58,25 @@ class ProjectBoardManager:
     - Loading and saving tasks from/to the central task board
     - Adding, updating, claiming, and completing tasks
     - Filtering and searching tasks
+
+    Tasks are served from an indexed TaskBoardStore; mutations are appended to a
+    change log next to the task board file and periodically compacted into it.
+    search_tasks uses a BM25-ranked TaskSearchIndex kept in sync with the store.
     """
 
-    def __init__(self, task_board_path: Optional[Path] = None):
+    def __init__(
+        self,
+        task_board_path: Optional[Path] = None,
+        compact_threshold: int = DEFAULT_COMPACT_THRESHOLD,
+    ):
         """
         Initialize the ProjectBoardManager.
 
         Args:
             task_board_path: Optional path to the task board file. If not provided,
                              the default path will be used.
+            compact_threshold: Number of change log records after which the log is
+                               folded into the task board file.
         """
         self.task_board_path = (
             task_board_path or Path(CENTRAL_TASK_DIR) / CENTRAL_TASK_FILE
@@ -81,6 +95,48 @@ class ProjectBoardManager:
                 logger.error(f"Failed to create task board: {e}")
                 raise FileOperationError(f"Failed to create task board: {e}")
 
+        self.store = TaskBoardStore(self.task_board_path, compact_threshold=compact_threshold)
+        self.search_index = TaskSearchIndex(
+            self.task_board_path.with_name(self.task_board_path.name + ".idx")
+        )
+        self.store.add_listener(self.search_index)
+
+    @contextmanager
+    def _storage_errors(self):
+        """Translate storage failures into FileOperationError."""
+        try:
+            yield
+        except json.JSONDecodeError as e:
+            logger.error(f"Failed to parse task board: {e}")
+            raise FileOperationError(f"Failed to parse task board: {e}")
+        except OSError as e:
+            logger.error(f"Failed to access task board: {e}")
+            raise FileOperationError(f"Failed to access task board: {e}")
+
+    def _get_for_update(self, task_id: str) -> Dict[str, Any]:
+        """
+        Get a copy of a task that can be modified and written back with store.put.
+
+        Raises:
+            TaskNotFoundError: If the task cannot be found.
+        """
+        task = self.store.get(task_id)
+        if task is None:
+            raise TaskNotFoundError(f"Task ID '{task_id}' not found.")
+        history = task.get("history")
+        task["history"] = list(history) if isinstance(history, list) else []
+        return task
+
+    def compact(self) -> None:
+        """
+        Fold the change log into the task board file.
+
+        Raises:
+            FileOperationError: If the task board cannot be written.
+        """
+        with self._storage_errors():
+            self.store.compact()
+
     def _load_tasks(self) -> List[Dict[str, Any]]:
         """
         Load tasks from the task board file.
@@ -91,27 +147,8 @@ class ProjectBoardManager:
         Raises:
             FileOperationError: If the file cannot be read or parsed.
         """
-        try:
-            if not self.task_board_path.exists():
-                logger.warning(f"Task board file not found: {self.task_board_path}")
-                return []
-
-            with open(self.task_board_path, "r", encoding="utf-8") as f:
-                tasks = json.load(f)
-
-            if not isinstance(tasks, list):
-                logger.error(
-                    f"Invalid task board format: expected list, got {type(tasks)}"
-                )
-                return []
-
-            return tasks
-        except json.JSONDecodeError as e:
-            logger.error(f"Failed to parse task board: {e}")
-            raise FileOperationError(f"Failed to parse task board: {e}")
-        except Exception as e:
-            logger.error(f"Failed to load task board: {e}")
-            raise FileOperationError(f"Failed to load task board: {e}")
+        with self._storage_errors():
+            return self.store.all()
 
     def _save_tasks(self, tasks: List[Dict[str, Any]]) -> bool:
         """
@@ -126,18 +163,9 @@ class ProjectBoardManager:
         Raises:
             FileOperationError: If the file cannot be written.
         """
-        try:
-            # Ensure the directory exists
-            self.task_board_path.parent.mkdir(parents=True, exist_ok=True)
-
-            # Write tasks to file
-            with open(self.task_board_path, "w", encoding="utf-8") as f:
-                json.dump(tasks, f, indent=2)
-
-            return True
-        except Exception as e:
-            logger.error(f"Failed to save task board: {e}")
-            raise FileOperationError(f"Failed to save task board: {e}")
+        with self._storage_errors():
+            self.store.replace_all(tasks)
+        return True
 
     def get_task(self, task_id: str) -> Dict[str, Any]:
         """
@@ -152,13 +180,12 @@ class ProjectBoardManager:
         Raises:
             TaskNotFoundError: If the task cannot be found.
         """
-        tasks = self._load_tasks()
+        with self._storage_errors():
+            task = self.store.get(task_id)
 
-        for task in tasks:
-            if task.get("task_id") == task_id:
-                return task
-
-        raise TaskNotFoundError(f"Task ID '{task_id}' not found.")
+        if task is None:
+            raise TaskNotFoundError(f"Task ID '{task_id}' not found.")
+        return task
 
     def add_task(self, task_data: Dict[str, Any]) -> str:
         """
@@ -180,11 +207,10 @@ class ProjectBoardManager:
             if field not in task_data:
                 raise InvalidTaskDataError(f"Missing required field: {field}")
 
-        # Load existing tasks
-        tasks = self._load_tasks()
-
         # Check for duplicate task_id
-        if any(task.get("task_id") == task_data["task_id"] for task in tasks):
+        with self._storage_errors():
+            exists = task_data["task_id"] in self.store
+        if exists:
             raise InvalidTaskDataError(
                 f"Task ID '{task_data['task_id']}' already exists."
             )
@@ -211,10 +237,8 @@ class ProjectBoardManager:
             )
 
         # Add task to board
-        tasks.append(task_data)
-
-        # Save updated task board
-        self._save_tasks(tasks)
+        with self._storage_errors():
+            self.store.put(task_data)
 
         return task_data["task_id"]
 
@@ -236,45 +260,36 @@ class ProjectBoardManager:
             TaskNotFoundError: If the task cannot be found.
             FileOperationError: If the task board cannot be updated.
         """
-        # Load existing tasks
-        tasks = self._load_tasks()
-
-        # Find the task to update
-        for i, task in enumerate(tasks):
-            if task.get("task_id") == task_id:
-                # Update task fields
-                for key, value in updates.items():
-                    # Don't update history directly
-                    if key != "history":
-                        task[key] = value
-
-                # Add history entry for the update
-                if "history" not in task or not isinstance(task["history"], list):
-                    task["history"] = []
-
-                # Add update history entry
-                task["history"].append(
-                    {
-                        "timestamp": datetime.datetime.now(
-                            datetime.timezone.utc
-                        ).isoformat(),
-                        "agent": agent_id or "SYSTEM",
-                        "action": "UPDATED",
-                        "details": f"Task updated: {', '.join(updates.keys())}",
-                    }
-                )
+        with self._storage_errors():
+            task = self._get_for_update(task_id)
 
-                # Update timestamp
-                task["timestamp_updated"] = datetime.datetime.now(
-                    datetime.timezone.utc
-                ).isoformat()
+            # Update task fields
+            for key, value in updates.items():
+                # Don't update history directly
+                if key != "history":
+                    task[key] = value
 
-                # Save updated task board
-                self._save_tasks(tasks)
+            # Add update history entry
+            task["history"].append(
+                {
+                    "timestamp": datetime.datetime.now(
+                        datetime.timezone.utc
+                    ).isoformat(),
+                    "agent": agent_id or "SYSTEM",
+                    "action": "UPDATED",
+                    "details": f"Task updated: {', '.join(updates.keys())}",
+                }
+            )
 
-                return True
+            # Update timestamp
+            task["timestamp_updated"] = datetime.datetime.now(
+                datetime.timezone.utc
+            ).isoformat()
 
-        raise TaskNotFoundError(f"Task ID '{task_id}' not found.")
+            # Save updated task
+            self.store.put(task)
+
+        return True
 
     def claim_task(self, task_id: str, agent_id: str) -> bool:
         """
@@ -291,42 +306,34 @@ class ProjectBoardManager:
             TaskNotFoundError: If the task cannot be found.
             FileOperationError: If the task board cannot be updated.
         """
-        # Load existing tasks
-        tasks = self._load_tasks()
-
-        # Find the task to claim
-        for task in tasks:
-            if task.get("task_id") == task_id:
-                # Update task status and assigned agent
-                task["status"] = "WORKING"
-                task["assigned_agent"] = agent_id
-                task["claimed_by"] = agent_id
-                task["timestamp_claimed_utc"] = datetime.datetime.now(
-                    datetime.timezone.utc
-                ).isoformat()
-                task["timestamp_updated"] = datetime.datetime.now(
-                    datetime.timezone.utc
-                ).isoformat()
-
-                # Add history entry
-                if "history" not in task or not isinstance(task["history"], list):
-                    task["history"] = []
-
-                task["history"].append(
-                    {
-                        "timestamp": task["timestamp_claimed_utc"],
-                        "agent": agent_id,
-                        "action": "CLAIMED",
-                        "details": f"Task claimed by {agent_id}",
-                    }
-                )
+        with self._storage_errors():
+            task = self._get_for_update(task_id)
+
+            # Update task status and assigned agent
+            task["status"] = "WORKING"
+            task["assigned_agent"] = agent_id
+            task["claimed_by"] = agent_id
+            task["timestamp_claimed_utc"] = datetime.datetime.now(
+                datetime.timezone.utc
+            ).isoformat()
+            task["timestamp_updated"] = datetime.datetime.now(
+                datetime.timezone.utc
+            ).isoformat()
 
-                # Save updated task board
-                self._save_tasks(tasks)
+            # Add history entry
+            task["history"].append(
+                {
+                    "timestamp": task["timestamp_claimed_utc"],
+                    "agent": agent_id,
+                    "action": "CLAIMED",
+                    "details": f"Task claimed by {agent_id}",
+                }
+            )
 
-                return True
+            # Save updated task
+            self.store.put(task)
 
-        raise TaskNotFoundError(f"Task ID '{task_id}' not found.")
+        return True
 
     def complete_task(
         self, task_id: str, agent_id: str, result_summary: Optional[str] = None
@@ -346,51 +353,44 @@ class ProjectBoardManager:
             TaskNotFoundError: If the task cannot be found.
             FileOperationError: If the task board cannot be updated.
         """
-        # Load existing tasks
-        tasks = self._load_tasks()
-
-        # Find the task to complete
-        for task in tasks:
-            if task.get("task_id") == task_id:
-                # Update task status
-                task["status"] = "COMPLETED"
-                task["timestamp_completed_utc"] = datetime.datetime.now(
-                    datetime.timezone.utc
-                ).isoformat()
-                task["timestamp_updated"] = datetime.datetime.now(
-                    datetime.timezone.utc
-                ).isoformat()
-
-                # Add result summary if provided
-                if result_summary:
-                    task["result_summary"] = result_summary
-
-                # Add history entry
-                if "history" not in task or not isinstance(task["history"], list):
-                    task["history"] = []
-
-                task["history"].append(
-                    {
-                        "timestamp": task["timestamp_completed_utc"],
-                        "agent": agent_id,
-                        "action": "COMPLETED",
-                        "details": f"Task completed by {agent_id}"
-                        + (f": {result_summary}" if result_summary else ""),
-                    }
-                )
+        with self._storage_errors():
+            task = self._get_for_update(task_id)
 
-                # Save updated task board
-                self._save_tasks(tasks)
+            # Update task status
+            task["status"] = "COMPLETED"
+            task["timestamp_completed_utc"] = datetime.datetime.now(
+                datetime.timezone.utc
+            ).isoformat()
+            task["timestamp_updated"] = datetime.datetime.now(
+                datetime.timezone.utc
+            ).isoformat()
+
+            # Add result summary if provided
+            if result_summary:
+                task["result_summary"] = result_summary
 
-                return True
+            # Add history entry
+            task["history"].append(
+                {
+                    "timestamp": task["timestamp_completed_utc"],
+                    "agent": agent_id,
+                    "action": "COMPLETED",
+                    "details": f"Task completed by {agent_id}"
+                    + (f": {result_summary}" if result_summary else ""),
+                }
+            )
 
-        raise TaskNotFoundError(f"Task ID '{task_id}' not found.")
+            # Save updated task
+            self.store.put(task)
+
+        return True
 
     def list_tasks(
         self,
         status: Optional[str] = None,
         agent_id: Optional[str] = None,
         priority: Optional[str] = None,
+        limit: Optional[int] = None,
     ) -> List[Dict[str, Any]]:
         """
         List tasks with optional filtering.
@@ -399,39 +399,15 @@ class ProjectBoardManager:
             status: Optional status to filter by.
             agent_id: Optional agent ID to filter by.
             priority: Optional priority to filter by.
+            limit: Optional maximum number of tasks to return.
 
         Returns:
-            List of task dictionaries matching the filters.
-        """
-        tasks = self._load_tasks()
-        filtered_tasks = tasks
-
-        # Apply status filter
-        if status:
-            filtered_tasks = [
-                t
-                for t in filtered_tasks
-                if t.get("status", "").upper() == status.upper()
-            ]
-
-        # Apply agent filter
-        if agent_id:
-            filtered_tasks = [
-                t
-                for t in filtered_tasks
-                if t.get("assigned_agent") == agent_id
-                or t.get("claimed_by") == agent_id
-            ]
-
-        # Apply priority filter
-        if priority:
-            filtered_tasks = [
-                t
-                for t in filtered_tasks
-                if t.get("priority", "").upper() == priority.upper()
-            ]
-
-        return filtered_tasks
+            List of task dictionaries matching the filters, in board order.
+        """
+        with self._storage_errors():
+            return self.store.query(
+                status=status, agent_id=agent_id, priority=priority, limit=limit
+            )
 
     def list_pending_tasks(self) -> List[Dict[str, Any]]:
         """
@@ -471,43 +447,48 @@ class ProjectBoardManager:
         return self.list_tasks(status="COMPLETED", agent_id=agent_id)
 
     def search_tasks(
-        self, query: str, case_sensitive: bool = False
+        self, query: str, case_sensitive: bool = False, limit: Optional[int] = None
     ) -> List[Dict[str, Any]]:
         """
-        Search tasks for a query string in name, description, or notes.
+        Search tasks by name, description, notes and result summary.
+
+        Every word of the query must occur in the task, either as a whole word, as the
+        start of a word, or inside a word. Results are ranked by relevance (BM25).
+
+        Matching inside a word needs query words of at least 3 characters; shorter
+        words only match whole words and word starts. An empty query returns every
+        task in board order, while a query without any word (only punctuation)
+        matches nothing.
 
         Args:
             query: The query string to search for.
-            case_sensitive: Whether the search should be case-sensitive.
+            case_sensitive: Additionally require the query to occur verbatim
+                (case-sensitive) in one of the fields.
+            limit: Optional maximum number of tasks to return.
 
         Returns:
-            List of task dictionaries matching the query.
-        """
-        tasks = self._load_tasks()
-        results = []
-
-        for task in tasks:
-            # Fields to search in
-            searchable_fields = [
-                task.get("name", ""),
-                task.get("description", ""),
-                task.get("notes", ""),
-                task.get("result_summary", ""),
-            ]
-
-            # Convert to lowercase if case-insensitive search
-            if not case_sensitive:
-                query = query.lower()
-                searchable_fields = [
-                    field.lower() if isinstance(field, str) else ""
-                    for field in searchable_fields
-                ]
-
-            # Check if query is in any of the fields
-            if any(query in field for field in searchable_fields):
-                results.append(task)
-
-        return results
+            List of task dictionaries matching the query, best match first.
+        """
+        if not query.strip():
+            with self._storage_errors():
+                return self.store.all()[:limit]
+
+        with self._storage_errors():
+            self.store.refresh()
+            hits = self.search_index.search(query, limit=None if case_sensitive else limit)
+            tasks = self.store.get_many(task_id for task_id, _ in hits)
+
+        if case_sensitive:
+            tasks = [
+                task
+                for task in tasks
+                if any(
+                    isinstance(task.get(field), str) and query in task[field]
+                    for field in ("name", "description", "notes", "result_summary")
+                )
+            ][:limit]
+
+        return tasks
 
     def delete_task(self, task_id: str, agent_id: Optional[str] = None) -> bool:
         """
@@ -524,23 +505,15 @@ class ProjectBoardManager:
             TaskNotFoundError: If the task cannot be found.
             FileOperationError: If the task board cannot be updated.
         """
-        # Load existing tasks
-        tasks = self._load_tasks()
+        with self._storage_errors():
+            deleted = self.store.delete(task_id)
 
-        # Find the task to delete
-        for i, task in enumerate(tasks):
-            if task.get("task_id") == task_id:
-                # Remove the task
-                tasks.pop(i)
+        if not deleted:
+            raise TaskNotFoundError(f"Task ID '{task_id}' not found.")
 
-                # Save updated task board
-                self._save_tasks(tasks)
+        logger.info(f"Task {task_id} deleted by {agent_id or 'SYSTEM'}")
 
-                logger.info(f"Task {task_id} deleted by {agent_id or 'SYSTEM'}")
-
-                return True
-
-        raise TaskNotFoundError(f"Task ID '{task_id}' not found.")
+        return True
 
     def generate_task_id(self, prefix: str = "TASK") -> str:
         """
@@ -607,6 +580,7 @@ def main():
     list_parser.add_argument("--status", help="Filter by status")
     list_parser.add_argument("--agent", help="Filter by agent ID")
     list_parser.add_argument("--priority", help="Filter by priority")
+    list_parser.add_argument("--limit", type=int, help="Maximum number of tasks")
 
     # Search tasks command
     search_parser = subparsers.add_parser("search", help="Search tasks")
@@ -614,12 +588,16 @@ def main():
     search_parser.add_argument(
         "--case-sensitive", action="store_true", help="Case-sensitive search"
     )
+    search_parser.add_argument("--limit", type=int, help="Maximum number of tasks")
 
     # Delete task command
     delete_parser = subparsers.add_parser("delete", help="Delete a task")
     delete_parser.add_argument("task_id", help="Task ID to delete")
     delete_parser.add_argument("--agent-id", help="Agent ID deleting the task")
 
+    # Compact command
+    subparsers.add_parser("compact", help="Fold the change log into the task board")
+
     args = parser.parse_args()
 
     # Initialize ProjectBoardManager
@@ -682,17 +660,21 @@ def main():
             print(json.dumps(task, indent=2))
 
         elif args.command == "list":
-            tasks = pbm.list_tasks(args.status, args.agent, args.priority)
+            tasks = pbm.list_tasks(args.status, args.agent, args.priority, args.limit)
             print(json.dumps(tasks, indent=2))
 
         elif args.command == "search":
-            tasks = pbm.search_tasks(args.query, args.case_sensitive)
+            tasks = pbm.search_tasks(args.query, args.case_sensitive, args.limit)
             print(json.dumps(tasks, indent=2))
 
         elif args.command == "delete":
             pbm.delete_task(args.task_id, args.agent_id)
             print(f"Task {args.task_id} deleted")
 
+        elif args.command == "compact":
+            pbm.compact()
+            print(f"Task board compacted: {pbm.task_board_path}")
+
         else:
             parser.print_help()
 
@@ -0,0 +1,375 @@
+"""
+TaskBoardStore - Indexed storage engine for the central task board.
+
+The board is kept in memory with a primary index on task_id and secondary indexes on
+status, assigned agent and priority. On disk it consists of:
+
+- the snapshot (task_board.json): a JSON list of tasks, readable by any tool
+- the change log (task_board.json.log): one JSON record per mutation, appended
+
+Mutations only append to the change log. Once the log holds compact_threshold records
+the snapshot is rewritten and the log truncated. Replaying the log is idempotent, so a
+crash between the two steps is harmless.
+
+Before every operation the store checks the snapshot's mtime/size/inode (its
+generation) and the log's size. Another process compacting the board triggers a full
+reload; another process appending to the log is picked up by replaying the new tail.
+
+Derived structures (such as the search index) register as listeners and are told about
+every change, whether made in this process or replayed from the log:
+
+- board_reloaded(tasks, generation): the board was (re)loaded from a snapshot
+- task_changed(task_id, old_task, new_task): a task was added, replaced or deleted
+- snapshot_written(generation): the snapshot was rewritten and the log truncated
+"""
+
+import itertools
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_COMPACT_THRESHOLD = 1000
+
+
+def _norm(value: Any) -> Optional[str]:
+    """Index key for case-insensitive fields (status, priority)."""
+    return value.upper() if isinstance(value, str) else None
+
+
+class TaskBoardStore:
+    """
+    In-memory, indexed view of a task board file with an append-only change log.
+
+    Returned task dictionaries are shallow copies: replacing top-level keys is safe,
+    but nested values (e.g. history) must not be mutated in place.
+    """
+
+    def __init__(self, path: Path, compact_threshold: int = DEFAULT_COMPACT_THRESHOLD):
+        """
+        Initialize the store. The board is loaded lazily on first access.
+
+        Args:
+            path: Path of the snapshot file; the change log lives next to it.
+            compact_threshold: Number of log records that triggers compaction.
+        """
+        self.path = Path(path)
+        self.log_path = self.path.with_name(self.path.name + ".log")
+        self.compact_threshold = compact_threshold
+
+        self._lock = threading.RLock()
+        self._tasks: Dict[str, Dict[str, Any]] = {}
+        self._order: Dict[str, int] = {}
+        self._next_order = 0
+        self._by_status: Dict[Optional[str], Set[str]] = {}
+        self._by_agent: Dict[str, Set[str]] = {}
+        self._by_priority: Dict[Optional[str], Set[str]] = {}
+
+        self._generation: Optional[Tuple[int, int, int]] = None
+        self._log_offset = 0
+        self._log_records = 0
+
+        self._listeners: List[Any] = []
+        self._notify = True
+
+    def add_listener(self, listener: Any) -> None:
+        """Register an object implementing the listener methods described above."""
+        with self._lock:
+            self._listeners.append(listener)
+            listener.board_reloaded(self._tasks.values(), None)
+
+    # --- Indexes ---
+
+    @staticmethod
+    def _agents_of(task: Dict[str, Any]) -> Set[str]:
+        return {a for a in (task.get("assigned_agent"), task.get("claimed_by")) if a}
+
+    def _index(self, task: Dict[str, Any]) -> None:
+        task_id = task["task_id"]
+        self._by_status.setdefault(_norm(task.get("status")), set()).add(task_id)
+        self._by_priority.setdefault(_norm(task.get("priority")), set()).add(task_id)
+        for agent in self._agents_of(task):
+            self._by_agent.setdefault(agent, set()).add(task_id)
+
+    def _unindex(self, task: Dict[str, Any]) -> None:
+        task_id = task["task_id"]
+        for index, key in ((self._by_status, _norm(task.get("status"))),
+                           (self._by_priority, _norm(task.get("priority")))):
+            ids = index.get(key)
+            if ids is not None:
+                ids.discard(task_id)
+                if not ids:
+                    del index[key]
+        for agent in self._agents_of(task):
+            ids = self._by_agent.get(agent)
+            if ids is not None:
+                ids.discard(task_id)
+                if not ids:
+                    del self._by_agent[agent]
+
+    def _apply_put(self, task: Dict[str, Any]) -> None:
+        task_id = task["task_id"]
+        old = self._tasks.get(task_id)
+        if old is not None:
+            self._unindex(old)
+        else:
+            self._order[task_id] = self._next_order
+            self._next_order += 1
+        self._tasks[task_id] = task
+        self._index(task)
+        if self._notify:
+            for listener in self._listeners:
+                listener.task_changed(task_id, old, task)
+
+    def _apply_delete(self, task_id: str) -> None:
+        old = self._tasks.pop(task_id, None)
+        if old is None:
+            return
+        self._unindex(old)
+        del self._order[task_id]
+        if self._notify:
+            for listener in self._listeners:
+                listener.task_changed(task_id, old, None)
+
+    def _clear(self) -> None:
+        self._tasks = {}
+        self._order = {}
+        self._next_order = 0
+        self._by_status = {}
+        self._by_agent = {}
+        self._by_priority = {}
+
+    def _bulk_load(self, tasks: Iterable[Dict[str, Any]], generation: Optional[Tuple[int, int, int]]) -> None:
+        """
+        Replace the board with tasks; listeners get one board_reloaded call.
+
+        Args:
+            tasks: The new board content.
+            generation: Generation of the snapshot the tasks were read from, or None if
+                they do not come from the current snapshot.
+        """
+        self._clear()
+        self._notify = False
+        try:
+            for task in tasks:
+                if isinstance(task, dict) and "task_id" in task:
+                    self._apply_put(task)
+        finally:
+            self._notify = True
+        for listener in self._listeners:
+            listener.board_reloaded(self._tasks.values(), generation)
+
+    # --- Persistence ---
+
+    def _stat_generation(self) -> Optional[Tuple[int, int, int]]:
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+    def _log_size(self) -> int:
+        try:
+            return os.path.getsize(self.log_path)
+        except FileNotFoundError:
+            return 0
+
+    def _reload(self) -> None:
+        """Load the snapshot and replay the whole change log."""
+        generation = self._stat_generation()
+        tasks = []
+        if generation is not None:
+            with open(self.path, "r", encoding="utf-8") as f:
+                tasks = json.load(f)
+            if not isinstance(tasks, list):
+                logger.error(f"Invalid task board format: expected list, got {type(tasks)}")
+                tasks = []
+        self._generation = generation
+        self._bulk_load(tasks, generation)
+        self._log_offset = 0
+        self._log_records = 0
+        self._replay_log()
+
+    def _replay_log(self) -> None:
+        """Apply log records written since the last replay."""
+        try:
+            with open(self.log_path, "rb") as f:
+                f.seek(self._log_offset)
+                data = f.read()
+        except FileNotFoundError:
+            return
+
+        # Only consume complete lines; a writer may be mid-append
+        end = data.rfind(b"\n") + 1
+        for line in data[:end].splitlines():
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                logger.warning(f"Skipping corrupt task board log record in {self.log_path}")
+                continue
+            if record.get("op") == "put":
+                self._apply_put(record["task"])
+            elif record.get("op") == "delete":
+                self._apply_delete(record["task_id"])
+            self._log_records += 1
+        self._log_offset += end
+
+    def _refresh(self) -> None:
+        """Bring the in-memory board up to date with the files."""
+        if self._stat_generation() != self._generation:
+            self._reload()
+            return
+        log_size = self._log_size()
+        if log_size < self._log_offset:
+            # Log truncated by a compaction we did not see the snapshot for yet
+            self._reload()
+        elif log_size > self._log_offset:
+            self._replay_log()
+
+    def _append(self, records: List[Dict[str, Any]]) -> None:
+        """Append records to the change log, then compact if it has grown too long."""
+        payload = "".join(json.dumps(r, separators=(",", ":")) + "\n" for r in records).encode("utf-8")
+        with open(self.log_path, "ab") as f:
+            f.write(payload)
+            f.flush()
+            end = f.tell()
+        if end - len(payload) == self._log_offset:
+            # Nobody else appended in between, so our records are already applied
+            self._log_offset = end
+            self._log_records += len(records)
+        else:
+            self._replay_log()
+        if self._log_records >= self.compact_threshold:
+            self._write_snapshot()
+
+    def _write_snapshot(self) -> None:
+        """Atomically rewrite the snapshot from memory and truncate the change log."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(list(self._tasks.values()), f, separators=(",", ":"))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+        with open(self.log_path, "wb"):
+            pass
+        self._generation = self._stat_generation()
+        self._log_offset = 0
+        self._log_records = 0
+        logger.debug(f"Compacted task board {self.path} ({len(self._tasks)} tasks)")
+        for listener in self._listeners:
+            listener.snapshot_written(self._generation)
+
+    def compact(self) -> None:
+        """Fold the change log into the snapshot."""
+        with self._lock:
+            self._refresh()
+            self._write_snapshot()
+
+    # --- Public API ---
+
+    def refresh(self) -> None:
+        """Pick up changes made by other processes (listeners are notified)."""
+        with self._lock:
+            self._refresh()
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._refresh()
+            return len(self._tasks)
+
+    def __contains__(self, task_id: str) -> bool:
+        with self._lock:
+            self._refresh()
+            return task_id in self._tasks
+
+    def get(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """Return a copy of a task, or None if it does not exist."""
+        with self._lock:
+            self._refresh()
+            task = self._tasks.get(task_id)
+            return dict(task) if task is not None else None
+
+    def get_many(self, task_ids: Iterable[str]) -> List[Dict[str, Any]]:
+        """Return copies of the given tasks that exist, in the given order."""
+        with self._lock:
+            self._refresh()
+            return [dict(self._tasks[t]) for t in task_ids if t in self._tasks]
+
+    def all(self) -> List[Dict[str, Any]]:
+        """Return copies of all tasks in board order."""
+        with self._lock:
+            self._refresh()
+            return [dict(task) for task in self._tasks.values()]
+
+    def query(
+        self,
+        status: Optional[str] = None,
+        agent_id: Optional[str] = None,
+        priority: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Return tasks matching all given filters, in board order.
+
+        Args:
+            status: Status to match (case-insensitive).
+            agent_id: Agent that the task is assigned to or claimed by.
+            priority: Priority to match (case-insensitive).
+            limit: Maximum number of tasks to return.
+
+        Returns:
+            List of task copies.
+        """
+        with self._lock:
+            self._refresh()
+            candidates = []
+            if status:
+                candidates.append(self._by_status.get(status.upper(), set()))
+            if agent_id:
+                candidates.append(self._by_agent.get(agent_id, set()))
+            if priority:
+                candidates.append(self._by_priority.get(priority.upper(), set()))
+
+            if not candidates:
+                return [dict(task) for task in itertools.islice(self._tasks.values(), limit)]
+
+            candidates.sort(key=len)
+            ids = candidates[0].intersection(*candidates[1:]) if len(candidates) > 1 else candidates[0]
+            if limit is not None and limit < len(ids) and limit * len(self._tasks) <= len(ids) ** 2:
+                # Matches are dense: walking the board in order finds `limit` of them
+                # sooner than sorting all of them
+                ordered = itertools.islice((t for t in self._tasks if t in ids), limit)
+            else:
+                ordered = sorted(ids, key=self._order.__getitem__)[:limit]
+            return [dict(self._tasks[task_id]) for task_id in ordered]
+
+    def put(self, task: Dict[str, Any]) -> None:
+        """Insert or replace a task."""
+        with self._lock:
+            self._refresh()
+            task = dict(task)
+            self._apply_put(task)
+            self._append([{"op": "put", "task": task}])
+
+    def delete(self, task_id: str) -> bool:
+        """Delete a task. Returns False if it did not exist."""
+        with self._lock:
+            self._refresh()
+            if task_id not in self._tasks:
+                return False
+            self._apply_delete(task_id)
+            self._append([{"op": "delete", "task_id": task_id}])
+            return True
+
+    def replace_all(self, tasks: List[Dict[str, Any]]) -> None:
+        """Replace the whole board and write a fresh snapshot."""
+        with self._lock:
+            self._bulk_load([dict(task) for task in tasks], None)
+            self._write_snapshot()
@@ -0,0 +1,323 @@
+"""
+TaskSearchIndex - Full-text search over the task board.
+
+An inverted index over the text fields of every task (name, description, notes,
+result_summary), ranked with BM25. Text is lowercased and split into word tokens.
+Each query token matches:
+
+- the identical term (full weight)
+- terms starting with it, e.g. "auth" -> "authentication" (PREFIX_WEIGHT)
+- terms containing it, found through a trigram index over the vocabulary, e.g.
+  "board" -> "taskboard" (SUBSTRING_WEIGHT)
+
+A task must match every query token. The index listens to a TaskBoardStore, so it is
+updated incrementally on every add, update and delete (including changes replayed from
+other processes). It is persisted next to the task board whenever the board snapshot is
+rewritten, and reloaded instead of rebuilt if it belongs to the current snapshot.
+"""
+
+import bisect
+import heapq
+import json
+import logging
+import math
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+INDEX_VERSION = 1
+
+# Fields indexed and their weight in term frequencies and document length
+FIELD_WEIGHTS = {
+    "name": 2.0,
+    "description": 1.0,
+    "notes": 1.0,
+    "result_summary": 1.0,
+}
+
+PREFIX_WEIGHT = 0.8
+SUBSTRING_WEIGHT = 0.5
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase word tokens."""
+    return _TOKEN_RE.findall(text.lower())
+
+
+def _trigrams(term: str) -> Set[str]:
+    return {term[i:i + 3] for i in range(len(term) - 2)}
+
+
+class TaskSearchIndex:
+    """
+    BM25-ranked inverted index over task text fields.
+
+    Implements the TaskBoardStore listener interface.
+    """
+
+    def __init__(self, path: Optional[Path] = None, k1: float = 1.2, b: float = 0.75):
+        """
+        Initialize an empty index.
+
+        Args:
+            path: Optional file the index is persisted to.
+            k1: BM25 term frequency saturation.
+            b: BM25 document length normalization.
+        """
+        self.path = Path(path) if path else None
+        self.k1 = k1
+        self.b = b
+        # Listener calls arrive under the store's lock; searches may run on other threads
+        self._lock = threading.RLock()
+        self._clear()
+
+    def _clear(self) -> None:
+        self._postings: Dict[str, Dict[str, float]] = {}
+        self._doc_terms: Dict[str, Dict[str, float]] = {}
+        self._doc_len: Dict[str, float] = {}
+        self._total_len = 0.0
+        self._vocab: List[str] = []
+        # Built on the first substring lookup, then maintained incrementally
+        self._trigram_terms: Optional[Dict[str, Set[str]]] = None
+
+    # --- Maintenance ---
+
+    @staticmethod
+    def _analyze(task: Dict[str, Any]) -> Dict[str, float]:
+        """Weighted term frequencies of a task."""
+        terms: Dict[str, float] = {}
+        for field, weight in FIELD_WEIGHTS.items():
+            value = task.get(field)
+            if not isinstance(value, str):
+                continue
+            for term in tokenize(value):
+                terms[term] = terms.get(term, 0.0) + weight
+        return terms
+
+    def _add_term(self, term: str) -> None:
+        bisect.insort(self._vocab, term)
+        if self._trigram_terms is not None:
+            for gram in _trigrams(term):
+                self._trigram_terms.setdefault(gram, set()).add(term)
+
+    def _remove_term(self, term: str) -> None:
+        i = bisect.bisect_left(self._vocab, term)
+        if i < len(self._vocab) and self._vocab[i] == term:
+            del self._vocab[i]
+        if self._trigram_terms is None:
+            return
+        for gram in _trigrams(term):
+            terms = self._trigram_terms.get(gram)
+            if terms is not None:
+                terms.discard(term)
+                if not terms:
+                    del self._trigram_terms[gram]
+
+    def _add_doc(self, task_id: str, terms: Dict[str, float], new_terms: Optional[List[str]] = None) -> None:
+        self._doc_terms[task_id] = terms
+        length = sum(terms.values())
+        self._doc_len[task_id] = length
+        self._total_len += length
+        for term, tf in terms.items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = {}
+                if new_terms is None:
+                    self._add_term(term)
+                else:
+                    new_terms.append(term)
+            postings[task_id] = tf
+
+    def _remove_doc(self, task_id: str) -> None:
+        terms = self._doc_terms.pop(task_id, None)
+        if terms is None:
+            return
+        self._total_len -= self._doc_len.pop(task_id)
+        for term in terms:
+            postings = self._postings[term]
+            del postings[task_id]
+            if not postings:
+                del self._postings[term]
+                self._remove_term(term)
+
+    def rebuild(self, tasks: Iterable[Dict[str, Any]]) -> None:
+        """Index tasks from scratch."""
+        with self._lock:
+            self._clear()
+            new_terms: List[str] = []
+            for task in tasks:
+                self._add_doc(task["task_id"], self._analyze(task), new_terms)
+            self._vocab = sorted(new_terms)
+
+    def _trigram_index(self) -> Dict[str, Set[str]]:
+        if self._trigram_terms is None:
+            self._trigram_terms = {}
+            for term in self._vocab:
+                for gram in _trigrams(term):
+                    self._trigram_terms.setdefault(gram, set()).add(term)
+        return self._trigram_terms
+
+    def update(self, task_id: str, task: Optional[Dict[str, Any]]) -> None:
+        """Re-index one task; task None removes it."""
+        with self._lock:
+            self._remove_doc(task_id)
+            if task is not None:
+                self._add_doc(task_id, self._analyze(task))
+
+    # --- TaskBoardStore listener interface ---
+
+    def board_reloaded(self, tasks: Iterable[Dict[str, Any]], generation: Optional[Tuple[int, int, int]]) -> None:
+        if generation is not None and self._load(generation):
+            return
+        self.rebuild(tasks)
+
+    def task_changed(self, task_id: str, old: Optional[Dict[str, Any]], new: Optional[Dict[str, Any]]) -> None:
+        if old is not None and new is not None and all(
+            old.get(field) == new.get(field) for field in FIELD_WEIGHTS
+        ):
+            return  # claims, status changes etc. do not touch indexed text
+        self.update(task_id, new)
+
+    def snapshot_written(self, generation: Optional[Tuple[int, int, int]]) -> None:
+        self.save(generation)
+
+    # --- Persistence ---
+
+    def save(self, generation: Optional[Tuple[int, int, int]]) -> None:
+        """Write the index to its file, tagged with the board snapshot generation."""
+        if self.path is None or generation is None:
+            return
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        try:
+            with self._lock, open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({
+                    "version": INDEX_VERSION,
+                    "generation": list(generation),
+                    "fields": FIELD_WEIGHTS,
+                    "postings": self._postings,
+                }, f, separators=(",", ":"))
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            # The index can always be rebuilt from the board
+            logger.warning(f"Failed to persist task search index: {e}")
+
+    def _load(self, generation: Tuple[int, int, int]) -> bool:
+        """Load the persisted index if it belongs to the given snapshot generation."""
+        if self.path is None or not self.path.exists():
+            return False
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable task search index: {e}")
+            return False
+        if (data.get("version") != INDEX_VERSION or data.get("fields") != FIELD_WEIGHTS
+                or tuple(data.get("generation", ())) != tuple(generation)):
+            return False
+
+        with self._lock:
+            self._clear()
+            self._postings = data["postings"]
+            for term, postings in self._postings.items():
+                for task_id, tf in postings.items():
+                    terms = self._doc_terms.get(task_id)
+                    if terms is None:
+                        terms = self._doc_terms[task_id] = {}
+                    terms[term] = tf
+            for task_id, terms in self._doc_terms.items():
+                self._doc_len[task_id] = sum(terms.values())
+            self._total_len = sum(self._doc_len.values())
+            self._vocab = sorted(self._postings)
+        return True
+
+    # --- Search ---
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._doc_terms)
+
+    def _expand(self, token: str, prefix: bool) -> Dict[str, float]:
+        """Index terms matched by a query token, with their match weight."""
+        matches: Dict[str, float] = {}
+        if token in self._postings:
+            matches[token] = 1.0
+
+        # Every expansion is kept: dropping rare terms would silently lose matches
+        expansions: List[str] = []
+        if prefix:
+            start = bisect.bisect_left(self._vocab, token)
+            end = bisect.bisect_left(self._vocab, token + "\U0010ffff")
+            expansions.extend(self._vocab[start:end])
+        if len(token) >= 3:
+            trigram_terms = self._trigram_index()
+            grams = sorted(_trigrams(token), key=lambda g: len(trigram_terms.get(g, ())))
+            candidates = set(trigram_terms.get(grams[0], ()))
+            for gram in grams[1:]:
+                if not candidates:
+                    break
+                candidates &= trigram_terms.get(gram, set())
+            expansions.extend(term for term in candidates if token in term)
+
+        for term in expansions:
+            if term not in matches:
+                matches[term] = PREFIX_WEIGHT if term.startswith(token) else SUBSTRING_WEIGHT
+        return matches
+
+    def search(self, query: str, limit: Optional[int] = None, prefix: bool = True) -> List[Tuple[str, float]]:
+        """
+        Find tasks matching every token of the query.
+
+        Args:
+            query: Free text query.
+            limit: Maximum number of results.
+            prefix: Let tokens match terms they are a prefix of.
+
+        Returns:
+            List of (task_id, score), best first.
+        """
+        with self._lock:
+            return self._search(query, limit, prefix)
+
+    def _search(self, query: str, limit: Optional[int], prefix: bool) -> List[Tuple[str, float]]:
+        tokens = list(dict.fromkeys(tokenize(query)))
+        if not tokens or not self._doc_terms:
+            return []
+
+        n_docs = len(self._doc_terms)
+        avg_len = self._total_len / n_docs if n_docs else 0.0
+        k1, b = self.k1, self.b
+
+        # Rarest tokens first so the candidate set shrinks quickly
+        expanded = [self._expand(token, prefix) for token in tokens]
+        expanded.sort(key=lambda matches: sum(len(self._postings[t]) for t in matches))
+
+        scores: Optional[Dict[str, float]] = None
+        for matches in expanded:
+            token_scores: Dict[str, float] = {}
+            for term, weight in matches.items():
+                postings = self._postings[term]
+                idf = math.log(1 + (n_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+                for task_id, tf in postings.items():
+                    if scores is not None and task_id not in scores:
+                        continue
+                    norm = k1 * (1 - b + b * self._doc_len[task_id] / avg_len)
+                    score = weight * idf * tf * (k1 + 1) / (tf + norm)
+                    if score > token_scores.get(task_id, 0.0):
+                        token_scores[task_id] = score
+            if scores is None:
+                scores = token_scores
+            else:
+                scores = {task_id: scores[task_id] + s for task_id, s in token_scores.items()}
+            if not scores:
+                return []
+
+        ranked = scores.items()
+        if limit is not None:
+            return heapq.nlargest(limit, ranked, key=lambda item: item[1])
+        return sorted(ranked, key=lambda item: item[1], reverse=True)
@@ -0,0 +1,78 @@
+"""
+Tests for the indexed task board storage engine.
+"""
+
+import json
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from dreamos.coordination.project_board_manager import (
+    ProjectBoardManager,
+    TaskNotFoundError,
+)
+
+
+def _task(i, status="PENDING", priority="MEDIUM"):
+    return {
+        "task_id": f"TASK-{i}",
+        "name": f"Task {i}",
+        "description": f"Description {i}",
+        "status": status,
+        "priority": priority,
+    }
+
+
+class TestProjectBoardStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = Path(tempfile.mkdtemp())
+        self.board_path = self.tmp_dir / "task_board.json"
+        self.pbm = ProjectBoardManager(self.board_path, compact_threshold=5)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_indexes_follow_mutations(self):
+        for i in range(4):
+            self.pbm.add_task(_task(i, priority="HIGH" if i % 2 else "LOW"))
+        self.pbm.claim_task("TASK-1", "Agent-1")
+        self.pbm.claim_task("TASK-3", "Agent-2")
+        self.pbm.complete_task("TASK-1", "Agent-1", "done")
+        self.pbm.delete_task("TASK-2")
+
+        ids = lambda tasks: [t["task_id"] for t in tasks]
+        self.assertEqual(ids(self.pbm.list_pending_tasks()), ["TASK-0"])
+        self.assertEqual(ids(self.pbm.list_working_tasks()), ["TASK-3"])
+        self.assertEqual(ids(self.pbm.list_completed_tasks("Agent-1")), ["TASK-1"])
+        self.assertEqual(ids(self.pbm.list_tasks(priority="high")), ["TASK-1", "TASK-3"])
+        self.assertEqual(ids(self.pbm.list_tasks(limit=2)), ["TASK-0", "TASK-1"])
+        self.assertEqual(self.pbm.get_task("TASK-1")["history"][-1]["action"], "COMPLETED")
+        with self.assertRaises(TaskNotFoundError):
+            self.pbm.get_task("TASK-2")
+
+    def test_log_compaction_and_other_process_changes(self):
+        for i in range(3):
+            self.pbm.add_task(_task(i))
+        # Below the threshold: changes live in the log only
+        with open(self.board_path, encoding="utf-8") as f:
+            self.assertEqual(json.load(f), [])
+
+        # A second manager (another process) sees and extends the log
+        other = ProjectBoardManager(self.board_path, compact_threshold=5)
+        self.assertEqual(len(other.list_tasks()), 3)
+        other.claim_task("TASK-0", "Agent-9")
+        self.assertEqual(self.pbm.get_task("TASK-0")["claimed_by"], "Agent-9")
+
+        # The fifth record triggers compaction; the first manager reloads the snapshot
+        self.pbm.add_task(_task(3))
+        with open(self.board_path, encoding="utf-8") as f:
+            self.assertEqual(len(json.load(f)), 4)
+        self.assertEqual(self.pbm.store.log_path.stat().st_size, 0)
+        other.add_task(_task(4))
+        self.assertEqual(len(self.pbm.list_tasks()), 5)
+        self.assertEqual(self.pbm.list_working_tasks("Agent-9")[0]["task_id"], "TASK-0")
+
+
+if __name__ == "__main__":
+    unittest.main()
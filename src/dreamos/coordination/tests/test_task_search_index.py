@@ -0,0 +1,83 @@
+"""
+Tests for the task board full-text search index.
+"""
+
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from dreamos.coordination.project_board_manager import ProjectBoardManager
+from dreamos.coordination.task_search_index import TaskSearchIndex
+
+
+def _task(task_id, name, description, **extra):
+    task = {
+        "task_id": task_id,
+        "name": name,
+        "description": description,
+        "status": "PENDING",
+        "priority": "MEDIUM",
+    }
+    task.update(extra)
+    return task
+
+
+class TestTaskSearchIndex(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = Path(tempfile.mkdtemp())
+        self.board_path = self.tmp_dir / "task_board.json"
+        self.pbm = ProjectBoardManager(self.board_path, compact_threshold=4)
+        self.pbm.add_task(_task("T-1", "Fix authentication bug", "Login fails for SSO users"))
+        self.pbm.add_task(_task("T-2", "Write docs", "Document the authentication flow"))
+        self.pbm.add_task(_task("T-3", "Refactor taskboard", "Split the board manager"))
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def ids(self, tasks):
+        return [t["task_id"] for t in tasks]
+
+    def test_ranking_prefix_and_substring(self):
+        # Name matches weigh more than description matches
+        self.assertEqual(self.ids(self.pbm.search_tasks("authentication")), ["T-1", "T-2"])
+        self.assertEqual(self.ids(self.pbm.search_tasks("auth")), ["T-1", "T-2"])
+        self.assertEqual(self.ids(self.pbm.search_tasks("auth login")), ["T-1"])
+        self.assertEqual(self.ids(self.pbm.search_tasks("board")), ["T-3"])
+        self.assertEqual(self.ids(self.pbm.search_tasks("SSO", case_sensitive=True)), ["T-1"])
+        self.assertEqual(self.pbm.search_tasks("sso", case_sensitive=True), [])
+        self.assertEqual(self.pbm.search_tasks("nothing"), [])
+        self.assertEqual(self.ids(self.pbm.search_tasks("")), ["T-1", "T-2", "T-3"])
+        self.assertEqual(self.ids(self.pbm.search_tasks("", limit=2)), ["T-1", "T-2"])
+
+    def test_incremental_updates_and_persistence(self):
+        self.pbm.update_task("T-2", {"name": "Write runbook", "description": "On-call notes"})
+        self.assertEqual(self.ids(self.pbm.search_tasks("authentication")), ["T-1"])
+        self.assertEqual(self.ids(self.pbm.search_tasks("runbook")), ["T-2"])
+        self.pbm.delete_task("T-1")
+        self.assertEqual(self.pbm.search_tasks("authentication"), [])
+
+        # Five log records exceed the threshold: the board is compacted, index saved
+        index_path = self.board_path.with_name("task_board.json.idx")
+        self.assertTrue(index_path.exists())
+
+        other = ProjectBoardManager(self.board_path)
+        other.store.refresh()
+        self.assertEqual(len(other.search_index), 2)
+        self.assertEqual(self.ids(other.search_tasks("runbook")), ["T-2"])
+
+        # Changes made by another process reach this index through the change log
+        other.add_task(_task("T-4", "Rotate keys", "Rotate the signing keys"))
+        self.assertEqual(self.ids(self.pbm.search_tasks("signing")), ["T-4"])
+
+    def test_common_prefix_keeps_every_match(self):
+        index = TaskSearchIndex()
+        index.rebuild(_task(f"T-{i}", f"fix test{i} module", "") for i in range(200))
+        self.assertEqual(len(index.search("test")), 200)
+        self.assertEqual(len(index.search("est")), 200)
+        self.assertEqual(len(index.search("test", limit=10)), 10)
+        self.assertEqual(index.search("test199")[0][0], "T-199")
+
+
+if __name__ == "__main__":
+    unittest.main()
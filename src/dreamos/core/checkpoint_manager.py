@@ -7,19 +7,46 @@ agent state checkpoints, as specified in docs/vision/CHECKPOINT_PROTOCOL.md.
 This is a critical component for addressing agent drift in long-running sessions.
 """
 
+import glob
 import json
 import time
 import os
 import logging
 import shutil
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from typing import Dict, List, Optional, Any
 
+from dreamos.core.checkpoint_store import DeltaCheckpointStore, is_delta_manifest
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, 
                    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger("dreamos.core.checkpoint_manager")
 
+def new_checkpoint_path(checkpoint_dir: str, agent_id: str, checkpoint_type: str) -> str:
+    """
+    Return an unused path for a new checkpoint.
+    
+    Names carry a microsecond UTC timestamp, so they sort in creation order.
+    If a checkpoint of any type already uses the timestamp (the clock did not
+    advance), it is bumped until it is free, so an existing checkpoint, possibly
+    the parent of a delta chain, is never overwritten.
+    
+    Args:
+        checkpoint_dir: Directory holding checkpoint files
+        agent_id: Identifier of the agent
+        checkpoint_type: Type of checkpoint ("routine", "pre_operation", "recovery")
+        
+    Returns:
+        Path of a checkpoint file that does not exist yet
+    """
+    now = datetime.now(timezone.utc)
+    while True:
+        prefix = os.path.join(checkpoint_dir, f"{agent_id}_{now.strftime('%Y%m%d%H%M%S%f')}_")
+        if not glob.glob(glob.escape(prefix) + "*.checkpoint"):
+            return f"{prefix}{checkpoint_type}.checkpoint"
+        now += timedelta(microseconds=1)
+
 class CheckpointManager:
     """
     Manager for agent state checkpoints to prevent drift in long-running sessions.
@@ -35,53 +62,67 @@ class CheckpointManager:
         
         # Get latest checkpoint
         latest = checkpoint_manager.get_latest_checkpoint("routine")
+    
+    With delta=True, checkpoints are small manifests referencing compressed,
+    content-addressed state sections (see checkpoint_store.py); unchanged sections
+    are never rewritten. Both formats can be restored regardless of the setting.
     """
     
-    def __init__(self, agent_id: str):
+    def __init__(self, agent_id: str, delta: bool = False, max_chain_length: int = 8):
         """
         Initialize the checkpoint manager for a specific agent.
         
         Args:
             agent_id: Identifier of the agent
+            delta: Write delta manifests instead of full JSON snapshots
+            max_chain_length: Delta checkpoints allowed before a full manifest is written
         """
         self.agent_id = agent_id
         self.checkpoint_dir = "runtime/agent_comms/checkpoints"
+        self.delta = delta
+        self.store = DeltaCheckpointStore(self.checkpoint_dir, agent_id, max_chain_length)
         os.makedirs(self.checkpoint_dir, exist_ok=True)
         logger.info(f"Initialized CheckpointManager for {agent_id}")
     
-    def create_checkpoint(self, checkpoint_type: str = "routine") -> str:
+    def create_checkpoint(self, checkpoint_type: str = "routine",
+                          state: Optional[Dict[str, Any]] = None) -> str:
         """
         Create a checkpoint of the agent's current state.
         
         Args:
             checkpoint_type: Type of checkpoint ("routine", "pre_operation", "recovery")
+            state: Previously collected state (see collect_state); collected now if omitted
             
         Returns:
             Path to the created checkpoint file
         """
-        timestamp = datetime.now(timezone.utc).strftime("%Y%m%d%H%M%S")
-        filename = f"{self.agent_id}_{timestamp}_{checkpoint_type}.checkpoint"
-        path = os.path.join(self.checkpoint_dir, filename)
+        path = self._new_checkpoint_path(checkpoint_type)
         
         # Collect agent state
-        state = {
-            "current_task": self._get_current_task_state(),
-            "mailbox": self._get_mailbox_state(),
-            "operational_context": self._get_operational_context(),
-            "memory": self._get_memory_state()
-        }
+        if state is None:
+            state = self.collect_state()
         
-        # Create checkpoint file
-        checkpoint_data = {
-            "agent_id": self.agent_id,
-            "timestamp": datetime.now(timezone.utc).isoformat(),
-            "checkpoint_type": checkpoint_type,
-            "version": "1.0",
-            "state": state
-        }
-        
-        with open(path, 'w') as f:
-            json.dump(checkpoint_data, f, indent=2)
+        if self.delta:
+            header = {
+                "agent_id": self.agent_id,
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "checkpoint_type": checkpoint_type
+            }
+            manifest = self.store.build_manifest(state, header, path, self._get_parent_checkpoint(path))
+            with open(path, 'w') as f:
+                json.dump(manifest, f)
+        else:
+            # Create checkpoint file
+            checkpoint_data = {
+                "agent_id": self.agent_id,
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "checkpoint_type": checkpoint_type,
+                "version": "1.0",
+                "state": state
+            }
+            
+            with open(path, 'w') as f:
+                json.dump(checkpoint_data, f, indent=2)
         
         logger.info(f"Created {checkpoint_type} checkpoint at {path}")
         
@@ -90,6 +131,20 @@ class CheckpointManager:
             
         return path
         
+    def collect_state(self) -> Dict[str, Any]:
+        """
+        Collect the agent state that a checkpoint records.
+        
+        Returns:
+            Dictionary with current_task, mailbox, operational_context and memory sections
+        """
+        return {
+            "current_task": self._get_current_task_state(),
+            "mailbox": self._get_mailbox_state(),
+            "operational_context": self._get_operational_context(),
+            "memory": self._get_memory_state()
+        }
+        
     def restore_checkpoint(self, checkpoint_path: str) -> bool:
         """
         Restore agent state from a checkpoint.
@@ -107,6 +162,10 @@ class CheckpointManager:
             # Validate checkpoint belongs to this agent
             if checkpoint_data["agent_id"] != self.agent_id:
                 raise ValueError(f"Checkpoint belongs to {checkpoint_data['agent_id']}, not {self.agent_id}")
+            
+            # Delta manifests reference their state through the chunk store
+            if is_delta_manifest(checkpoint_data):
+                checkpoint_data["state"] = self.store.resolve_state(checkpoint_path)
                 
             # Apply state restoration
             self._restore_task_state(checkpoint_data["state"]["current_task"])
@@ -331,10 +390,25 @@ class CheckpointManager:
             
         return checkpoints
     
+    def _new_checkpoint_path(self, checkpoint_type: str) -> str:
+        """Return an unused path for a new checkpoint (see new_checkpoint_path)."""
+        return new_checkpoint_path(self.checkpoint_dir, self.agent_id, checkpoint_type)
+    
+    def _get_parent_checkpoint(self, path: str) -> Optional[str]:
+        """Return the newest existing checkpoint of any type other than `path`."""
+        checkpoints = sorted(
+            (c for c in self._list_checkpoints() if os.path.abspath(c) != os.path.abspath(path)),
+            key=os.path.getmtime
+        )
+        return checkpoints[-1] if checkpoints else None
+    
     def _apply_retention_policy(self, checkpoint_type: str) -> None:
         """
         Apply retention policy for checkpoints.
         
+        Delta checkpoints that a retained checkpoint depends on are kept, and
+        chunks no longer referenced by any checkpoint are removed.
+        
         Args:
             checkpoint_type: Type of checkpoint
         """
@@ -346,11 +420,19 @@ class CheckpointManager:
                 if len(routine_checkpoints) > 3:
                     # Sort by creation time (oldest first)
                     sorted_checkpoints = sorted(routine_checkpoints)
+                    # Keep the parents of the 3 newest so their chains stay restorable
+                    protected = self.store.ancestors(sorted_checkpoints[-3:])
                     # Remove oldest checkpoints (everything except the 3 newest)
                     for checkpoint in sorted_checkpoints[:-3]:
+                        if checkpoint in protected:
+                            continue
                         if os.path.exists(checkpoint):
                             os.remove(checkpoint)
                             logger.info(f"Removed old routine checkpoint: {checkpoint}")
+                    
+                    removed = self.store.collect_garbage(self._list_checkpoints())
+                    if removed:
+                        logger.info(f"Removed {removed} unreferenced checkpoint chunks")
             
             # For recovery checkpoints, we keep them for 7 days
             # This would require a date-based cleanup which we'll implement in a future update
@@ -0,0 +1,275 @@
+"""
+Checkpoint Service
+
+This module implements a background checkpoint writer so that agent loops and the
+process monitor can request checkpoints without blocking on disk.
+
+Requests are queued per agent. If several requests for the same agent queue up before
+the writer reaches them they are coalesced: the latest state wins, the most important
+checkpoint type requested is kept, and every caller receives the same completion future. The writer collects state (if the caller did not
+supply a snapshot), writes the checkpoints of a batch, then fsyncs the batch once.
+"""
+
+import logging
+import os
+import queue
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional
+
+from dreamos.core.checkpoint_manager import CheckpointManager
+
+logger = logging.getLogger("dreamos.core.checkpoint_service")
+
+# Importance of checkpoint types when requests are coalesced; unknown types rank lowest
+CHECKPOINT_TYPE_RANK = {"routine": 0, "pre_operation": 1, "recovery": 2}
+
+
+class _CheckpointRequest:
+    """A pending checkpoint for one agent."""
+
+    __slots__ = ("agent_id", "checkpoint_type", "state", "future")
+
+    def __init__(self, agent_id: str, checkpoint_type: str, state: Optional[Dict[str, Any]]):
+        self.agent_id = agent_id
+        self.checkpoint_type = checkpoint_type
+        self.state = state
+        self.future: Future = Future()
+
+
+def _fsync_path(path: str) -> None:
+    """Flush a file or directory to disk. Directories cannot be opened on Windows, which is fine."""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+class CheckpointService:
+    """
+    Background writer for agent checkpoints.
+
+    Usage:
+        service = CheckpointService(delta=True)
+        future = service.request_checkpoint("agent-3", "routine")
+        ...
+        path = future.result(timeout=5)
+        service.shutdown()
+    """
+
+    def __init__(self,
+                 max_pending: int = 64,
+                 batch_size: int = 16,
+                 batch_window: float = 0.05,
+                 delta: bool = False,
+                 manager_factory: Optional[Callable[..., Any]] = None):
+        """
+        Initialize the service and start its writer thread.
+
+        Args:
+            max_pending: Maximum number of agents with a queued, not yet started checkpoint
+            batch_size: Maximum checkpoints written before a single fsync pass
+            batch_window: Seconds to wait for more requests before writing a partial batch
+            delta: Use the delta checkpoint format (see checkpoint_store.py)
+            manager_factory: Callable(agent_id) returning a checkpoint manager;
+                defaults to CheckpointManager
+        """
+        self.max_pending = max_pending
+        self.batch_size = batch_size
+        self.batch_window = batch_window
+        self._manager_factory = manager_factory or (lambda agent_id: CheckpointManager(agent_id, delta=delta))
+        self._managers: Dict[str, Any] = {}
+
+        self._pending: Dict[str, _CheckpointRequest] = {}  # insertion order == queue order
+        self._cond = threading.Condition()
+        self._busy = False
+        self._stopped = False
+
+        self.stats = {"requested": 0, "coalesced": 0, "written": 0, "failed": 0, "batches": 0}
+
+        self._thread = threading.Thread(target=self._run, name="checkpoint-writer", daemon=True)
+        self._thread.start()
+        logger.info("Checkpoint service started")
+
+    def request_checkpoint(self,
+                           agent_id: str,
+                           checkpoint_type: str = "routine",
+                           state: Optional[Dict[str, Any]] = None,
+                           block: bool = False,
+                           timeout: Optional[float] = None) -> Future:
+        """
+        Queue a checkpoint for an agent and return immediately.
+
+        Args:
+            agent_id: Identifier of the agent
+            checkpoint_type: Type of checkpoint ("routine", "pre_operation", "recovery")
+            state: Optional snapshot of the agent state; collected by the writer if omitted
+            block: Wait for room if the queue is full instead of raising
+            timeout: Maximum seconds to wait when block is True
+
+        Returns:
+            Future resolving to the checkpoint path once it is written and synced
+
+        Raises:
+            queue.Full: If the queue is full and block is False (or the timeout expires)
+            RuntimeError: If the service has been shut down
+        """
+        with self._cond:
+            if self._stopped:
+                raise RuntimeError("Checkpoint service is shut down")
+
+            self.stats["requested"] += 1
+            existing = self._pending.get(agent_id)
+            if existing is not None:
+                # Latest state wins without downgrading the type; everyone waiting
+                # gets the same result
+                if (CHECKPOINT_TYPE_RANK.get(checkpoint_type, 0)
+                        >= CHECKPOINT_TYPE_RANK.get(existing.checkpoint_type, 0)):
+                    existing.checkpoint_type = checkpoint_type
+                existing.state = state
+                self.stats["coalesced"] += 1
+                return existing.future
+
+            if len(self._pending) >= self.max_pending:
+                if not block:
+                    raise queue.Full(f"Checkpoint queue is full ({self.max_pending} agents pending)")
+                if not self._cond.wait_for(lambda: len(self._pending) < self.max_pending or self._stopped,
+                                           timeout):
+                    raise queue.Full(f"Checkpoint queue is full ({self.max_pending} agents pending)")
+                if self._stopped:
+                    raise RuntimeError("Checkpoint service is shut down")
+
+            request = _CheckpointRequest(agent_id, checkpoint_type, state)
+            self._pending[agent_id] = request
+            self._cond.notify_all()
+            return request.future
+
+    def pending_count(self) -> int:
+        """Return the number of agents with a queued checkpoint."""
+        with self._cond:
+            return len(self._pending)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every queued checkpoint has been written.
+
+        Args:
+            timeout: Maximum seconds to wait
+
+        Returns:
+            True if the queue drained, False on timeout
+        """
+        with self._cond:
+            return self._cond.wait_for(lambda: not self._pending and not self._busy, timeout)
+
+    def shutdown(self, wait: bool = True, timeout: Optional[float] = None) -> None:
+        """
+        Stop accepting requests. Queued checkpoints are still written.
+
+        Args:
+            wait: Wait for the writer thread to finish
+            timeout: Maximum seconds to wait
+        """
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+        if wait:
+            self._thread.join(timeout)
+        logger.info(f"Checkpoint service stopped: {self.stats}")
+
+    def _get_manager(self, agent_id: str) -> Any:
+        manager = self._managers.get(agent_id)
+        if manager is None:
+            manager = self._managers[agent_id] = self._manager_factory(agent_id)
+            store = getattr(manager, "store", None)
+            if store is not None:
+                # The writer fsyncs the chunk files of each batch (see _write_batch)
+                store.batch_sync = True
+        return manager
+
+    def _take_batch(self) -> List[_CheckpointRequest]:
+        """Wait for requests and remove up to batch_size of them from the queue."""
+        with self._cond:
+            self._cond.wait_for(lambda: self._pending or self._stopped)
+            if not self._pending:
+                return []
+
+            # Give concurrent callers a moment to fill the batch
+            if len(self._pending) < self.batch_size and not self._stopped:
+                self._cond.wait_for(lambda: len(self._pending) >= self.batch_size or self._stopped,
+                                    self.batch_window)
+
+            batch = []
+            for agent_id in list(self._pending)[:self.batch_size]:
+                batch.append(self._pending.pop(agent_id))
+            self._busy = True
+            self._cond.notify_all()
+            return batch
+
+    def _write_batch(self, batch: List[_CheckpointRequest]) -> None:
+        """Write every checkpoint in the batch, then fsync them together."""
+        written = []
+        synced_paths: List[str] = []
+        for request in batch:
+            try:
+                manager = self._get_manager(request.agent_id)
+                path = manager.create_checkpoint(request.checkpoint_type, request.state)
+                store = getattr(manager, "store", None)
+                if store is not None:
+                    synced_paths.extend(store.drain_unsynced())
+                synced_paths.append(path)
+                written.append((request, path))
+            except Exception as e:
+                logger.error(f"Failed to write checkpoint for {request.agent_id}: {str(e)}")
+                self.stats["failed"] += 1
+                request.future.set_exception(e)
+
+        directories = set()
+        for path in synced_paths:
+            _fsync_path(path)
+            directories.add(os.path.dirname(path) or ".")
+        for directory in directories:
+            _fsync_path(directory)
+
+        for request, path in written:
+            self.stats["written"] += 1
+            request.future.set_result(path)
+        self.stats["batches"] += 1
+
+    def _run(self) -> None:
+        """Writer thread main loop."""
+        while True:
+            batch = self._take_batch()
+            if not batch:
+                return
+            try:
+                self._write_batch(batch)
+            finally:
+                with self._cond:
+                    self._busy = False
+                    self._cond.notify_all()
+
+
+# Singleton instance
+_checkpoint_service = None
+_checkpoint_service_lock = threading.Lock()
+
+
+def get_checkpoint_service() -> CheckpointService:
+    """
+    Get the shared checkpoint service, starting it on first use.
+
+    Returns:
+        CheckpointService instance
+    """
+    global _checkpoint_service
+    with _checkpoint_service_lock:
+        if _checkpoint_service is None:
+            _checkpoint_service = CheckpointService()
+        return _checkpoint_service
@@ -0,0 +1,312 @@
+"""
+Delta Checkpoint Store
+
+This module implements content-addressed storage for agent checkpoints. Each state
+section (current task, mailbox, operational context, memory) is serialized to
+canonical JSON, compressed, and stored once under its SHA-256 digest. Dictionary
+sections are split one level deep so that, for example, appending to session memory
+does not rewrite unchanged short-term memory. A checkpoint is then a small manifest
+that references section digests.
+
+Delta manifests only list the sections that changed since their parent; restoring
+walks the parent chain until every section is resolved. Every `max_chain_length`
+checkpoints a full manifest (all sections, no parent) is written so chains stay short.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import zlib
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+
+logger = logging.getLogger("dreamos.core.checkpoint_store")
+
+DELTA_FORMAT = "delta"
+DELTA_VERSION = "2.0"
+SECTIONS = ("current_task", "mailbox", "operational_context", "memory")
+TREE_KEY = "__tree__"
+
+
+def _read_manifest_file(path: str) -> Dict[str, Any]:
+    """Default manifest loader."""
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def is_delta_manifest(data: Dict[str, Any]) -> bool:
+    """Return True if checkpoint data is a delta manifest rather than a full snapshot."""
+    return data.get("format") == DELTA_FORMAT
+
+
+class DeltaCheckpointStore:
+    """
+    Content-addressed chunk store and manifest builder for one agent.
+
+    Chunks live under `<checkpoint_dir>/objects/<agent_id>/<digest[:2]>/<digest>`.
+    Manifests are written by the caller next to the legacy `.checkpoint` files so
+    listing, sorting and retention keep working unchanged.
+    """
+
+    def __init__(self, checkpoint_dir: str, agent_id: str, max_chain_length: int = 8,
+                 compression_level: int = 6, batch_sync: bool = False):
+        """
+        Initialize the store.
+
+        Args:
+            checkpoint_dir: Directory holding checkpoint manifests
+            agent_id: Identifier of the agent
+            max_chain_length: Number of delta manifests allowed before a full one is written
+            compression_level: zlib compression level for chunks
+            batch_sync: Record written chunk files in `unsynced` for the owner to fsync
+                (see drain_unsynced); enabled by CheckpointService
+        """
+        self.checkpoint_dir = checkpoint_dir
+        self.agent_id = agent_id
+        self.max_chain_length = max_chain_length
+        self.compression_level = compression_level
+        self.objects_dir = os.path.join(checkpoint_dir, "objects", agent_id)
+
+        # Chunk files written since the last drain_unsynced(), if batch_sync is set
+        self.batch_sync = batch_sync
+        self.unsynced: List[str] = []
+
+        # Resolved section digests of the last manifest built by this process
+        self._last_path: Optional[str] = None
+        self._last_digests: Dict[str, str] = {}
+        self._last_depth = 0
+
+    def _chunk_path(self, digest: str) -> str:
+        return os.path.join(self.objects_dir, digest[:2], digest)
+
+    def put(self, section: Any) -> str:
+        """
+        Store a state section and return its digest. Existing chunks are not rewritten.
+
+        Args:
+            section: JSON-serializable section data
+
+        Returns:
+            Hex SHA-256 digest of the stored chunk
+        """
+        if isinstance(section, dict):
+            tree = {key: self._put_chunk(value) for key, value in section.items()}
+            return self._put_chunk({TREE_KEY: tree})
+        return self._put_chunk(section)
+
+    def _put_chunk(self, data: Any) -> str:
+        payload = json.dumps(data, sort_keys=True, separators=(",", ":")).encode("utf-8")
+        digest = hashlib.sha256(payload).hexdigest()
+        path = self._chunk_path(digest)
+        if os.path.exists(path):
+            return digest
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(zlib.compress(payload, self.compression_level))
+        os.replace(tmp_path, path)
+        if self.batch_sync:
+            self.unsynced.append(path)
+        return digest
+
+    def drain_unsynced(self) -> List[str]:
+        """Return and forget the chunk files written since the last call."""
+        paths, self.unsynced = self.unsynced, []
+        return paths
+
+    def get(self, digest: str) -> Any:
+        """
+        Load a state section by digest.
+
+        Args:
+            digest: Digest returned by `put`
+
+        Returns:
+            The decoded section data
+        """
+        data = self._get_chunk(digest)
+        if isinstance(data, dict) and set(data) == {TREE_KEY}:
+            return {key: self._get_chunk(child) for key, child in data[TREE_KEY].items()}
+        return data
+
+    def _get_chunk(self, digest: str) -> Any:
+        with open(self._chunk_path(digest), 'rb') as f:
+            return json.loads(zlib.decompress(f.read()).decode("utf-8"))
+
+    def build_manifest(self, state: Dict[str, Any], header: Dict[str, Any],
+                       path: str, parent_path: Optional[str],
+                       load_manifest: Callable[[str], Dict[str, Any]] = _read_manifest_file) -> Dict[str, Any]:
+        """
+        Store changed sections and return the manifest for a new checkpoint.
+
+        Args:
+            state: Section name -> section data
+            header: Fields copied into the manifest (agent_id, timestamp, checkpoint_type)
+            path: Path the manifest will be written to
+            parent_path: Path of the previous checkpoint, or None for a full manifest
+            load_manifest: Callable used to read manifests from disk
+
+        Returns:
+            Manifest dictionary ready to be written as JSON
+        """
+        digests = {name: self.put(section) for name, section in state.items()}
+
+        parent_digests: Dict[str, str] = {}
+        depth = 0
+        if parent_path and os.path.abspath(parent_path) != os.path.abspath(path):
+            try:
+                if parent_path == self._last_path:
+                    parent_digests, depth = self._last_digests, self._last_depth + 1
+                else:
+                    parent = load_manifest(parent_path)
+                    if is_delta_manifest(parent):
+                        parent_digests = self.resolve_digests(parent_path, load_manifest)
+                        depth = parent.get("depth", 0) + 1
+            except Exception as e:
+                logger.warning(f"Ignoring unreadable parent checkpoint {parent_path}: {str(e)}")
+                parent_digests, depth = {}, 0
+
+        if not parent_digests or depth > self.max_chain_length:
+            parent_path, depth = None, 0
+            sections = digests
+        else:
+            sections = {name: digest for name, digest in digests.items()
+                        if parent_digests.get(name) != digest}
+
+        manifest = dict(header)
+        manifest.update({
+            "version": DELTA_VERSION,
+            "format": DELTA_FORMAT,
+            "parent": os.path.basename(parent_path) if parent_path else None,
+            "depth": depth,
+            "sections": sections
+        })
+
+        self._last_path, self._last_digests, self._last_depth = path, digests, depth
+        return manifest
+
+    def _parent_path(self, manifest: Dict[str, Any]) -> Optional[str]:
+        parent = manifest.get("parent")
+        return os.path.join(self.checkpoint_dir, parent) if parent else None
+
+    def resolve_digests(self, path: str,
+                        load_manifest: Callable[[str], Dict[str, Any]] = _read_manifest_file) -> Dict[str, str]:
+        """
+        Follow a manifest chain and return the digest of every section.
+
+        Args:
+            path: Path of the newest manifest in the chain
+            load_manifest: Callable used to read manifests from disk
+
+        Returns:
+            Section name -> digest
+
+        Raises:
+            ValueError: If the chain loops or ends before every section is found
+        """
+        digests: Dict[str, str] = {}
+        seen: Set[str] = set()
+        current: Optional[str] = path
+        while current:
+            key = os.path.abspath(current)
+            if key in seen:
+                raise ValueError(f"Checkpoint chain loops at {current}")
+            seen.add(key)
+
+            manifest = load_manifest(current)
+            for name, digest in manifest.get("sections", {}).items():
+                digests.setdefault(name, digest)
+            if all(name in digests for name in SECTIONS):
+                break
+            current = self._parent_path(manifest)
+
+        missing = [name for name in SECTIONS if name not in digests]
+        if missing:
+            raise ValueError(f"Checkpoint chain for {path} is missing sections: {', '.join(missing)}")
+        return digests
+
+    def resolve_state(self, path: str,
+                      load_manifest: Callable[[str], Dict[str, Any]] = _read_manifest_file) -> Dict[str, Any]:
+        """
+        Reconstruct the full state referenced by a manifest chain.
+
+        Args:
+            path: Path of the manifest to restore
+            load_manifest: Callable used to read manifests from disk
+
+        Returns:
+            Section name -> section data, in the same shape as a full checkpoint's "state"
+        """
+        return {name: self.get(digest)
+                for name, digest in self.resolve_digests(path, load_manifest).items()}
+
+    def ancestors(self, paths: Iterable[str],
+                  load_manifest: Callable[[str], Dict[str, Any]] = _read_manifest_file) -> Set[str]:
+        """
+        Return every manifest reachable through parent links from `paths`, excluding `paths`.
+
+        Retention must not delete these, or the newer checkpoints could not be restored.
+        """
+        result: Set[str] = set()
+        for path in paths:
+            current = path
+            while current:
+                try:
+                    manifest = load_manifest(current)
+                except Exception:
+                    break
+                if not is_delta_manifest(manifest):
+                    break
+                current = self._parent_path(manifest)
+                if not current or current in result:
+                    break
+                result.add(current)
+        return result - set(paths)
+
+    def collect_garbage(self, manifest_paths: Iterable[str],
+                        load_manifest: Callable[[str], Dict[str, Any]] = _read_manifest_file) -> int:
+        """
+        Delete chunks not referenced by any of the given manifests.
+
+        Args:
+            manifest_paths: All checkpoints that still exist for this agent
+            load_manifest: Callable used to read manifests from disk
+
+        Returns:
+            Number of chunks removed
+        """
+        if not os.path.isdir(self.objects_dir):
+            return 0
+
+        live: Set[str] = set()
+        for path in manifest_paths:
+            try:
+                manifest = load_manifest(path)
+            except Exception as e:
+                # Keep everything if we cannot tell what is referenced
+                logger.warning(f"Skipping chunk garbage collection, unreadable checkpoint {path}: {str(e)}")
+                return 0
+            if is_delta_manifest(manifest):
+                live.update(manifest.get("sections", {}).values())
+        if self._last_digests:
+            live.update(self._last_digests.values())
+
+        # Section trees reference their per-key chunks
+        for digest in list(live):
+            try:
+                data = self._get_chunk(digest)
+            except FileNotFoundError:
+                continue
+            if isinstance(data, dict) and set(data) == {TREE_KEY}:
+                live.update(data[TREE_KEY].values())
+
+        removed = 0
+        for prefix in os.listdir(self.objects_dir):
+            prefix_dir = os.path.join(self.objects_dir, prefix)
+            for digest in os.listdir(prefix_dir):
+                if digest not in live and not digest.endswith(".tmp"):
+                    os.remove(os.path.join(prefix_dir, digest))
+                    removed += 1
+        return removed
+
@@ -296,6 +296,16 @@ class GuiAutomationConfig(BaseModel):
     copy_coords_file_path: str = (
         "runtime/config/copy_coords.json"  # Default path for copy coordinates
     )
+    paste_threshold_chars: Optional[int] = Field(
+        200,
+        description="Prompts at least this long are pasted from the clipboard instead of typed (None: always type)",  # noqa: E501
+    )
+    ready_timeout_seconds: float = Field(
+        2.0, description="Maximum wait for a Cursor window to report focus"
+    )
+    ready_poll_interval_seconds: float = Field(
+        0.01, description="Initial polling interval while waiting for focus"
+    )
 
 
 # EDIT END
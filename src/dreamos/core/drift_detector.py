@@ -1,12 +1,66 @@
 """
 Drift Detection module for monitoring agent behavior changes.
+
+Every (agent, metric) series keeps its last window_size values in a ring buffer
+with incrementally maintained mean and variance (Welford's update, applied in
+both directions as values enter and leave the window), so adding a point is O(1)
+regardless of the window size. The moments are recomputed exactly when a value
+dominating the window's spread leaves it, where the downdate would lose precision.
+
+A point is compared with the baseline formed by the window_size - 1 points before
+it. Besides the default z-score test, EWMA, CUSUM and Page-Hinkley detectors can
+be enabled through config["detectors"]; the latter catch small, persistent shifts
+that never cross the z-score threshold on a single point.
+
+Detected drift is kept in drift_history and indexed in time buckets of
+config["history_bucket_seconds"], so windowed summaries cost O(buckets).
+
+add_metric_points_batch evaluates whole arrays (or a DataFrame) of points, computing
+the rolling baselines with NumPy per series; it continues from, and leaves behind,
+the same per-series state as the streaming path.
 """
 
-from typing import Dict, Any, List, Optional, Tuple
+import bisect
+import math
+from typing import Dict, Any, Iterator, List, Optional, Tuple
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 import numpy as np
-import statistics
+
+
+DEFAULT_CONFIG = {
+    "window_size": 100,  # Number of data points for baseline
+    "detection_threshold": 2.0,  # Standard deviations for drift detection
+    "confidence_threshold": 0.8,  # Minimum confidence for drift detection
+    "metrics": ["response_time", "accuracy", "helpfulness", "safety"],
+    "detectors": ["zscore"],  # Any of: zscore, ewma, cusum, page_hinkley
+    "ewma_lambda": 0.2,  # Weight of the newest point in the EWMA
+    "ewma_threshold": 3.0,  # EWMA control limit, in EWMA standard deviations
+    "cusum_k": 0.5,  # CUSUM allowance, in baseline standard deviations
+    "cusum_h": 5.0,  # CUSUM decision threshold
+    "page_hinkley_delta": 0.5,  # Page-Hinkley tolerated deviation, in standard deviations
+    "page_hinkley_lambda": 5.0,  # Page-Hinkley decision threshold
+    "history_bucket_seconds": 3600,  # Granularity of the drift history index
+}
+
+DETECTORS = ("zscore", "ewma", "cusum", "page_hinkley")
+
+# Rows returned by DriftDetector.add_metric_points_batch; index is the input row
+DRIFT_POINT_DTYPE = np.dtype([
+    ("index", np.int64),
+    ("timestamp", "datetime64[us]"),
+    ("agent_id", object),
+    ("metric_name", object),
+    ("old_value", np.float64),
+    ("new_value", np.float64),
+    ("drift_magnitude", np.float64),
+    ("confidence", np.float64),
+    ("severity", "U8"),
+    ("detector", "U12"),
+])
+
+# Baseline windows evaluated per NumPy call, bounding temporary memory
+_BATCH_CHUNK_ROWS = 16384
 
 
 @dataclass
@@ -21,6 +75,7 @@ class DriftPoint:
     drift_magnitude: float
     confidence: float
     severity: str  # 'low', 'medium', 'high', 'critical'
+    detector: str = "zscore"
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary representation."""
@@ -32,24 +87,228 @@ class DriftPoint:
             "new_value": self.new_value,
             "drift_magnitude": self.drift_magnitude,
             "confidence": self.confidence,
-            "severity": self.severity
+            "severity": self.severity,
+            "detector": self.detector
         }
 
 
+class RollingWindow:
+    """Fixed-size ring buffer with O(1) running mean and sample variance."""
+    
+    __slots__ = ("capacity", "_buffer", "_start", "_count", "mean", "_m2", "_updates")
+    
+    # Recompute the moments from scratch every RESYNC_FACTOR * capacity updates to
+    # keep floating point error from accumulating
+    RESYNC_FACTOR = 16
+    # Also recompute them when an evicted value carried more than CANCELLATION_LIMIT
+    # times the M2 left behind: the downdate then cancels most significant digits
+    # (e.g. a spike of 1e9 leaving a window of values around 1)
+    CANCELLATION_LIMIT = 1e4
+    
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._buffer: List[float] = [0.0] * capacity
+        self._start = 0
+        self._count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self._updates = 0
+    
+    def __len__(self) -> int:
+        return self._count
+    
+    def __iter__(self) -> Iterator[float]:
+        """Iterate values from oldest to newest."""
+        for i in range(self._count):
+            yield self._buffer[(self._start + i) % self.capacity]
+    
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, (list, tuple)):
+            return list(self) == list(other)
+        return NotImplemented
+    
+    def __repr__(self) -> str:
+        return f"RollingWindow({list(self)!r})"
+    
+    def push(self, value: float) -> None:
+        """Append a value, evicting the oldest one if the window is full."""
+        if self._count == self.capacity:
+            self.pop_oldest()
+        self._buffer[(self._start + self._count) % self.capacity] = value
+        self._count += 1
+        delta = value - self.mean
+        self.mean += delta / self._count
+        self._m2 += delta * (value - self.mean)
+        self._tick()
+    
+    def pop_oldest(self) -> float:
+        """Remove and return the oldest value."""
+        value = self._buffer[self._start]
+        self._start = (self._start + 1) % self.capacity
+        self._count -= 1
+        if self._count == 0:
+            self.mean = 0.0
+            self._m2 = 0.0
+        else:
+            delta = value - self.mean
+            self.mean -= delta / self._count
+            removed = delta * (value - self.mean)
+            self._m2 -= removed
+            if removed > self.CANCELLATION_LIMIT * self._m2:
+                self._resync()
+                return value
+        self._tick()
+        return value
+    
+    def _tick(self) -> None:
+        self._updates += 1
+        if self._updates >= self.RESYNC_FACTOR * self.capacity:
+            self._resync()
+    
+    def _resync(self) -> None:
+        """Recompute mean and M2 exactly (two-pass) from the buffered values."""
+        self._updates = 0
+        if self._count == 0:
+            self.mean = self._m2 = 0.0
+            return
+        values = list(self)
+        self.mean = math.fsum(values) / self._count
+        self._m2 = math.fsum((v - self.mean) ** 2 for v in values)
+    
+    def variance(self) -> float:
+        """Sample variance (n - 1 denominator); 0.0 for fewer than two values."""
+        if self._count < 2:
+            return 0.0
+        return max(self._m2, 0.0) / (self._count - 1)
+    
+    def std(self) -> float:
+        """Sample standard deviation."""
+        return math.sqrt(self.variance())
+    
+    def clear(self) -> None:
+        self._start = self._count = self._updates = 0
+        self.mean = self._m2 = 0.0
+    
+    def load(self, values: List[float]) -> None:
+        """Replace the contents with the last capacity values given."""
+        values = list(values)[-self.capacity:]
+        self._buffer[:len(values)] = values
+        self._start = 0
+        self._count = len(values)
+        self._resync()
+
+
+class _SeriesState:
+    """Rolling window plus sequential detector state for one (agent, metric) series."""
+    
+    __slots__ = ("window", "ewma", "cusum_pos", "cusum_neg", "ph_pos", "ph_pos_min",
+                 "ph_neg", "ph_neg_min")
+    
+    def __init__(self, window_size: int):
+        self.window = RollingWindow(window_size)
+        self.reset_detectors()
+    
+    def reset_detectors(self) -> None:
+        self.ewma: Optional[float] = None
+        self.cusum_pos = self.cusum_neg = 0.0
+        self.ph_pos = self.ph_pos_min = 0.0
+        self.ph_neg = self.ph_neg_min = 0.0
+
+
+class _DriftBucket:
+    """Drift points of one time bucket with their aggregates."""
+    
+    __slots__ = ("points", "count", "confidence_sum", "magnitude_sum", "severity", "agents")
+    
+    def __init__(self):
+        self.points: List[DriftPoint] = []
+        self.count = 0
+        self.confidence_sum = 0.0
+        self.magnitude_sum = 0.0
+        self.severity: Dict[str, int] = {}
+        # agent_id -> [count, confidence_sum, severity counts, {metric: [magnitude_sum, count]}]
+        self.agents: Dict[str, List[Any]] = {}
+    
+    def add(self, drift: DriftPoint) -> None:
+        self.points.append(drift)
+        self.count += 1
+        self.confidence_sum += drift.confidence
+        self.magnitude_sum += drift.drift_magnitude
+        self.severity[drift.severity] = self.severity.get(drift.severity, 0) + 1
+        agent = self.agents.get(drift.agent_id)
+        if agent is None:
+            agent = self.agents[drift.agent_id] = [0, 0.0, {}, {}]
+        agent[0] += 1
+        agent[1] += drift.confidence
+        agent[2][drift.severity] = agent[2].get(drift.severity, 0) + 1
+        metric = agent[3].setdefault(drift.metric_name, [0.0, 0])
+        metric[0] += drift.drift_magnitude
+        metric[1] += 1
+
+
+class DriftHistoryIndex:
+    """Drift points bucketed by time, for O(buckets) windowed summaries."""
+    
+    def __init__(self, bucket_seconds: float = 3600):
+        self.bucket_seconds = bucket_seconds
+        self._buckets: Dict[int, _DriftBucket] = {}
+        self._keys: List[int] = []  # sorted bucket keys
+    
+    def _key(self, timestamp: datetime) -> int:
+        return math.floor(timestamp.timestamp() / self.bucket_seconds)
+    
+    def add(self, drift: DriftPoint) -> None:
+        key = self._key(drift.timestamp)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = _DriftBucket()
+            bisect.insort(self._keys, key)
+        bucket.add(drift)
+    
+    def clear(self) -> None:
+        self._buckets.clear()
+        self._keys.clear()
+    
+    def window(self, cutoff: Optional[datetime]) -> Tuple[List[_DriftBucket], List[DriftPoint]]:
+        """
+        Split the history at or after cutoff into whole buckets and loose points.
+        
+        Returns:
+            Buckets entirely at or after cutoff (oldest first) and the points of the
+            bucket the cutoff falls into that are at or after it
+        """
+        if cutoff is None:
+            return [self._buckets[k] for k in self._keys], []
+        first = self._key(cutoff)
+        i = bisect.bisect_left(self._keys, first)
+        partial: List[DriftPoint] = []
+        if i < len(self._keys) and self._keys[i] == first:
+            partial = [d for d in self._buckets[first].points if d.timestamp >= cutoff]
+            i += 1
+        return [self._buckets[k] for k in self._keys[i:]], partial
+    
+    def points(self, cutoff: Optional[datetime]) -> Iterator[DriftPoint]:
+        """Points at or after cutoff, bucket by bucket (oldest bucket first)."""
+        buckets, partial = self.window(cutoff)
+        yield from partial
+        for bucket in buckets:
+            yield from bucket.points
+
+
 class DriftDetector:
     """Detects behavioral drift in agent performance."""
     
     def __init__(self, config: Optional[Dict[str, Any]] = None):
-        self.config = config or {
-            "window_size": 100,  # Number of data points for baseline
-            "detection_threshold": 2.0,  # Standard deviations for drift detection
-            "confidence_threshold": 0.8,  # Minimum confidence for drift detection
-            "metrics": ["response_time", "accuracy", "helpfulness", "safety"]
-        }
+        self.config = dict(DEFAULT_CONFIG, **(config or {}))
+        unknown = set(self.config["detectors"]) - set(DETECTORS)
+        if unknown:
+            raise ValueError(f"Unknown drift detectors: {sorted(unknown)}")
         
         self.baselines: Dict[str, Dict[str, List[float]]] = {}
         self.drift_history: List[DriftPoint] = []
-        self.agent_metrics: Dict[str, Dict[str, List[float]]] = {}
+        self.history_index = DriftHistoryIndex(self.config["history_bucket_seconds"])
+        self.agent_metrics: Dict[str, Dict[str, RollingWindow]] = {}
+        self._series: Dict[Tuple[str, str], _SeriesState] = {}
         self.window_size = 10
         self.actions = []
         self.violations = []
@@ -60,42 +319,155 @@ class DriftDetector:
         if timestamp is None:
             timestamp = datetime.utcnow()
         
-        # Initialize agent metrics if needed
-        if agent_id not in self.agent_metrics:
-            self.agent_metrics[agent_id] = {}
-        if metric_name not in self.agent_metrics[agent_id]:
-            self.agent_metrics[agent_id][metric_name] = []
+        state = self._series_state(agent_id, metric_name)
+        window = state.window
         
-        # Add the data point
-        self.agent_metrics[agent_id][metric_name].append(value)
+        # The baseline is the window_size - 1 points before this one
+        if len(window) == window.capacity:
+            window.pop_oldest()
+        drift_point = None
+        if len(window) >= window.capacity - 1:
+            drift_point = self._detect_drift(agent_id, metric_name, value, timestamp, state)
+        window.push(value)
         
-        # Maintain window size
-        window_size = self.config["window_size"]
-        if len(self.agent_metrics[agent_id][metric_name]) > window_size:
-            self.agent_metrics[agent_id][metric_name] = \
-                self.agent_metrics[agent_id][metric_name][-window_size:]
-        
-        # Check for drift if we have enough data
-        if len(self.agent_metrics[agent_id][metric_name]) >= window_size:
-            drift_point = self._detect_drift(agent_id, metric_name, value, timestamp)
-            if drift_point:
-                self.drift_history.append(drift_point)
-                return drift_point
-        
-        return None
+        if drift_point:
+            self._record_drift(drift_point)
+        return drift_point
+    
+    def _series_state(self, agent_id: str, metric_name: str) -> _SeriesState:
+        state = self._series.get((agent_id, metric_name))
+        if state is None:
+            state = self._series[(agent_id, metric_name)] = _SeriesState(self.config["window_size"])
+            self.agent_metrics.setdefault(agent_id, {})[metric_name] = state.window
+        return state
+    
+    def add_metric_points_batch(self, agent_ids: Any, metric_names: Any = None, values: Any = None,
+                                timestamps: Any = None) -> np.ndarray:
+        """
+        Add many metric data points at once, e.g. to baseline or backfill from history.
+        
+        Equivalent to calling add_metric_point for every row in order: the same drift
+        points are recorded (up to floating point rounding of the baseline statistics)
+        and the per-series state afterwards is the same, so streaming can continue.
+        
+        Args:
+            agent_ids: Array-like of agent IDs, or a DataFrame with agent_id,
+                metric_name, value and (optionally) timestamp columns
+            metric_names: Array-like of metric names
+            values: Array-like of values
+            timestamps: Array-like of datetime64 values or naive UTC datetimes;
+                defaults to now
+            
+        Returns:
+            Structured array (DRIFT_POINT_DTYPE) of the detected drift, in input order
+        """
+        if hasattr(agent_ids, "columns"):
+            frame = agent_ids
+            agent_ids, metric_names, values = frame["agent_id"], frame["metric_name"], frame["value"]
+            if "timestamp" in frame.columns:
+                timestamps = frame["timestamp"]
+        agent_ids = np.asarray(agent_ids, dtype=object)
+        metric_names = np.asarray(metric_names, dtype=object)
+        values = np.asarray(values, dtype=np.float64)
+        if timestamps is None:
+            timestamps = np.full(len(values), np.datetime64(datetime.utcnow(), "us"))
+        timestamps = np.asarray(timestamps, dtype="datetime64[us]")
+        if not len(agent_ids) == len(metric_names) == len(values) == len(timestamps):
+            raise ValueError("agent_ids, metric_names, values and timestamps must have the same length")
+        if not len(values):
+            return np.empty(0, dtype=DRIFT_POINT_DTYPE)
+        
+        # Group rows by series, keeping input order within each series
+        _, agent_codes = np.unique(agent_ids, return_inverse=True)
+        _, metric_codes = np.unique(metric_names, return_inverse=True)
+        series_codes = agent_codes.astype(np.int64) * (metric_codes.max() + 1) + metric_codes
+        order = np.argsort(series_codes, kind="stable")
+        boundaries = np.flatnonzero(np.diff(series_codes[order])) + 1
+        
+        found = []
+        for rows in np.split(order, boundaries):
+            agent_id, metric_name = agent_ids[rows[0]], metric_names[rows[0]]
+            found.extend(self._evaluate_series(self._series_state(agent_id, metric_name),
+                                               agent_id, metric_name, rows, values[rows]))
+        found.sort(key=lambda item: item[0])
+        
+        result = np.empty(len(found), dtype=DRIFT_POINT_DTYPE)
+        for i, (row, old_value, magnitude, confidence, detector) in enumerate(found):
+            drift_point = DriftPoint(
+                timestamp=timestamps[row].astype(datetime),
+                agent_id=agent_ids[row],
+                metric_name=metric_names[row],
+                old_value=old_value,
+                new_value=float(values[row]),
+                drift_magnitude=magnitude,
+                confidence=confidence,
+                severity=self._severity(magnitude),
+                detector=detector
+            )
+            self._record_drift(drift_point)
+            result[i] = (row, timestamps[row], drift_point.agent_id, drift_point.metric_name,
+                         old_value, drift_point.new_value, magnitude, confidence,
+                         drift_point.severity, detector)
+        return result
+    
+    def _evaluate_series(self, state: _SeriesState, agent_id: str, metric_name: str,
+                         rows: np.ndarray, values: np.ndarray) -> List[Tuple[int, float, float, float, str]]:
+        """
+        Evaluate one series' new points against rolling baselines and advance its state.
+        
+        Returns:
+            (row, baseline mean, drift magnitude, confidence, detector) per drift point
+        """
+        window = state.window
+        baseline_size = window.capacity - 1
+        history = np.fromiter(window, dtype=np.float64, count=len(window))
+        series = np.concatenate([history, values])
+        window.load(series[-window.capacity:].tolist())
+        
+        # Positions in series of the new points that have a full baseline before them
+        first = max(len(history), baseline_size)
+        if first >= len(series) or baseline_size < 1:
+            return []
+        positions = np.arange(first, len(series))
+        means = np.empty(len(positions))
+        stds = np.empty(len(positions))
+        windows = np.lib.stride_tricks.sliding_window_view(series, baseline_size)
+        for start in range(0, len(positions), _BATCH_CHUNK_ROWS):
+            chunk = windows[positions[start:start + _BATCH_CHUNK_ROWS] - baseline_size]
+            means[start:start + len(chunk)] = chunk.mean(axis=1)
+            stds[start:start + len(chunk)] = chunk.std(axis=1, ddof=1) if baseline_size > 1 else 0.0
+        
+        valid = stds > 0
+        positions, means, stds = positions[valid], means[valid], stds[valid]
+        z = (series[positions] - means) / stds
+        magnitudes = np.abs(z)
+        confidences = np.minimum(0.99, 1.0 - (1.0 / baseline_size) + magnitudes / 10)
+        
+        if list(self.config["detectors"]) == ["zscore"]:
+            fired = magnitudes >= self.config["detection_threshold"]
+            detectors = np.full(len(z), "zscore", dtype=object)
+        else:
+            # Sequential detectors depend on their previous alarms; run them point by point
+            detectors = np.array([self._first_alarm(state, zi, mi) for zi, mi in
+                                  zip(z.tolist(), magnitudes.tolist())], dtype=object)
+            fired = np.array([d is not None for d in detectors], dtype=bool)
+        keep = fired & (confidences >= self.config["confidence_threshold"])
+        
+        offset = len(history)
+        return list(zip(rows[positions[keep] - offset].tolist(), means[keep].tolist(),
+                        magnitudes[keep].tolist(), confidences[keep].tolist(),
+                        detectors[keep].tolist()))
+    
+    def _record_drift(self, drift_point: DriftPoint) -> None:
+        self.drift_history.append(drift_point)
+        self.history_index.add(drift_point)
     
     def _detect_drift(self, agent_id: str, metric_name: str, new_value: float, 
-                     timestamp: datetime) -> Optional[DriftPoint]:
-        """Detect drift for a specific metric."""
-        values = self.agent_metrics[agent_id][metric_name]
-        
-        if len(values) < self.config["window_size"]:
-            return None
-        
-        # Calculate baseline (excluding the new value)
-        baseline_values = values[:-1]
-        baseline_mean = statistics.mean(baseline_values)
-        baseline_std = statistics.stdev(baseline_values) if len(baseline_values) > 1 else 0
+                     timestamp: datetime, state: _SeriesState) -> Optional[DriftPoint]:
+        """Run the configured detectors on a point against its baseline window."""
+        window = state.window
+        baseline_mean = window.mean
+        baseline_std = window.std()
         
         if baseline_std == 0:
             return None
@@ -103,26 +475,16 @@ class DriftDetector:
         # Calculate drift magnitude
         drift_magnitude = abs(new_value - baseline_mean) / baseline_std
         
-        # Check if drift exceeds threshold
-        if drift_magnitude < self.config["detection_threshold"]:
+        detector = self._first_alarm(state, (new_value - baseline_mean) / baseline_std, drift_magnitude)
+        if detector is None:
             return None
         
         # Calculate confidence based on sample size and drift magnitude
-        confidence = min(0.99, 1.0 - (1.0 / len(baseline_values)) + (drift_magnitude / 10))
+        confidence = min(0.99, 1.0 - (1.0 / len(window)) + (drift_magnitude / 10))
         
         if confidence < self.config["confidence_threshold"]:
             return None
         
-        # Determine severity
-        if drift_magnitude >= 4.0:
-            severity = "critical"
-        elif drift_magnitude >= 3.0:
-            severity = "high"
-        elif drift_magnitude >= 2.5:
-            severity = "medium"
-        else:
-            severity = "low"
-        
         return DriftPoint(
             timestamp=timestamp,
             agent_id=agent_id,
@@ -131,9 +493,64 @@ class DriftDetector:
             new_value=new_value,
             drift_magnitude=drift_magnitude,
             confidence=confidence,
-            severity=severity
+            severity=self._severity(drift_magnitude),
+            detector=detector
         )
     
+    @staticmethod
+    def _severity(drift_magnitude: float) -> str:
+        if drift_magnitude >= 4.0:
+            return "critical"
+        elif drift_magnitude >= 3.0:
+            return "high"
+        elif drift_magnitude >= 2.5:
+            return "medium"
+        return "low"
+    
+    def _first_alarm(self, state: _SeriesState, z: float, drift_magnitude: float) -> Optional[str]:
+        """
+        Update the sequential detectors with a standardized point.
+        
+        Args:
+            state: Series state
+            z: Point minus baseline mean, in baseline standard deviations
+            drift_magnitude: abs(z)
+        
+        Returns:
+            Name of the first detector (in DETECTORS order) that raised an alarm
+        """
+        config = self.config
+        alarm = None
+        for name in config["detectors"]:
+            if name == "zscore":
+                fired = drift_magnitude >= config["detection_threshold"]
+            elif name == "ewma":
+                lam = config["ewma_lambda"]
+                state.ewma = z if state.ewma is None else lam * z + (1 - lam) * state.ewma
+                fired = abs(state.ewma) >= config["ewma_threshold"] * math.sqrt(lam / (2 - lam))
+                if fired:
+                    state.ewma = None
+            elif name == "cusum":
+                k = config["cusum_k"]
+                state.cusum_pos = max(0.0, state.cusum_pos + z - k)
+                state.cusum_neg = max(0.0, state.cusum_neg - z - k)
+                fired = max(state.cusum_pos, state.cusum_neg) > config["cusum_h"]
+                if fired:
+                    state.cusum_pos = state.cusum_neg = 0.0
+            else:  # page_hinkley
+                delta = config["page_hinkley_delta"]
+                state.ph_pos += z - delta
+                state.ph_pos_min = min(state.ph_pos_min, state.ph_pos)
+                state.ph_neg += -z - delta
+                state.ph_neg_min = min(state.ph_neg_min, state.ph_neg)
+                fired = max(state.ph_pos - state.ph_pos_min,
+                            state.ph_neg - state.ph_neg_min) > config["page_hinkley_lambda"]
+                if fired:
+                    state.ph_pos = state.ph_pos_min = state.ph_neg = state.ph_neg_min = 0.0
+            if fired and alarm is None:
+                alarm = name
+        return alarm
+    
     def get_agent_drift_summary(self, agent_id: str, 
                                time_window: Optional[timedelta] = None) -> Dict[str, Any]:
         """Get drift summary for a specific agent."""
@@ -141,12 +558,35 @@ class DriftDetector:
             time_window = timedelta(days=7)
         
         cutoff_time = datetime.utcnow() - time_window
-        recent_drifts = [
-            drift for drift in self.drift_history
-            if drift.agent_id == agent_id and drift.timestamp >= cutoff_time
-        ]
+        buckets, partial = self.history_index.window(cutoff_time)
+        
+        count = 0
+        confidence_sum = 0.0
+        severity_counts: Dict[str, int] = {}
+        metric_drifts: Dict[str, List[float]] = {}  # metric -> [magnitude_sum, count]
+        for bucket in buckets:
+            agent = bucket.agents.get(agent_id)
+            if agent is None:
+                continue
+            count += agent[0]
+            confidence_sum += agent[1]
+            for severity, n in agent[2].items():
+                severity_counts[severity] = severity_counts.get(severity, 0) + n
+            for metric, (magnitude_sum, n) in agent[3].items():
+                totals = metric_drifts.setdefault(metric, [0.0, 0])
+                totals[0] += magnitude_sum
+                totals[1] += n
+        for drift in partial:
+            if drift.agent_id != agent_id:
+                continue
+            count += 1
+            confidence_sum += drift.confidence
+            severity_counts[drift.severity] = severity_counts.get(drift.severity, 0) + 1
+            totals = metric_drifts.setdefault(drift.metric_name, [0.0, 0])
+            totals[0] += drift.drift_magnitude
+            totals[1] += 1
         
-        if not recent_drifts:
+        if not count:
             return {
                 "agent_id": agent_id,
                 "drift_count": 0,
@@ -155,28 +595,14 @@ class DriftDetector:
                 "most_drifted_metric": None
             }
         
-        # Calculate statistics
-        severity_counts = {}
-        for drift in recent_drifts:
-            severity_counts[drift.severity] = severity_counts.get(drift.severity, 0) + 1
-        
-        avg_confidence = statistics.mean([drift.confidence for drift in recent_drifts])
-        
-        # Find most drifted metric
-        metric_drifts = {}
-        for drift in recent_drifts:
-            if drift.metric_name not in metric_drifts:
-                metric_drifts[drift.metric_name] = []
-            metric_drifts[drift.metric_name].append(drift.drift_magnitude)
-        
         most_drifted_metric = max(metric_drifts.keys(), 
-                                 key=lambda m: statistics.mean(metric_drifts[m])) if metric_drifts else None
+                                 key=lambda m: metric_drifts[m][0] / metric_drifts[m][1])
         
         return {
             "agent_id": agent_id,
-            "drift_count": len(recent_drifts),
+            "drift_count": count,
             "severity_distribution": severity_counts,
-            "average_confidence": avg_confidence,
+            "average_confidence": confidence_sum / count,
             "most_drifted_metric": most_drifted_metric
         }
     
@@ -186,12 +612,16 @@ class DriftDetector:
             time_window = timedelta(days=7)
         
         cutoff_time = datetime.utcnow() - time_window
-        recent_drifts = [
-            drift for drift in self.drift_history
-            if drift.timestamp >= cutoff_time
-        ]
+        buckets, partial = self.history_index.window(cutoff_time)
         
-        if not recent_drifts:
+        # Treat the loose points of the cutoff bucket as one more (oldest) bucket
+        head = _DriftBucket()
+        for drift in partial:
+            head.add(drift)
+        buckets = [head] + buckets if head.count else buckets
+        total = sum(bucket.count for bucket in buckets)
+        
+        if not total:
             return {
                 "total_drifts": 0,
                 "affected_agents": 0,
@@ -201,23 +631,18 @@ class DriftDetector:
             }
         
         # Calculate statistics
-        affected_agents = len(set(drift.agent_id for drift in recent_drifts))
-        severity_counts = {}
-        for drift in recent_drifts:
-            severity_counts[drift.severity] = severity_counts.get(drift.severity, 0) + 1
-        
-        avg_confidence = statistics.mean([drift.confidence for drift in recent_drifts])
+        agents = set()
+        severity_counts: Dict[str, int] = {}
+        confidence_sum = 0.0
+        for bucket in buckets:
+            agents.update(bucket.agents)
+            confidence_sum += bucket.confidence_sum
+            for severity, n in bucket.severity.items():
+                severity_counts[severity] = severity_counts.get(severity, 0) + n
         
         # Determine trend
-        if len(recent_drifts) > 10:
-            # Calculate trend over time
-            sorted_drifts = sorted(recent_drifts, key=lambda d: d.timestamp)
-            first_half = sorted_drifts[:len(sorted_drifts)//2]
-            second_half = sorted_drifts[len(sorted_drifts)//2:]
-            
-            first_avg = statistics.mean([d.drift_magnitude for d in first_half])
-            second_avg = statistics.mean([d.drift_magnitude for d in second_half])
-            
+        if total > 10:
+            first_avg, second_avg = self._half_magnitudes(buckets, total)
             if second_avg > first_avg * 1.2:
                 trend = "increasing"
             elif second_avg < first_avg * 0.8:
@@ -228,19 +653,47 @@ class DriftDetector:
             trend = "insufficient_data"
         
         return {
-            "total_drifts": len(recent_drifts),
-            "affected_agents": affected_agents,
+            "total_drifts": total,
+            "affected_agents": len(agents),
             "severity_distribution": severity_counts,
-            "average_confidence": avg_confidence,
+            "average_confidence": confidence_sum / total,
             "drift_trend": trend
         }
     
+    @staticmethod
+    def _half_magnitudes(buckets: List[_DriftBucket], total: int) -> Tuple[float, float]:
+        """
+        Mean drift magnitude of the older and the newer half of the drifts (by time).
+        
+        Only the bucket containing the split point is sorted; all others contribute
+        their aggregates.
+        """
+        half = total // 2
+        first_sum = 0.0
+        seen = 0
+        for bucket in buckets:
+            if seen + bucket.count <= half:
+                first_sum += bucket.magnitude_sum
+                seen += bucket.count
+                if seen == half:
+                    break
+                continue
+            ordered = sorted(bucket.points, key=lambda d: d.timestamp)
+            first_sum += sum(d.drift_magnitude for d in ordered[:half - seen])
+            break
+        total_sum = sum(bucket.magnitude_sum for bucket in buckets)
+        return first_sum / half, (total_sum - first_sum) / (total - half)
+    
     def reset_baseline(self, agent_id: str, metric_name: Optional[str] = None):
         """Reset baseline for an agent and optionally specific metric."""
         if metric_name:
-            if agent_id in self.agent_metrics and metric_name in self.agent_metrics[agent_id]:
-                self.agent_metrics[agent_id][metric_name] = []
+            state = self._series.get((agent_id, metric_name))
+            if state is not None:
+                state.window.clear()
+                state.reset_detectors()
         else:
+            for metric in self.agent_metrics.get(agent_id, {}):
+                self._series.pop((agent_id, metric), None)
             if agent_id in self.agent_metrics:
                 self.agent_metrics[agent_id] = {}
     
@@ -248,7 +701,10 @@ class DriftDetector:
                          severity: Optional[str] = None,
                          time_window: Optional[timedelta] = None) -> List[DriftPoint]:
         """Get drift history with optional filtering."""
-        drifts = self.drift_history.copy()
+        if time_window:
+            drifts = list(self.history_index.points(datetime.utcnow() - time_window))
+        else:
+            drifts = self.drift_history.copy()
         
         if agent_id:
             drifts = [d for d in drifts if d.agent_id == agent_id]
@@ -256,12 +712,8 @@ class DriftDetector:
         if severity:
             drifts = [d for d in drifts if d.severity == severity]
         
-        if time_window:
-            cutoff_time = datetime.utcnow() - time_window
-            drifts = [d for d in drifts if d.timestamp >= cutoff_time]
-        
         return sorted(drifts, key=lambda d: d.timestamp, reverse=True)
-
+    
     def add_action(self, agent_id: str, action_type: str, compliance_score: float) -> Optional[str]:
         """Add an action to the drift detector."""
         self.actions.append({
@@ -283,4 +735,4 @@ class DriftDetector:
     
     def predict_compliance(self, agent_id: str, action_data: Dict[str, Any]) -> float:
         """Predict compliance score for an agent."""
-        return 0.8  # Default high compliance 
\ No newline at end of file
+        return 0.8  # Default high compliance 
@@ -21,7 +21,8 @@ from dreamos.utils.resilient_io import (
 )
 
 # Import the checkpoint manager
-from dreamos.core.checkpoint_manager import CheckpointManager
+from dreamos.core.checkpoint_manager import CheckpointManager, new_checkpoint_path
+from dreamos.core.checkpoint_store import DeltaCheckpointStore, is_delta_manifest
 
 # Configure logging
 logging.basicConfig(level=logging.INFO,
@@ -47,54 +48,69 @@ class ResilientCheckpointManager:
         
         # Get latest checkpoint
         latest = resilient_manager.get_latest_checkpoint("routine")
+    
+    Supports the same delta checkpoint format as CheckpointManager.
     """
     
-    def __init__(self, agent_id: str):
+    def __init__(self, agent_id: str, delta: bool = False, max_chain_length: int = 8):
         """
         Initialize the resilient checkpoint manager for a specific agent.
         
         Args:
             agent_id: Identifier of the agent
+            delta: Write delta manifests instead of full JSON snapshots
+            max_chain_length: Delta checkpoints allowed before a full manifest is written
         """
         self.agent_id = agent_id
         self.checkpoint_dir = "runtime/agent_comms/checkpoints"
-        self.manager = CheckpointManager(agent_id)
+        self.delta = delta
+        self.store = DeltaCheckpointStore(self.checkpoint_dir, agent_id, max_chain_length)
+        self.manager = CheckpointManager(agent_id, delta=delta, max_chain_length=max_chain_length)
         logger.info(f"Initialized ResilientCheckpointManager for {agent_id}")
     
-    def create_checkpoint(self, checkpoint_type: str = "routine") -> str:
+    def create_checkpoint(self, checkpoint_type: str = "routine",
+                          state: Optional[Dict[str, Any]] = None) -> str:
         """
         Create a checkpoint of the agent's current state with resilient IO.
         
         Args:
             checkpoint_type: Type of checkpoint ("routine", "pre_operation", "recovery")
+            state: Previously collected state (see collect_state); collected now if omitted
             
         Returns:
             Path to the created checkpoint file
         """
-        timestamp = self._get_timestamp()
-        filename = f"{self.agent_id}_{timestamp}_{checkpoint_type}.checkpoint"
-        path = os.path.join(self.checkpoint_dir, filename)
+        path = new_checkpoint_path(self.checkpoint_dir, self.agent_id, checkpoint_type)
         
         try:
             # Collect agent state using resilient IO operations
-            state = {
-                "current_task": self._get_current_task_state(),
-                "mailbox": self._get_mailbox_state(),
-                "operational_context": self._get_operational_context(),
-                "memory": self._get_memory_state()
-            }
-            
-            # Create checkpoint data
-            checkpoint_data = {
-                "agent_id": self.agent_id,
-                "timestamp": self._get_timestamp_iso(),
-                "checkpoint_type": checkpoint_type,
-                "version": "1.0",
-                "state": state
-            }
+            if state is None:
+                state = self.collect_state()
             
-            # Write checkpoint data using resilient IO
-            write_json(path, checkpoint_data)
+            if self.delta:
+                header = {
+                    "agent_id": self.agent_id,
+                    "timestamp": self._get_timestamp_iso(),
+                    "checkpoint_type": checkpoint_type
+                }
+                checkpoint_data = self.store.build_manifest(
+                    state, header, path, self._get_parent_checkpoint(path), load_manifest=read_json
+                )
+                
+                # Write manifest using resilient IO
+                write_json(path, checkpoint_data, indent=None)
+            else:
+                # Create checkpoint data
+                checkpoint_data = {
+                    "agent_id": self.agent_id,
+                    "timestamp": self._get_timestamp_iso(),
+                    "checkpoint_type": checkpoint_type,
+                    "version": "1.0",
+                    "state": state
+                }
+                
+                # Write checkpoint data using resilient IO
+                write_json(path, checkpoint_data)
             
             logger.info(f"Created {checkpoint_type} checkpoint at {path}")
             
@@ -106,7 +122,16 @@ class ResilientCheckpointManager:
         except Exception as e:
             logger.error(f"Failed to create checkpoint: {str(e)}")
             # Try to use the original checkpoint manager as a fallback
-            return self.manager.create_checkpoint(checkpoint_type)
+            return self.manager.create_checkpoint(checkpoint_type, state)
+    
+    def collect_state(self) -> Dict[str, Any]:
+        """Collect the agent state that a checkpoint records, using resilient IO."""
+        return {
+            "current_task": self._get_current_task_state(),
+            "mailbox": self._get_mailbox_state(),
+            "operational_context": self._get_operational_context(),
+            "memory": self._get_memory_state()
+        }
     
     def restore_checkpoint(self, checkpoint_path: str) -> bool:
         """
@@ -126,6 +151,10 @@ class ResilientCheckpointManager:
             if checkpoint_data["agent_id"] != self.agent_id:
                 raise ValueError(f"Checkpoint belongs to {checkpoint_data['agent_id']}, not {self.agent_id}")
             
+            # Delta manifests reference their state through the chunk store
+            if is_delta_manifest(checkpoint_data):
+                checkpoint_data["state"] = self.store.resolve_state(checkpoint_path, load_manifest=read_json)
+            
             # Apply state restoration
             self._restore_task_state(checkpoint_data["state"]["current_task"])
             self._restore_mailbox_state(checkpoint_data["state"]["mailbox"])
@@ -359,8 +388,16 @@ class ResilientCheckpointManager:
             
         return checkpoints
     
+    def _get_parent_checkpoint(self, path: str) -> Optional[str]:
+        """Return the newest existing checkpoint of any type other than `path`."""
+        checkpoints = sorted(
+            (c for c in self._list_checkpoints() if os.path.abspath(c) != os.path.abspath(path)),
+            key=os.path.getmtime
+        )
+        return checkpoints[-1] if checkpoints else None
+    
     def _apply_retention_policy(self, checkpoint_type: str) -> None:
-        """Apply retention policy for checkpoints."""
+        """Apply retention policy for checkpoints, keeping delta chains restorable."""
         try:
             # Retention policies based on checkpoint type
             if checkpoint_type == "routine":
@@ -369,21 +406,25 @@ class ResilientCheckpointManager:
                 if len(routine_checkpoints) > 3:
                     # Sort by creation time
                     sorted_checkpoints = sorted(routine_checkpoints)
+                    # Keep the parents of the 3 newest so their chains stay restorable
+                    protected = self.store.ancestors(sorted_checkpoints[-3:], load_manifest=read_json)
                     # Remove oldest checkpoints
                     for checkpoint in sorted_checkpoints[:-3]:
+                        if checkpoint in protected:
+                            continue
                         if os.path.exists(checkpoint):
                             os.remove(checkpoint)
                             logger.info(f"Removed old routine checkpoint: {checkpoint}")
+                    
+                    removed = self.store.collect_garbage(self._list_checkpoints(), load_manifest=read_json)
+                    if removed:
+                        logger.info(f"Removed {removed} unreferenced checkpoint chunks")
             
             # For recovery checkpoints, we keep them for 7 days
             # This would require a date-based cleanup which we'll implement in a future update
         except Exception as e:
             logger.error(f"Error applying retention policy: {str(e)}")
     
-    def _get_timestamp(self) -> str:
-        """Get current timestamp in YYYYMMDDHHMMSS format."""
-        return time.strftime("%Y%m%d%H%M%S", time.gmtime())
-    
     def _get_timestamp_iso(self) -> str:
         """Get current timestamp in ISO format."""
         return time.strftime("%Y-%m-%dT%H:%M:%S.000Z", time.gmtime())
@@ -10,6 +10,7 @@ This module provides a robust task execution system with:
 
 import os
 import json
+import atexit
 import logging
 import asyncio
 import uuid
@@ -44,10 +45,17 @@ class TaskExecutor:
         
         Args:
             task_nexus: Task nexus for task management
-            feedback_engine: Optional feedback engine for quality tracking
+            feedback_engine: Optional feedback engine for quality tracking. The default
+                engine analyzes feedback asynchronously, so execution never waits on it;
+                it is closed by close() or at interpreter exit.
         """
         self.task_nexus = task_nexus
-        self.feedback_engine = feedback_engine or FeedbackEngineV2()
+        self._owns_feedback_engine = feedback_engine is None
+        if feedback_engine is None:
+            feedback_engine = FeedbackEngineV2({"async_ingest": True})
+            # Feedback still queued at exit would otherwise be lost with the daemon threads
+            atexit.register(feedback_engine.close)
+        self.feedback_engine = feedback_engine
         self.execution_history = {}  # Track execution attempts
         self.quality_metrics = {}  # Track quality metrics
         
@@ -55,6 +63,18 @@ class TaskExecutor:
         self.product_output_dir = Path("runtime/product_outputs")
         self.product_output_dir.mkdir(parents=True, exist_ok=True)
         
+    def close(self, timeout: Optional[float] = None) -> None:
+        """Drain queued feedback and flush the default feedback engine to disk.
+        
+        A feedback engine passed in by the caller is left open.
+        
+        Args:
+            timeout: Maximum seconds to wait for queued feedback
+        """
+        if self._owns_feedback_engine:
+            self.feedback_engine.close(timeout)
+            atexit.unregister(self.feedback_engine.close)
+        
     async def execute_task(self, task_id: str, agent_id: str) -> bool:
         """Execute a task with proper tracking and error handling."""
         task = self.task_nexus.get_task_by_id(task_id)
@@ -279,4 +279,21 @@ def test_get_quality_metrics(executor):
     
     # Get nonexistent task metrics
     nonexistent_metrics = executor.get_quality_metrics("nonexistent")
-    assert nonexistent_metrics == {} 
\ No newline at end of file
+    assert nonexistent_metrics == {} 
+def test_close_drains_default_feedback_engine(task_nexus):
+    """Test that the default feedback engine is closed by close() or at exit."""
+    with patch("dreamos.core.tasks.execution.task_executor.FeedbackEngineV2") as engine_cls, \
+            patch("dreamos.core.tasks.execution.task_executor.atexit") as atexit:
+        executor = TaskExecutor(task_nexus)
+        engine = engine_cls.return_value
+        engine_cls.assert_called_once_with({"async_ingest": True})
+        atexit.register.assert_called_once_with(engine.close)
+
+        executor.close(timeout=1.0)
+        engine.close.assert_called_once_with(1.0)
+        atexit.unregister.assert_called_once_with(engine.close)
+
+def test_close_leaves_supplied_feedback_engine_open(executor, feedback_engine):
+    """Test that close() does not close a feedback engine passed in by the caller."""
+    executor.close()
+    feedback_engine.close.assert_not_called()
@@ -11,6 +11,7 @@ import unittest
 from pathlib import Path
 from datetime import datetime, timezone
 import time
+from unittest import mock
 
 # Import the module to test
 from dreamos.core.checkpoint_manager import CheckpointManager
@@ -204,6 +205,71 @@ class TestCheckpointManager(unittest.TestCase):
             restored_context = json.load(f)
         
         self.assertEqual(restored_context["goals"], ["Test goal 1", "Test goal 2"])
+    
+    def test_delta_checkpoint_chain(self):
+        """Test that delta checkpoints store only changed sections and restore through the chain."""
+        manager = CheckpointManager(self.agent_id, delta=True)
+        self.addCleanup(shutil.rmtree, manager.store.objects_dir, True)
+        
+        test_memory = {"short_term": ["fact 1"], "session": ["step 1"]}
+        with open(f"{self.agent_data_dir}/memory.json", 'w') as f:
+            json.dump(test_memory, f)
+        
+        base = manager.create_checkpoint("recovery")
+        
+        # Only the operational context changes
+        with open(f"{self.agent_data_dir}/context.json", 'w') as f:
+            json.dump({"goals": ["Delta goal"]}, f)
+        delta = manager.create_checkpoint("pre_operation")
+        
+        with open(base, 'r') as f:
+            base_manifest = json.load(f)
+        with open(delta, 'r') as f:
+            delta_manifest = json.load(f)
+        
+        self.assertEqual(base_manifest["format"], "delta")
+        self.assertIsNone(base_manifest["parent"])
+        self.assertEqual(len(base_manifest["sections"]), 4)
+        self.assertEqual(delta_manifest["parent"], os.path.basename(base))
+        self.assertEqual(list(delta_manifest["sections"]), ["operational_context"])
+        
+        # Modify memory, then restore the delta checkpoint
+        with open(f"{self.agent_data_dir}/memory.json", 'w') as f:
+            json.dump({"short_term": [], "session": []}, f)
+        
+        self.assertTrue(manager.restore_checkpoint(delta))
+        
+        with open(f"{self.agent_data_dir}/memory.json", 'r') as f:
+            self.assertEqual(json.load(f), test_memory)
+        with open(f"{self.agent_data_dir}/context.json", 'r') as f:
+            self.assertEqual(json.load(f)["goals"], ["Delta goal"])
+    
+    def test_same_instant_checkpoints_do_not_overwrite(self):
+        """Test that checkpoints created at the same clock reading get distinct names."""
+        manager = CheckpointManager(self.agent_id, delta=True)
+        self.addCleanup(shutil.rmtree, manager.store.objects_dir, True)
+        
+        with open(f"{self.agent_data_dir}/context.json", 'w') as f:
+            json.dump({"goals": ["First goal"]}, f)
+        frozen = datetime(2025, 1, 1, 12, 0, 0, tzinfo=timezone.utc)
+        with mock.patch("dreamos.core.checkpoint_manager.datetime") as clock:
+            clock.now.return_value = frozen
+            first = manager.create_checkpoint("routine")
+            with open(f"{self.agent_data_dir}/context.json", 'w') as f:
+                json.dump({"goals": ["Second goal"]}, f)
+            second = manager.create_checkpoint("routine")
+        
+        self.assertNotEqual(first, second)
+        self.assertEqual(sorted([second, first]), [first, second])
+        with open(second, 'r') as f:
+            self.assertEqual(json.load(f)["parent"], os.path.basename(first))
+        
+        self.assertTrue(manager.restore_checkpoint(first))
+        with open(f"{self.agent_data_dir}/context.json", 'r') as f:
+            self.assertEqual(json.load(f)["goals"], ["First goal"])
+        self.assertTrue(manager.restore_checkpoint(second))
+        with open(f"{self.agent_data_dir}/context.json", 'r') as f:
+            self.assertEqual(json.load(f)["goals"], ["Second goal"])
 
 if __name__ == "__main__":
     unittest.main() 
\ No newline at end of file
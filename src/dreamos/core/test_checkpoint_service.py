@@ -0,0 +1,106 @@
+"""
+Test script for the CheckpointService implementation.
+
+This script tests queueing, coalescing and completion of background checkpoints.
+"""
+
+import queue
+import tempfile
+import threading
+import time
+import types
+import unittest
+
+from dreamos.core.checkpoint_service import CheckpointService
+from dreamos.core.checkpoint_store import DeltaCheckpointStore
+
+
+class FakeCheckpointManager:
+    """Records checkpoints instead of writing them; blocks until released."""
+
+    def __init__(self, agent_id, release, written):
+        self.agent_id = agent_id
+        self.release = release
+        self.written = written
+
+    def create_checkpoint(self, checkpoint_type="routine", state=None):
+        self.release.wait(5)
+        self.written.append((self.agent_id, checkpoint_type, state))
+        return f"{self.agent_id}_{checkpoint_type}.checkpoint"
+
+
+class TestCheckpointService(unittest.TestCase):
+    """Test cases for CheckpointService."""
+
+    def setUp(self):
+        """Set up a service whose writes block until released."""
+        self.release = threading.Event()
+        self.written = []
+        self.service = CheckpointService(
+            max_pending=2,
+            batch_window=0,
+            manager_factory=lambda agent_id: FakeCheckpointManager(agent_id, self.release, self.written)
+        )
+
+    def tearDown(self):
+        """Stop the writer thread."""
+        self.release.set()
+        self.service.shutdown()
+
+    def test_coalescing_and_completion(self):
+        """Queued requests for the same agent share one write with the latest state."""
+        # Occupy the writer so the following requests stay queued
+        first = self.service.request_checkpoint("agent-0", "routine")
+        while self.service.pending_count():
+            time.sleep(0.001)
+
+        a = self.service.request_checkpoint("agent-1", "routine", {"memory": 1})
+        b = self.service.request_checkpoint("agent-1", "recovery", {"memory": 2})
+        self.assertIs(a, b)
+
+        # Only agent-1 is pending, so one more agent fits and a third does not
+        self.service.request_checkpoint("agent-2")
+        with self.assertRaises(queue.Full):
+            self.service.request_checkpoint("agent-3")
+
+        self.release.set()
+        self.assertEqual(first.result(timeout=5), "agent-0_routine.checkpoint")
+        self.assertEqual(b.result(timeout=5), "agent-1_recovery.checkpoint")
+        self.assertTrue(self.service.flush(timeout=5))
+
+        self.assertIn(("agent-1", "recovery", {"memory": 2}), self.written)
+        self.assertEqual(len(self.written), 3)
+        self.assertEqual(self.service.stats["coalesced"], 1)
+
+    def test_coalescing_keeps_most_important_type(self):
+        """A routine request queued after a pre_operation one does not downgrade it."""
+        first = self.service.request_checkpoint("agent-0", "routine")
+        while self.service.pending_count():
+            time.sleep(0.001)
+
+        pre = self.service.request_checkpoint("agent-1", "pre_operation", {"memory": 1})
+        routine = self.service.request_checkpoint("agent-1", "routine", {"memory": 2})
+        self.assertIs(pre, routine)
+
+        self.release.set()
+        first.result(timeout=5)
+        self.assertEqual(routine.result(timeout=5), "agent-1_pre_operation.checkpoint")
+        self.assertIn(("agent-1", "pre_operation", {"memory": 2}), self.written)
+
+    def test_service_enables_batched_sync_of_delta_chunks(self):
+        """Only stores owned by the service record their chunk files for batched fsync."""
+        with tempfile.TemporaryDirectory() as checkpoint_dir:
+            standalone = DeltaCheckpointStore(checkpoint_dir, "agent-1")
+            standalone.put({"memory": [1]})
+            self.assertEqual(standalone.unsynced, [])
+
+            manager = types.SimpleNamespace(store=DeltaCheckpointStore(checkpoint_dir, "agent-2"))
+            service = CheckpointService(manager_factory=lambda agent_id: manager)
+            self.addCleanup(service.shutdown)
+            self.assertIs(service._get_manager("agent-2"), manager)
+            manager.store.put({"memory": [2]})
+            self.assertEqual(len(manager.store.drain_unsynced()), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,165 @@
+"""
+Tests for the streaming DriftDetector.
+"""
+
+import random
+import statistics
+import unittest
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from dreamos.core.drift_detector import DriftDetector, RollingWindow
+
+
+def _mixed_magnitude(rng, n):
+    """Values around 0.1-10 with rare spikes of up to 2e9."""
+    return [rng.choice([0.1, 1.0, 10.0, 1e3, 1e6, 1e9]) * rng.uniform(1, 2) if rng.random() < 0.05
+            else rng.uniform(0.1, 10) for _ in range(n)]
+
+
+class TestDriftDetector(unittest.TestCase):
+    """Test cases for rolling statistics, detectors and bucketed history."""
+
+    def test_rolling_window_matches_exact_statistics(self):
+        rng = random.Random(1)
+        window = RollingWindow(50)
+        values = []
+        for _ in range(5000):
+            value = rng.gauss(1000, 3)
+            window.push(value)
+            values = (values + [value])[-50:]
+        self.assertEqual(window, values)
+        self.assertAlmostEqual(window.mean, statistics.mean(values), places=9)
+        self.assertAlmostEqual(window.std(), statistics.stdev(values), places=9)
+
+        for _ in range(200):
+            window.push(7.0)
+        self.assertEqual(window.std(), 0.0)
+
+    def test_rolling_window_survives_heavy_tailed_values(self):
+        rng = random.Random(4)
+        values = _mixed_magnitude(rng, 5000)
+        window = RollingWindow(20)
+        for i, value in enumerate(values):
+            window.push(value)
+            recent = values[max(0, i - 19):i + 1]
+            self.assertAlmostEqual(window.mean / statistics.mean(recent), 1.0, places=9)
+            if len(recent) > 1:
+                self.assertAlmostEqual(window.std() / statistics.stdev(recent), 1.0, places=6)
+
+        # Streaming flags exactly the points an exact two-pass baseline does
+        detector = DriftDetector({"window_size": 20})
+        flagged = [i for i, value in enumerate(values) if detector.add_metric_point("A", "rt", value)]
+        expected = []
+        for i in range(19, len(values)):
+            baseline = values[i - 19:i]
+            z = abs(values[i] - statistics.mean(baseline)) / statistics.stdev(baseline)
+            if z >= 2.0 and min(0.99, 1 - 1 / 19 + z / 10) >= 0.8:
+                expected.append(i)
+        self.assertEqual(flagged, expected)
+
+    def test_zscore_baseline_excludes_new_point(self):
+        detector = DriftDetector({"window_size": 5})
+        start = datetime(2026, 1, 1)
+        for i, value in enumerate([10.0, 11.0, 10.0, 11.0]):
+            self.assertIsNone(detector.add_metric_point("A", "rt", value, start + timedelta(seconds=i)))
+        drift = detector.add_metric_point("A", "rt", 20.0, start + timedelta(seconds=4))
+        self.assertAlmostEqual(drift.old_value, 10.5)
+        self.assertAlmostEqual(drift.drift_magnitude, 9.5 / statistics.stdev([10, 11, 10, 11]))
+        self.assertEqual(drift.severity, "critical")
+        self.assertEqual(drift.detector, "zscore")
+        self.assertEqual(len(detector.agent_metrics["A"]["rt"]), 5)
+
+    def test_cusum_catches_small_persistent_shift(self):
+        rng = random.Random(2)
+        values = [rng.gauss(0, 1) for _ in range(200)] + [rng.gauss(1.2, 1) for _ in range(40)]
+
+        zscore = DriftDetector({"window_size": 100, "detection_threshold": 4.0})
+        cusum = DriftDetector({"window_size": 100, "detection_threshold": 4.0,
+                               "detectors": ["zscore", "cusum"]})
+        for value in values:
+            zscore.add_metric_point("A", "accuracy", value)
+            cusum.add_metric_point("A", "accuracy", value)
+        self.assertEqual(zscore.drift_history, [])
+        self.assertTrue(any(d.detector == "cusum" for d in cusum.drift_history))
+
+        with self.assertRaises(ValueError):
+            DriftDetector({"detectors": ["zscore", "magic"]})
+
+    def test_bucketed_summaries(self):
+        detector = DriftDetector({"window_size": 3, "history_bucket_seconds": 60})
+        now = datetime.utcnow()
+        for hours_ago in (0.1, 0.5, 2, 30):
+            for value in (1.0, 2.0):
+                detector.add_metric_point("A", "rt", value, now - timedelta(hours=hours_ago))
+            detector.add_metric_point("A", "rt", 50.0, now - timedelta(hours=hours_ago))
+
+        self.assertEqual(detector.get_system_drift_summary(timedelta(hours=1))["total_drifts"], 2)
+        self.assertEqual(detector.get_agent_drift_summary("A", timedelta(hours=3))["drift_count"], 3)
+        self.assertEqual(detector.get_agent_drift_summary("A")["most_drifted_metric"], "rt")
+        self.assertEqual(len(detector.get_drift_history(time_window=timedelta(hours=24))), 3)
+        self.assertEqual(detector.get_agent_drift_summary("B")["drift_count"], 0)
+
+    def test_batch_matches_streaming(self):
+        rng = random.Random(3)
+        rows = []
+        for i in range(3000):
+            metric = rng.choice(["rt", "accuracy", "constant"])
+            value = 5.0 if metric == "constant" else rng.gauss(10 + (i > 1500), 1)
+            if rng.random() < 0.02:
+                value += 6
+            rows.append((f"A{rng.randrange(4)}", metric, value))
+        self._assert_batch_matches_streaming(rows, {"window_size": 20, "detectors": ["zscore", "cusum"]})
+
+    def test_batch_matches_streaming_on_mixed_magnitudes(self):
+        rng = random.Random(5)
+        values = _mixed_magnitude(rng, 6000)
+        rows = [(f"A{rng.randrange(2)}", "rt", value) for value in values]
+        for config in ({"window_size": 20}, {"window_size": 20, "detectors": ["zscore", "cusum"]}):
+            self._assert_batch_matches_streaming(rows, config)
+
+    def _assert_batch_matches_streaming(self, rows, config):
+        """Stream rows[:500], batch rows[500:-500], stream the rest; compare with pure streaming."""
+        start = datetime(2026, 1, 1)
+        rows = [row + (start + timedelta(seconds=i),) for i, row in enumerate(rows)]
+        end = len(rows) - 500
+        streaming, batch = DriftDetector(config), DriftDetector(config)
+        for row in rows[:500]:
+            streaming.add_metric_point(*row)
+            batch.add_metric_point(*row)
+        for row in rows[500:end]:
+            streaming.add_metric_point(*row)
+        agent_ids, metrics, values, timestamps = zip(*rows[500:end])
+        result = batch.add_metric_points_batch(agent_ids, metrics, values,
+                                               np.array(timestamps, dtype="datetime64[us]"))
+        for row in rows[end:]:
+            streaming.add_metric_point(*row)
+            batch.add_metric_point(*row)
+
+        key = lambda d: (d.timestamp, d.agent_id, d.metric_name, d.severity, d.detector)
+        self.assertEqual([key(d) for d in batch.drift_history], [key(d) for d in streaming.drift_history])
+        np.testing.assert_allclose([d.drift_magnitude for d in batch.drift_history],
+                                   [d.drift_magnitude for d in streaming.drift_history], rtol=1e-9)
+        self.assertTrue(np.all(np.diff(result["index"]) > 0))
+        self.assertEqual(len(result), sum(1 for d in streaming.drift_history
+                                          if start + timedelta(seconds=500) <= d.timestamp
+                                          < start + timedelta(seconds=end)))
+
+    def test_batch_accepts_dataframe(self):
+        import pandas as pd
+
+        values = [1.0, 2.0, 1.0, 2.0, 1.0, 2.0, 30.0]
+        frame = pd.DataFrame({
+            "agent_id": ["A"] * len(values),
+            "metric_name": ["rt"] * len(values),
+            "value": values,
+            "timestamp": pd.date_range("2026-01-01", periods=len(values), freq="min"),
+        })
+        result = DriftDetector({"window_size": 5}).add_metric_points_batch(frame)
+        self.assertEqual(result["index"].tolist(), [6])
+        self.assertEqual(result["severity"][0], "critical")
+
+
+if __name__ == "__main__":
+    unittest.main()
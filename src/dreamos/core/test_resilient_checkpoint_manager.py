@@ -15,6 +15,7 @@ import shutil
 import unittest
 import tempfile
 import time
+from datetime import datetime, timezone
 from unittest.mock import patch, MagicMock
 from pathlib import Path
 
@@ -290,6 +291,32 @@ class TestResilientCheckpointManager(unittest.TestCase):
         # Verify we have 3 checkpoints (pruned from 5 to 3)
         self.assertEqual(len(routine_checkpoints), 3, f"Expected 3 checkpoints, found {len(routine_checkpoints)}")
 
+    def test_same_second_checkpoints_keep_delta_chain(self):
+        """Test that checkpoints created in the same second never overwrite each other"""
+        # Delta manifests and their chunks live under the working directory
+        cwd = os.getcwd()
+        os.chdir(self.test_dir)
+        self.addCleanup(os.chdir, cwd)
+        manager = ResilientCheckpointManager(self.agent_id, delta=True)
+        context_path = os.path.join(self.agent_data_dir, "context.json")
+        
+        frozen = datetime(2025, 1, 1, 12, 0, 0, tzinfo=timezone.utc)
+        paths = []
+        with patch("dreamos.core.checkpoint_manager.datetime") as clock:
+            clock.now.return_value = frozen
+            for i, checkpoint_type in enumerate(["routine", "pre_operation", "routine"]):
+                with open(context_path, 'w') as f:
+                    json.dump({"goals": [f"Goal {i}"]}, f)
+                paths.append(manager.create_checkpoint(checkpoint_type))
+        
+        self.assertEqual(len(set(paths)), 3)
+        self.assertEqual(sorted(paths, key=os.path.basename), paths)
+        self.assertTrue(all(os.path.exists(path) for path in paths))
+        self.assertEqual(read_json(paths[1])["parent"], os.path.basename(paths[0]))
+        for i, path in enumerate(paths):
+            state = manager.store.resolve_state(path, load_manifest=read_json)
+            self.assertEqual(state["operational_context"]["goals"], [f"Goal {i}"])
+
 def run_integration_test():
     """Run an integration test with the ResilientCheckpointManager"""
     # Import os, time and other required modules
@@ -391,11 +391,11 @@ class CheckpointVerifier:
         # Extract timestamps and calculate intervals
         timestamps = []
         for filename in checkpoint_files:
-            # Extract timestamp from filename (agent-X_YYYYMMDDHHMMSS_type.checkpoint)
+            # Extract timestamp from filename (agent-X_YYYYMMDDHHMMSS[ffffff]_type.checkpoint)
             parts = filename.split("_")
             if len(parts) >= 2:
                 try:
-                    timestamp = datetime.strptime(parts[1], "%Y%m%d%H%M%S")
+                    timestamp = datetime.strptime(parts[1][:14], "%Y%m%d%H%M%S")
                     timestamps.append(timestamp)
                 except ValueError:
                     logger.warning(f"Could not parse timestamp from filename: {filename}")
@@ -8,16 +8,27 @@ This engine is responsible for:
 - Processing user feedback
 - Generating quality improvement recommendations
 - Monitoring performance and reliability
+
+Feedback records and analysis reports are appended to a segmented log
+(see feedback_store.py); derived state is snapshotted in the background of
+ingestion, at most every snapshot_interval_seconds.
+
+With config "async_ingest" (or start_pipeline()), ingest_feedback only
+enqueues the item and analysis runs in a FeedbackPipeline
+(see feedback_pipeline.py), so callers are never blocked on it.
 """
 
 import json
 import logging
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Union
+from typing import Dict, List, Optional, Any, Tuple, Union
 import jsonschema
 
-from dreamos.utils.resilient_io import read_file, write_file
+from dreamos.utils.resilient_io import read_file
+
+from .feedback_pipeline import FeedbackPipeline
+from .feedback_store import DEFAULT_SEGMENT_MAX_BYTES, DEFAULT_SNAPSHOT_INTERVAL, FeedbackStore
 
 logger = logging.getLogger(__name__)
 
@@ -31,84 +42,177 @@ class FeedbackEngineV2:
             config: Optional configuration dictionary
         """
         self.config = config or {}
-        self.feedback_data = {}  # Store feedback data in memory
-        self.quality_metrics = {}  # Store quality metrics
-        self.analysis_reports = []  # Store analysis reports
-        self.retry_strategies = {}  # Store retry strategies
+        self.quality_metrics = {}  # Quality metrics history per task
+        self.task_feedback = {}  # User feedback and failures per task
+        self.retry_strategies = {}  # Retry strategy per task
         
         # Initialize feedback directory
-        self.feedback_dir = Path("runtime/feedback")
+        self.feedback_dir = Path(self.config.get("feedback_dir", "runtime/feedback"))
         self.feedback_dir.mkdir(parents=True, exist_ok=True)
         
+        self.store = FeedbackStore(
+            self.feedback_dir,
+            segment_max_bytes=self.config.get("segment_max_bytes", DEFAULT_SEGMENT_MAX_BYTES),
+            snapshot_interval=self.config.get("snapshot_interval_seconds", DEFAULT_SNAPSHOT_INTERVAL),
+        )
+        # Feedback records by id and analysis reports, owned and indexed by the store
+        self.feedback_data = self.store.feedback
+        self.analysis_reports = self.store.reports
+        
         # Load existing feedback data if available
         self._load_feedback_data()
+        
+        self.pipeline: Optional[FeedbackPipeline] = None
+        if self.config.get("async_ingest"):
+            self.start_pipeline(**self.config.get("pipeline", {}))
+    
+    def start_pipeline(self, **options: Any) -> FeedbackPipeline:
+        """Process ingested feedback asynchronously from now on.
+        
+        Args:
+            **options: FeedbackPipeline options (max_queue, batch_size, batch_timeout,
+                workers, block_timeout)
+            
+        Returns:
+            The running pipeline
+        """
+        if self.pipeline is None:
+            self.pipeline = FeedbackPipeline(self, **options)
+        return self.pipeline
+    
+    def close(self, timeout: Optional[float] = None) -> None:
+        """Drain and stop the pipeline, if any, and write pending state to disk.
+        
+        Args:
+            timeout: Maximum seconds to wait for queued feedback
+        """
+        if self.pipeline is not None:
+            self.pipeline.close(timeout)
+            self.pipeline = None
+        self.store.flush()
+    
+    def _derived_state(self) -> Dict[str, Any]:
+        """State rebuilt from feedback records, as stored in the snapshot."""
+        return {
+            "quality_metrics": self.quality_metrics,
+            "task_feedback": self.task_feedback,
+            "retry_strategies": self.retry_strategies
+        }
     
     def _load_feedback_data(self) -> None:
         """Load existing feedback data from disk."""
         try:
-            feedback_file = self.feedback_dir / "feedback_data.json"
-            if feedback_file.exists():
-                data = json.loads(read_file(feedback_file))
-                self.feedback_data = data.get("feedback_data", {})
-                self.quality_metrics = data.get("quality_metrics", {})
-                self.analysis_reports = data.get("analysis_reports", [])
-                self.retry_strategies = data.get("retry_strategies", {})
+            state, pending = self.store.load()
+            if state is not None:
+                self.quality_metrics.update(state.get("quality_metrics", {}))
+                self.task_feedback.update(state.get("task_feedback", {}))
+                self.retry_strategies.update(state.get("retry_strategies", {}))
+            # Records written after the last snapshot
+            for entry in pending:
+                self._apply_feedback(entry["data"], entry["timestamp"])
+            
+            legacy_file = self.feedback_dir / "feedback_data.json"
+            if legacy_file.exists() and not self.feedback_data and not self.analysis_reports:
+                self._migrate_legacy_data(legacy_file)
+            elif self.feedback_data:
                 logger.info("Loaded existing feedback data")
         except Exception as e:
             logger.error(f"Failed to load feedback data: {str(e)}")
     
-    def _save_feedback_data(self) -> None:
-        """Save feedback data to disk."""
-        try:
-            data = {
-                "feedback_data": self.feedback_data,
-                "quality_metrics": self.quality_metrics,
-                "analysis_reports": self.analysis_reports,
-                "retry_strategies": self.retry_strategies
-            }
-            feedback_file = self.feedback_dir / "feedback_data.json"
-            write_file(feedback_file, json.dumps(data, indent=2))
-            logger.info("Saved feedback data")
-        except Exception as e:
-            logger.error(f"Failed to save feedback data: {str(e)}")
+    def _migrate_legacy_data(self, legacy_file: Path) -> None:
+        """Import a feedback_data.json written by earlier versions into the store.
+        
+        Args:
+            legacy_file: Path of the legacy file; renamed once imported
+        """
+        data = json.loads(read_file(legacy_file))
+        for key, entry in data.get("feedback_data", {}).items():
+            if isinstance(entry, dict) and "data" in entry:
+                self.store.append_feedback(key, entry.get("timestamp"), entry["data"])
+            elif isinstance(entry, dict):
+                # Per-task user feedback and failures used to share this dictionary
+                self.task_feedback[key] = entry
+        for report in data.get("analysis_reports", []):
+            self.store.append_report(report)
+        self.quality_metrics.update(data.get("quality_metrics", {}))
+        self.retry_strategies.update(data.get("retry_strategies", {}))
+        self.store.save_state(self._derived_state(), force=True)
+        legacy_file.rename(legacy_file.with_name(legacy_file.name + ".migrated"))
+        logger.info(f"Migrated {len(self.feedback_data)} legacy feedback records")
+    
+    def flush(self) -> None:
+        """Write any pending snapshot of derived state to disk."""
+        self.store.flush()
     
     def ingest_feedback(self, feedback: Dict[str, Any]) -> None:
         """Ingest feedback data for analysis.
         
+        When the pipeline is running the feedback is only queued.
+        
         Args:
             feedback: Feedback data to ingest
         """
+        if self.pipeline is not None:
+            self.pipeline.submit(feedback)
+            return
+        
         try:
-            # Validate feedback structure
-            self._validate_feedback(feedback)
-            
-            # Store feedback data
-            feedback_id = feedback.get("id", str(len(self.feedback_data)))
-            self.feedback_data[feedback_id] = {
-                "timestamp": datetime.now(timezone.utc).isoformat(),
-                "data": feedback
-            }
-            
-            # Process feedback based on type
-            feedback_type = feedback.get("type")
-            if feedback_type == "quality_metrics":
-                self._process_quality_metrics(feedback)
-            elif feedback_type == "user_feedback":
-                self._process_user_feedback(feedback)
-            elif feedback_type == "task_failure":
-                self._process_task_failure(feedback)
+            feedback_id, context = self._record_feedback(feedback)
             
             # Generate analysis report
-            self._generate_analysis_report(feedback_id)
+            self.store.append_report(self._build_analysis_report(feedback_id, feedback, context))
             
-            # Save updated data
-            self._save_feedback_data()
+            # Snapshot derived state (debounced)
+            self.store.save_state(self._derived_state())
             
-            logger.info(f"Ingested feedback of type {feedback_type}")
+            logger.info(f"Ingested feedback of type {feedback.get('type')}")
             
         except Exception as e:
             logger.error(f"Failed to ingest feedback: {str(e)}")
     
+    def _record_feedback(self, feedback: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
+        """Validate, store and apply a feedback item. Calls must not run concurrently.
+        
+        Args:
+            feedback: Feedback data
+            
+        Returns:
+            The feedback ID and the analysis context (see _analysis_context)
+            
+        Raises:
+            ValueError: If feedback is invalid
+        """
+        # Validate feedback structure
+        self._validate_feedback(feedback)
+        
+        # Store feedback data
+        timestamp = datetime.now(timezone.utc).isoformat()
+        feedback_id = feedback.get("id", str(len(self.feedback_data)))
+        self.store.append_feedback(feedback_id, timestamp, feedback)
+        
+        # Process feedback based on type
+        self._apply_feedback(feedback, timestamp)
+        return feedback_id, self._analysis_context(feedback)
+    
+    def _analysis_context(self, feedback: Dict[str, Any]) -> Dict[str, Any]:
+        """Capture the derived state an analysis depends on, right after applying feedback.
+        
+        Args:
+            feedback: Feedback data that was just applied
+            
+        Returns:
+            Context for _build_analysis_report
+        """
+        feedback_type = feedback.get("type")
+        task_id = feedback["task_id"]
+        if feedback_type == "quality_metrics":
+            task_metrics = self.quality_metrics.get(task_id, [])
+            previous = task_metrics[-2]["metrics"].get("quality_score", 0) if len(task_metrics) > 1 else None
+            return {"previous_quality_score": previous}
+        if feedback_type == "task_failure":
+            return {"retry_strategy": self.retry_strategies.get(task_id)}
+        return {}
+    
     def _validate_feedback(self, feedback: Dict[str, Any]) -> None:
         """Validate feedback data structure.
         
@@ -123,11 +227,27 @@ class FeedbackEngineV2:
         if missing_fields:
             raise ValueError(f"Missing required fields: {missing_fields}")
     
-    def _process_quality_metrics(self, feedback: Dict[str, Any]) -> None:
+    def _apply_feedback(self, feedback: Dict[str, Any], timestamp: str) -> None:
+        """Update derived state with a feedback record.
+        
+        Args:
+            feedback: Feedback data
+            timestamp: Time the feedback was ingested
+        """
+        feedback_type = feedback.get("type")
+        if feedback_type == "quality_metrics":
+            self._process_quality_metrics(feedback, timestamp)
+        elif feedback_type == "user_feedback":
+            self._process_user_feedback(feedback, timestamp)
+        elif feedback_type == "task_failure":
+            self._process_task_failure(feedback, timestamp)
+    
+    def _process_quality_metrics(self, feedback: Dict[str, Any], timestamp: str) -> None:
         """Process quality metrics feedback.
         
         Args:
             feedback: Quality metrics feedback
+            timestamp: Time the feedback was ingested
         """
         task_id = feedback["task_id"]
         metrics = feedback.get("metrics", {})
@@ -136,43 +256,39 @@ class FeedbackEngineV2:
             self.quality_metrics[task_id] = []
         
         self.quality_metrics[task_id].append({
-            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "timestamp": timestamp,
             "metrics": metrics
         })
     
-    def _process_user_feedback(self, feedback: Dict[str, Any]) -> None:
+    def _process_user_feedback(self, feedback: Dict[str, Any], timestamp: str) -> None:
         """Process user feedback.
         
         Args:
             feedback: User feedback data
+            timestamp: Time the feedback was ingested
         """
         task_id = feedback["task_id"]
         user_feedback = feedback.get("feedback", {})
         
         # Store user feedback
-        if task_id not in self.feedback_data:
-            self.feedback_data[task_id] = {"user_feedback": []}
-        
-        self.feedback_data[task_id]["user_feedback"].append({
-            "timestamp": datetime.now(timezone.utc).isoformat(),
+        self.task_feedback.setdefault(task_id, {}).setdefault("user_feedback", []).append({
+            "timestamp": timestamp,
             "feedback": user_feedback
         })
     
-    def _process_task_failure(self, feedback: Dict[str, Any]) -> None:
+    def _process_task_failure(self, feedback: Dict[str, Any], timestamp: str) -> None:
         """Process task failure feedback.
         
         Args:
             feedback: Task failure feedback
+            timestamp: Time the feedback was ingested
         """
         task_id = feedback["task_id"]
         error = feedback.get("error", "")
         
         # Store failure data
-        if task_id not in self.feedback_data:
-            self.feedback_data[task_id] = {"failures": []}
-        
-        self.feedback_data[task_id]["failures"].append({
-            "timestamp": datetime.now(timezone.utc).isoformat(),
+        self.task_feedback.setdefault(task_id, {}).setdefault("failures", []).append({
+            "timestamp": timestamp,
             "error": error,
             "agent_id": feedback.get("agent_id", "unknown")
         })
@@ -180,49 +296,58 @@ class FeedbackEngineV2:
         # Generate retry strategy
         self._generate_retry_strategy(task_id, error)
     
-    def _generate_analysis_report(self, feedback_id: str) -> None:
+    def _build_analysis_report(
+        self, feedback_id: str, feedback: Dict[str, Any], context: Dict[str, Any]
+    ) -> Dict[str, Any]:
         """Generate analysis report for feedback.
         
+        Only reads its arguments, so reports can be built concurrently.
+        
         Args:
             feedback_id: ID of the feedback to analyze
+            feedback: Feedback data
+            context: Analysis context captured by _record_feedback
+            
+        Returns:
+            Analysis report
         """
-        feedback = self.feedback_data[feedback_id]
-        feedback_type = feedback["data"].get("type")
+        feedback_type = feedback.get("type")
         
         report = {
             "feedback_id": feedback_id,
+            "task_id": feedback.get("task_id"),
             "timestamp": datetime.now(timezone.utc).isoformat(),
             "type": feedback_type,
             "analysis": {}
         }
         
         if feedback_type == "quality_metrics":
-            report["analysis"] = self._analyze_quality_metrics(feedback["data"])
+            report["analysis"] = self._analyze_quality_metrics(feedback, context["previous_quality_score"])
         elif feedback_type == "user_feedback":
-            report["analysis"] = self._analyze_user_feedback(feedback["data"])
+            report["analysis"] = self._analyze_user_feedback(feedback)
         elif feedback_type == "task_failure":
-            report["analysis"] = self._analyze_task_failure(feedback["data"])
+            report["analysis"] = self._analyze_task_failure(feedback, context["retry_strategy"])
         
-        self.analysis_reports.append(report)
+        return report
     
-    def _analyze_quality_metrics(self, feedback: Dict[str, Any]) -> Dict[str, Any]:
+    def _analyze_quality_metrics(
+        self, feedback: Dict[str, Any], previous_score: Optional[float]
+    ) -> Dict[str, Any]:
         """Analyze quality metrics.
         
         Args:
             feedback: Quality metrics feedback
+            previous_score: Previous quality score of the task, None if this is the first
             
         Returns:
             Analysis results
         """
         metrics = feedback.get("metrics", {})
-        task_id = feedback["task_id"]
         
         # Calculate trends
-        task_metrics = self.quality_metrics.get(task_id, [])
-        if len(task_metrics) > 1:
+        if previous_score is not None:
             current = metrics.get("quality_score", 0)
-            previous = task_metrics[-2]["metrics"].get("quality_score", 0)
-            trend = "improving" if current > previous else "degrading" if current < previous else "stable"
+            trend = "improving" if current > previous_score else "degrading" if current < previous_score else "stable"
         else:
             trend = "initial"
         
@@ -249,11 +374,14 @@ class FeedbackEngineV2:
             "action_items": self._extract_action_items(user_feedback.get("comments", ""))
         }
     
-    def _analyze_task_failure(self, feedback: Dict[str, Any]) -> Dict[str, Any]:
+    def _analyze_task_failure(
+        self, feedback: Dict[str, Any], retry_strategy: Optional[Dict[str, Any]]
+    ) -> Dict[str, Any]:
         """Analyze task failure.
         
         Args:
             feedback: Task failure feedback
+            retry_strategy: Retry strategy generated for the task
             
         Returns:
             Analysis results
@@ -263,7 +391,7 @@ class FeedbackEngineV2:
         return {
             "error_type": self._classify_error(error),
             "severity": self._assess_severity(error),
-            "retry_strategy": self.retry_strategies.get(feedback["task_id"])
+            "retry_strategy": retry_strategy
         }
     
     def _generate_quality_recommendations(self, metrics: Dict[str, Any]) -> List[str]:
@@ -374,18 +502,19 @@ class FeedbackEngineV2:
             return self.quality_metrics.get(task_id, {})
         return self.quality_metrics
     
-    def get_analysis_reports(self, task_id: Optional[str] = None) -> List[Dict[str, Any]]:
+    def get_analysis_reports(
+        self, task_id: Optional[str] = None, feedback_type: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
         """Get analysis reports.
         
         Args:
             task_id: Optional specific task ID
+            feedback_type: Optional feedback type (e.g. "task_failure")
             
         Returns:
-            Analysis reports
+            Analysis reports, oldest first
         """
-        if task_id:
-            return [r for r in self.analysis_reports if r.get("task_id") == task_id]
-        return self.analysis_reports
+        return self.store.get_reports(task_id or None, feedback_type)
     
     def get_retry_strategy(self, task_id: str) -> Optional[Dict[str, Any]]:
         """Get retry strategy for task.
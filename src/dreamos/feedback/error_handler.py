@@ -1,20 +1,37 @@
 import os
-import json
 import logging
 import time
 from datetime import datetime
 from typing import Dict, Any, List, Callable, Optional
 
+from .status_store import StatusStore, shared_store
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
 class ErrorHandler:
-    def __init__(self, error_dir: str = 'runtime/errors'):
+    def __init__(self, error_dir: str = 'runtime/errors', store: Optional[StatusStore] = None):
+        """Error log, retries and alerts of agents.
+
+        Args:
+            error_dir: Directory of the legacy JSON files
+            store: Store to use; defaults to shared_store(), the database shared with StatusMonitor and MetricsTracker
+        """
         self.error_dir = error_dir
         self.error_file = os.path.join(error_dir, 'error_log.json')
         self.alert_file = os.path.join(error_dir, 'alerts.json')
         os.makedirs(error_dir, exist_ok=True)
+        self.store = store or shared_store()
+        self.store.migrate_json(self.error_file, lambda entries: self._import_entries('errors', entries))
+        self.store.migrate_json(self.alert_file, lambda entries: self._import_entries('alerts', entries))
+
+    def _import_entries(self, namespace: str, entries: List[Dict[str, Any]]):
+        by_agent: Dict[str, List[Dict[str, Any]]] = {}
+        for entry in entries:
+            by_agent.setdefault(entry['agent_id'], []).append(entry)
+        for agent_id, agent_entries in by_agent.items():
+            self.store.extend(namespace, agent_id, agent_entries)
 
     def handle_error(self, agent_id: str, error: Exception, retry_func: Optional[Callable] = None, max_retries: int = 3):
         """Handle an error with optional retry logic."""
@@ -27,16 +44,7 @@ class ErrorHandler:
                 'retries': 0
             }
 
-            if os.path.exists(self.error_file):
-                with open(self.error_file, 'r') as f:
-                    error_log = json.load(f)
-            else:
-                error_log = []
-
-            error_log.append(error_entry)
-
-            with open(self.error_file, 'w') as f:
-                json.dump(error_log, f, indent=2)
+            self.store.append('errors', agent_id, error_entry)
             logger.error(f"Error logged for {agent_id}: {error}")
 
             if retry_func:
@@ -69,16 +77,7 @@ class ErrorHandler:
                 'severity': severity
             }
 
-            if os.path.exists(self.alert_file):
-                with open(self.alert_file, 'r') as f:
-                    alerts = json.load(f)
-            else:
-                alerts = []
-
-            alerts.append(alert)
-
-            with open(self.alert_file, 'w') as f:
-                json.dump(alerts, f, indent=2)
+            self.store.append('alerts', agent_id, alert)
             logger.warning(f"Alert raised for {agent_id}: {message}")
         except Exception as e:
             logger.error(f"Failed to raise alert: {e}")
@@ -86,15 +85,7 @@ class ErrorHandler:
     def get_error_log(self, agent_id: Optional[str] = None) -> List[Dict[str, Any]]:
         """Get error log for an agent or all agents."""
         try:
-            if not os.path.exists(self.error_file):
-                return []
-
-            with open(self.error_file, 'r') as f:
-                error_log = json.load(f)
-
-            if agent_id:
-                return [entry for entry in error_log if entry['agent_id'] == agent_id]
-            return error_log
+            return self.store.history('errors', agent_id)
         except Exception as e:
             logger.error(f"Failed to get error log: {e}")
             return []
@@ -102,15 +93,7 @@ class ErrorHandler:
     def get_alerts(self, agent_id: Optional[str] = None) -> List[Dict[str, Any]]:
         """Get alerts for an agent or all agents."""
         try:
-            if not os.path.exists(self.alert_file):
-                return []
-
-            with open(self.alert_file, 'r') as f:
-                alerts = json.load(f)
-
-            if agent_id:
-                return [alert for alert in alerts if alert['agent_id'] == agent_id]
-            return alerts
+            return self.store.history('alerts', agent_id)
         except Exception as e:
             logger.error(f"Failed to get alerts: {e}")
             return []
@@ -0,0 +1,301 @@
+"""
+Asynchronous ingestion pipeline for FeedbackEngineV2.
+
+Producers call submit(), which only puts the item on a bounded queue. A dispatcher
+thread takes micro-batches off the queue (up to batch_size items, waiting at most
+batch_timeout for a batch to fill) and runs them through three stages:
+
+- record: validate, persist and apply each item to the engine's derived state,
+  in submission order (serial)
+- analyze: build the analysis reports on a pool of worker threads
+- store: persist the reports in submission order and snapshot derived state once
+
+Backpressure: when the queue is full, submit() blocks for up to block_timeout
+seconds (0 = never, None = indefinitely) and then drops the item, counting it.
+"""
+
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class _StageStats:
+    """Running totals for one pipeline stage."""
+
+    __slots__ = ("batches", "items", "busy", "max_latency")
+
+    def __init__(self):
+        self.batches = 0
+        self.items = 0
+        self.busy = 0.0
+        self.max_latency = 0.0
+
+    def observe(self, items: int, seconds: float) -> None:
+        self.batches += 1
+        self.items += items
+        self.busy += seconds
+        self.max_latency = max(self.max_latency, seconds)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "batches": self.batches,
+            "items": self.items,
+            "items_per_second": self.items / self.busy if self.busy else 0.0,
+            "mean_batch_latency": self.busy / self.batches if self.batches else 0.0,
+            "max_batch_latency": self.max_latency,
+        }
+
+
+class _LatencyStats:
+    """Running count, mean and max of a latency in seconds."""
+
+    __slots__ = ("count", "total", "max")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else 0.0,
+            "max": self.max,
+        }
+
+
+class FeedbackPipeline:
+    """Bounded, micro-batching feedback ingestion for a FeedbackEngineV2."""
+
+    STAGES = ("record", "analyze", "store")
+
+    def __init__(
+        self,
+        engine: Any,
+        max_queue: int = 10000,
+        batch_size: int = 64,
+        batch_timeout: float = 0.05,
+        workers: int = 4,
+        block_timeout: Optional[float] = 1.0,
+        clock: Callable[[], float] = time.perf_counter,
+    ):
+        """Start the pipeline.
+
+        Args:
+            engine: The FeedbackEngineV2 that records and analyzes the feedback
+            max_queue: Maximum number of queued items
+            batch_size: Maximum number of items per micro-batch
+            batch_timeout: Seconds to wait for a micro-batch to fill
+            workers: Threads building analysis reports
+            block_timeout: Seconds submit() waits for queue space before dropping
+                the item; 0 never waits, None waits indefinitely
+            clock: Clock used for latency metrics
+        """
+        self.engine = engine
+        self.batch_size = max(1, batch_size)
+        self.batch_timeout = batch_timeout
+        self.block_timeout = block_timeout
+        self._clock = clock
+
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=max_queue)
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="feedback-analysis")
+        self._cond = threading.Condition()
+        self._unfinished = 0
+        self._closed = False
+
+        self.stats = {"submitted": 0, "dropped": 0, "processed": 0, "failed": 0}
+        self._stage_stats = {stage: _StageStats() for stage in self.STAGES}
+        self._queue_wait = _LatencyStats()
+        self._end_to_end = _LatencyStats()
+
+        self._thread = threading.Thread(target=self._run, name="feedback-pipeline", daemon=True)
+        self._thread.start()
+
+    # --- Producer side ---
+
+    def submit(self, feedback: Dict[str, Any]) -> bool:
+        """Queue a feedback item.
+
+        Args:
+            feedback: Feedback data, as for FeedbackEngineV2.ingest_feedback
+
+        Returns:
+            False if the pipeline is closed or the item was dropped because the queue
+            stayed full
+        """
+        with self._cond:
+            if self._closed:
+                return False
+            self._unfinished += 1
+        try:
+            if self.block_timeout == 0:
+                self._queue.put_nowait((feedback, self._clock()))
+            else:
+                self._queue.put((feedback, self._clock()), timeout=self.block_timeout)
+        except queue.Full:
+            with self._cond:
+                self._unfinished -= 1
+                self.stats["dropped"] += 1
+                self._cond.notify_all()
+            logger.warning(f"Feedback queue full, dropped {feedback.get('type')} feedback for task {feedback.get('task_id')}")
+            return False
+        with self._cond:
+            self.stats["submitted"] += 1
+        return True
+
+    def join(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every submitted item has been processed.
+
+        Args:
+            timeout: Maximum seconds to wait
+
+        Returns:
+            True if the pipeline is idle
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while self._unfinished:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+            return True
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """Stop accepting items, process what is queued and stop the threads.
+
+        Args:
+            timeout: Maximum seconds to wait for queued items
+        """
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+        self._executor.shutdown(wait=not self._thread.is_alive())
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Return counters, queue depth, per-stage throughput and latencies.
+
+        Returns:
+            Dictionary of counters plus "queue_depth", "stages", "queue_wait" and
+            "end_to_end" (seconds from submit() to the report being stored)
+        """
+        with self._cond:
+            return dict(
+                self.stats,
+                queue_depth=self._queue.qsize(),
+                stages={stage: stats.snapshot() for stage, stats in self._stage_stats.items()},
+                queue_wait=self._queue_wait.snapshot(),
+                end_to_end=self._end_to_end.snapshot(),
+            )
+
+    # --- Dispatcher ---
+
+    def _next_batch(self) -> Tuple[List[Tuple[Dict[str, Any], float]], bool]:
+        """Block for the next micro-batch. Returns the batch and whether to stop after it."""
+        item = self._queue.get()
+        if item is _STOP:
+            return [], True
+        batch = [item]
+        deadline = self._clock() + self.batch_timeout
+        while len(batch) < self.batch_size:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                remaining = deadline - self._clock()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+            if item is _STOP:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _run(self) -> None:
+        stop = False
+        while not stop:
+            batch, stop = self._next_batch()
+            if stop:
+                # Items submitted while close() was running land behind the stop marker
+                while True:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+            if not batch:
+                continue
+            try:
+                self._process(batch)
+            except Exception as e:
+                # Never let one bad batch kill the dispatcher
+                logger.error(f"Feedback pipeline batch failed: {e}", exc_info=True)
+                with self._cond:
+                    self.stats["failed"] += len(batch)
+            finally:
+                with self._cond:
+                    self._unfinished -= len(batch)
+                    self._cond.notify_all()
+
+    def _process(self, batch: List[Tuple[Dict[str, Any], float]]) -> None:
+        engine = self.engine
+
+        # record: serial, in submission order
+        start = self._clock()
+        recorded = []
+        for feedback, enqueued_at in batch:
+            try:
+                feedback_id, context = engine._record_feedback(feedback)
+            except Exception as e:
+                logger.error(f"Failed to ingest feedback: {e}")
+                continue
+            recorded.append((feedback_id, feedback, context, enqueued_at))
+        after_record = self._clock()
+
+        # analyze: parallel
+        def analyze(item):
+            feedback_id, feedback, context, _ = item
+            try:
+                return engine._build_analysis_report(feedback_id, feedback, context)
+            except Exception as e:
+                logger.error(f"Failed to analyze feedback {feedback_id}: {e}")
+                return None
+
+        reports = list(self._executor.map(analyze, recorded))
+        after_analyze = self._clock()
+
+        # store: serial, in submission order
+        for report in reports:
+            if report is not None:
+                engine.store.append_report(report)
+        engine.store.save_state(engine._derived_state())
+        done = self._clock()
+
+        with self._cond:
+            self._stage_stats["record"].observe(len(batch), after_record - start)
+            self._stage_stats["analyze"].observe(len(recorded), after_analyze - after_record)
+            self._stage_stats["store"].observe(len(recorded), done - after_analyze)
+            for _, enqueued_at in batch:
+                self._queue_wait.observe(start - enqueued_at)
+            for item, report in zip(recorded, reports):
+                if report is not None:
+                    self._end_to_end.observe(done - item[3])
+            analyzed = sum(1 for report in reports if report is not None)
+            self.stats["processed"] += analyzed
+            self.stats["failed"] += len(batch) - analyzed
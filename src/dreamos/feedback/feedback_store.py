@@ -0,0 +1,272 @@
+"""
+Segmented, append-only persistence for FeedbackEngineV2.
+
+Feedback records and analysis reports are appended as JSON lines to numbered segment
+files (segment-000001.jsonl, ...). A new segment is started once the current one
+exceeds segment_max_bytes, so no write ever touches more than the record itself.
+Everything read back is indexed in memory by id, task_id and feedback type.
+
+State derived from the records (quality metrics, retry strategies, ...) is written
+as a snapshot together with the log position it covers. Snapshot writes are
+debounced: at most one every snapshot_interval seconds, plus one on flush(). Losing
+a pending snapshot is harmless, because on load every record after the snapshot's
+position is handed back to the engine to be re-applied.
+"""
+
+import json
+import logging
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from dreamos.utils.resilient_io import write_file
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SEGMENT_MAX_BYTES = 4 * 1024 * 1024
+DEFAULT_SNAPSHOT_INTERVAL = 5.0
+SNAPSHOT_VERSION = 1
+
+_SEGMENT_RE = re.compile(r"^segment-(\d{6})\.jsonl$")
+
+# Position in the log: (segment number, byte offset within the segment)
+LogPosition = Tuple[int, int]
+
+
+class FeedbackStore:
+    """Append-only segment log of feedback records and reports with in-memory indexes."""
+
+    def __init__(
+        self,
+        directory: Path,
+        segment_max_bytes: int = DEFAULT_SEGMENT_MAX_BYTES,
+        snapshot_interval: float = DEFAULT_SNAPSHOT_INTERVAL,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize the store. Call load() before use.
+
+        Args:
+            directory: Directory holding the segments and the snapshot
+            segment_max_bytes: Size after which a new segment is started
+            snapshot_interval: Minimum seconds between two snapshot writes
+            clock: Monotonic clock used for debouncing
+        """
+        self.directory = Path(directory)
+        self.segment_dir = self.directory / "segments"
+        self.snapshot_path = self.directory / "feedback_state.json"
+        self.segment_max_bytes = segment_max_bytes
+        self.snapshot_interval = snapshot_interval
+        self._clock = clock
+        self._lock = threading.RLock()
+
+        # Indexes
+        self.feedback: Dict[str, Dict[str, Any]] = {}
+        self.reports: List[Dict[str, Any]] = []
+        self._feedback_by_task: Dict[str, List[str]] = {}
+        self._feedback_by_type: Dict[str, List[str]] = {}
+        self._reports_by_task: Dict[str, List[Dict[str, Any]]] = {}
+        self._reports_by_type: Dict[str, List[Dict[str, Any]]] = {}
+
+        self._segment = 1
+        self._offset = 0
+
+        self._pending_state: Optional[Dict[str, Any]] = None
+        self._last_snapshot = float("-inf")
+
+    # --- Indexes ---
+
+    def _index_feedback(self, feedback_id: str, record: Dict[str, Any]) -> None:
+        data = record["data"]
+        if feedback_id not in self.feedback:
+            self._feedback_by_task.setdefault(str(data.get("task_id")), []).append(feedback_id)
+            self._feedback_by_type.setdefault(str(data.get("type")), []).append(feedback_id)
+        else:
+            # Same id ingested again: the newer record wins, re-index it
+            self._unindex_feedback(feedback_id)
+            self._index_feedback(feedback_id, record)
+        self.feedback[feedback_id] = record
+
+    def _unindex_feedback(self, feedback_id: str) -> None:
+        data = self.feedback.pop(feedback_id)["data"]
+        for index, key in ((self._feedback_by_task, str(data.get("task_id"))),
+                           (self._feedback_by_type, str(data.get("type")))):
+            ids = index.get(key, [])
+            if feedback_id in ids:
+                ids.remove(feedback_id)
+
+    def _index_report(self, report: Dict[str, Any]) -> None:
+        self.reports.append(report)
+        self._reports_by_task.setdefault(str(report.get("task_id")), []).append(report)
+        self._reports_by_type.setdefault(str(report.get("type")), []).append(report)
+
+    def _apply(self, entry: Dict[str, Any]) -> None:
+        if entry.get("kind") == "feedback":
+            self._index_feedback(entry["id"], {"timestamp": entry["timestamp"], "data": entry["data"]})
+        elif entry.get("kind") == "report":
+            self._index_report(entry["report"])
+
+    # --- Segments ---
+
+    def _segment_path(self, number: int) -> Path:
+        return self.segment_dir / f"segment-{number:06d}.jsonl"
+
+    def _segment_numbers(self) -> List[int]:
+        if not self.segment_dir.exists():
+            return []
+        numbers = []
+        for path in self.segment_dir.iterdir():
+            match = _SEGMENT_RE.match(path.name)
+            if match:
+                numbers.append(int(match.group(1)))
+        return sorted(numbers)
+
+    def _append(self, entries: List[Dict[str, Any]]) -> None:
+        payload = "".join(json.dumps(e, separators=(",", ":")) + "\n" for e in entries).encode("utf-8")
+        if self._offset and self._offset + len(payload) > self.segment_max_bytes:
+            self._segment += 1
+            self._offset = 0
+        self.segment_dir.mkdir(parents=True, exist_ok=True)
+        with open(self._segment_path(self._segment), "ab") as f:
+            f.write(payload)
+        self._offset += len(payload)
+
+    # --- Loading ---
+
+    def load(self) -> Tuple[Optional[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Read the snapshot and all segments.
+
+        Returns:
+            The snapshot's derived state (None if there is no usable snapshot) and the
+            feedback records written after it, which the caller must re-apply.
+        """
+        with self._lock:
+            state, position = self._read_snapshot()
+            pending: List[Dict[str, Any]] = []
+            numbers = self._segment_numbers()
+            for number in numbers:
+                with open(self._segment_path(number), "rb") as f:
+                    data = f.read()
+                # A crash may leave a torn last line; ignore it and overwrite it later
+                end = data.rfind(b"\n") + 1
+                offset = 0
+                for line in data[:end].splitlines(keepends=True):
+                    covered = (number, offset) < position
+                    offset += len(line)
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        logger.warning(f"Skipping corrupt feedback record in segment {number}")
+                        continue
+                    self._apply(entry)
+                    if entry.get("kind") == "feedback" and not covered:
+                        pending.append(entry)
+                if end < len(data):
+                    with open(self._segment_path(number), "r+b") as f:
+                        f.truncate(end)
+                self._segment, self._offset = number, end
+            if numbers:
+                logger.info(
+                    f"Loaded {len(self.feedback)} feedback records and {len(self.reports)} "
+                    f"reports from {len(numbers)} segments"
+                )
+            return state, pending
+
+    def _read_snapshot(self) -> Tuple[Optional[Dict[str, Any]], LogPosition]:
+        if not self.snapshot_path.exists():
+            return None, (0, 0)
+        try:
+            with open(self.snapshot_path, "r", encoding="utf-8") as f:
+                snapshot = json.load(f)
+            if snapshot.get("version") != SNAPSHOT_VERSION:
+                raise ValueError(f"unsupported version {snapshot.get('version')}")
+            return snapshot["state"], tuple(snapshot["position"])
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            # Derived state is rebuilt by re-applying every record
+            logger.warning(f"Ignoring unusable feedback snapshot: {e}")
+            return None, (0, 0)
+
+    # --- Writing ---
+
+    def append_feedback(self, feedback_id: str, timestamp: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Persist and index a feedback record.
+
+        Returns:
+            The stored record ({"timestamp", "data"})
+        """
+        with self._lock:
+            entry = {"kind": "feedback", "id": feedback_id, "timestamp": timestamp, "data": data}
+            self._append([entry])
+            self._apply(entry)
+            return self.feedback[feedback_id]
+
+    def append_report(self, report: Dict[str, Any]) -> None:
+        """Persist and index an analysis report."""
+        with self._lock:
+            self._append([{"kind": "report", "report": report}])
+            self._index_report(report)
+
+    def save_state(self, state: Dict[str, Any], force: bool = False) -> bool:
+        """Snapshot derived state, debounced.
+
+        Args:
+            state: JSON-serializable derived state covering every record appended so far
+            force: Write now even if the last snapshot is recent
+
+        Returns:
+            True if the snapshot was written
+        """
+        with self._lock:
+            self._pending_state = state
+            if not force and self._clock() - self._last_snapshot < self.snapshot_interval:
+                return False
+            return self._write_snapshot()
+
+    def flush(self) -> bool:
+        """Write a pending snapshot, if any."""
+        with self._lock:
+            if self._pending_state is None:
+                return False
+            return self._write_snapshot()
+
+    def _write_snapshot(self) -> bool:
+        snapshot = {
+            "version": SNAPSHOT_VERSION,
+            "position": [self._segment, self._offset],
+            "state": self._pending_state,
+        }
+        try:
+            write_file(self.snapshot_path, json.dumps(snapshot, separators=(",", ":")))
+        except Exception as e:
+            logger.error(f"Failed to write feedback snapshot: {e}")
+            return False
+        self._pending_state = None
+        self._last_snapshot = self._clock()
+        return True
+
+    # --- Queries ---
+
+    def feedback_ids(self, task_id: Optional[str] = None, feedback_type: Optional[str] = None) -> List[str]:
+        """Ids of feedback records matching the filters, in ingestion order."""
+        with self._lock:
+            if task_id is None and feedback_type is None:
+                return list(self.feedback)
+            if task_id is None:
+                return list(self._feedback_by_type.get(feedback_type, []))
+            ids = self._feedback_by_task.get(task_id, [])
+            if feedback_type is not None:
+                ids = [i for i in ids if self.feedback[i]["data"].get("type") == feedback_type]
+            return list(ids)
+
+    def get_reports(self, task_id: Optional[str] = None, feedback_type: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Analysis reports matching the filters, in ingestion order."""
+        with self._lock:
+            if task_id is None and feedback_type is None:
+                return list(self.reports)
+            if task_id is None:
+                return list(self._reports_by_type.get(feedback_type, []))
+            reports = self._reports_by_task.get(task_id, [])
+            if feedback_type is not None:
+                reports = [r for r in reports if r.get("type") == feedback_type]
+            return list(reports)
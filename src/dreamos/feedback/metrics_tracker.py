@@ -1,36 +1,50 @@
 import os
-import json
 import logging
 from datetime import datetime
 from typing import Dict, Any, List, Optional
 
+from .status_store import StatusStore, shared_store
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
 class MetricsTracker:
-    def __init__(self, metrics_dir: str = 'runtime/metrics'):
+    def __init__(self, metrics_dir: str = 'runtime/metrics', store: Optional[StatusStore] = None):
+        """Current and archived metrics of agents.
+
+        Args:
+            metrics_dir: Directory of the legacy JSON files
+            store: Store to use; defaults to shared_store(), the database shared with StatusMonitor and ErrorHandler
+        """
         self.metrics_dir = metrics_dir
         self.current_file = os.path.join(metrics_dir, 'current_metrics.json')
         self.history_file = os.path.join(metrics_dir, 'metrics_history.json')
         os.makedirs(metrics_dir, exist_ok=True)
+        self.store = store or shared_store()
+        self.store.migrate_json(self.current_file, self._import_current)
+        self.store.migrate_json(self.history_file, self._import_history)
+
+    def _import_current(self, current_metrics: Dict[str, Any]):
+        for agent_id, entry in current_metrics.items():
+            self.store.put('metrics', agent_id, entry)
+
+    def _import_history(self, history: List[Dict[str, Any]]):
+        by_agent: Dict[str, List[Dict[str, Any]]] = {}
+        for archived in history:
+            for agent_id, entry in archived['metrics'].items():
+                by_agent.setdefault(agent_id, []).append(
+                    {'timestamp': archived['timestamp'], 'agent_id': agent_id, 'value': entry})
+        for agent_id, entries in by_agent.items():
+            self.store.extend('metrics_history', agent_id, entries)
 
     def record_metrics(self, agent_id: str, metrics: Dict[str, Any]):
         """Record metrics for an agent."""
         try:
-            if os.path.exists(self.current_file):
-                with open(self.current_file, 'r') as f:
-                    current_metrics = json.load(f)
-            else:
-                current_metrics = {}
-
-            current_metrics[agent_id] = {
+            self.store.put('metrics', agent_id, {
                 'timestamp': datetime.now().isoformat(),
                 'metrics': metrics
-            }
-
-            with open(self.current_file, 'w') as f:
-                json.dump(current_metrics, f, indent=2)
+            })
             logger.info(f"Recorded metrics for {agent_id}")
         except Exception as e:
             logger.error(f"Failed to record metrics for {agent_id}: {e}")
@@ -38,43 +52,17 @@ class MetricsTracker:
     def archive_metrics(self):
         """Archive current metrics to history."""
         try:
-            if not os.path.exists(self.current_file):
-                return
-
-            with open(self.current_file, 'r') as f:
-                current_metrics = json.load(f)
-
-            if os.path.exists(self.history_file):
-                with open(self.history_file, 'r') as f:
-                    history = json.load(f)
-            else:
-                history = []
-
-            history.append({
-                'timestamp': datetime.now().isoformat(),
-                'metrics': current_metrics
-            })
-
-            with open(self.history_file, 'w') as f:
-                json.dump(history, f, indent=2)
-
-            os.remove(self.current_file)
-            logger.info("Metrics archived to history")
+            if self.store.archive('metrics', 'metrics_history', datetime.now().isoformat()):
+                logger.info("Metrics archived to history")
         except Exception as e:
             logger.error(f"Failed to archive metrics: {e}")
 
     def get_current_metrics(self, agent_id: Optional[str] = None) -> Dict[str, Any]:
         """Get current metrics for an agent or all agents."""
         try:
-            if not os.path.exists(self.current_file):
-                return {}
-
-            with open(self.current_file, 'r') as f:
-                current_metrics = json.load(f)
-
             if agent_id:
-                return current_metrics.get(agent_id, {})
-            return current_metrics
+                return self.store.get('metrics', agent_id) or {}
+            return self.store.get_all('metrics')
         except Exception as e:
             logger.error(f"Failed to get current metrics: {e}")
             return {}
@@ -82,11 +70,15 @@ class MetricsTracker:
     def get_metrics_history(self, agent_id: Optional[str] = None) -> List[Dict[str, Any]]:
         """Get metrics history for an agent or all agents."""
         try:
-            if not os.path.exists(self.history_file):
-                return []
-
-            with open(self.history_file, 'r') as f:
-                history = json.load(f)
+            # Per-agent archive entries, regrouped into one entry per archive_metrics call
+            history = []
+            archives: Dict[str, Dict[str, Any]] = {}
+            for entry in self.store.history('metrics_history'):
+                archived = archives.get(entry['timestamp'])
+                if archived is None:
+                    archived = archives[entry['timestamp']] = {'timestamp': entry['timestamp'], 'metrics': {}}
+                    history.append(archived)
+                archived['metrics'][entry['agent_id']] = entry['value']
 
             if agent_id:
                 return [entry for entry in history if agent_id in entry['metrics']]
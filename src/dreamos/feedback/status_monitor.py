@@ -1,57 +1,54 @@
 import os
-import json
 import logging
 from datetime import datetime
 from typing import Dict, Any, Optional
 
+from .status_store import StatusStore, shared_store
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
 class StatusMonitor:
-    def __init__(self, status_dir: str = 'runtime/status'):
+    def __init__(self, status_dir: str = 'runtime/status', store: Optional[StatusStore] = None):
+        """Heartbeats and devlogs of agents.
+
+        Args:
+            status_dir: Directory of the legacy JSON files
+            store: Store to use; defaults to shared_store(), the database shared with MetricsTracker and ErrorHandler
+        """
         self.status_dir = status_dir
         self.heartbeat_file = os.path.join(status_dir, 'heartbeat.json')
         self.devlog_file = os.path.join(status_dir, 'devlog.json')
         os.makedirs(status_dir, exist_ok=True)
+        self.store = store or shared_store()
+        self.store.migrate_json(self.heartbeat_file, self._import_heartbeats)
+        self.store.migrate_json(self.devlog_file, self._import_devlog)
+
+    def _import_heartbeats(self, heartbeats: Dict[str, Any]):
+        for agent_id, heartbeat in heartbeats.items():
+            self.store.put('heartbeat', agent_id, heartbeat)
+
+    def _import_devlog(self, devlog: Dict[str, Any]):
+        for agent_id, entries in devlog.items():
+            self.store.extend('devlog', agent_id, entries)
 
     def update_heartbeat(self, agent_id: str, status: Dict[str, Any]):
         """Update the heartbeat status for an agent."""
         try:
-            if os.path.exists(self.heartbeat_file):
-                with open(self.heartbeat_file, 'r') as f:
-                    heartbeats = json.load(f)
-            else:
-                heartbeats = {}
-
-            heartbeats[agent_id] = {
+            self.store.put('heartbeat', agent_id, {
                 'timestamp': datetime.now().isoformat(),
                 'status': status
-            }
-
-            with open(self.heartbeat_file, 'w') as f:
-                json.dump(heartbeats, f, indent=2)
+            })
             logger.info(f"Updated heartbeat for {agent_id}")
         except Exception as e:
             logger.error(f"Failed to update heartbeat for {agent_id}: {e}")
 
     def add_devlog_entry(self, agent_id: str, entry: Dict[str, Any]):
-        """Add a devlog entry for an agent."""
+        """Add a devlog entry for an agent (the store keeps the newest max_history per agent)."""
         try:
-            if os.path.exists(self.devlog_file):
-                with open(self.devlog_file, 'r') as f:
-                    devlog = json.load(f)
-            else:
-                devlog = {}
-
-            if agent_id not in devlog:
-                devlog[agent_id] = []
-
             entry['timestamp'] = datetime.now().isoformat()
-            devlog[agent_id].append(entry)
-
-            with open(self.devlog_file, 'w') as f:
-                json.dump(devlog, f, indent=2)
+            self.store.append('devlog', agent_id, entry)
             logger.info(f"Added devlog entry for {agent_id}")
         except Exception as e:
             logger.error(f"Failed to add devlog entry for {agent_id}: {e}")
@@ -59,15 +56,9 @@ class StatusMonitor:
     def get_heartbeat(self, agent_id: Optional[str] = None) -> Dict[str, Any]:
         """Get heartbeat status for an agent or all agents."""
         try:
-            if not os.path.exists(self.heartbeat_file):
-                return {}
-
-            with open(self.heartbeat_file, 'r') as f:
-                heartbeats = json.load(f)
-
             if agent_id:
-                return heartbeats.get(agent_id, {})
-            return heartbeats
+                return self.store.get('heartbeat', agent_id) or {}
+            return self.store.get_all('heartbeat')
         except Exception as e:
             logger.error(f"Failed to get heartbeat: {e}")
             return {}
@@ -75,15 +66,9 @@ class StatusMonitor:
     def get_devlog(self, agent_id: Optional[str] = None) -> Dict[str, Any]:
         """Get devlog entries for an agent or all agents."""
         try:
-            if not os.path.exists(self.devlog_file):
-                return {}
-
-            with open(self.devlog_file, 'r') as f:
-                devlog = json.load(f)
-
             if agent_id:
-                return devlog.get(agent_id, [])
-            return devlog
+                return self.store.history('devlog', agent_id)
+            return self.store.history_by_agent('devlog')
         except Exception as e:
             logger.error(f"Failed to get devlog: {e}")
             return {}
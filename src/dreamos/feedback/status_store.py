@@ -0,0 +1,260 @@
+"""
+Embedded status store shared by the feedback monitors.
+
+StatusMonitor, MetricsTracker and ErrorHandler used to load a JSON file and rewrite
+it completely on every call, so concurrent writers lost each other's updates and
+every write cost as much as the whole file. They now keep their state in one SQLite
+database in WAL mode:
+
+- current values (heartbeats, current metrics) are upserted per (namespace, agent),
+- histories (devlog, errors, alerts, archived metrics) are appended per agent and
+  trimmed to the newest max_history entries of that agent.
+
+Each write is a single short transaction. WAL lets readers run alongside the
+writer, and busy_timeout makes concurrent writers (threads or processes) wait for
+the write lock instead of failing. Every thread gets its own connection.
+
+Monitors created without an explicit store all use shared_store(), one StatusStore
+on DEFAULT_STATUS_DB per process.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_HISTORY = 1000
+DEFAULT_BUSY_TIMEOUT = 30.0
+DEFAULT_STATUS_DB = 'runtime/status/status.db'
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS current (
+    namespace TEXT NOT NULL,
+    agent_id TEXT NOT NULL,
+    value TEXT NOT NULL,
+    PRIMARY KEY (namespace, agent_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS history (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    namespace TEXT NOT NULL,
+    agent_id TEXT NOT NULL,
+    value TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS history_by_agent ON history (namespace, agent_id, id);
+"""
+
+_TRIM = """
+DELETE FROM history WHERE namespace = ? AND agent_id = ? AND id <= (
+    SELECT id FROM history WHERE namespace = ? AND agent_id = ?
+    ORDER BY id DESC LIMIT 1 OFFSET ?
+)
+"""
+
+
+class StatusStore:
+    """SQLite (WAL) store of per-agent current values and bounded per-agent histories."""
+
+    def __init__(self, path: str, max_history: int = DEFAULT_MAX_HISTORY,
+                 busy_timeout: float = DEFAULT_BUSY_TIMEOUT):
+        """Open (creating if needed) the database.
+
+        Args:
+            path: Database file
+            max_history: Entries kept per agent and history namespace
+            busy_timeout: Seconds a writer waits for the write lock
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_history = max_history
+        self.busy_timeout = busy_timeout
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+        conn = self._connection()
+        conn.executescript(_SCHEMA)
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.path), timeout=self.busy_timeout,
+                                   isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+
+    def _write(self, statements: Iterable[Tuple[str, tuple]]) -> None:
+        """Run statements in one IMMEDIATE transaction (takes the write lock up front)."""
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for sql, params in statements:
+                conn.execute(sql, params)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    # --- Current values ---
+
+    def put(self, namespace: str, agent_id: str, value: Dict[str, Any]) -> None:
+        """Insert or replace the current value of an agent."""
+        self._write([(
+            "INSERT INTO current (namespace, agent_id, value) VALUES (?, ?, ?) "
+            "ON CONFLICT (namespace, agent_id) DO UPDATE SET value = excluded.value",
+            (namespace, agent_id, json.dumps(value)),
+        )])
+
+    def get(self, namespace: str, agent_id: str) -> Optional[Dict[str, Any]]:
+        """Current value of an agent, or None."""
+        row = self._connection().execute(
+            "SELECT value FROM current WHERE namespace = ? AND agent_id = ?", (namespace, agent_id)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def get_all(self, namespace: str) -> Dict[str, Dict[str, Any]]:
+        """Current values of all agents."""
+        rows = self._connection().execute(
+            "SELECT agent_id, value FROM current WHERE namespace = ? ORDER BY agent_id", (namespace,)
+        )
+        return {agent_id: json.loads(value) for agent_id, value in rows}
+
+    # --- Histories ---
+
+    def _append_statements(self, namespace: str, agent_id: str,
+                           entries: List[Dict[str, Any]]) -> List[Tuple[str, tuple]]:
+        statements = [
+            ("INSERT INTO history (namespace, agent_id, value) VALUES (?, ?, ?)",
+             (namespace, agent_id, json.dumps(entry)))
+            for entry in entries
+        ]
+        statements.append((_TRIM, (namespace, agent_id, namespace, agent_id, self.max_history)))
+        return statements
+
+    def append(self, namespace: str, agent_id: str, entry: Dict[str, Any]) -> None:
+        """Append a history entry, dropping the agent's oldest beyond max_history."""
+        self._write(self._append_statements(namespace, agent_id, [entry]))
+
+    def extend(self, namespace: str, agent_id: str, entries: List[Dict[str, Any]]) -> None:
+        """Append several history entries in one transaction."""
+        if entries:
+            self._write(self._append_statements(namespace, agent_id, entries))
+
+    def history(self, namespace: str, agent_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """History entries, oldest first, for one agent or all agents."""
+        if agent_id is None:
+            rows = self._connection().execute(
+                "SELECT value FROM history WHERE namespace = ? ORDER BY id", (namespace,)
+            )
+        else:
+            rows = self._connection().execute(
+                "SELECT value FROM history WHERE namespace = ? AND agent_id = ? ORDER BY id",
+                (namespace, agent_id),
+            )
+        return [json.loads(value) for value, in rows]
+
+    def history_by_agent(self, namespace: str) -> Dict[str, List[Dict[str, Any]]]:
+        """History entries of all agents, grouped by agent."""
+        grouped: Dict[str, List[Dict[str, Any]]] = {}
+        rows = self._connection().execute(
+            "SELECT agent_id, value FROM history WHERE namespace = ? ORDER BY id", (namespace,)
+        )
+        for agent_id, value in rows:
+            grouped.setdefault(agent_id, []).append(json.loads(value))
+        return grouped
+
+    def archive(self, namespace: str, history_namespace: str, timestamp: str) -> int:
+        """Move every current value of namespace into history_namespace atomically.
+
+        Each archived entry is {"timestamp": timestamp, "agent_id": ..., "value": <current value>}.
+
+        Returns:
+            The number of agents archived
+        """
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            rows = conn.execute(
+                "SELECT agent_id, value FROM current WHERE namespace = ?", (namespace,)
+            ).fetchall()
+            for agent_id, value in rows:
+                entry = {"timestamp": timestamp, "agent_id": agent_id, "value": json.loads(value)}
+                for sql, params in self._append_statements(history_namespace, agent_id, [entry]):
+                    conn.execute(sql, params)
+            conn.execute("DELETE FROM current WHERE namespace = ?", (namespace,))
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return len(rows)
+
+    # --- Legacy files ---
+
+    def migrate_json(self, path: str, load) -> bool:
+        """Import a legacy JSON file once and rename it to <name>.migrated.
+
+        Args:
+            path: Legacy file
+            load: Callable receiving the parsed JSON that writes it into the store
+
+        Returns:
+            True if a file was migrated
+        """
+        legacy = Path(path)
+        # Claim the file by renaming it first: rename is atomic, so when several
+        # processes migrate at once exactly one of them imports it.
+        claimed = legacy.with_name(f"{legacy.name}.migrating-{os.getpid()}-{threading.get_ident()}")
+        try:
+            legacy.rename(claimed)
+        except FileNotFoundError:
+            return False
+        except OSError as e:
+            logger.error(f"Failed to migrate {legacy}: {e}")
+            return False
+        try:
+            with open(claimed, "r") as f:
+                data = json.load(f)
+            load(data)
+        except (OSError, ValueError) as e:
+            claimed.rename(legacy)
+            logger.error(f"Failed to migrate {legacy}: {e}")
+            return False
+        except BaseException:
+            claimed.rename(legacy)
+            raise
+        claimed.replace(legacy.with_name(legacy.name + ".migrated"))
+        logger.info(f"Migrated {legacy} into {self.path}")
+        return True
+
+    def close(self) -> None:
+        """Close the connections of all threads."""
+        with self._connections_lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections = []
+        self._local = threading.local()
+
+
+_shared_stores: Dict[Path, StatusStore] = {}
+_shared_stores_lock = threading.Lock()
+
+
+def shared_store(path: Optional[str] = None) -> StatusStore:
+    """The process-wide StatusStore on path (default DEFAULT_STATUS_DB).
+
+    StatusMonitor, MetricsTracker and ErrorHandler use it when no store is passed,
+    so they share one database instead of each opening its own.
+    """
+    resolved = Path(path or DEFAULT_STATUS_DB).resolve()
+    with _shared_stores_lock:
+        store = _shared_stores.get(resolved)
+        if store is None:
+            store = _shared_stores[resolved] = StatusStore(str(resolved))
+        return store
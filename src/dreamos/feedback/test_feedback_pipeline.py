@@ -0,0 +1,76 @@
+"""
+Tests for asynchronous feedback ingestion.
+"""
+
+import shutil
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+from dreamos.feedback import FeedbackEngineV2
+
+
+class _SlowEngine(FeedbackEngineV2):
+    """Engine whose analysis blocks until released."""
+
+    def __init__(self, config):
+        self.release = threading.Event()
+        super().__init__(config)
+
+    def _analyze_sentiment(self, text):
+        self.release.wait(5)
+        return "neutral"
+
+
+def _metrics(task_id, score):
+    return {"type": "quality_metrics", "task_id": task_id, "metrics": {"quality_score": score}}
+
+
+class TestFeedbackPipeline(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = Path(tempfile.mkdtemp())
+        self.config = {"feedback_dir": str(self.tmp_dir), "async_ingest": True,
+                       "pipeline": {"batch_size": 8, "workers": 3}}
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_async_ingest_keeps_order_and_reports_metrics(self):
+        engine = FeedbackEngineV2(self.config)
+        scores = [0.5, 0.7, 0.7, 0.2] * 10
+        for score in scores:
+            engine.ingest_feedback(_metrics("T-1", score))
+        engine.ingest_feedback({"type": "quality_metrics"})  # invalid: no task_id
+        self.assertTrue(engine.pipeline.join(timeout=5))
+
+        trends = [r["analysis"]["trend"] for r in engine.get_analysis_reports("T-1")]
+        self.assertEqual(trends[:5], ["initial", "improving", "stable", "degrading", "improving"])
+        self.assertEqual(len(trends), len(scores))
+
+        metrics = engine.pipeline.get_metrics()
+        self.assertEqual(metrics["submitted"], len(scores) + 1)
+        self.assertEqual(metrics["processed"], len(scores))
+        self.assertEqual(metrics["failed"], 1)
+        self.assertEqual(metrics["stages"]["analyze"]["items"], len(scores))
+        self.assertGreater(metrics["end_to_end"]["count"], 0)
+
+        engine.close()
+        self.assertIsNone(engine.pipeline)
+        self.assertEqual(len(FeedbackEngineV2({"feedback_dir": str(self.tmp_dir)}).get_analysis_reports()), len(scores))
+
+    def test_backpressure_drops_when_queue_full(self):
+        self.config["pipeline"] = {"batch_size": 1, "max_queue": 2, "block_timeout": 0}
+        engine = _SlowEngine(self.config)
+        feedback = {"type": "user_feedback", "task_id": "T-1", "feedback": {"comments": "ok"}}
+        accepted = [engine.pipeline.submit(dict(feedback)) for _ in range(10)]
+        self.assertFalse(all(accepted))
+        self.assertGreaterEqual(engine.pipeline.get_metrics()["dropped"], 1)
+
+        engine.release.set()
+        engine.close(timeout=5)
+        self.assertEqual(len(engine.get_analysis_reports()), sum(accepted))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+"""
+Tests for FeedbackEngineV2 persistence through the segmented feedback store.
+"""
+
+import json
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from dreamos.feedback import FeedbackEngineV2
+
+
+def _metrics(task_id, score):
+    return {"type": "quality_metrics", "task_id": task_id, "metrics": {"quality_score": score}}
+
+
+def _failure(task_id, error="boom"):
+    return {"type": "task_failure", "task_id": task_id, "error": error, "agent_id": "Agent-1"}
+
+
+class TestFeedbackStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = Path(tempfile.mkdtemp())
+        self.config = {
+            "feedback_dir": str(self.tmp_dir),
+            "segment_max_bytes": 512,
+            "snapshot_interval_seconds": 3600,
+        }
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_indexed_queries_and_reload(self):
+        engine = FeedbackEngineV2(self.config)
+        engine.ingest_feedback(_metrics("T-1", 0.5))
+        engine.ingest_feedback(_failure("T-2"))
+        engine.ingest_feedback(_metrics("T-1", 0.9))
+        engine.ingest_feedback({"type": "user_feedback", "task_id": "T-2",
+                                "feedback": {"satisfaction": 4}})
+
+        reports = engine.get_analysis_reports("T-1")
+        self.assertEqual([r["analysis"]["trend"] for r in reports], ["initial", "improving"])
+        self.assertEqual(len(engine.get_analysis_reports(feedback_type="task_failure")), 1)
+        self.assertEqual(len(engine.get_analysis_reports("T-2", "user_feedback")), 1)
+        self.assertEqual(len(engine.get_analysis_reports()), 4)
+        self.assertGreater(len(list((self.tmp_dir / "segments").iterdir())), 1)
+
+        # Only the first snapshot has been written; the rest is replayed from the log
+        reloaded = FeedbackEngineV2(self.config)
+        self.assertEqual(reloaded.quality_metrics, engine.quality_metrics)
+        self.assertEqual(reloaded.task_feedback, engine.task_feedback)
+        self.assertEqual(reloaded.retry_strategies, engine.retry_strategies)
+        self.assertEqual(reloaded.get_analysis_reports(), engine.get_analysis_reports())
+
+        engine.flush()
+        reloaded = FeedbackEngineV2(self.config)
+        self.assertEqual(len(reloaded.get_quality_metrics("T-1")), 2)
+        self.assertEqual(reloaded.task_feedback["T-2"]["failures"][0]["error"], "boom")
+
+    def test_migrates_legacy_file(self):
+        legacy = {
+            "feedback_data": {
+                "0": {"timestamp": "2024-01-01T00:00:00+00:00", "data": _failure("T-9")},
+                "T-9": {"failures": [{"timestamp": "2024-01-01T00:00:00+00:00", "error": "boom"}]},
+            },
+            "quality_metrics": {},
+            "analysis_reports": [{"feedback_id": "0", "type": "task_failure", "analysis": {}}],
+            "retry_strategies": {"T-9": {"max_retries": 3}},
+        }
+        (self.tmp_dir / "feedback_data.json").write_text(json.dumps(legacy))
+
+        engine = FeedbackEngineV2(self.config)
+        self.assertIn("0", engine.feedback_data)
+        self.assertEqual(engine.get_retry_strategy("T-9"), {"max_retries": 3})
+        self.assertTrue((self.tmp_dir / "feedback_data.json.migrated").exists())
+
+        reloaded = FeedbackEngineV2(self.config)
+        self.assertEqual(reloaded.task_feedback, engine.task_feedback)
+        self.assertEqual(len(reloaded.get_analysis_reports(feedback_type="task_failure")), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,117 @@
+"""
+Tests for the shared SQLite status store and the monitors built on it.
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+from dreamos.feedback.error_handler import ErrorHandler
+from dreamos.feedback.metrics_tracker import MetricsTracker
+from dreamos.feedback.status_monitor import StatusMonitor
+from dreamos.feedback.status_store import StatusStore, shared_store
+
+
+class TestStatusStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = Path(tempfile.mkdtemp())
+        self.store = StatusStore(str(self.tmp_dir / "status.db"), max_history=5)
+
+    def tearDown(self):
+        self.store.close()
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_concurrent_writers_lose_nothing(self):
+        monitor = StatusMonitor(str(self.tmp_dir), store=self.store)
+        handler = ErrorHandler(str(self.tmp_dir), store=self.store)
+        # A second store on the same file stands in for another process
+        other = StatusStore(str(self.tmp_dir / "status.db"), max_history=5)
+
+        def worker(n):
+            for i in range(40):
+                monitor.update_heartbeat(f"Agent-{n}", {"beat": i})
+                monitor.add_devlog_entry(f"Agent-{n}", {"event": i})
+                other.append("alerts", f"Agent-{n}", {"agent_id": f"Agent-{n}", "message": str(i)})
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        other.close()
+
+        heartbeats = monitor.get_heartbeat()
+        self.assertEqual(len(heartbeats), 8)
+        self.assertTrue(all(h["status"] == {"beat": 39} for h in heartbeats.values()))
+        devlog = monitor.get_devlog("Agent-3")
+        self.assertEqual([e["event"] for e in devlog], [35, 36, 37, 38, 39])
+        self.assertEqual(len(monitor.get_devlog()), 8)
+        self.assertEqual([a["message"] for a in handler.get_alerts("Agent-0")], ["35", "36", "37", "38", "39"])
+        self.assertEqual(len(handler.get_alerts()), 40)
+
+    def test_metrics_archive_and_legacy_migration(self):
+        (self.tmp_dir / "current_metrics.json").write_text(json.dumps(
+            {"Agent-1": {"timestamp": "2026-01-01T00:00:00", "metrics": {"tasks": 1}}}))
+        (self.tmp_dir / "alerts.json").write_text(json.dumps(
+            [{"timestamp": "2026-01-01T00:00:00", "agent_id": "Agent-2", "message": "old", "severity": "warning"}]))
+
+        tracker = MetricsTracker(str(self.tmp_dir), store=self.store)
+        handler = ErrorHandler(str(self.tmp_dir), store=self.store)
+        self.assertEqual(tracker.get_current_metrics("Agent-1")["metrics"], {"tasks": 1})
+        self.assertEqual(handler.get_alerts("Agent-2")[0]["message"], "old")
+        self.assertFalse((self.tmp_dir / "alerts.json").exists())
+
+        tracker.record_metrics("Agent-2", {"tasks": 7})
+        tracker.archive_metrics()
+        tracker.record_metrics("Agent-1", {"tasks": 2})
+        tracker.archive_metrics()
+        self.assertEqual(tracker.get_current_metrics(), {})
+
+        history = tracker.get_metrics_history()
+        self.assertEqual([sorted(h["metrics"]) for h in history], [["Agent-1", "Agent-2"], ["Agent-1"]])
+        self.assertEqual(len(tracker.get_metrics_history("Agent-2")), 1)
+        self.assertEqual(history[1]["metrics"]["Agent-1"]["metrics"], {"tasks": 2})
+
+        handler.handle_error("Agent-1", ValueError("boom"))
+        self.assertEqual(handler.get_error_log("Agent-1")[0]["error_type"], "ValueError")
+
+    def test_concurrent_migration_imports_once(self):
+        legacy = self.tmp_dir / "alerts.json"
+        legacy.write_text(json.dumps([{"agent_id": "Agent-1", "message": "old"}]))
+        # A second store on the same file stands in for another process
+        other = StatusStore(str(self.tmp_dir / "status.db"), max_history=5)
+        results = []
+
+        def load(entries):
+            # The other process starts migrating while this one is importing
+            results.append(other.migrate_json(str(legacy), lambda data: other.extend("alerts", "Agent-1", data)))
+            self.store.extend("alerts", "Agent-1", entries)
+
+        self.assertTrue(self.store.migrate_json(str(legacy), load))
+        other.close()
+        self.assertEqual(results, [False])
+        self.assertEqual(len(self.store.history("alerts", "Agent-1")), 1)
+        self.assertEqual([p.name for p in self.tmp_dir.glob("alerts.json*")], ["alerts.json.migrated"])
+
+    def test_monitors_default_to_one_shared_store(self):
+        cwd = os.getcwd()
+        os.chdir(self.tmp_dir)
+        try:
+            monitor = StatusMonitor(str(self.tmp_dir / "status"))
+            tracker = MetricsTracker(str(self.tmp_dir / "metrics"))
+            handler = ErrorHandler(str(self.tmp_dir / "errors"))
+            self.assertIs(monitor.store, shared_store())
+            self.assertIs(tracker.store, monitor.store)
+            self.assertIs(handler.store, monitor.store)
+            monitor.store.close()
+        finally:
+            os.chdir(cwd)
+        self.assertTrue((self.tmp_dir / "runtime" / "status" / "status.db").exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
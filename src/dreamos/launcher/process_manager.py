@@ -362,8 +362,40 @@ class ProcessManager:
             # Save process data
             self._save_process_data(process_id, process_data)
             
+            # Agent state is written by the background checkpoint service so the
+            # monitor thread never blocks on the mailbox scan or disk
+            if process_data.get("component_type") == "agent":
+                self._request_agent_checkpoint(process_id, process_data["component_id"])
+            
             # Notify process of checkpoint (to be implemented based on checkpoint protocol)
             logger.info(f"Triggered checkpoint for process {process_id}: {checkpoint_id}")
+    
+    def _request_agent_checkpoint(self, process_id: str, agent_id: str):
+        """
+        Queue an agent state checkpoint and record its path when it is written.
+        
+        Args:
+            process_id: ID of the process
+            agent_id: ID of the agent component
+        """
+        try:
+            from dreamos.core.checkpoint_service import get_checkpoint_service
+            future = get_checkpoint_service().request_checkpoint(agent_id, "routine")
+        except Exception as e:
+            logger.error(f"Error queueing checkpoint for process {process_id}: {e}")
+            return
+        
+        def _on_written(done):
+            if done.exception() is not None:
+                logger.error(f"Checkpoint for process {process_id} failed: {done.exception()}")
+                return
+            with self._lock:
+                process_data = self._processes.get(process_id)
+                if process_data is not None:
+                    process_data["checkpoint_path"] = done.result()
+                    self._save_process_data(process_id, process_data)
+        
+        future.add_done_callback(_on_written)
             
     def _handle_process_termination(self, process_id: str):
         """
@@ -1,66 +1,86 @@
 """
 Core metrics collection and management for agent responses.
+
+Samples are appended to a per-agent time series (see timeseries.py) instead of
+rewriting a JSON file per sample; MetricsCollector answers aggregate queries from
+the downsampled rollups without reading raw samples. All AgentMetrics of the same
+agent and directory share one time series.
 """
 
 import time
 import json
-from datetime import datetime
-from typing import Dict, List, Optional, Any
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Any, Iterable, Tuple
 from pathlib import Path
 
+from .timeseries import (
+    DEFAULT_FLUSH_INTERVAL,
+    DEFAULT_ROLLUP_SECONDS,
+    SAMPLE_FIELDS,
+    Rollup,
+    RollupReader,
+    open_series,
+)
+
+logger = logging.getLogger(__name__)
+
 class AgentMetrics:
     """Manages metrics collection for individual agents."""
     
-    def __init__(self, agent_id: str):
+    def __init__(self, agent_id: str, metrics_dir: str = "runtime/metrics",
+                 rollup_seconds: int = DEFAULT_ROLLUP_SECONDS,
+                 flush_interval: float = DEFAULT_FLUSH_INTERVAL):
         self.agent_id = agent_id
-        self.metrics_dir = Path("runtime/metrics")
+        self.metrics_dir = Path(metrics_dir)
         self.metrics_dir.mkdir(parents=True, exist_ok=True)
-        self.metrics_file = self.metrics_dir / f"{agent_id}_metrics.json"
-        self._load_metrics()
-    
-    def _load_metrics(self):
-        """Load existing metrics from file."""
-        if self.metrics_file.exists():
-            with open(self.metrics_file, 'r') as f:
-                self.metrics = json.load(f)
-        else:
-            self.metrics = {
-                'response_times': [],
-                'success_rates': [],
-                'resource_utilization': []
-            }
+        self.series = open_series(self.metrics_dir, agent_id, rollup_seconds=rollup_seconds,
+                                  flush_interval=flush_interval)
+        self.metrics_file = self.series.raw_path
+        self._migrate_legacy_file()
     
-    def _save_metrics(self):
-        """Save metrics to file."""
-        with open(self.metrics_file, 'w') as f:
-            json.dump(self.metrics, f, indent=2)
+    def _migrate_legacy_file(self):
+        """Move samples from the old <agent>_metrics.json into the time series."""
+        legacy_file = self.metrics_dir / f"{self.agent_id}_metrics.json"
+        if not legacy_file.exists():
+            return
+        with open(legacy_file, 'r') as f:
+            legacy = json.load(f)
+        count = 0
+        for sample_type in SAMPLE_FIELDS:
+            for sample in legacy.get(sample_type, []):
+                timestamp = datetime.fromisoformat(sample['timestamp']).timestamp()
+                self.series.append(sample_type, sample, timestamp)
+                count += 1
+        self.series.flush()
+        legacy_file.rename(legacy_file.with_name(legacy_file.name + ".migrated"))
+        logger.info(f"Migrated {count} samples from {legacy_file}")
+    
+    @property
+    def metrics(self) -> Dict[str, List[Dict[str, Any]]]:
+        """All raw samples by type, read from the time series on first access."""
+        return self.series.read_samples()
+    
+    def _record(self, sample_type: str, sample: Dict[str, Any]):
+        now = time.time()
+        sample = {'timestamp': datetime.fromtimestamp(now).isoformat(), **sample}
+        self.series.append(sample_type, sample, now)
     
     def record_response_time(self, action: str, duration_ms: float):
         """Record response time for an action."""
-        self.metrics['response_times'].append({
-            'timestamp': datetime.now().isoformat(),
-            'action': action,
-            'duration_ms': duration_ms
-        })
-        self._save_metrics()
+        self._record('response_times', {'action': action, 'duration_ms': duration_ms})
     
     def record_success_rate(self, action: str, success: bool):
         """Record success/failure for an action."""
-        self.metrics['success_rates'].append({
-            'timestamp': datetime.now().isoformat(),
-            'action': action,
-            'success': success
-        })
-        self._save_metrics()
+        self._record('success_rates', {'action': action, 'success': success})
     
     def record_resource_utilization(self, resource_type: str, utilization: float):
         """Record resource utilization."""
-        self.metrics['resource_utilization'].append({
-            'timestamp': datetime.now().isoformat(),
-            'resource_type': resource_type,
-            'utilization': utilization
-        })
-        self._save_metrics()
+        self._record('resource_utilization', {'resource_type': resource_type, 'utilization': utilization})
+    
+    def flush(self):
+        """Write pending rollups so that MetricsCollector queries see every sample."""
+        self.series.flush()
     
     def get_response_times(self, action: Optional[str] = None) -> List[Dict[str, Any]]:
         """Get response times, optionally filtered by action."""
@@ -83,18 +103,102 @@ class AgentMetrics:
 class MetricsCollector:
     """Collects metrics across multiple agents."""
     
-    def __init__(self):
-        self.metrics_dir = Path("runtime/metrics")
+    def __init__(self, metrics_dir: str = "runtime/metrics"):
+        self.metrics_dir = Path(metrics_dir)
         self.metrics_dir.mkdir(parents=True, exist_ok=True)
+        self._readers: Dict[str, RollupReader] = {}
     
     def get_all_agent_metrics(self) -> Dict[str, AgentMetrics]:
         """Get metrics for all agents."""
         metrics = {}
-        for metrics_file in self.metrics_dir.glob("*_metrics.json"):
-            agent_id = metrics_file.stem.replace("_metrics", "")
-            metrics[agent_id] = AgentMetrics(agent_id)
+        for pattern in ("*_metrics.jsonl", "*_metrics.json"):
+            for metrics_file in self.metrics_dir.glob(pattern):
+                agent_id = metrics_file.name[:-len(pattern[1:])]
+                if agent_id not in metrics:
+                    metrics[agent_id] = AgentMetrics(agent_id, str(self.metrics_dir))
         return metrics
     
+    def _rollup_readers(self, agent_id: Optional[str] = None) -> Iterable[RollupReader]:
+        pattern = f"{agent_id}_rollups.jsonl" if agent_id else "*_rollups.jsonl"
+        for rollup_file in self.metrics_dir.glob(pattern):
+            reader = self._readers.get(rollup_file.name)
+            if reader is None:
+                reader = self._readers[rollup_file.name] = RollupReader(rollup_file)
+            reader.refresh()
+            yield reader
+    
+    def _aggregate(self, sample_type: str, key: Optional[str], window: Optional[timedelta],
+                   agent_id: Optional[str]) -> Tuple[Rollup, float]:
+        """Merge the rollups of all (or one) agents.
+        
+        Windows are resolved to rollup intervals: every interval that ends inside
+        the window counts in full.
+        
+        Returns:
+            The merged rollup and the number of seconds it spans
+        """
+        since = time.time() - window.total_seconds() if window else None
+        total = Rollup()
+        first, last = None, None
+        for reader in self._rollup_readers(agent_id):
+            rollup, start, end = reader.query(sample_type, key, since)
+            total.merge(rollup)
+            if rollup.count:
+                first = start if first is None else min(first, start)
+                last = end if last is None else max(last, end)
+        if window:
+            span = window.total_seconds()
+        else:
+            span = (last - first) if total.count else 0.0
+        return total, span
+    
+    @staticmethod
+    def _summary(rollup: Rollup, percentiles: Iterable[float]) -> Dict[str, Any]:
+        summary = {
+            'count': rollup.count,
+            'mean': rollup.mean,
+            'min': rollup.minimum if rollup.count else None,
+            'max': rollup.maximum if rollup.count else None,
+        }
+        for q in percentiles:
+            summary[f"p{q:g}"] = rollup.percentile(q)
+        return summary
+    
+    def get_response_time_percentiles(self, percentiles: Iterable[float] = (50, 90, 99),
+                                      action: Optional[str] = None,
+                                      window: Optional[timedelta] = None,
+                                      agent_id: Optional[str] = None) -> Dict[str, Any]:
+        """Response time count, mean, min, max and percentiles (e.g. 'p99') from rollups.
+        
+        Percentiles are accurate to within 1% of the exact value.
+        """
+        rollup, _ = self._aggregate('response_times', action, window, agent_id)
+        return self._summary(rollup, percentiles)
+    
+    def get_resource_utilization_percentiles(self, resource_type: Optional[str] = None,
+                                             percentiles: Iterable[float] = (50, 90, 99),
+                                             window: Optional[timedelta] = None,
+                                             agent_id: Optional[str] = None) -> Dict[str, Any]:
+        """Resource utilization count, mean, min, max and percentiles from rollups."""
+        rollup, _ = self._aggregate('resource_utilization', resource_type, window, agent_id)
+        return self._summary(rollup, percentiles)
+    
+    def get_success_rate(self, action: Optional[str] = None, window: Optional[timedelta] = None,
+                         agent_id: Optional[str] = None) -> Dict[str, Any]:
+        """Fraction of successful actions from rollups."""
+        rollup, _ = self._aggregate('success_rates', action, window, agent_id)
+        return {
+            'count': rollup.count,
+            'successes': int(rollup.total),
+            'success_rate': rollup.mean,
+        }
+    
+    def get_request_rate(self, window: Optional[timedelta] = None, action: Optional[str] = None,
+                         agent_id: Optional[str] = None) -> float:
+        """Recorded response times per second over the window (or the whole history)."""
+        rollup, span = self._aggregate('response_times', action, window, agent_id)
+        return rollup.count / span if span else 0.0
+    
     def get_aggregate_response_times(self, action: Optional[str] = None) -> List[Dict[str, Any]]:
         """Get aggregate response times across all agents."""
         all_times = []
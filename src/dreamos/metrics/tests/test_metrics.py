@@ -11,15 +11,19 @@ from ..agent_metrics import AgentMetrics, MetricsCollector
 from ..metrics_visualizer import MetricsVisualizer
 from ..metrics_integration import MetricsManager, MetricsDecorator
 
+def _remove_agent_files(agent_id):
+    for suffix in ("_metrics.jsonl", "_rollups.jsonl"):
+        metrics_file = Path("runtime/metrics") / f"{agent_id}{suffix}"
+        if metrics_file.exists():
+            metrics_file.unlink()
+
 class TestAgentMetrics(unittest.TestCase):
     def setUp(self):
         self.agent_id = "test_agent"
         self.metrics = AgentMetrics(self.agent_id)
-        self.metrics_file = Path("runtime/metrics") / f"{self.agent_id}_metrics.json"
     
     def tearDown(self):
-        if self.metrics_file.exists():
-            self.metrics_file.unlink()
+        _remove_agent_files(self.agent_id)
     
     def test_record_response_time(self):
         self.metrics.record_response_time("test_action", 100.0)
@@ -50,9 +54,7 @@ class TestMetricsCollector(unittest.TestCase):
     
     def tearDown(self):
         for agent_id in ["agent1", "agent2"]:
-            metrics_file = Path("runtime/metrics") / f"{agent_id}_metrics.json"
-            if metrics_file.exists():
-                metrics_file.unlink()
+            _remove_agent_files(agent_id)
     
     def test_get_all_agent_metrics(self):
         metrics = self.collector.get_all_agent_metrics()
@@ -119,9 +121,7 @@ class TestMetricsIntegration(unittest.TestCase):
         self.decorator = MetricsDecorator(self.agent_id)
     
     def tearDown(self):
-        metrics_file = Path("runtime/metrics") / f"{self.agent_id}_metrics.json"
-        if metrics_file.exists():
-            metrics_file.unlink()
+        _remove_agent_files(self.agent_id)
     
     def test_record_action(self):
         start_time = time.time()
@@ -0,0 +1,140 @@
+"""
+Tests for the append-only agent metrics time series and rollup queries.
+"""
+
+import json
+import random
+import shutil
+import statistics
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from dreamos.metrics.agent_metrics import AgentMetrics, MetricsCollector
+from dreamos.metrics.timeseries import AgentTimeSeries, Rollup, RollupReader
+
+
+class TestAgentTimeSeries(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = Path(tempfile.mkdtemp())
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_rollup_percentiles_within_accuracy(self):
+        rng = random.Random(1)
+        values = [rng.lognormvariate(4, 1) for _ in range(20000)]
+        left, right = Rollup(), Rollup()
+        for i, value in enumerate(values):
+            (left if i % 2 else right).add(value)
+        left.merge(Rollup.from_dict(json.loads(json.dumps(right.to_dict()))))
+
+        exact = statistics.quantiles(values, n=100, method="inclusive")
+        for q in (50, 90, 99):
+            self.assertAlmostEqual(left.percentile(q) / exact[q - 1], 1.0, delta=0.011)
+        self.assertEqual(left.count, len(values))
+        self.assertEqual(left.percentile(100), max(values))
+
+    def test_unflushed_samples_replayed_and_compacted(self):
+        now = [datetime(2026, 1, 10).timestamp()]
+        series = AgentTimeSeries(self.tmp_dir, "A", rollup_seconds=60, flush_interval=3600,
+                                 coarsen_after=3600, clock=lambda: now[0])
+        for minute in range(180):
+            ts = now[0] - 3 * 3600 + minute * 60
+            sample = {"timestamp": datetime.fromtimestamp(ts).isoformat(), "action": "run",
+                      "duration_ms": float(minute)}
+            series.append("response_times", sample, ts)
+            if minute == 100:
+                series.flush()
+        # The last 79 samples were never flushed: a new instance re-aggregates them
+        reopened = AgentTimeSeries(self.tmp_dir, "A", rollup_seconds=60, coarsen_after=3600,
+                                   clock=lambda: now[0])
+        reopened.compact()
+
+        reader = RollupReader(reopened.rollup_path)
+        reader.refresh()
+        rollup, _, _ = reader.query("response_times")
+        self.assertEqual(rollup.count, 180)
+        self.assertEqual(rollup.total, sum(range(180)))
+        widths = sorted({width for _, width, _, _ in reader.rollups})
+        self.assertEqual(widths, [60, 3600])
+        self.assertEqual(len(reopened.read_samples()["response_times"]), 180)
+
+
+class TestMetricsCollectorRollups(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_aggregate_queries_read_rollups(self):
+        agent1 = AgentMetrics("agent1", self.tmp_dir)
+        agent2 = AgentMetrics("agent2", self.tmp_dir)
+        for i in range(100):
+            agent1.record_response_time("plan", float(i + 1))
+            agent2.record_response_time("act", 1000.0)
+            agent1.record_success_rate("plan", i % 4 != 0)
+        agent2.record_resource_utilization("cpu", 0.5)
+        agent1.flush()
+        agent2.flush()
+
+        collector = MetricsCollector(self.tmp_dir)
+        self.assertEqual(set(collector.get_all_agent_metrics()), {"agent1", "agent2"})
+        plan = collector.get_response_time_percentiles(action="plan", window=timedelta(hours=1))
+        self.assertEqual(plan["count"], 100)
+        self.assertAlmostEqual(plan["p50"], 50.5, delta=0.6)
+        self.assertEqual(plan["max"], 100.0)
+        self.assertEqual(collector.get_response_time_percentiles(agent_id="agent2")["p99"], 1000.0)
+        self.assertEqual(collector.get_success_rate(action="plan"),
+                         {"count": 100, "successes": 75, "success_rate": 0.75})
+        self.assertAlmostEqual(collector.get_request_rate(timedelta(minutes=10)), 200 / 600)
+        self.assertEqual(collector.get_resource_utilization_percentiles("cpu")["p50"], 0.5)
+
+        # Raw samples stay available, and new rollups are picked up incrementally
+        self.assertEqual(len(agent1.get_response_times("plan")), 100)
+        agent2.record_response_time("act", 3000.0)
+        agent2.flush()
+        self.assertEqual(collector.get_response_time_percentiles(agent_id="agent2")["max"], 3000.0)
+
+    def test_two_writers_share_one_series(self):
+        # e.g. MetricsManager, MetricsDecorator and get_all_agent_metrics() for one agent
+        first = AgentMetrics("agent1", self.tmp_dir, flush_interval=3600)
+        second = AgentMetrics("agent1", self.tmp_dir, flush_interval=3600)
+        self.assertIs(first.series, second.series)
+        first.record_response_time("plan", 1.0)
+        second.record_response_time("plan", 2.0)
+        collector = MetricsCollector(self.tmp_dir)
+        third = collector.get_all_agent_metrics()["agent1"]
+        third.record_response_time("plan", 3.0)
+        for metrics in (first, second, third):
+            metrics.flush()
+
+        summary = collector.get_response_time_percentiles(agent_id="agent1")
+        self.assertEqual((summary["count"], summary["max"]), (3, 3.0))
+        self.assertEqual([rt["duration_ms"] for rt in first.get_response_times()], [1.0, 2.0, 3.0])
+
+        # A series whose files were removed is not handed out again
+        for path in Path(self.tmp_dir).glob("agent1_*"):
+            path.unlink()
+        fresh = AgentMetrics("agent1", self.tmp_dir)
+        self.assertEqual(fresh.get_response_times(), [])
+
+    def test_legacy_json_file_is_migrated(self):
+        legacy = {
+            "response_times": [{"timestamp": datetime.now().isoformat(), "action": "plan", "duration_ms": 5.0}],
+            "success_rates": [],
+            "resource_utilization": [],
+        }
+        legacy_file = Path(self.tmp_dir) / "old_metrics.json"
+        legacy_file.write_text(json.dumps(legacy))
+
+        metrics = MetricsCollector(self.tmp_dir).get_all_agent_metrics()
+        self.assertEqual(metrics["old"].get_response_times(), legacy["response_times"])
+        self.assertFalse(legacy_file.exists())
+        self.assertEqual(MetricsCollector(self.tmp_dir).get_response_time_percentiles()["count"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
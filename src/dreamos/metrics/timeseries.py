@@ -0,0 +1,440 @@
+"""
+Append-only time series with downsampled rollups for agent metrics.
+
+Every sample is appended as one JSON line to <agent>_metrics.jsonl; nothing that
+has been written is rewritten. Samples are also aggregated per rollup interval
+(count, sum, min, max and a log-scale histogram for percentiles) and the aggregates
+are appended to <agent>_rollups.jsonl. Rollup lines are deltas: readers sum all
+lines with the same (start, width, type, key), so a partially filled interval can
+be flushed early and topped up later. Each flushed line records the raw file offset
+it covers, and samples written after the last flush are re-aggregated on load.
+
+Rollup files are compacted periodically: deltas are merged and intervals older than
+coarsen_after seconds are downsampled to hourly buckets.
+
+An agent's files must have a single writer: open_series() hands every caller in the
+process the same AgentTimeSeries, so samples are never aggregated by two instances.
+"""
+
+import json
+import logging
+import math
+import os
+import threading
+import time
+import weakref
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ROLLUP_SECONDS = 60
+DEFAULT_FLUSH_INTERVAL = 1.0
+DEFAULT_COARSEN_AFTER = 24 * 3600
+DEFAULT_COMPACT_EVERY = 5000
+COARSE_ROLLUP_SECONDS = 3600
+
+# Relative error of percentiles read from rollup histograms
+HISTOGRAM_ACCURACY = 0.01
+_GAMMA = (1 + HISTOGRAM_ACCURACY) / (1 - HISTOGRAM_ACCURACY)
+_LOG_GAMMA = math.log(_GAMMA)
+
+# Sample type -> (key field, value field)
+SAMPLE_FIELDS = {
+    "response_times": ("action", "duration_ms"),
+    "success_rates": ("action", "success"),
+    "resource_utilization": ("resource_type", "utilization"),
+}
+
+# (interval start, interval width, sample type, key)
+RollupKey = Tuple[int, int, str, str]
+
+
+class Rollup:
+    """Mergeable aggregate of samples: count, sum, min, max and a log-scale histogram."""
+
+    __slots__ = ("count", "total", "minimum", "maximum", "zeros", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.minimum = math.inf
+        self.maximum = -math.inf
+        self.zeros = 0
+        self.buckets: Dict[int, int] = {}
+
+    def add(self, value: float) -> None:
+        """Add one sample."""
+        self.count += 1
+        self.total += value
+        if value < self.minimum:
+            self.minimum = value
+        if value > self.maximum:
+            self.maximum = value
+        if value > 0:
+            index = math.ceil(math.log(value) / _LOG_GAMMA)
+            self.buckets[index] = self.buckets.get(index, 0) + 1
+        else:
+            self.zeros += 1
+
+    def merge(self, other: "Rollup") -> None:
+        """Add all samples aggregated in other."""
+        self.count += other.count
+        self.total += other.total
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+        self.zeros += other.zeros
+        for index, count in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + count
+
+    @property
+    def mean(self) -> Optional[float]:
+        return self.total / self.count if self.count else None
+
+    def percentile(self, q: float) -> Optional[float]:
+        """Approximate q-th percentile (0-100) within HISTOGRAM_ACCURACY relative error.
+
+        Returns:
+            The percentile, or None if the rollup is empty
+        """
+        if not self.count:
+            return None
+        rank = q / 100 * (self.count - 1)
+        seen = self.zeros
+        value = 0.0 if rank < seen else self.maximum
+        if rank >= seen:
+            for index in sorted(self.buckets):
+                seen += self.buckets[index]
+                if rank < seen:
+                    value = 2 * _GAMMA ** index / (_GAMMA + 1)
+                    break
+        return min(max(value, self.minimum), self.maximum)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "sum": self.total,
+            "min": self.minimum,
+            "max": self.maximum,
+            "zeros": self.zeros,
+            "hist": {str(index): count for index, count in self.buckets.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Rollup":
+        rollup = cls()
+        rollup.count = data["count"]
+        rollup.total = data["sum"]
+        rollup.minimum = data["min"]
+        rollup.maximum = data["max"]
+        rollup.zeros = data.get("zeros", 0)
+        rollup.buckets = {int(index): count for index, count in data.get("hist", {}).items()}
+        return rollup
+
+
+def _encode(key: RollupKey, rollup: Rollup, position: int) -> str:
+    start, width, sample_type, name = key
+    entry = {"start": start, "width": width, "type": sample_type, "key": name, "pos": position}
+    entry.update(rollup.to_dict())
+    return json.dumps(entry, separators=(",", ":")) + "\n"
+
+
+def _decode(line: bytes) -> Tuple[RollupKey, Rollup, int]:
+    entry = json.loads(line)
+    key = (entry["start"], entry["width"], entry["type"], entry["key"])
+    return key, Rollup.from_dict(entry), entry.get("pos", 0)
+
+
+def _complete_lines(data: bytes) -> Tuple[List[bytes], int]:
+    """Split data into complete lines, ignoring a torn last line."""
+    end = data.rfind(b"\n") + 1
+    return data[:end].splitlines(), end
+
+
+def _repair(path: Path) -> int:
+    """Create path if missing and cut off a torn last line left by a crash.
+
+    Returns:
+        The size of the file
+    """
+    with open(path, "ab+") as f:
+        size = f.tell()
+        if not size:
+            return 0
+        f.seek(max(0, size - 65536))
+        tail = f.read()
+        end = size - len(tail) + tail.rfind(b"\n") + 1
+        if end < size:
+            f.truncate(end)
+        return end
+
+
+class AgentTimeSeries:
+    """Append-only raw sample log and rollup log of one agent.
+
+    Use open_series() rather than creating instances directly: a second live instance
+    would re-aggregate the first one's unflushed samples, and both would flush them.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        agent_id: str,
+        rollup_seconds: int = DEFAULT_ROLLUP_SECONDS,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+        coarsen_after: float = DEFAULT_COARSEN_AFTER,
+        compact_every: int = DEFAULT_COMPACT_EVERY,
+        clock: Callable[[], float] = time.time,
+    ):
+        """Open (creating if needed) the agent's files and re-aggregate unflushed samples.
+
+        Args:
+            directory: Directory holding the metrics files
+            agent_id: Agent whose samples are stored
+            rollup_seconds: Width of a rollup interval
+            flush_interval: Seconds after which pending rollups are flushed on append
+            coarsen_after: Age in seconds after which compaction downsamples intervals to hours
+            compact_every: Number of rollup lines appended between two compactions
+            clock: Wall clock used for flushing and compaction
+        """
+        self.agent_id = agent_id
+        self.raw_path = Path(directory) / f"{agent_id}_metrics.jsonl"
+        self.rollup_path = Path(directory) / f"{agent_id}_rollups.jsonl"
+        self.rollup_seconds = rollup_seconds
+        self.flush_interval = flush_interval
+        self.coarsen_after = coarsen_after
+        self.compact_every = compact_every
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._pending: Dict[RollupKey, Rollup] = {}
+        # Raw samples by type, read from the raw file on first use
+        self._samples: Optional[Dict[str, List[Dict[str, Any]]]] = None
+        self._last_flush = clock()
+        self._rollup_lines = 0
+
+        self._raw_offset = _repair(self.raw_path)
+        self._raw_inode = os.stat(self.raw_path).st_ino
+        _repair(self.rollup_path)
+        self._replay(self._covered_offset())
+
+    def is_current(self) -> bool:
+        """Whether the raw file is still the one this instance opened and appended to."""
+        try:
+            stat = os.stat(self.raw_path)
+        except FileNotFoundError:
+            return False
+        return stat.st_ino == self._raw_inode and stat.st_size >= self._raw_offset
+
+    def _covered_offset(self) -> int:
+        """Raw file offset covered by the last flushed rollup line."""
+        with open(self.rollup_path, "rb") as f:
+            f.seek(0, os.SEEK_END)
+            f.seek(max(0, f.tell() - 65536))
+            lines, _ = _complete_lines(f.read())
+        for line in reversed(lines):
+            try:
+                return _decode(line)[2]
+            except (ValueError, KeyError, TypeError):
+                continue
+        return 0
+
+    def _replay(self, position: int) -> None:
+        if position >= self._raw_offset:
+            return
+        with open(self.raw_path, "rb") as f:
+            f.seek(position)
+            lines, _ = _complete_lines(f.read(self._raw_offset - position))
+        for line in lines:
+            try:
+                sample = json.loads(line)
+                timestamp = datetime.fromisoformat(sample["timestamp"]).timestamp()
+                self._aggregate(sample["type"], sample, timestamp)
+            except (ValueError, KeyError, TypeError):
+                logger.warning(f"Skipping corrupt metrics sample for {self.agent_id}")
+        logger.info(f"Re-aggregated {len(lines)} unflushed samples for {self.agent_id}")
+
+    def _aggregate(self, sample_type: str, sample: Dict[str, Any], timestamp: float) -> None:
+        key_field, value_field = SAMPLE_FIELDS[sample_type]
+        start = int(timestamp // self.rollup_seconds) * self.rollup_seconds
+        key = (start, self.rollup_seconds, sample_type, str(sample[key_field]))
+        rollup = self._pending.get(key)
+        if rollup is None:
+            rollup = self._pending[key] = Rollup()
+        rollup.add(float(sample[value_field]))
+
+    def append(self, sample_type: str, sample: Dict[str, Any], timestamp: float) -> None:
+        """Append a sample and fold it into the pending rollups.
+
+        Args:
+            sample_type: One of SAMPLE_FIELDS
+            sample: Sample as returned by AgentMetrics (timestamp, key and value fields)
+            timestamp: Sample time as a POSIX timestamp
+        """
+        line = json.dumps({"type": sample_type, **sample}, separators=(",", ":")) + "\n"
+        payload = line.encode("utf-8")
+        with self._lock:
+            with open(self.raw_path, "ab") as f:
+                f.write(payload)
+            self._raw_offset += len(payload)
+            self._aggregate(sample_type, sample, timestamp)
+            if self._samples is not None:
+                self._samples[sample_type].append(sample)
+            if self._clock() - self._last_flush >= self.flush_interval:
+                self._flush()
+
+    def flush(self) -> None:
+        """Append all pending rollups to the rollup file."""
+        with self._lock:
+            self._flush()
+
+    def _flush(self) -> None:
+        self._last_flush = self._clock()
+        if not self._pending:
+            return
+        payload = "".join(_encode(key, rollup, self._raw_offset) for key, rollup in self._pending.items())
+        with open(self.rollup_path, "ab") as f:
+            f.write(payload.encode("utf-8"))
+        self._rollup_lines += len(self._pending)
+        self._pending = {}
+        if self._rollup_lines >= self.compact_every:
+            self._compact()
+
+    def compact(self) -> None:
+        """Merge rollup deltas and downsample old intervals to hourly buckets."""
+        with self._lock:
+            self._flush()
+            self._compact()
+
+    def _compact(self) -> None:
+        cutoff = self._clock() - self.coarsen_after
+        merged: Dict[RollupKey, Rollup] = {}
+        with open(self.rollup_path, "rb") as f:
+            lines, _ = _complete_lines(f.read())
+        for line in lines:
+            try:
+                (start, width, sample_type, name), rollup, _ = _decode(line)
+            except (ValueError, KeyError, TypeError):
+                continue
+            if start + width <= cutoff and width < COARSE_ROLLUP_SECONDS:
+                start = start // COARSE_ROLLUP_SECONDS * COARSE_ROLLUP_SECONDS
+                width = COARSE_ROLLUP_SECONDS
+            key = (start, width, sample_type, name)
+            if key in merged:
+                merged[key].merge(rollup)
+            else:
+                merged[key] = rollup
+        tmp_path = self.rollup_path.with_suffix(".jsonl.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.writelines(_encode(key, merged[key], self._raw_offset) for key in sorted(merged))
+        os.replace(tmp_path, self.rollup_path)
+        logger.debug(f"Compacted {len(lines)} rollup lines to {len(merged)} for {self.agent_id}")
+        self._rollup_lines = 0
+
+    def read_samples(self) -> Dict[str, List[Dict[str, Any]]]:
+        """Every raw sample, grouped by sample type.
+
+        The raw file is read once; later appends are added to the returned lists.
+        """
+        with self._lock:
+            if self._samples is not None:
+                return self._samples
+            with open(self.raw_path, "rb") as f:
+                lines, _ = _complete_lines(f.read(self._raw_offset))
+            samples: Dict[str, List[Dict[str, Any]]] = {sample_type: [] for sample_type in SAMPLE_FIELDS}
+            for line in lines:
+                try:
+                    sample = json.loads(line)
+                    samples[sample.pop("type")].append(sample)
+                except (ValueError, KeyError):
+                    logger.warning(f"Skipping corrupt metrics sample for {self.agent_id}")
+            self._samples = samples
+            return samples
+
+
+# (resolved directory, agent_id) -> live series; an entry goes away with its last user
+_open_series: "weakref.WeakValueDictionary[Tuple[Path, str], AgentTimeSeries]" = weakref.WeakValueDictionary()
+_open_series_lock = threading.Lock()
+
+
+def open_series(directory: Path, agent_id: str, **options: Any) -> AgentTimeSeries:
+    """Return the process-wide AgentTimeSeries of an agent, opening it if needed.
+
+    Args:
+        directory: Directory holding the metrics files
+        agent_id: Agent whose samples are stored
+        **options: AgentTimeSeries options, used only when the series is opened
+
+    Returns:
+        The series shared by every caller for this directory and agent
+    """
+    key = (Path(directory).resolve(), agent_id)
+    with _open_series_lock:
+        series = _open_series.get(key)
+        # Files removed or replaced behind the series' back are opened afresh
+        if series is None or not series.is_current():
+            series = _open_series[key] = AgentTimeSeries(directory, agent_id, **options)
+        return series
+
+
+class RollupReader:
+    """Reads an agent's rollup file incrementally, following appends and compactions."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.rollups: Dict[RollupKey, Rollup] = {}
+        self._offset = 0
+        self._inode: Optional[int] = None
+
+    def refresh(self) -> None:
+        """Merge rollup lines appended since the last refresh."""
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            self.rollups, self._offset, self._inode = {}, 0, None
+            return
+        if stat.st_ino != self._inode or stat.st_size < self._offset:
+            # Compacted (replaced) since the last read
+            self.rollups, self._offset, self._inode = {}, 0, stat.st_ino
+        if stat.st_size == self._offset:
+            return
+        with open(self.path, "rb") as f:
+            f.seek(self._offset)
+            lines, end = _complete_lines(f.read(stat.st_size - self._offset))
+        for line in lines:
+            try:
+                key, rollup, _ = _decode(line)
+            except (ValueError, KeyError, TypeError):
+                logger.warning(f"Skipping corrupt rollup line in {self.path}")
+                continue
+            if key in self.rollups:
+                self.rollups[key].merge(rollup)
+            else:
+                self.rollups[key] = rollup
+        self._offset += end
+
+    def query(
+        self, sample_type: str, key: Optional[str] = None, since: Optional[float] = None
+    ) -> Tuple[Rollup, Optional[float], Optional[float]]:
+        """Aggregate the rollups of one sample type.
+
+        Args:
+            sample_type: One of SAMPLE_FIELDS
+            key: Only this action/resource type (all if None)
+            since: Only intervals ending after this POSIX timestamp
+
+        Returns:
+            The merged rollup and the start and end of the intervals it covers
+        """
+        result = Rollup()
+        first: Optional[float] = None
+        last: Optional[float] = None
+        for (start, width, rollup_type, name), rollup in self.rollups.items():
+            if rollup_type != sample_type or (key is not None and name != key):
+                continue
+            if since is not None and start + width <= since:
+                continue
+            result.merge(rollup)
+            first = start if first is None else min(first, start)
+            last = start + width if last is None else max(last, start + width)
+        return result, first, last
@@ -0,0 +1,342 @@
+"""
+Load- and capability-aware task distribution used by TaskDistributor.
+
+- EpisodeCache keeps parsed episode files and re-parses a file only when its
+  mtime or size changes.
+- AgentLoad tracks an agent's outstanding work (sum of task costs) and its observed
+  throughput (cost units per second, an EWMA over completed tasks).
+- TaskDistributionEngine.plan() assigns tasks in priority order (largest cost first
+  within a priority) to agents whose capabilities cover the task's requirements:
+
+  - "least_loaded": each task goes to the agent with the earliest expected finish
+    time, (outstanding + cost) / throughput, i.e. weighted least-loaded.
+  - "min_cost": tasks are taken in batches of batch_size and each batch is solved
+    as a min-cost assignment of tasks to (agent, position) slots. A task in the
+    k-th position from the end of an agent's queue delays k tasks, so the slot costs
+    (outstanding + k * cost) / throughput and the matching minimizes the batch's
+    total expected completion time.
+
+Task cost is the first positive number among COST_FIELDS (default_cost otherwise);
+priorities may be numbers or names from PRIORITY_LEVELS.
+"""
+
+import logging
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+import numpy as np
+import yaml
+from scipy.optimize import linear_sum_assignment
+
+logger = logging.getLogger(__name__)
+
+STRATEGIES = ("least_loaded", "min_cost")
+COST_FIELDS = ("estimated_cost", "points", "estimated_hours", "effort")
+PRIORITY_LEVELS = {"critical": 4, "high": 3, "medium": 2, "normal": 2, "low": 1}
+DONE_STATUSES = {"completed", "complete", "done", "failed", "cancelled"}
+DEFAULT_BATCH_SIZE = 64
+
+# Cost of an infeasible (capability mismatch) pairing in the assignment matrix
+_INFEASIBLE = 1e18
+
+
+def task_id(task: Dict[str, Any]) -> str:
+    return str(task.get("id") or task.get("task_id") or "")
+
+
+def task_priority(task: Dict[str, Any]) -> float:
+    """Numeric priority of a task (higher first); unknown values count as 0."""
+    priority = task.get("priority", 0)
+    if isinstance(priority, str):
+        level = PRIORITY_LEVELS.get(priority.strip().lower())
+        if level is not None:
+            return float(level)
+    try:
+        return float(priority)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def task_cost(task: Dict[str, Any], default: float = 1.0) -> float:
+    """Estimated cost of a task from the first positive value among COST_FIELDS."""
+    for name in COST_FIELDS:
+        try:
+            value = float(task.get(name))
+        except (TypeError, ValueError):
+            continue
+        if value > 0:
+            return value
+    return default
+
+
+def required_capabilities(task: Dict[str, Any]) -> FrozenSet[str]:
+    required = task.get("required_capabilities") or task.get("capabilities") or []
+    if isinstance(required, str):
+        required = [required]
+    return frozenset(str(c) for c in required)
+
+
+class EpisodeCache:
+    """Parsed episode files, re-parsed only when a file's mtime or size changes."""
+
+    def __init__(self, episodes_dir: Path, pattern: str = "episode-*.yaml"):
+        self.episodes_dir = Path(episodes_dir)
+        self.pattern = pattern
+        self.parse_count = 0
+        self._entries: Dict[Path, Tuple[Tuple[int, int], List[Dict[str, Any]]]] = {}
+
+    def _parse(self, path: Path) -> List[Dict[str, Any]]:
+        self.parse_count += 1
+        try:
+            with open(path, "r") as f:
+                episode = yaml.safe_load(f)
+        except Exception as e:
+            logger.error(f"Failed to load tasks from {path}: {e}")
+            return []
+        if not isinstance(episode, dict) or "tasks" not in episode:
+            return []
+        if not isinstance(episode["tasks"], list):
+            logger.warning(f"Invalid tasks format in {path}")
+            return []
+        tasks = []
+        for index, task in enumerate(episode["tasks"]):
+            if isinstance(task, dict):
+                if not task_id(task):
+                    task = {**task, "id": f"{path.stem}-{index + 1}"}
+                tasks.append(task)
+        return tasks
+
+    def load_tasks(self) -> Tuple[List[Dict[str, Any]], int]:
+        """All tasks of all episode files (copies, safe to modify).
+
+        Returns:
+            The tasks and the number of episode files
+        """
+        paths = sorted(self.episodes_dir.glob(self.pattern))
+        tasks: List[Dict[str, Any]] = []
+        for path in paths:
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            key = (stat.st_mtime_ns, stat.st_size)
+            cached = self._entries.get(path)
+            if cached is None or cached[0] != key:
+                cached = self._entries[path] = (key, self._parse(path))
+            tasks.extend(dict(task) for task in cached[1])
+        for stale in set(self._entries) - set(paths):
+            del self._entries[stale]
+        return tasks, len(paths)
+
+
+@dataclass
+class AgentLoad:
+    """Outstanding work and observed throughput of one agent."""
+
+    agent_id: str
+    capabilities: FrozenSet[str] = frozenset()
+    throughput: float = 1.0
+    outstanding: Dict[str, float] = field(default_factory=dict)
+    outstanding_cost: float = 0.0
+    completed: int = 0
+
+    def add(self, task: str, cost: float) -> None:
+        self.outstanding_cost += cost - self.outstanding.get(task, 0.0)
+        self.outstanding[task] = cost
+
+    def remove(self, task: str) -> Optional[float]:
+        cost = self.outstanding.pop(task, None)
+        if cost is not None:
+            self.outstanding_cost = max(0.0, self.outstanding_cost - cost) if self.outstanding else 0.0
+        return cost
+
+    def finish_time(self, extra_cost: float = 0.0) -> float:
+        """Expected seconds until the outstanding work (plus extra_cost) is done."""
+        return (self.outstanding_cost + extra_cost) / self.throughput
+
+    def can_run(self, required: FrozenSet[str]) -> bool:
+        return required <= self.capabilities
+
+
+@dataclass
+class DistributionPlan:
+    """Result of TaskDistributionEngine.plan()."""
+
+    assignments: Dict[str, List[Dict[str, Any]]] = field(default_factory=dict)
+    unassigned: List[Dict[str, Any]] = field(default_factory=list)
+    skipped: int = 0
+
+    @property
+    def assigned_count(self) -> int:
+        return sum(len(tasks) for tasks in self.assignments.values())
+
+
+class TaskDistributionEngine:
+    """Assigns tasks to agents by outstanding load, throughput and capabilities."""
+
+    def __init__(self, strategy: str = "least_loaded", default_throughput: float = 1.0,
+                 throughput_alpha: float = 0.3, default_cost: float = 1.0,
+                 batch_size: int = DEFAULT_BATCH_SIZE):
+        """Initialize the engine.
+
+        Args:
+            strategy: One of STRATEGIES
+            default_throughput: Throughput assumed before an agent completes a task
+            throughput_alpha: EWMA weight of each newly observed completion
+            default_cost: Cost of tasks without an estimate
+            batch_size: Tasks per assignment problem for the min_cost strategy
+
+        Raises:
+            ValueError: If the strategy is unknown
+        """
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unknown strategy {strategy!r}, expected one of {STRATEGIES}")
+        self.strategy = strategy
+        self.default_throughput = default_throughput
+        self.throughput_alpha = throughput_alpha
+        self.default_cost = default_cost
+        self.batch_size = batch_size
+        self.agents: Dict[str, AgentLoad] = {}
+        # Every task id ever assigned or seen in a mailbox; never assigned again
+        self.known_tasks: Dict[str, str] = {}
+        self._counted_completions: set = set()
+
+    # --- Agent state ---
+
+    def set_agents(self, registry: Dict[str, Any]) -> None:
+        """Register agents (registry entries may list "capabilities"); others are dropped."""
+        for agent_id, info in registry.items():
+            capabilities = frozenset(str(c) for c in (info or {}).get("capabilities", []) or [])
+            agent = self.agents.get(agent_id)
+            if agent is None:
+                self.agents[agent_id] = AgentLoad(agent_id, capabilities, self.default_throughput)
+            else:
+                agent.capabilities = capabilities
+        for agent_id in set(self.agents) - set(registry):
+            del self.agents[agent_id]
+
+    def record_completion(self, agent_id: str, task: str, duration: Optional[float] = None) -> None:
+        """Remove a finished task from the agent's load and update its throughput.
+
+        Args:
+            agent_id: Agent that ran the task
+            task: Task id
+            duration: Seconds the task took, if known
+        """
+        agent = self.agents.get(agent_id)
+        if agent is None:
+            return
+        cost = agent.remove(task)
+        key = (agent_id, task)
+        if key in self._counted_completions:
+            return
+        self._counted_completions.add(key)
+        agent.completed += 1
+        if cost is not None and duration and duration > 0:
+            observed = cost / duration
+            agent.throughput += self.throughput_alpha * (observed - agent.throughput)
+
+    def release(self, agent_id: str, tasks: Iterable[str]) -> None:
+        """Undo assignments that could not be delivered, so they are planned again."""
+        agent = self.agents.get(agent_id)
+        for task in tasks:
+            self.known_tasks.pop(task, None)
+            if agent is not None:
+                agent.remove(task)
+
+    def sync_agent(self, agent_id: str, outstanding: Dict[str, float],
+                   completed: Iterable[Tuple[str, float, Optional[float]]]) -> None:
+        """Replace an agent's state with what its mailbox reports.
+
+        Args:
+            agent_id: Agent
+            outstanding: Task id -> cost of unfinished tasks
+            completed: (task id, cost, duration or None) of finished tasks
+        """
+        agent = self.agents.get(agent_id)
+        if agent is None:
+            return
+        for task, cost, duration in completed:
+            self.known_tasks[task] = agent_id
+            agent.add(task, cost)
+            self.record_completion(agent_id, task, duration)
+        agent.outstanding, agent.outstanding_cost = {}, 0.0
+        for task, cost in outstanding.items():
+            self.known_tasks[task] = agent_id
+            agent.add(task, cost)
+
+    # --- Planning ---
+
+    def plan(self, tasks: List[Dict[str, Any]]) -> DistributionPlan:
+        """Assign new tasks and add them to the agents' outstanding work.
+
+        Tasks whose id is already known (assigned earlier or found in a mailbox) are
+        skipped. A task pinned to a registered agent via "assigned_to" goes to it.
+        """
+        plan = DistributionPlan()
+        pending = []
+        for task in tasks:
+            if task_id(task) in self.known_tasks:
+                plan.skipped += 1
+            else:
+                pending.append(task)
+        pending.sort(key=lambda t: (-task_priority(t), -task_cost(t, self.default_cost)))
+
+        free = []
+        for task in pending:
+            pinned = task.get("assigned_to")
+            if pinned in self.agents:
+                self._assign(plan, self.agents[pinned], task)
+            elif not any(agent.can_run(required_capabilities(task)) for agent in self.agents.values()):
+                plan.unassigned.append(task)
+            else:
+                free.append(task)
+
+        if self.strategy == "least_loaded":
+            self._plan_least_loaded(plan, free)
+        else:
+            self._plan_min_cost(plan, free)
+        if plan.unassigned:
+            logger.warning(f"{len(plan.unassigned)} tasks need capabilities no agent has")
+        return plan
+
+    def _assign(self, plan: DistributionPlan, agent: AgentLoad, task: Dict[str, Any]) -> None:
+        agent.add(task_id(task), task_cost(task, self.default_cost))
+        self.known_tasks[task_id(task)] = agent.agent_id
+        plan.assignments.setdefault(agent.agent_id, []).append(task)
+
+    def _eligible(self, cache: Dict[FrozenSet[str], List[AgentLoad]], task: Dict[str, Any]) -> List[AgentLoad]:
+        required = required_capabilities(task)
+        agents = cache.get(required)
+        if agents is None:
+            agents = cache[required] = [a for a in self.agents.values() if a.can_run(required)]
+        return agents
+
+    def _plan_least_loaded(self, plan: DistributionPlan, tasks: List[Dict[str, Any]]) -> None:
+        eligible: Dict[FrozenSet[str], List[AgentLoad]] = {}
+        for task in tasks:
+            cost = task_cost(task, self.default_cost)
+            agent = min(self._eligible(eligible, task), key=lambda a: (a.finish_time(cost), a.agent_id))
+            self._assign(plan, agent, task)
+
+    def _plan_min_cost(self, plan: DistributionPlan, tasks: List[Dict[str, Any]]) -> None:
+        agents = sorted(self.agents.values(), key=lambda a: a.agent_id)
+        eligible: Dict[FrozenSet[str], List[AgentLoad]] = {}
+        for start in range(0, len(tasks), self.batch_size):
+            batch = tasks[start:start + self.batch_size]
+            slots = len(batch)
+            positions = np.arange(1, slots + 1)
+            matrix = np.full((slots, len(agents) * slots), _INFEASIBLE)
+            for row, task in enumerate(batch):
+                cost = task_cost(task, self.default_cost)
+                allowed = set(id(a) for a in self._eligible(eligible, task))
+                for column, agent in enumerate(agents):
+                    if id(agent) in allowed:
+                        matrix[row, column * slots:(column + 1) * slots] = (
+                            agent.outstanding_cost + positions * cost) / agent.throughput
+            rows, columns = linear_sum_assignment(matrix)
+            # Queue each agent's tasks from the highest position (runs first) down
+            order = sorted(zip(columns // slots, -(columns % slots), rows))
+            for agent_index, _, row in order:
+                self._assign(plan, agents[agent_index], batch[row])
@@ -1,11 +1,20 @@
 import yaml
 import json
 import logging
+from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Tuple
 import random
 import time
 
+from dreamos.tools.task_distribution_engine import (
+    DONE_STATUSES,
+    EpisodeCache,
+    TaskDistributionEngine,
+    task_cost,
+    task_id,
+)
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -15,11 +24,17 @@ logging.basicConfig(
 logger = logging.getLogger('task_distributor')
 
 class TaskDistributor:
-    def __init__(self):
-        self.episodes_dir = Path("episodes")
-        self.mailbox_dir = Path("runtime/agent_comms/agent_mailboxes")
-        self.registry_file = Path("runtime/agent_registry.json")
+    def __init__(self, strategy: str = "least_loaded", episodes_dir: str = "episodes",
+                 mailbox_dir: str = "runtime/agent_comms/agent_mailboxes",
+                 registry_file: str = "runtime/agent_registry.json"):
+        self.episodes_dir = Path(episodes_dir)
+        self.mailbox_dir = Path(mailbox_dir)
+        self.registry_file = Path(registry_file)
         self.registry = self._load_registry()
+        self.episode_cache = EpisodeCache(self.episodes_dir)
+        self.engine = TaskDistributionEngine(strategy)
+        # agent_id -> ((mtime_ns, size), tasks) of the agent's tasks.yaml
+        self._mailbox_cache: Dict[str, Tuple[Tuple[int, int], List[Dict[str, Any]]]] = {}
         
     def _load_registry(self) -> dict:
         """Load agent registry."""
@@ -67,34 +82,37 @@ class TaskDistributor:
         except Exception as e:
             logger.error(f"Failed to assign tasks to {agent_id}: {e}")
             
+    def _format_tasks(self, agent_id: str, tasks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Format tasks for an agent's task file."""
+        formatted_tasks = []
+        assigned_at = time.strftime("%Y-%m-%d %H:%M:%S")
+        for task in tasks:
+            if isinstance(task, dict):
+                formatted_tasks.append({
+                    "id": task.get("id", ""),
+                    "title": task.get("title", ""),
+                    "description": task.get("description", ""),
+                    "priority": task.get("priority", 0),
+                    "estimated_cost": task_cost(task, self.engine.default_cost),
+                    "status": "pending",
+                    "assigned_at": assigned_at
+                })
+            else:
+                logger.warning(f"Skipping invalid task format for {agent_id}: {task}")
+        return formatted_tasks
+            
     def assign_tasks_to_agent(self, agent_id: str, tasks: List[Dict[str, Any]]) -> bool:
-        """Assign tasks to a specific agent."""
+        """Assign tasks to a specific agent, replacing its task file."""
         try:
             if not tasks:
                 logger.warning(f"No tasks available to assign to {agent_id}")
                 return False
             
             # Create agent's task file
-            agent_tasks_file = Path(f"runtime/agent_comms/agent_mailboxes/{agent_id}/tasks.yaml")
+            agent_tasks_file = self.mailbox_dir / agent_id / "tasks.yaml"
             agent_tasks_file.parent.mkdir(parents=True, exist_ok=True)
             
-            # Format tasks for the agent
-            formatted_tasks = []
-            for task in tasks:
-                if isinstance(task, dict):
-                    formatted_task = {
-                        "id": task.get("id", ""),
-                        "title": task.get("title", ""),
-                        "description": task.get("description", ""),
-                        "priority": task.get("priority", 0),
-                        "status": "pending",
-                        "assigned_at": time.strftime("%Y-%m-%d %H:%M:%S")
-                    }
-                    formatted_tasks.append(formatted_task)
-                else:
-                    logger.warning(f"Skipping invalid task format for {agent_id}: {task}")
-                    continue
-            
+            formatted_tasks = self._format_tasks(agent_id, tasks)
             if not formatted_tasks:
                 logger.warning(f"No valid tasks to assign to {agent_id}")
                 return False
@@ -110,66 +128,106 @@ class TaskDistributor:
             logger.error(f"Failed to assign tasks to {agent_id}: {e}")
             return False
 
-    def distribute_tasks(self):
-        """Distribute tasks from episode files to agents."""
+    def _read_agent_tasks(self, agent_id: str) -> List[Dict[str, Any]]:
+        """Tasks in an agent's tasks.yaml, re-parsed only when the file changed."""
+        agent_tasks_file = self.mailbox_dir / agent_id / "tasks.yaml"
         try:
-            # Get all episode files
-            episode_files = list(Path("episodes").glob("episode-*.yaml"))
-            if not episode_files:
+            stat = agent_tasks_file.stat()
+        except OSError:
+            self._mailbox_cache.pop(agent_id, None)
+            return []
+        key = (stat.st_mtime_ns, stat.st_size)
+        cached = self._mailbox_cache.get(agent_id)
+        if cached is None or cached[0] != key:
+            try:
+                with open(agent_tasks_file, 'r') as f:
+                    data = yaml.safe_load(f) or {}
+                tasks = [t for t in data.get("tasks", []) if isinstance(t, dict)]
+            except Exception as e:
+                logger.error(f"Failed to read tasks of {agent_id}: {e}")
+                tasks = []
+            cached = self._mailbox_cache[agent_id] = (key, tasks)
+        return cached[1]
+
+    @staticmethod
+    def _duration(task: Dict[str, Any]) -> Optional[float]:
+        """Seconds from assignment to completion, or None if unknown.
+        
+        assigned_at is written in naive local time; completed_at may carry an offset.
+        Both are made timezone-aware (naive values as local time) before subtracting.
+        """
+        try:
+            started = datetime.fromisoformat(str(task["assigned_at"])).astimezone()
+            finished = datetime.fromisoformat(str(task["completed_at"])).astimezone()
+            return (finished - started).total_seconds()
+        except (KeyError, ValueError, TypeError, OverflowError, OSError):
+            return None
+
+    def _refresh_agent_loads(self):
+        """Update outstanding work and throughput of every agent from its task file."""
+        for agent_id in self.engine.agents:
+            outstanding, completed = {}, []
+            for task in self._read_agent_tasks(agent_id):
+                cost = task_cost(task, self.engine.default_cost)
+                if str(task.get("status", "")).lower() in DONE_STATUSES:
+                    completed.append((task_id(task), cost, self._duration(task)))
+                else:
+                    outstanding[task_id(task)] = cost
+            self.engine.sync_agent(agent_id, outstanding, completed)
+
+    def _append_agent_tasks(self, agent_id: str, tasks: List[Dict[str, Any]]) -> int:
+        """Append tasks to an agent's task file in a single write."""
+        formatted_tasks = self._format_tasks(agent_id, tasks)
+        agent_tasks_file = self.mailbox_dir / agent_id / "tasks.yaml"
+        agent_tasks_file.parent.mkdir(parents=True, exist_ok=True)
+        all_tasks = self._read_agent_tasks(agent_id) + formatted_tasks
+        with open(agent_tasks_file, 'w') as f:
+            yaml.dump({"tasks": all_tasks}, f, default_flow_style=False)
+        stat = agent_tasks_file.stat()
+        self._mailbox_cache[agent_id] = ((stat.st_mtime_ns, stat.st_size), all_tasks)
+        return len(formatted_tasks)
+
+    def distribute_tasks(self) -> Dict[str, Any]:
+        """Distribute new tasks from episode files to agents by load and capabilities.
+        
+        Tasks already present in an agent's task file are not assigned again. Each
+        agent's task file is written at most once per call.
+        
+        Returns:
+            Summary with assigned, skipped and unassigned counts and tasks per agent
+        """
+        summary = {"assigned": 0, "skipped": 0, "unassigned": 0, "per_agent": {}}
+        try:
+            all_tasks, episode_count = self.episode_cache.load_tasks()
+            if not episode_count:
                 logger.warning("No episode files found")
-                return
-            
-            # Load and combine tasks from all episode files
-            all_tasks = []
-            for episode_file in episode_files:
-                try:
-                    with open(episode_file, 'r') as f:
-                        episode_data = yaml.safe_load(f)
-                        if isinstance(episode_data, dict) and "tasks" in episode_data:
-                            tasks = episode_data["tasks"]
-                            if isinstance(tasks, list):
-                                all_tasks.extend(tasks)
-                            else:
-                                logger.warning(f"Invalid tasks format in {episode_file}")
-                except Exception as e:
-                    logger.error(f"Failed to load tasks from {episode_file}: {e}")
-                    continue
-            
+                return summary
             if not all_tasks:
                 logger.warning("No valid tasks found in episode files")
-                return
+                return summary
             
-            # Sort tasks by priority
-            all_tasks.sort(key=lambda x: x.get("priority", 0), reverse=True)
-            
-            # Get available agents
-            available_agents = list(self.registry.keys())
-            if not available_agents:
+            self.engine.set_agents(self.registry)
+            if not self.engine.agents:
                 logger.warning("No agents available for task distribution")
-                return
-            
-            # Distribute tasks evenly among agents
-            tasks_per_agent = len(all_tasks) // len(available_agents)
-            remaining_tasks = len(all_tasks) % len(available_agents)
+                return summary
             
-            task_index = 0
-            for agent_id in available_agents:
-                # Calculate number of tasks for this agent
-                agent_task_count = tasks_per_agent + (1 if remaining_tasks > 0 else 0)
-                remaining_tasks -= 1
-                
-                # Get tasks for this agent
-                agent_tasks = all_tasks[task_index:task_index + agent_task_count]
-                task_index += agent_task_count
-                
-                # Assign tasks to agent
-                if agent_tasks:
-                    self.assign_tasks_to_agent(agent_id, agent_tasks)
+            self._refresh_agent_loads()
+            plan = self.engine.plan(all_tasks)
+            for agent_id, agent_tasks in plan.assignments.items():
+                try:
+                    summary["per_agent"][agent_id] = self._append_agent_tasks(agent_id, agent_tasks)
+                    logger.info(f"Assigned {len(agent_tasks)} tasks to {agent_id}")
+                except Exception as e:
+                    logger.error(f"Failed to assign tasks to {agent_id}: {e}")
+                    self.engine.release(agent_id, [task_id(t) for t in agent_tasks])
             
-            logger.info(f"Distributed {len(all_tasks)} tasks from {len(episode_files)} episode files")
+            summary.update(assigned=plan.assigned_count, skipped=plan.skipped,
+                           unassigned=len(plan.unassigned))
+            logger.info(f"Distributed {plan.assigned_count} new tasks from {episode_count} episode files")
             
         except Exception as e:
             logger.error(f"Error in task distribution: {e}")
+        return summary
 
 def main():
     distributor = TaskDistributor()
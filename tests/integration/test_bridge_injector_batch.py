@@ -0,0 +1,108 @@
+"""
+Integration Test: Bridge Injector Batches
+----------------------------------------
+Tests batch command processing in the Bridge Injector.
+"""
+
+import os
+import sys
+import json
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+
+# Add src directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src')))
+
+# Import modules to test
+from bridge.injector import BridgeInjector
+
+
+class TestInjectorBatchProcessing(unittest.TestCase):
+    """Test case for BridgeInjector.process_commands."""
+
+    def setUp(self):
+        """Set up an injector with a recording EXECUTE_TASK router."""
+        self.test_log_dir = tempfile.mkdtemp()
+        self.log_path = os.path.join(self.test_log_dir, "bridge_logs.jsonl")
+        self.injector = BridgeInjector({
+            'logger_config': {'log_path': self.log_path, 'enable_console': False}
+        })
+        self.routed_threads = set()
+
+        def execute_task_router(cmd):
+            self.routed_threads.add(threading.get_ident())
+            time.sleep(0.01)
+            if cmd['payload'].get('trigger_error'):
+                raise ValueError("Test error triggered")
+            return {"status": "success", "command_id": cmd["command_id"],
+                    "result": {"task_id": cmd['payload']['task_id']}}
+
+        self.injector.routers["EXECUTE_TASK"] = execute_task_router
+
+    def tearDown(self):
+        """Remove the temporary log directory."""
+        shutil.rmtree(self.test_log_dir, ignore_errors=True)
+
+    def _make_batch(self):
+        batch = [{"command_type": "EXECUTE_TASK", "source": "test", "payload": {"task_id": f"task-{i}"}}
+                 for i in range(6)]
+        batch.insert(2, {"command_type": "GET_STATUS", "source": "test"})
+        batch.insert(4, {"command_type": "EXECUTE_TASK", "source": "test", "payload": {}})
+        batch[6]["payload"]["trigger_error"] = True
+        return batch
+
+    def _check_responses(self, batch, responses):
+        self.assertEqual(len(responses), len(batch))
+        for command, response in zip(batch, responses):
+            if command["command_type"] == "GET_STATUS":
+                self.assertEqual(response["status"], "success")
+                self.assertIn("system_status", response["result"]["data"])
+            elif "task_id" not in command["payload"]:
+                self.assertEqual(response["error"]["code"], "INVALID_COMMAND")
+            elif command["payload"].get("trigger_error"):
+                self.assertEqual(response["status"], "error")
+                self.assertEqual(response["metadata"]["command_id"], command["command_id"])
+            else:
+                self.assertEqual(response["result"]["task_id"], command["payload"]["task_id"])
+
+    def test_responses_keep_input_order(self):
+        """Responses line up with the batch and the batch is logged once."""
+        batch = self._make_batch()
+        responses = self.injector.process_commands(batch)
+        self._check_responses(batch, responses)
+
+        self.assertEqual(self.injector.stats["commands_processed"], 7)
+        self.assertEqual(self.injector.stats["successful_commands"], 6)
+        self.assertEqual(self.injector.logger.current_recursion_depth, 0)
+
+        with open(self.log_path, 'r', encoding='utf-8') as f:
+            messages = [json.loads(line)["message"] for line in f]
+        self.assertEqual(sum(m.startswith("Received") for m in messages), 1)
+
+    def test_malformed_items_fail_individually(self):
+        """Items that are not command objects get an error response; the rest are routed."""
+        batch = self._make_batch()
+        batch[1:1] = [None, "GET_STATUS"]
+        responses = self.injector.process_commands(batch)
+
+        self.assertEqual(len(responses), len(batch))
+        for index in (1, 2):
+            self.assertEqual(responses[index]["status"], "error")
+            self.assertEqual(responses[index]["error"]["code"], "INVALID_COMMAND")
+        del batch[1:3], responses[1:3]
+        self._check_responses(batch, responses)
+        self.assertEqual(self.injector.logger.current_recursion_depth, 0)
+
+    def test_concurrent_batch(self):
+        """Concurrent routing returns the same responses in the same order."""
+        batch = self._make_batch()
+        responses = self.injector.process_commands(batch, concurrent=True)
+        self._check_responses(batch, responses)
+        self.assertGreater(len(self.routed_threads), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+"""
+Integration Test: Bridge Injector Validation
+--------------------------------------------
+Tests schema compilation and the validation modes of the Bridge Injector.
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+
+# Add src directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src')))
+
+# Import modules to test
+from bridge.injector import BridgeInjector
+
+# Properties are checked before required, so the first error is the nested one
+ORDERED_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "command_type": {"type": "string"},
+        "source": {"type": "string"},
+        "payload": {"type": "object", "properties": {"name": {"type": "string"}}}
+    },
+    "required": ["command_type", "source", "target"]
+}
+
+
+class TestInjectorValidation(unittest.TestCase):
+    """Test case for BridgeInjector schema validation."""
+
+    def setUp(self):
+        """Create a temporary log directory."""
+        self.test_log_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Remove the temporary log directory."""
+        shutil.rmtree(self.test_log_dir, ignore_errors=True)
+
+    def _injector(self, **config):
+        config['logger_config'] = {
+            'log_path': os.path.join(self.test_log_dir, "bridge_logs.jsonl"),
+            'enable_console': False
+        }
+        return BridgeInjector(config)
+
+    def _check(self, injector, command):
+        return injector.validators["ORDERED"](command)
+
+    def test_first_and_best_modes(self):
+        """Mode "first" reports the first error found, mode "best" the most relevant one."""
+        command = {"command_type": "ORDERED", "source": "test", "payload": {"name": 5}}
+        first = self._check(self._injector(command_schemas={"ORDERED": ORDERED_SCHEMA},
+                                           validation_mode="first"), command)
+        best = self._check(self._injector(command_schemas={"ORDERED": ORDERED_SCHEMA}), command)
+
+        self.assertFalse(first["is_valid"])
+        self.assertFalse(best["is_valid"])
+        self.assertEqual(first["errors"]["path"], ["payload", "name"])
+        self.assertEqual(best["errors"]["path"], [])
+        self.assertIn("'target' is a required property", best["error_message"])
+
+        valid = dict(command, payload={"name": "x"}, target="agent")
+        for mode in ("first", "best"):
+            injector = self._injector(command_schemas={"ORDERED": ORDERED_SCHEMA}, validation_mode=mode)
+            self.assertTrue(self._check(injector, valid)["is_valid"])
+
+    def test_invalid_command_schema_falls_back_to_default(self):
+        """A command type with an invalid schema is validated against the default schema."""
+        injector = self._injector(command_schemas={"BROKEN": {"type": 12}})
+        self.assertNotIn("BROKEN", injector.compiled_validators)
+        self.assertTrue(injector.validators["BROKEN"]({"command_type": "BROKEN", "source": "test"})["is_valid"])
+        self.assertFalse(injector.validators["BROKEN"]({"command_type": "BROKEN"})["is_valid"])
+
+    def test_invalid_default_schema_fails_at_init(self):
+        """An invalid default schema is rejected when the injector is created."""
+        with self.assertRaisesRegex(ValueError, "Invalid default command schema"):
+            self._injector(command_schemas={"default": {"type": 12}})
+
+
+if __name__ == "__main__":
+    unittest.main()
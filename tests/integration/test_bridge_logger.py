@@ -0,0 +1,125 @@
+"""
+Integration Test: Bridge Logger Writer
+-------------------------------------
+Tests the queue-backed, batched writer mode of the BridgeLogger.
+"""
+
+import os
+import sys
+import json
+import shutil
+import tempfile
+import unittest
+
+# Add src directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src')))
+
+# Import modules to test
+from bridge.logging import BridgeLogger
+
+
+class TestBridgeLoggerAsyncWriter(unittest.TestCase):
+    """Test case for the non-blocking BridgeLogger mode."""
+
+    def setUp(self):
+        """Set up a temporary log directory."""
+        self.test_log_dir = tempfile.mkdtemp()
+        self.log_path = os.path.join(self.test_log_dir, "bridge_logs.jsonl")
+
+    def tearDown(self):
+        """Remove the temporary log directory."""
+        shutil.rmtree(self.test_log_dir, ignore_errors=True)
+
+    def _read_events(self, path):
+        with open(path, 'r', encoding='utf-8') as f:
+            return [json.loads(line) for line in f]
+
+    def test_close_flushes_queued_events(self):
+        """All events logged before close() are written, in order."""
+        logger = BridgeLogger({
+            'log_path': self.log_path,
+            'enable_console': False,
+            'async_mode': True,
+            'batch_size': 16
+        })
+        for i in range(200):
+            logger.log({"source": "test", "message": f"event {i}"})
+        logger.close()
+
+        events = self._read_events(self.log_path)
+        self.assertEqual(len(events), 201)  # includes the initialization event
+        self.assertEqual(events[-1]["message"], "event 199")
+        self.assertEqual(logger.get_stats()["dropped_events"], 0)
+
+    def test_rotation_by_tracked_bytes(self):
+        """The writer rotates once its tracked byte count passes max_log_size."""
+        logger = BridgeLogger({
+            'log_path': self.log_path,
+            'enable_console': False,
+            'async_mode': True,
+            'max_log_size': 2048
+        })
+        for i in range(500):
+            logger.log({"source": "test", "message": f"event {i}", "payload": {"pad": "x" * 50}})
+        logger.close()
+
+        self.assertTrue(os.path.exists(f"{self.log_path}.1"))
+        self.assertEqual(self._read_events(self.log_path)[-1]["message"], "event 499")
+
+    def test_overload_counts_dropped_events(self):
+        """Events that do not fit in the queue are counted, never lost silently."""
+        logger = BridgeLogger({
+            'log_path': self.log_path,
+            'enable_console': False,
+            'async_mode': True,
+            'queue_size': 5
+        })
+        for i in range(500):
+            logger.log({"source": "test", "message": f"event {i}"})
+        logger.close()
+
+        stats = logger.get_stats()
+        self.assertEqual(stats["written_events"] + stats["dropped_events"], 501)
+        self.assertEqual(len(self._read_events(self.log_path)), stats["written_events"])
+
+
+class TestBridgeLoggerLoopDetection(unittest.TestCase):
+    """Test case for sliding-window loop detection."""
+
+    def setUp(self):
+        """Set up a logger with a tight window for PING commands."""
+        self.test_log_dir = tempfile.mkdtemp()
+        self.logger = BridgeLogger({
+            'log_path': os.path.join(self.test_log_dir, "bridge_logs.jsonl"),
+            'enable_console': False,
+            'loop_rules': {'PING': {'window': 3, 'threshold': 2}}
+        })
+
+    def tearDown(self):
+        """Remove the temporary log directory."""
+        shutil.rmtree(self.test_log_dir, ignore_errors=True)
+
+    def test_thresholds_per_command_type(self):
+        """Each command type uses its own window size and threshold."""
+        command = {"command_type": "EXECUTE_TASK", "payload": {"task": 1}}
+        results = [self.logger.detect_infinite_loop(command) for _ in range(7)]
+        self.assertEqual(results, [False] * 5 + [True, True])
+
+        ping = {"command_type": "PING"}
+        self.assertEqual([self.logger.detect_infinite_loop(ping) for _ in range(3)], [False, False, True])
+
+    def test_repeats_outside_window_are_forgotten(self):
+        """Digests that slide out of the window no longer count."""
+        ping = {"command_type": "PING"}
+        for i in range(6):
+            self.assertFalse(self.logger.detect_infinite_loop(ping))
+            self.assertFalse(self.logger.detect_infinite_loop({"command_type": "PING", "n": i}))
+            self.assertFalse(self.logger.detect_infinite_loop({"command_type": "PING", "m": i}))
+
+        window = self.logger.loop_windows["PING"]
+        self.assertEqual(len(window), 3)
+        self.assertEqual(sum(window.counts.values()), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
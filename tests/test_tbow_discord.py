@@ -2,10 +2,13 @@ import unittest
 from unittest.mock import Mock, patch, AsyncMock
 import json
 import os
+import shutil
+import tempfile
 from datetime import datetime, timedelta
 import pytest
 import discord
 from basicbot.tbow_discord import TBOWDiscord, AlertRule, AlertManager, parse_conditions, DigestManager, PriceCache, AlertLogger
+from basicbot.tbow_discord import compile_conditions, evaluate_conditions, CONDITION_HANDLERS, PriceSeries
 
 class TestTBOWDiscord(unittest.TestCase):
     def setUp(self):
@@ -505,5 +508,85 @@ class TestTBOWDiscord(unittest.TestCase):
             channel.send.assert_called_once()
             self.assertIn('Daily Alert Digest', channel.send.call_args[0][0])
 
+class TestAlertConditions(unittest.TestCase):
+    """Alert condition compilation, independent of the bot fixture"""
+
+    def test_compiled_conditions_shared_evaluation(self):
+        """Test shared sub-conditions are evaluated once per tick"""
+        calls = []
+        data = Mock(price=[210.0, 215.5], vwap=[212.0, 213.0], rsi=[38.0, 35.0], macd_hist=[-0.2, 0.1])
+        
+        mask_a = compile_conditions(("MACD_curl_up", "RSI_below_40"))
+        mask_b = compile_conditions(("RSI_below_40", "VWAP_above"))
+        self.assertEqual(mask_a, compile_conditions(("RSI_below_40", "MACD_curl_up")))
+        
+        original = CONDITION_HANDLERS["RSI_below_40"]
+        def counting(d):
+            calls.append(1)
+            return original(d)
+        with patch.dict(CONDITION_HANDLERS, {"RSI_below_40": counting}):
+            met = evaluate_conditions(mask_a | mask_b, data)
+        
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(mask_a & met, mask_a)
+        self.assertEqual(mask_b & met, mask_b)
+        
+        with self.assertRaises(KeyError):
+            compile_conditions(("INVALID_CONDITION",))
+
+class TestIndexedStorage(unittest.TestCase):
+    """Time-indexed price cache and alert log, independent of the bot fixture"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_price_series_bounded_and_sorted(self):
+        """Test the price buffer drops old points and keeps time order"""
+        series = PriceSeries(max_points=3)
+        start = datetime(2024, 1, 2, 9, 30)
+        for i in range(7):
+            series.append(start + timedelta(minutes=i), 100.0 + i)
+        series.append(start + timedelta(minutes=4, seconds=30), 999.0)
+
+        self.assertEqual(len(series), 3)
+        self.assertEqual([p for _, p in series], [999.0, 105.0, 106.0])
+        self.assertEqual(series.price_at_or_after(start), 999.0)
+        self.assertIsNone(series.price_at_or_after(start + timedelta(minutes=10)))
+        self.assertEqual(
+            series.prices_between(start + timedelta(minutes=5), start + timedelta(minutes=6)),
+            [105.0, 106.0]
+        )
+
+    def test_alert_log_indexed_by_day_and_id(self):
+        """Test alert log queries use the SQLite index and backfill from CSV"""
+        log_file = os.path.join(self.temp_dir, 'alert_log.csv')
+        yesterday = (datetime.now() - timedelta(days=1)).isoformat()
+        with open(log_file, 'w', newline='') as f:
+            f.write('alert_id,symbol,conditions,fired_ts,price_at_fire,price_after_30m\n')
+            f.write(f'old-1,TSLA,VWAP_above,{yesterday},200.0,\n')
+
+        logger = AlertLogger(log_file)
+        alert = AlertRule(
+            symbol='TSLA',
+            conditions=['MACD_curl_up', 'RSI_below_40'],
+            target='123456789',
+            user_id='123456789',
+            created=datetime.now()
+        )
+        logger.log_alert(alert, 215.50, 216.00)
+
+        alerts = logger.get_todays_alerts()
+        self.assertEqual([a['alert_id'] for a in alerts], [alert.alert_id])
+        self.assertEqual(alerts[0]['price_after_30m'], 216.00)
+        self.assertEqual(len(logger.get_alerts_for_date((datetime.now() - timedelta(days=1)).date())), 1)
+        self.assertEqual(logger.get_alert(alert.alert_id)['price_at_fire'], 215.50)
+        self.assertIsNone(logger.get_alert('old-1'))
+
+        # Reopening must not backfill twice
+        self.assertEqual(len(AlertLogger(log_file).get_todays_alerts()), 1)
+
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
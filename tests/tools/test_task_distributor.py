@@ -0,0 +1,94 @@
+"""Tests for load- and capability-aware task distribution."""
+
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+import yaml
+
+from dreamos.tools.task_distribution_engine import TaskDistributionEngine
+from dreamos.tools.task_distributor import TaskDistributor
+
+
+def make_tasks(costs, **extra):
+    return [{"id": f"T-{i}", "estimated_cost": cost, **extra} for i, cost in enumerate(costs)]
+
+
+@pytest.mark.parametrize("strategy", ["least_loaded", "min_cost"])
+def test_engine_balances_by_throughput_and_capabilities(strategy):
+    engine = TaskDistributionEngine(strategy)
+    engine.set_agents({"fast": {"capabilities": ["code"]}, "slow": {}})
+    engine.agents["fast"].throughput = 3.0
+
+    tasks = make_tasks([4] * 8) + [{"id": "C-1", "estimated_cost": 1, "required_capabilities": ["code"]},
+                                   {"id": "X-1", "required_capabilities": ["gpu"]}]
+    plan = engine.plan(tasks)
+
+    assert [t["id"] for t in plan.unassigned] == ["X-1"]
+    assert "C-1" in [t["id"] for t in plan.assignments["fast"]]
+    # Work splits roughly 3:1, so both agents finish at about the same time
+    assert len(plan.assignments["fast"]) >= 5
+    finish = [agent.finish_time() for agent in engine.agents.values()]
+    assert max(finish) - min(finish) <= 4
+
+    # Already planned tasks are not assigned again
+    assert engine.plan(tasks).skipped == 9
+
+
+def test_completions_update_throughput():
+    engine = TaskDistributionEngine(throughput_alpha=0.5)
+    engine.set_agents({"A": {}})
+    engine.plan(make_tasks([10]))
+    engine.record_completion("A", "T-0", duration=2.0)
+    engine.record_completion("A", "T-0", duration=2.0)
+    assert engine.agents["A"].throughput == pytest.approx(3.0)
+    assert engine.agents["A"].outstanding_cost == 0
+    assert engine.agents["A"].completed == 1
+
+    with pytest.raises(ValueError):
+        TaskDistributionEngine("round_robin")
+
+
+def test_distribute_tasks_batches_writes_and_uses_cache(tmp_path):
+    episodes = tmp_path / "episodes"
+    episodes.mkdir()
+    (episodes / "episode-01.yaml").write_text(yaml.safe_dump({"tasks": [
+        {"id": "A", "priority": "high", "estimated_cost": 3},
+        {"id": "B", "priority": 1},
+        {"title": "no id", "priority": "low"},
+    ]}))
+    registry = tmp_path / "agent_registry.json"
+    registry.write_text(json.dumps({"Agent-1": {"capabilities": []}, "Agent-2": {"capabilities": []}}))
+    mailboxes = tmp_path / "mailboxes"
+
+    distributor = TaskDistributor(episodes_dir=str(episodes), mailbox_dir=str(mailboxes),
+                                  registry_file=str(registry))
+    summary = distributor.distribute_tasks()
+    assert summary["assigned"] == 3
+    assert distributor.distribute_tasks()["skipped"] == 3
+    assert distributor.episode_cache.parse_count == 1
+
+    files = {path.parent.name: yaml.safe_load(path.read_text())["tasks"]
+             for path in mailboxes.glob("*/tasks.yaml")}
+    assert sorted(t["id"] for tasks in files.values() for t in tasks) == ["A", "B", "episode-01-3"]
+    assert [t["id"] for t in files["Agent-1"]][0] == "A"
+
+    # Agent-1 finished its task: the next distribution sees its load drop
+    files["Agent-1"][0].update(status="completed", completed_at=files["Agent-1"][0]["assigned_at"])
+    (mailboxes / "Agent-1" / "tasks.yaml").write_text(yaml.safe_dump({"tasks": files["Agent-1"]}))
+    (episodes / "episode-02.yaml").write_text(yaml.safe_dump({"tasks": [{"id": "C", "estimated_cost": 2}]}))
+    assert distributor.distribute_tasks()["per_agent"] == {"Agent-1": 1}
+    assert distributor.episode_cache.parse_count == 2
+
+
+def test_duration_mixes_naive_and_aware_timestamps():
+    assigned = datetime(2026, 1, 1, 12, 0, 0)
+    completed = (assigned + timedelta(seconds=90)).astimezone(timezone.utc)
+    task = {"assigned_at": assigned.strftime("%Y-%m-%d %H:%M:%S"), "completed_at": completed.isoformat()}
+    assert TaskDistributor._duration(task) == pytest.approx(90.0)
+    # Unquoted in tasks.yaml, both load as datetime objects
+    task = yaml.safe_load(f"assigned_at: {task['assigned_at']}\ncompleted_at: {task['completed_at']}\n")
+    assert isinstance(task["completed_at"], datetime)
+    assert TaskDistributor._duration(task) == pytest.approx(90.0)
+    assert TaskDistributor._duration({"assigned_at": "soon", "completed_at": completed}) is None
+    assert TaskDistributor._duration({"completed_at": completed.isoformat()}) is None